@@ -29,6 +29,7 @@ from vikit.postprocessing.subtitles.simple_video_subtitle_renderer import (
     SimpleVideoSubtitleRenderer,
 )
 from vikit.prompt.prompt_factory import PromptFactory
+from vikit.video.building.build_job_server import BuildJobServer
 from vikit.video.composite_video import CompositeVideo
 from vikit.video.imported_video import ImportedVideo
 from vikit.video.prompt_based_video import PromptBasedVideo
@@ -80,6 +81,11 @@ async def batch_raw_text_based_prompting(
     to_interpolate = True if model_provider == "videocrafter" else False
     prompt_df = pd.read_csv(prompt_file, delimiter=";", header=0)
 
+    # The server builds several videos at once, sharing the models gateway
+    build_job_server = BuildJobServer()
+    await build_job_server.start()
+    jobs = []
+
     for _, row in prompt_df.iterrows():
         output_file = f"{row.iloc[0]}.mp4"
         prompt_content = row.iloc[1]
@@ -102,7 +108,13 @@ async def batch_raw_text_based_prompting(
         video_build_settings.prompt = prompt_obj
 
         video = RawTextBasedVideo(prompt_content)
-        await video.build(build_settings=video_build_settings)
+        jobs.append(
+            await build_job_server.submit(video, build_settings=video_build_settings)
+        )
+
+    await build_job_server.stop()
+    for job in jobs:
+        logger.info(f"Video {job.video.id}: {job.status} {job.video.media_url}")
 
 
 async def composite_textonly_prompting(
@@ -0,0 +1,53 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+import pytest
+
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.video.building.build_job_server import BuildJobServer, BuildJobStatus
+from vikit.video.raw_text_based_video import RawTextBasedVideo
+from vikit.video.video_build_settings import VideoBuildSettings
+
+
+class TestBuildJobServer:
+    """
+    Load tests of the build job server, building many videos with the fake gateway
+    """
+
+    @pytest.mark.local_integration
+    @pytest.mark.asyncio
+    async def test_build_many_videos(self):
+        nb_videos = 12
+        with WorkingFolderContext():
+            async with BuildJobServer(nb_workers=4, test_mode=True) as server:
+                jobs = [
+                    await server.submit(
+                        RawTextBasedVideo(f"This is prompt text {i}"),
+                        build_settings=VideoBuildSettings(
+                            target_dir_path=f"build_{i}",
+                            output_video_file_name=f"video_{i}.mp4",
+                        ),
+                        priority=i % 3,
+                    )
+                    for i in range(nb_videos)
+                ]
+
+            assert all(job.status == BuildJobStatus.SUCCEEDED for job in jobs), [
+                job.error for job in jobs
+            ]
+            for i in range(nb_videos):
+                assert os.path.exists(f"build_{i}/video_{i}.mp4")
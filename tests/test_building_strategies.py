@@ -18,6 +18,7 @@ import pytest
 import tests.testing_tools as tools
 from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
 from vikit.video.building.build_order import (
+    VideoBuildOrder,
     get_lazy_dependency_chain_build_order,
 )
 from vikit.video.composite_video import CompositeVideo
@@ -161,3 +162,44 @@ class TestVideoBuildingStrategies:
 
         # Assert the build order
         assert build_order == [video2, video4, video5, video3, video1]
+
+    @pytest.mark.unit
+    def test_get_lazy_dependency_chain_build_order__no_state_between_calls(self):
+        first_video = RawTextBasedVideo("a")
+        second_video = RawTextBasedVideo("b")
+
+        first_build_order = get_lazy_dependency_chain_build_order(
+            video_tree=[first_video],
+            build_settings=VideoBuildSettings(),
+            already_added=set(),
+        )
+        second_build_order = get_lazy_dependency_chain_build_order(
+            video_tree=[second_video],
+            build_settings=VideoBuildSettings(),
+            already_added=set(),
+        )
+
+        assert first_build_order == [first_video]
+        assert second_build_order == [second_video]
+
+    @pytest.mark.unit
+    def test_video_build_order__one_per_build(self):
+        composite = CompositeVideo()
+        first_video = RawTextBasedVideo("a")
+        composite.append_video(first_video)
+        build_order = VideoBuildOrder(video_tree=[composite])
+
+        second_video = RawTextBasedVideo("b")
+        second_video.video_dependencies = [first_video]
+        composite.append_video(second_video)
+        next_build_order = VideoBuildOrder(video_tree=[composite])
+
+        assert build_order.get_build_order() == [first_video, composite]
+        assert next_build_order.get_build_order() == [
+            first_video,
+            second_video,
+            composite,
+        ]
+        assert second_video not in build_order
+        assert second_video in next_build_order
+        assert len(next_build_order) == 3
@@ -62,6 +62,17 @@ class TestCompositeVideo:
         with pytest.raises(TypeError):
             _ = Video()
 
+    @pytest.mark.unit
+    def test_get_children_build_settings__in_composite_workspace(self):
+        with WorkingFolderContext():
+            composite = CompositeVideo().append_video(RawTextBasedVideo("test"))
+            composite.build_settings = VideoBuildSettings(target_dir_path="build")
+
+            children_build_settings = composite.get_children_build_settings()
+
+            assert children_build_settings.get_workspace() == composite.workspace
+            assert composite.workspace.path == os.path.abspath("build")
+
     @pytest.mark.unit
     def test__get_ratio_to_multiply_animations(
         self,
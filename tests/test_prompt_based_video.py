@@ -15,13 +15,17 @@
 
 import os
 
+import pysrt
 import pytest
 
 import tests.testing_medias as test_media
 import tests.testing_tools as tools  # used to get a library of test prompts
 from vikit.common.context_managers import WorkingFolderContext
+from vikit.gateways.fake_ML_models_gateway import FakeMLModelsGateway
+from vikit.gateways.ML_models_gateway import PromptEnhancement
 from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
 from vikit.music_building_context import MusicBuildingContext
+from vikit.prompt.prompt import Prompt
 from vikit.prompt.prompt_factory import PromptFactory
 from vikit.video.prompt_based_video import PromptBasedVideo
 from vikit.video.video import VideoBuildSettings
@@ -29,6 +33,28 @@ from vikit.video.video import VideoBuildSettings
 TEST_PROMPT = "A group of stones in a forest, with symbols"
 
 
+class _BatchRecordingGateway(FakeMLModelsGateway):
+    """
+    Fake gateway enhancing each subtitle text in a recognizable way, and recording the
+    batches it is asked to enhance
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    async def get_prompt_enhancements_async(self, subtitle_texts):
+        self.batches.append(subtitle_texts)
+        return [
+            PromptEnhancement(
+                keywords=f"{text} keywords",
+                enhanced_prompt=f"{text} scenario",
+                title="test_title",
+            )
+            for text in subtitle_texts
+        ]
+
+
 class TestPromptBasedVideo:
     """
     Tests for PromptBasedVideo
@@ -39,6 +65,34 @@ class TestPromptBasedVideo:
         with pytest.raises(ValueError):
             _ = PromptBasedVideo(str(""))
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_compose__enhances_all_subtitles_in_one_batch(self):
+        prompt = Prompt()
+        prompt.subtitles = pysrt.SubRipFile(
+            [
+                pysrt.SubRipItem(
+                    index=i + 1, start=i * 1000, end=(i + 1) * 1000, text=text
+                )
+                for i, text in enumerate(["first", "second", "third"])
+            ]
+        )
+        gateway = _BatchRecordingGateway()
+
+        pbvid = await PromptBasedVideo(prompt=prompt).compose(
+            build_settings=VideoBuildSettings(), ml_models_gateway=gateway
+        )
+
+        assert gateway.batches == [["first", "second", "third"]]
+        assert [
+            [video.text for video in sub_video.video_list]
+            for sub_video in pbvid.video_list
+        ] == [
+            ["first scenario", "first keywords"],
+            ["second scenario", "second keywords"],
+            ["third scenario", "third keywords"],
+        ]
+
     @pytest.mark.local_integration
     @pytest.mark.asyncio
     async def test_get_title(self):
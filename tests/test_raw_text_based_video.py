@@ -13,12 +13,14 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
 import os
 
 import pytest
 
 from vikit.common.context_managers import WorkingFolderContext
 from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
+from vikit.video.composite_video import CompositeVideo
 from vikit.video.raw_text_based_video import RawTextBasedVideo
 from vikit.video.video import VideoBuildSettings
 
@@ -110,3 +112,40 @@ class TestRawTextBasedVideo:
 
             assert built.media_url is not None
             assert os.path.isdir("testdir2"), f"Directory not found: testdir2"
+
+    @pytest.mark.local_integration
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("in_composite", [False, True])
+    async def test_concurrent_builds_in_separate_target_paths(self, in_composite):
+        with WorkingFolderContext():
+            working_folder = os.getcwd()
+            videos = [RawTextBasedVideo(f"This is prompt text {i}") for i in range(2)]
+            if in_composite:
+                videos = [CompositeVideo().append_video(video) for video in videos]
+            gateway = MLModelsGatewayFactory().get_ml_models_gateway(test_mode=True)
+
+            built_videos = await asyncio.gather(
+                *(
+                    video.build_async(
+                        build_settings=VideoBuildSettings(
+                            target_dir_path=f"build_{i}",
+                            output_video_file_name=f"video_{i}.mp4",
+                        ),
+                        ml_models_gateway=gateway,
+                    )
+                    for i, video in enumerate(videos)
+                )
+            )
+
+            assert os.getcwd() == working_folder
+            for i, built in enumerate(built_videos):
+                assert built.media_url == os.path.abspath(f"build_{i}/video_{i}.mp4")
+                assert os.path.exists(built.media_url)
+                if in_composite:
+                    child = built.video_list[0]
+                    assert os.path.dirname(child.media_url) == os.path.abspath(
+                        f"build_{i}"
+                    )
+            assert not [f for f in os.listdir() if os.path.isfile(f)], (
+                "No build file should be written to the working folder"
+            )
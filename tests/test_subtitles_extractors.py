@@ -13,6 +13,8 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
+import os
 import warnings
 
 import pysrt
@@ -20,11 +22,19 @@ import pytest
 from loguru import logger
 
 import tests.testing_tools as tools  # used to get a library of test prompts
+import vikit.prompt.recorded_prompt_subtitles_extractor as extractor_module
 from vikit.common.context_managers import WorkingFolderContext
 from vikit.gateways import vikit_gateway
 from vikit.prompt.recorded_prompt_subtitles_extractor import (
     RecordedPromptSubtitlesExtractor,
 )
+from vikit.prompt.subtitle_extractor import SubtitleExtractor
+from vikit.prompt.subtitle_merge_strategies import (
+    MaxCharactersMergeStrategy,
+    MinDurationMergeStrategy,
+    SentenceBoundaryMergeStrategy,
+    SubtitleMergeStrategy,
+)
 
 SAMPLE_PROMPT_TEXT = """A group of ancient, moss-covered stones come to life in an abandoned forest, revealing intricate carvings
 and symbols. This is additional text to make sure we generate several subtitles. """
@@ -56,3 +66,224 @@ class TestSubtitlesExtrators:
                 sub = pysrt.SubRipItem(sub)
                 assert sub.text is not None
                 logger.debug(f"Subtitle: {sub.text}")
+
+
+class _SlowTranscriptionGateway:
+    """Transcribes each slice as one subtitle named after the slice file"""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def get_subtitles_async(self, audiofile_path):
+        assert os.path.exists(audiofile_path)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+        return {
+            "output": {
+                "transcription": "1\n00:00:01,000 --> 00:00:02,500\n"
+                + os.path.basename(audiofile_path)
+                + "\n"
+            }
+        }
+
+
+@pytest.fixture
+def fake_audio_slicing(monkeypatch):
+    async def fake_get_media_duration_async(path):
+        return 1000.5
+
+    async def fake_extract_audio_slice(audiofile_path, start, end, target_file_name):
+        with open(target_file_name, "wb") as f:
+            f.write(b"fake audio")
+        return target_file_name
+
+    monkeypatch.setenv("STEPS", "300")
+    monkeypatch.setattr(
+        extractor_module, "get_media_duration_async", fake_get_media_duration_async
+    )
+    monkeypatch.setattr(
+        extractor_module, "extract_audio_slice", fake_extract_audio_slice
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_extract_subtitles_async__slices_transcribed_concurrently(
+    fake_audio_slicing,
+):
+    with WorkingFolderContext():
+        gateway = _SlowTranscriptionGateway()
+        extractor = RecordedPromptSubtitlesExtractor(max_concurrent_transcriptions=2)
+
+        subs = await extractor.extract_subtitles_async(
+            recorded_prompt_file_path="recording.mp3", ml_models_gateway=gateway
+        )
+
+        # Slice files are removed once transcribed, no SRT files are written
+        assert os.listdir() == []
+
+    assert gateway.max_running == 2
+    assert [sub.index for sub in subs] == [1, 2, 3, 4]
+    assert [sub.text for sub in subs] == [
+        "slice_0_300.mp3",
+        "slice_300_600.mp3",
+        "slice_600_900.mp3",
+        "slice_900_1000.5.mp3",
+    ]
+    # Each slice is shifted by its start time
+    assert [(sub.start.ordinal, sub.end.ordinal) for sub in subs] == [
+        (1000, 2500),
+        (301000, 302500),
+        (601000, 602500),
+        (901000, 902500),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_extract_subtitles_async__sub_second_audio__single_slice(
+    fake_audio_slicing, monkeypatch
+):
+    async def fake_get_media_duration_async(path):
+        return 0.5
+
+    monkeypatch.setattr(
+        extractor_module, "get_media_duration_async", fake_get_media_duration_async
+    )
+    with WorkingFolderContext():
+        subs = await RecordedPromptSubtitlesExtractor().extract_subtitles_async(
+            recorded_prompt_file_path="recording.mp3",
+            ml_models_gateway=_SlowTranscriptionGateway(),
+        )
+
+    assert [sub.text for sub in subs] == ["slice_0_0.5.mp3"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_extract_subtitles_async__failed_slice__cancels_others(
+    fake_audio_slicing,
+):
+    class FailingGateway(_SlowTranscriptionGateway):
+        async def get_subtitles_async(self, audiofile_path):
+            if "slice_0_" in audiofile_path:
+                return {"error": "quota exceeded"}
+            return await super().get_subtitles_async(audiofile_path)
+
+    with WorkingFolderContext():
+        gateway = FailingGateway()
+        extractor = RecordedPromptSubtitlesExtractor()
+
+        with pytest.raises(ValueError, match="transcription"):
+            await extractor.extract_subtitles_async(
+                recorded_prompt_file_path="recording.mp3", ml_models_gateway=gateway
+            )
+
+    assert gateway.running == 0
+
+
+def _create_subtitles(subtitles: list[tuple[float, float, str]]) -> pysrt.SubRipFile:
+    return pysrt.SubRipFile(
+        [
+            pysrt.SubRipItem(
+                index=index,
+                start=pysrt.SubRipTime.from_ordinal(round(start_sec * 1000)),
+                end=pysrt.SubRipTime.from_ordinal(round(end_sec * 1000)),
+                text=text,
+            )
+            for index, (start_sec, end_sec, text) in enumerate(subtitles, start=1)
+        ]
+    )
+
+
+def _as_tuples(subs: pysrt.SubRipFile) -> list[tuple[int, int, int, str]]:
+    return [(sub.index, sub.start.ordinal, sub.end.ordinal, sub.text) for sub in subs]
+
+
+@pytest.mark.unit
+def test_merge_short_subtitles__merges_until_min_duration():
+    subs = _create_subtitles(
+        [
+            (0.0, 2.0, "One."),
+            (2.0, 4.0, "Two"),
+            (6.9, 8.0, "three."),
+            (7.5, 9.0, "Four"),
+            (9.0, 10.0, "five."),
+        ]
+    )
+
+    merged_subs = SubtitleExtractor().merge_short_subtitles(subs, min_duration=7)
+
+    # Milliseconds count: 6.9s after the start of the group is still too short
+    assert _as_tuples(merged_subs) == [
+        (1, 0, 8000, "One. Two three."),
+        (2, 7500, 10000, "Four five."),
+    ]
+    assert len(subs) == 5, "The input subtitles should be left untouched"
+
+
+@pytest.mark.unit
+def test_merge_subtitles__strategies_combined():
+    subs = _create_subtitles(
+        [
+            (0.0, 1.0, "One."),
+            (1.0, 2.0, "Two"),
+            (2.0, 3.0, "three"),
+            (3.0, 4.0, "four."),
+            (4.0, 5.0, "Five"),
+        ]
+    )
+    extractor = SubtitleExtractor()
+
+    assert [
+        sub.text
+        for sub in extractor.merge_subtitles(
+            subs, strategies=[SentenceBoundaryMergeStrategy()]
+        )
+    ] == ["One.", "Two three four.", "Five"]
+    assert [
+        sub.text
+        for sub in extractor.merge_subtitles(
+            subs, strategies=[MaxCharactersMergeStrategy(max_characters=10)]
+        )
+    ] == ["One. Two", "three", "four. Five"]
+    assert [
+        sub.text
+        for sub in extractor.merge_subtitles(
+            subs,
+            strategies=[
+                MinDurationMergeStrategy(min_duration_sec=10),
+                SentenceBoundaryMergeStrategy(),
+                MaxCharactersMergeStrategy(max_characters=10),
+            ],
+        )
+    ] == ["One.", "Two three", "four.", "Five"]
+
+
+@pytest.mark.unit
+def test_subtitle_merge_strategy__should_merge_required():
+    class _IncompleteMergeStrategy(SubtitleMergeStrategy):
+        pass
+
+    with pytest.raises(TypeError):
+        _IncompleteMergeStrategy()
+
+
+@pytest.mark.unit
+def test_merge_subtitles__long_word_level_transcript():
+    nb_words = 50000
+    subs = _create_subtitles(
+        [(i * 0.3, (i + 1) * 0.3, f"word{i}") for i in range(nb_words)]
+    )
+
+    merged_subs = SubtitleExtractor().merge_short_subtitles(subs, min_duration=3)
+
+    assert len(merged_subs) == nb_words // 10
+    assert merged_subs[-1].text.split() == [
+        f"word{i}" for i in range(nb_words - 10, nb_words)
+    ]
@@ -21,9 +21,13 @@ from loguru import logger
 
 import tests.testing_tools as tools  # used to get a library of test prompts
 from vikit.common.context_managers import WorkingFolderContext
+from vikit.gateways.fake_ML_models_gateway import FakeMLModelsGateway
+from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
 from vikit.video.imported_video import ImportedVideo
 from vikit.video.prompt_based_video import PromptBasedVideo
+from vikit.video.raw_text_based_video import RawTextBasedVideo
 from vikit.video.video import Video
+from vikit.video.video_build_settings import VideoBuildSettings
 
 TESTS_MEDIA_FOLDER = "medias/"
 SMALL_VIDEO_CHAT_FILE = "chat_video_super8.mp4"
@@ -42,6 +46,67 @@ class TestVideo:
         warnings.simplefilter("ignore", category=DeprecationWarning)
         logger.add("log_test_video.txt", rotation="10 MB")
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_build_async__owned_gateway_closed(self, monkeypatch):
+        gateway = FakeMLModelsGateway()
+        nb_closes = 0
+        nb_closes_during_builds = []
+
+        async def counting_close():
+            nonlocal nb_closes
+            nb_closes += 1
+
+        async def fake_build_async(build_settings, ml_models_gateway):
+            nb_closes_during_builds.append(nb_closes)
+            return video
+
+        monkeypatch.setattr(gateway, "close", counting_close)
+        monkeypatch.setattr(
+            MLModelsGatewayFactory,
+            "get_ml_models_gateway",
+            lambda self, test_mode=False: gateway,
+        )
+        video = RawTextBasedVideo("test")
+        monkeypatch.setattr(video, "_build_async", fake_build_async)
+
+        assert await video.build_async() is video
+        assert nb_closes == 1
+
+        await video.build_async(ml_models_gateway=gateway)
+        assert nb_closes == 1, "A gateway given by the caller is not closed"
+        assert nb_closes_during_builds == [0, 1]
+
+    @pytest.mark.unit
+    def test_set_final_video_name__intermediate_file_moved(self):
+        with WorkingFolderContext():
+            video = RawTextBasedVideo("test")
+            video.build_settings = VideoBuildSettings()
+            video.workspace = video.build_settings.get_workspace()
+            video.media_url = video.get_file_name_by_state()
+            with open(video.media_url, "w") as f:
+                f.write("video")
+            intermediate_path = video.media_url
+
+            video.set_final_video_name("final.mp4")
+
+            assert video.media_url == os.path.abspath("final.mp4")
+            assert not os.path.exists(intermediate_path)
+
+    @pytest.mark.unit
+    def test_set_final_video_name__imported_file_kept(self):
+        with WorkingFolderContext():
+            with open("imported.mp4", "w") as f:
+                f.write("video")
+            video = ImportedVideo("imported.mp4")
+            video.build_settings = VideoBuildSettings()
+            video.workspace = video.build_settings.get_workspace()
+
+            video.set_final_video_name("final.mp4")
+
+            assert video.media_url == os.path.abspath("final.mp4")
+            assert os.path.exists("imported.mp4")
+
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_get_first_frame_as_image_path_with_non_generated_video(self):
@@ -13,18 +13,33 @@
 # limitations under the License.
 # ==============================================================================
 
+import os
+
 import pytest
 from loguru import logger
 
+import vikit.common.artifact_cache as artifact_cache
 from tests.testing_medias import get_test_prompt_recording_trainboy
+from vikit.common.artifact_cache import ArtifactCache, LocalArtifactCacheBackend
 from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.media_poller import MediaPoller
 from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
+from vikit.music_building_context import MusicBuildingContext
 from vikit.prompt.prompt_factory import PromptFactory
 from vikit.prompt.recorded_prompt import RecordedPrompt
+from vikit.video.building.handlers import fused_post_build_handler, videogen_handler
+from vikit.video.building.handlers.fused_post_build_handler import (
+    FusedPostBuildHandler,
+)
+from vikit.video.building.handlers.interpolation_handler import (
+    VideoInterpolationHandler,
+)
+from vikit.video.building.handlers.music_merge_handler import MusicMergeHandler
 from vikit.video.building.handlers.use_prompt_audio_track_and_audio_merging_handler import (
     UsePromptAudioTrackAndAudioMergingHandler,
 )
 from vikit.video.building.handlers.videogen_handler import VideoGenHandler
+from vikit.video.building.video_building_pipeline import VideoBuildingPipeline
 from vikit.video.raw_text_based_video import RawTextBasedVideo
 from vikit.video.video_build_settings import VideoBuildSettings
 
@@ -34,6 +49,69 @@ class TestVideoBuildingHandlers:
     Test the video building handlers
     """
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("fuse_post_build_handlers", [True, False])
+    def test_get_handlers__fuse_post_build_handlers(self, fuse_post_build_handlers):
+        prompt = RecordedPrompt()
+        prompt.audio_recording = get_test_prompt_recording_trainboy()
+        build_settings = VideoBuildSettings(
+            prompt=prompt,
+            include_read_aloud_prompt=True,
+            music_building_context=MusicBuildingContext(apply_background_music=True),
+            fuse_post_build_handlers=fuse_post_build_handlers,
+        )
+        vid = RawTextBasedVideo(raw_text_prompt="test")
+
+        handlers = VideoBuildingPipeline().get_handlers(
+            vid, build_settings=build_settings
+        )
+
+        if fuse_post_build_handlers:
+            assert len(handlers) == 1
+            assert isinstance(handlers[0], FusedPostBuildHandler)
+            assert len(handlers[0].handlers) == 3
+        else:
+            assert len(handlers) == 3
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_fused_post_build_handler__named_after_post_build_state(
+        self, monkeypatch
+    ):
+        merges = []
+
+        async def fake_reencode_and_merge_audio_tracks(
+            media_url, audio_tracks, fps, target_file_name
+        ):
+            merges.append((audio_tracks, target_file_name))
+            return target_file_name
+
+        async def fake_prepare_audio_track_async(video, ml_models_gateway=None):
+            video.metadata.bg_music_applied = True
+            return "music.mp3"
+
+        monkeypatch.setattr(
+            fused_post_build_handler,
+            "reencode_and_merge_audio_tracks",
+            fake_reencode_and_merge_audio_tracks,
+        )
+        music_handler = MusicMergeHandler(music_to_merge="music.mp3")
+        music_handler.audio_file_relative_volume = 0.3
+        monkeypatch.setattr(
+            music_handler, "prepare_audio_track_async", fake_prepare_audio_track_async
+        )
+        vid = RawTextBasedVideo(raw_text_prompt="test")
+        vid.build_settings = VideoBuildSettings()
+        vid.media_url = "video.mp4"
+        file_name_before_post_build = vid.get_file_name_by_state()
+
+        await FusedPostBuildHandler(handlers=[music_handler]).execute_async(
+            video=vid, ml_models_gateway=None
+        )
+
+        assert merges == [([("music.mp3", 0.3)], vid.get_file_name_by_state())]
+        assert vid.media_url != file_name_before_post_build
+
     @pytest.mark.local_integration
     @pytest.mark.asyncio
     async def test_VideoBuildingHandlerGenerateFomApi(self):
@@ -56,6 +134,103 @@ class TestVideoBuildingHandlers:
                 "Video built should have a media url"
             )
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_video_gen_handler__reuses_cached_video(self, monkeypatch):
+        test_gateway = MLModelsGatewayFactory().get_ml_models_gateway(test_mode=True)
+        nb_generations = 0
+        generate_video_async = test_gateway.generate_video_async
+
+        async def counting_generate_video_async(*args, **kwargs):
+            nonlocal nb_generations
+            nb_generations += 1
+            return await generate_video_async(*args, **kwargs)
+
+        monkeypatch.setattr(
+            test_gateway, "generate_video_async", counting_generate_video_async
+        )
+
+        with WorkingFolderContext():
+            monkeypatch.setattr(
+                artifact_cache._artifact_cache,
+                "instance",
+                ArtifactCache(LocalArtifactCacheBackend(cache_dir="cache")),
+            )
+            for _ in range(2):
+                vid = RawTextBasedVideo(raw_text_prompt="test")
+                vid.build_settings = VideoBuildSettings()
+                api_handler = VideoGenHandler(
+                    video_gen_build_settings=vid.build_settings
+                )
+                video_built = await api_handler.execute_async(
+                    video=vid, ml_models_gateway=test_gateway
+                )
+                assert video_built.media_url
+
+        assert nb_generations == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_video_gen_handler__unavailable_media__not_cached(self, monkeypatch):
+        test_gateway = MLModelsGatewayFactory().get_ml_models_gateway(test_mode=True)
+
+        async def never_available(media_url):
+            return False
+
+        media_poller = MediaPoller(
+            initial_interval_sec=0.01, check_media=never_available
+        )
+        monkeypatch.setattr(videogen_handler, "get_media_poller", lambda: media_poller)
+        monkeypatch.setattr(videogen_handler, "get_media_polling_interval", lambda: 0.05)
+
+        with WorkingFolderContext():
+            cache = ArtifactCache(LocalArtifactCacheBackend(cache_dir="cache"))
+            monkeypatch.setattr(artifact_cache._artifact_cache, "instance", cache)
+            vid = RawTextBasedVideo(raw_text_prompt="test")
+            vid.build_settings = VideoBuildSettings()
+
+            video_built = await VideoGenHandler(
+                video_gen_build_settings=vid.build_settings
+            ).execute_async(video=vid, ml_models_gateway=test_gateway)
+
+            assert video_built.media_url == video_built.media_url_http
+            assert not os.path.exists("cache") or not os.listdir("cache")
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_interpolation_handler__cached_per_build_settings(self, monkeypatch):
+        test_gateway = MLModelsGatewayFactory().get_ml_models_gateway(test_mode=True)
+        nb_interpolations = 0
+        interpolate_async = test_gateway.interpolate_async
+
+        async def counting_interpolate_async(*args, **kwargs):
+            nonlocal nb_interpolations
+            nb_interpolations += 1
+            return await interpolate_async(*args, **kwargs)
+
+        monkeypatch.setattr(
+            test_gateway, "interpolate_async", counting_interpolate_async
+        )
+
+        with WorkingFolderContext():
+            monkeypatch.setattr(
+                artifact_cache._artifact_cache,
+                "instance",
+                ArtifactCache(LocalArtifactCacheBackend(cache_dir="cache")),
+            )
+            with open("video.mp4", "wb") as f:
+                f.write(b"video")
+            for aspect_ratio in [(16, 9), (16, 9), (9, 16)]:
+                vid = RawTextBasedVideo(raw_text_prompt="test")
+                vid.build_settings = VideoBuildSettings(aspect_ratio=aspect_ratio)
+                vid.media_url = os.path.abspath("video.mp4")
+                video_built = await VideoInterpolationHandler().execute_async(
+                    video=vid, ml_models_gateway=test_gateway
+                )
+                assert os.path.exists(video_built.media_url)
+
+        assert nb_interpolations == 2
+
     @pytest.mark.local_integration
     @pytest.mark.asyncio
     async def test_use_prompt_audio_track(self):
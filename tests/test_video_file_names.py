@@ -14,11 +14,14 @@
 # ==============================================================================
 
 import datetime
+import os
 import random
 import warnings
 
 import pytest
 
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.workspace import BuildWorkspace
 from vikit.video.composite_video import CompositeVideo
 from vikit.video.raw_text_based_video import RawTextBasedVideo
 from vikit.video.video_build_settings import VideoBuildSettings
@@ -222,3 +225,15 @@ class TestVideoFileNames:
         assert (  # Check the build id has not changed
             vid_fname.build_id == bld_set.id
         ), "The build ID is not correct, {}".format(bld_set.id)
+
+    @pytest.mark.unit
+    def test_get_file_name_by_state__absolute_path_in_workspace(self):
+        with WorkingFolderContext():
+            video = CompositeVideo()
+            video.workspace = BuildWorkspace("build")
+            bld_set = self.get_test_build_settings()
+
+            path = video.get_file_name_by_state(build_settings=bld_set)
+
+            assert os.path.dirname(path) == os.path.abspath("build")
+            assert VideoFileName.from_file_name(path).build_id == bld_set.id
@@ -0,0 +1,216 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+import shutil
+
+import pysrt
+import pytest
+
+import vikit.prompt.recorded_prompt_subtitles_extractor as extractor_module
+import vikit.prompt.voice_over_generator as voice_over_module
+from vikit.common.artifact_cache import ArtifactCache, LocalArtifactCacheBackend
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.gateways.fake_ML_models_gateway import FakeMLModelsGateway
+from vikit.prompt.recorded_prompt_subtitles_extractor import (
+    RecordedPromptSubtitlesExtractor,
+)
+from vikit.prompt.voice_over_generator import VoiceOverGenerator, split_into_sentences
+
+
+class _TextToSpeechGateway(FakeMLModelsGateway):
+    """
+    Fake gateway "reading aloud" a text by writing it to the target file, so the
+    generated audio lasts one second per character
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.read_texts = []
+
+    async def generate_mp3_from_text_async(self, prompt_text, target_file=None):
+        self.read_texts.append(prompt_text)
+        with open(target_file, "w") as f:
+            f.write(prompt_text)
+
+
+class _FakeSubtitlesExtractor:
+    """
+    Transcribes a fake audio file into a single subtitle holding its content
+    """
+
+    transcribed_texts = []
+
+    async def extract_subtitles_async(
+        self, recorded_prompt_file_path, ml_models_gateway
+    ):
+        with open(recorded_prompt_file_path) as f:
+            text = f.read()
+        self.transcribed_texts.append(text)
+        return pysrt.SubRipFile(
+            [pysrt.SubRipItem(index=1, start=0, end=len(text) * 1000, text=text)]
+        )
+
+
+@pytest.fixture
+def fake_audio(monkeypatch):
+    async def fake_get_media_duration_async(path):
+        with open(path) as f:
+            return float(len(f.read()))
+
+    async def fake_concatenate_audios(audio_file_paths, target_file_name):
+        with open(target_file_name, "w") as target_file:
+            for audio_file_path in audio_file_paths:
+                with open(audio_file_path) as f:
+                    target_file.write(f.read())
+        return target_file_name
+
+    monkeypatch.setattr(
+        voice_over_module, "get_media_duration_async", fake_get_media_duration_async
+    )
+    monkeypatch.setattr(
+        voice_over_module, "concatenate_audios", fake_concatenate_audios
+    )
+    monkeypatch.setattr(
+        voice_over_module, "RecordedPromptSubtitlesExtractor", _FakeSubtitlesExtractor
+    )
+    monkeypatch.setattr(_FakeSubtitlesExtractor, "transcribed_texts", [])
+    monkeypatch.setattr(voice_over_module, "get_artifact_cache", lambda: None)
+
+
+def _read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+@pytest.mark.unit
+def test_split_into_sentences():
+    assert split_into_sentences(" One. Two!  Three?\nFour… Five, six ") == [
+        "One.",
+        "Two!",
+        "Three?",
+        "Four…",
+        "Five, six",
+    ]
+    assert split_into_sentences("  ") == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_async__sentences_read_once_and_concatenated(fake_audio):
+    with WorkingFolderContext():
+        gateway = _TextToSpeechGateway()
+
+        subs = await VoiceOverGenerator(
+            gateway, sentence_chunking=True
+        ).generate_async("One. Two! One.", target_file="prompt.mp3")
+
+        assert _read("prompt.mp3") == "One.Two!One."
+        assert os.listdir() == ["prompt.mp3"]
+
+    assert gateway.read_texts == ["One.", "Two!"]
+    assert [sub.index for sub in subs] == [1, 2, 3]
+    assert [sub.text for sub in subs] == ["One.", "Two!", "One."]
+    assert [sub.start.ordinal for sub in subs] == [0, 4000, 8000]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_async__unchanged_sentences_served_from_cache(fake_audio):
+    with WorkingFolderContext():
+        artifact_cache = ArtifactCache(LocalArtifactCacheBackend("cache"))
+        gateway = _TextToSpeechGateway()
+        generator = VoiceOverGenerator(
+            gateway, artifact_cache=artifact_cache, sentence_chunking=True
+        )
+        await generator.generate_async("One. Two.", target_file="first.mp3")
+
+        subs = await generator.generate_async("One. Three.", target_file="second.mp3")
+
+        assert _read("second.mp3") == "One.Three."
+
+    # The sentences of a text are read and transcribed concurrently
+    assert sorted(gateway.read_texts[:2]) == ["One.", "Two."]
+    assert gateway.read_texts[2:] == ["Three."]
+    assert sorted(_FakeSubtitlesExtractor.transcribed_texts[:2]) == ["One.", "Two."]
+    assert _FakeSubtitlesExtractor.transcribed_texts[2:] == ["Three."]
+    assert [sub.text for sub in subs] == ["One.", "Three."]
+    assert [sub.start.ordinal for sub in subs] == [0, 4000]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_async__sub_second_sentences__subtitles_kept(
+    fake_audio, monkeypatch
+):
+    class _TranscribingGateway(_TextToSpeechGateway):
+        async def get_subtitles_async(self, audiofile_path):
+            text = _read(audiofile_path)
+            return {
+                "transcription": f"1\n00:00:00,000 --> 00:00:00,500\n{text}\n"
+            }
+
+    async def fake_get_media_duration_async(path):
+        return 0.5
+
+    async def fake_extract_audio_slice(audiofile_path, start, end, target_file_name):
+        shutil.copyfile(audiofile_path, target_file_name)
+        return target_file_name
+
+    # The real extractor, slicing audio files lasting half a second
+    monkeypatch.setattr(
+        voice_over_module,
+        "RecordedPromptSubtitlesExtractor",
+        RecordedPromptSubtitlesExtractor,
+    )
+    monkeypatch.setattr(
+        extractor_module, "get_media_duration_async", fake_get_media_duration_async
+    )
+    monkeypatch.setattr(
+        voice_over_module, "get_media_duration_async", fake_get_media_duration_async
+    )
+    monkeypatch.setattr(
+        extractor_module, "extract_audio_slice", fake_extract_audio_slice
+    )
+    with WorkingFolderContext():
+        subs = await VoiceOverGenerator(
+            _TranscribingGateway(), sentence_chunking=True
+        ).generate_async("Hi. Yes.", target_file="prompt.mp3")
+
+    assert [sub.text for sub in subs] == ["Hi.", "Yes."]
+    assert [sub.start.ordinal for sub in subs] == [0, 500]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_async__no_sentence_chunking__whole_text_read(fake_audio):
+    with WorkingFolderContext():
+        gateway = _TextToSpeechGateway()
+
+        subs = await VoiceOverGenerator(
+            gateway, sentence_chunking=False
+        ).generate_async("One. Two.", target_file="prompt.mp3")
+
+    assert gateway.read_texts == ["One. Two."]
+    assert [sub.text for sub in subs] == ["One. Two."]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_async__empty_text__fails(fake_audio):
+    with pytest.raises(ValueError):
+        await VoiceOverGenerator(_TextToSpeechGateway()).generate_async(
+            " ", target_file="prompt.mp3"
+        )
@@ -16,6 +16,8 @@
 import datetime
 from random import randint
 
+from vikit.common.workspace import BuildWorkspace
+
 
 class GeneralBuildSettings:
 
@@ -46,6 +48,8 @@ class GeneralBuildSettings:
         self.target_file_name = target_file_name
         self.vikit_api_key = vikit_api_key
         self.aspect_ratio = aspect_ratio
+        self._workspace = None
+        self._workspace_dir_path = None
 
     @property
     def output_path(self) -> str:
@@ -62,3 +66,17 @@ class GeneralBuildSettings:
         self.target_dir_path = output_path
 
         return self
+
+    def get_workspace(self) -> BuildWorkspace:
+        """
+        Get the workspace of a build using these settings: the target directory if
+        set, the current working directory otherwise.
+
+        The workspace is resolved once, so all the videos of a build write to the same
+        folder even if the working directory changes meanwhile, until the target
+        directory is changed.
+        """
+        if self._workspace is None or self._workspace_dir_path != self.target_dir_path:
+            self._workspace = BuildWorkspace(self.target_dir_path)
+            self._workspace_dir_path = self.target_dir_path
+        return self._workspace
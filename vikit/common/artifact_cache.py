@@ -0,0 +1,281 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from loguru import logger
+
+import vikit.common.config as config
+from vikit.common.gcs_transfer import get_gcs_transfer_manager
+from vikit.common.process_wide import ProcessWideInstance
+
+# Blob metadata key holding the last time a GCS artifact was read or written
+LAST_ACCESS_METADATA_KEY = "vikit-last-access"
+
+
+def get_file_hash(file_path: str) -> str:
+    """
+    Get the sha256 hash of a file content, read in chunks to avoid loading it at once
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def get_artifact_key(**generation_inputs) -> str:
+    """
+    Get the content address of an artifact from everything used to generate it
+
+    Local files given as inputs are hashed by content, so the key does not depend on
+    where the file lives. Other values must be JSON serializable.
+
+    Returns:
+        str: The artifact key
+    """
+    canonical_inputs = {}
+    for name, value in generation_inputs.items():
+        if isinstance(value, str) and os.path.isfile(value):
+            value = {"file_sha256": get_file_hash(value)}
+        canonical_inputs[name] = value
+    return hashlib.sha256(
+        json.dumps(canonical_inputs, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class ArtifactCacheBackend(ABC):
+    """
+    Storage of the cached artifacts, one file per key
+    """
+
+    @abstractmethod
+    def get(self, key: str, target_path: str) -> bool:
+        """
+        Copy the artifact stored under a key to a local path
+
+        Returns:
+            bool: Whether the artifact was found
+        """
+
+    @abstractmethod
+    def put(self, key: str, source_path: str):
+        """
+        Store a local file as the artifact of a key, then evict the least recently used
+        artifacts if the cache got too big
+        """
+
+
+class LocalArtifactCacheBackend(ArtifactCacheBackend):
+    """
+    Stores the artifacts in a local directory, using the file modification time to
+    track the last access for LRU eviction
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int = None):
+        """
+        Args:
+            cache_dir: The directory where the artifacts are stored
+            max_size_bytes: The maximum total size of the artifacts, or None for no limit
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+    def _get_artifact_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str, target_path: str) -> bool:
+        artifact_path = self._get_artifact_path(key)
+        with self._lock:
+            if not os.path.exists(artifact_path):
+                return False
+            os.utime(artifact_path)  # Mark as recently used
+        shutil.copyfile(artifact_path, target_path)
+        return True
+
+    def put(self, key: str, source_path: str):
+        artifact_path = self._get_artifact_path(key)
+        os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+        # Copy to a temporary file first so readers never see a partial artifact
+        tmp_path = f"{artifact_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, tmp_path)
+        with self._lock:
+            os.replace(tmp_path, artifact_path)
+            self._evict()
+
+    def _evict(self):
+        if self.max_size_bytes is None:
+            return
+        artifacts = []
+        for root, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                if file_name.endswith(".tmp"):
+                    continue
+                stat = os.stat(os.path.join(root, file_name))
+                artifacts.append((stat.st_mtime, stat.st_size, file_name))
+
+        total_size = sum(size for _, size, _ in artifacts)
+        for _, size, key in sorted(artifacts):
+            if total_size <= self.max_size_bytes:
+                break
+            logger.debug(f"Evicting artifact {key} from the cache")
+            os.remove(self._get_artifact_path(key))
+            total_size -= size
+
+
+class GCSArtifactCacheBackend(ArtifactCacheBackend):
+    """
+    Stores the artifacts in a Google Cloud Storage bucket, tracking the last access in
+    the blob metadata for LRU eviction
+    """
+
+    def __init__(self, bucket_name: str, prefix: str = "", max_size_bytes: int = None):
+        """
+        Args:
+            bucket_name: The bucket where the artifacts are stored
+            prefix: The prefix of the artifact blobs in the bucket
+            max_size_bytes: The maximum total size of the artifacts, or None for no limit
+        """
+        self.bucket = get_gcs_transfer_manager().client.bucket(bucket_name)
+        self.prefix = prefix.strip("/")
+        self.max_size_bytes = max_size_bytes
+
+    def _get_blob_name(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def get(self, key: str, target_path: str) -> bool:
+        blob = self.bucket.blob(self._get_blob_name(key))
+        if not blob.exists():
+            return False
+        blob.download_to_filename(target_path)
+        blob.metadata = {LAST_ACCESS_METADATA_KEY: str(time.time())}
+        blob.patch()
+        return True
+
+    def put(self, key: str, source_path: str):
+        blob = self.bucket.blob(self._get_blob_name(key))
+        blob.metadata = {LAST_ACCESS_METADATA_KEY: str(time.time())}
+        blob.upload_from_filename(source_path)
+        self._evict()
+
+    def _evict(self):
+        if self.max_size_bytes is None:
+            return
+        blobs = list(self.bucket.list_blobs(prefix=self.prefix or None))
+
+        def _get_last_access(blob) -> float:
+            return float((blob.metadata or {}).get(LAST_ACCESS_METADATA_KEY, 0))
+
+        total_size = sum(blob.size or 0 for blob in blobs)
+        for blob in sorted(blobs, key=_get_last_access):
+            if total_size <= self.max_size_bytes:
+                break
+            logger.debug(f"Evicting artifact {blob.name} from the cache")
+            blob.delete()
+            total_size -= blob.size or 0
+
+
+class ArtifactCache:
+    """
+    Content addressed cache of generated artifacts, such as the videos generated for a
+    scene, so identical generation inputs are served without calling the models again.
+
+    The backend calls are blocking, so they run in a thread to keep the event loop free.
+    Cache errors are logged and treated as misses: the cache is just an optimization.
+    """
+
+    def __init__(self, backend: ArtifactCacheBackend):
+        self.backend = backend
+
+    async def get_async(self, key: str, target_path: str) -> str:
+        """
+        Get a cached artifact
+
+        Args:
+            key: The artifact key, see get_artifact_key
+            target_path: The local path to copy the artifact to
+
+        Returns:
+            str: The target path if the artifact was cached, None otherwise
+        """
+        try:
+            is_cached = await asyncio.to_thread(self.backend.get, key, target_path)
+        except Exception as e:
+            logger.warning(f"Could not read artifact {key} from the cache: {e}")
+            return None
+        logger.debug(f"Artifact cache {'hit' if is_cached else 'miss'} for {key}")
+        return target_path if is_cached else None
+
+    async def put_async(self, key: str, source_path: str):
+        """
+        Cache an artifact
+
+        Args:
+            key: The artifact key, see get_artifact_key
+            source_path: The local path of the artifact
+        """
+        try:
+            await asyncio.to_thread(self.backend.put, key, source_path)
+        except Exception as e:
+            logger.warning(f"Could not write artifact {key} to the cache: {e}")
+
+
+def _create_artifact_cache() -> ArtifactCache:
+    max_size_bytes = config.get_artifact_cache_max_size_bytes()
+    if config.get_artifact_cache_gcs_bucket():
+        return ArtifactCache(
+            GCSArtifactCacheBackend(
+                bucket_name=config.get_artifact_cache_gcs_bucket(),
+                prefix=config.get_artifact_cache_gcs_prefix(),
+                max_size_bytes=max_size_bytes,
+            )
+        )
+    if config.get_artifact_cache_dir():
+        return ArtifactCache(
+            LocalArtifactCacheBackend(
+                cache_dir=config.get_artifact_cache_dir(),
+                max_size_bytes=max_size_bytes,
+            )
+        )
+    return None
+
+
+_artifact_cache = ProcessWideInstance(_create_artifact_cache)
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """
+    Get the process wide artifact cache, created on first use from the configuration
+
+    Returns:
+        ArtifactCache: The artifact cache, or None if no cache is configured
+    """
+    return _artifact_cache.get()
+
+
+def set_artifact_cache(artifact_cache: ArtifactCache):
+    """
+    Replace the process wide artifact cache, e.g. to share one across builds or to
+    disable it with None
+    """
+    _artifact_cache.set(artifact_cache)
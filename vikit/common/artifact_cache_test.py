@@ -0,0 +1,109 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+import pytest
+
+from vikit.common.artifact_cache import (
+    ArtifactCache,
+    ArtifactCacheBackend,
+    LocalArtifactCacheBackend,
+    get_artifact_key,
+)
+from vikit.common.context_managers import WorkingFolderContext
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.unit
+def test_get_artifact_key__depends_on_all_inputs():
+    key = get_artifact_key(prompt_text="a cat", aspect_ratio=(16, 9))
+
+    assert key == get_artifact_key(aspect_ratio=(16, 9), prompt_text="a cat")
+    assert key != get_artifact_key(prompt_text="a cat", aspect_ratio=(9, 16))
+    assert key != get_artifact_key(prompt_text="a dog", aspect_ratio=(16, 9))
+
+
+@pytest.mark.unit
+def test_get_artifact_key__local_files_keyed_by_content():
+    with WorkingFolderContext():
+        _write_file("first.png", b"image")
+        _write_file("second.png", b"image")
+        _write_file("third.png", b"other image")
+
+        assert get_artifact_key(image="first.png") == get_artifact_key(
+            image="second.png"
+        )
+        assert get_artifact_key(image="first.png") != get_artifact_key(
+            image="third.png"
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_local_cache__put_then_get():
+    with WorkingFolderContext():
+        _write_file("video.mp4", b"video")
+        cache = ArtifactCache(LocalArtifactCacheBackend(cache_dir="cache"))
+
+        assert await cache.get_async("key", "cached.mp4") is None
+
+        await cache.put_async("key", "video.mp4")
+
+        assert await cache.get_async("key", "cached.mp4") == "cached.mp4"
+        assert _read_file("cached.mp4") == b"video"
+
+
+@pytest.mark.unit
+def test_local_cache__evicts_least_recently_used():
+    with WorkingFolderContext():
+        backend = LocalArtifactCacheBackend(cache_dir="cache", max_size_bytes=10)
+        _write_file("video.mp4", b"12345")
+        backend.put("first", "video.mp4")
+        backend.put("second", "video.mp4")
+        # Make first the most recently used
+        os.utime(backend._get_artifact_path("second"), (0, 0))
+        assert backend.get("first", "out.mp4")
+
+        backend.put("third", "video.mp4")
+
+        assert backend.get("first", "out.mp4")
+        assert not backend.get("second", "out.mp4")
+        assert backend.get("third", "out.mp4")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cache__backend_errors__treated_as_miss():
+    class FailingBackend(ArtifactCacheBackend):
+        def get(self, key, target_path):
+            raise OSError("unavailable")
+
+        def put(self, key, source_path):
+            raise OSError("unavailable")
+
+    cache = ArtifactCache(FailingBackend())
+
+    await cache.put_async("key", "video.mp4")
+    assert await cache.get_async("key", "cached.mp4") is None
@@ -13,6 +13,7 @@
 # limitations under the License.
 # ==============================================================================
 
+import json
 import os
 import uuid
 from os import path
@@ -220,6 +221,321 @@ def get_seconds_per_word() -> float:
     return float(nb_seconds_per_words)
 
 
+def get_media_info_cache_file() -> str:
+    """
+    The JSON file where ffprobe results are persisted across builds. If not set, the
+    results are only cached in memory for the lifetime of the process
+    """
+    return os.getenv("MEDIA_INFO_CACHE_FILE", None)
+
+
+def get_media_info_cache_max_entries() -> int:
+    """
+    The maximum number of ffprobe results cached, the least recently used ones being
+    evicted first
+    """
+    max_entries = int(os.getenv("MEDIA_INFO_CACHE_MAX_ENTRIES", 10000))
+    if max_entries < 1:
+        raise ValueError(f"MEDIA_INFO_CACHE_MAX_ENTRIES ({max_entries}) must be >= 1")
+    return max_entries
+
+
+def get_max_concurrent_encode_jobs() -> int:
+    """
+    The maximum number of ffmpeg encoding processes running at once. If not set, it is
+    inferred from the number of cores
+    """
+    max_concurrent_encode_jobs = os.getenv("MAX_CONCURRENT_ENCODE_JOBS", None)
+    return int(max_concurrent_encode_jobs) if max_concurrent_encode_jobs else None
+
+
+def get_max_concurrent_remux_jobs() -> int:
+    """
+    The maximum number of ffmpeg stream copy processes running at once. If not set, it
+    is inferred from the number of cores
+    """
+    max_concurrent_remux_jobs = os.getenv("MAX_CONCURRENT_REMUX_JOBS", None)
+    return int(max_concurrent_remux_jobs) if max_concurrent_remux_jobs else None
+
+
+def get_max_concurrent_probe_jobs() -> int:
+    """
+    The maximum number of ffprobe processes running at once. If not set, it is
+    inferred from the number of cores
+    """
+    max_concurrent_probe_jobs = os.getenv("MAX_CONCURRENT_PROBE_JOBS", None)
+    return int(max_concurrent_probe_jobs) if max_concurrent_probe_jobs else None
+
+
+def get_encode_threads() -> int:
+    """
+    The number of threads each ffmpeg encoding process may use. If not set, the cores
+    are shared evenly between the concurrent encoding processes
+    """
+    encode_threads = os.getenv("ENCODE_THREADS", None)
+    return int(encode_threads) if encode_threads else None
+
+
+def get_artifact_cache_dir() -> str:
+    """
+    The local directory where generated artifacts, e.g. scene videos, are cached. If
+    neither this nor ARTIFACT_CACHE_GCS_BUCKET is set, generated artifacts are not cached
+    """
+    return os.getenv("ARTIFACT_CACHE_DIR", None)
+
+
+def get_artifact_cache_gcs_bucket() -> str:
+    """
+    The GCS bucket where generated artifacts are cached, preferred over
+    ARTIFACT_CACHE_DIR when set
+    """
+    return os.getenv("ARTIFACT_CACHE_GCS_BUCKET", None)
+
+
+def get_artifact_cache_gcs_prefix() -> str:
+    return os.getenv("ARTIFACT_CACHE_GCS_PREFIX", "artifact_cache")
+
+
+def get_artifact_cache_max_size_bytes() -> int:
+    """
+    The maximum total size of the cached artifacts, the least recently used ones being
+    evicted first. If not set, the cache grows without limit
+    """
+    max_size_mb = os.getenv("ARTIFACT_CACHE_MAX_SIZE_MB", None)
+    return int(float(max_size_mb) * 1024 * 1024) if max_size_mb else None
+
+
+def get_provider_rate_limits() -> dict:
+    """
+    The call budgets of the model providers, as a JSON object mapping a provider name,
+    e.g. haiper or runway, to its limits, e.g.
+    {"haiper": {"requests_per_sec": 0.5, "max_in_flight": 2, "burst": 1}}
+
+    The "default" entry applies to the providers not listed. Providers without limits
+    are still paused when they ask us to retry later
+    """
+    provider_rate_limits = os.getenv("PROVIDER_RATE_LIMITS", None)
+    if not provider_rate_limits:
+        return {}
+    provider_rate_limits = json.loads(provider_rate_limits)
+    if not isinstance(provider_rate_limits, dict):
+        raise ValueError(
+            f"PROVIDER_RATE_LIMITS ({provider_rate_limits}) must be a JSON object"
+        )
+    return provider_rate_limits
+
+
+def get_media_upload_bucket() -> str:
+    """
+    The GCS bucket where local media files too big to be sent inline to the models are
+    uploaded, so requests carry a signed URL instead of the base64 encoded file. If not
+    set, media files are always sent inline.
+
+    The uploaded files are deleted when the gateway is closed. A lifecycle rule
+    deleting the objects under MEDIA_UPLOAD_BLOB_PREFIX after a day is still advised,
+    for the processes exiting without closing their gateway
+    """
+    return os.getenv("MEDIA_UPLOAD_BUCKET", None)
+
+
+def get_media_upload_blob_prefix() -> str:
+    return os.getenv("MEDIA_UPLOAD_BLOB_PREFIX", "uploads")
+
+
+def get_media_upload_url_expiration_sec() -> int:
+    """
+    The number of seconds the signed URLs of the media files uploaded to
+    MEDIA_UPLOAD_BUCKET are valid for
+    """
+    expiration_sec = int(os.getenv("MEDIA_UPLOAD_URL_EXPIRATION_SEC", 3600))
+    if not expiration_sec > 0:
+        raise ValueError(
+            f"MEDIA_UPLOAD_URL_EXPIRATION_SEC ({expiration_sec}) must be > 0"
+        )
+    return expiration_sec
+
+
+def get_max_inline_media_size() -> int:
+    """
+    The maximum size in bytes of a local media file sent inline, as base64, to the
+    models. Bigger files are uploaded to MEDIA_UPLOAD_BUCKET if set
+    """
+    max_inline_media_size = int(os.getenv("MAX_INLINE_MEDIA_SIZE", 4 * 1024 * 1024))
+    if max_inline_media_size < 0:
+        raise ValueError(
+            f"MAX_INLINE_MEDIA_SIZE ({max_inline_media_size}) must be >= 0"
+        )
+    return max_inline_media_size
+
+
+def get_nb_download_segments() -> int:
+    """
+    The number of segments big HTTP(S) files and GCS blobs are downloaded in, in
+    parallel
+    """
+    nb_download_segments = int(os.getenv("NB_DOWNLOAD_SEGMENTS", 4))
+    if nb_download_segments < 1:
+        raise ValueError(f"NB_DOWNLOAD_SEGMENTS ({nb_download_segments}) must be >= 1")
+    return nb_download_segments
+
+
+def get_min_segmented_download_size() -> int:
+    """
+    The minimum size in bytes of an HTTP(S) file or GCS blob downloaded in parallel
+    segments
+    """
+    return int(os.getenv("MIN_SEGMENTED_DOWNLOAD_SIZE", 16 * 1024 * 1024))
+
+
+def get_gcs_transfer_max_workers() -> int:
+    """
+    The maximum number of GCS uploads and downloads running at once
+    """
+    gcs_transfer_max_workers = int(os.getenv("GCS_TRANSFER_MAX_WORKERS", 8))
+    if gcs_transfer_max_workers < 1:
+        raise ValueError(
+            f"GCS_TRANSFER_MAX_WORKERS ({gcs_transfer_max_workers}) must be >= 1"
+        )
+    return gcs_transfer_max_workers
+
+
+def get_storage_emulator_host() -> str:
+    """
+    The address of a GCS emulator, e.g. a local fake GCS server, used instead of
+    Google Cloud Storage when set
+    """
+    return os.getenv("STORAGE_EMULATOR_HOST", None)
+
+
+def get_file_copy_strategies() -> list[str]:
+    """
+    The ways local files are copied, in the order they are tried, among hardlink,
+    reflink, rename and copy. Rename is only used when the source can be moved, and
+    hardlink only suits files never rewritten in place
+    """
+    file_copy_strategies = os.getenv("FILE_COPY_STRATEGIES", "reflink,copy")
+    return [s.strip() for s in file_copy_strategies.split(",") if s.strip()]
+
+
+def get_max_render_workers() -> int:
+    """
+    The number of worker processes running moviepy based renders (subtitles, text
+    overlays, logos), None to use half the number of cores
+    """
+    max_render_workers = os.getenv("MAX_RENDER_WORKERS", None)
+    return int(max_render_workers) if max_render_workers else None
+
+
+def get_subtitle_renderer() -> str:
+    """
+    How subtitles are burnt into videos: moviepy (default) draws them frame by frame,
+    ass has ffmpeg and libass render them in a single pass
+    """
+    subtitle_renderer = os.getenv("SUBTITLE_RENDERER", "moviepy")
+    if subtitle_renderer not in ("moviepy", "ass"):
+        raise ValueError(
+            f"SUBTITLE_RENDERER ({subtitle_renderer}) must be one of moviepy or ass"
+        )
+    return subtitle_renderer
+
+
+def get_max_concurrent_transcriptions() -> int:
+    """
+    The maximum number of audio slices of a recorded prompt transcribed at once
+    """
+    max_concurrent_transcriptions = int(os.getenv("MAX_CONCURRENT_TRANSCRIPTIONS", 4))
+    if max_concurrent_transcriptions < 1:
+        raise ValueError(
+            f"MAX_CONCURRENT_TRANSCRIPTIONS ({max_concurrent_transcriptions}) must be "
+            ">= 1"
+        )
+    return max_concurrent_transcriptions
+
+
+def get_prompt_enhancement_batch_size() -> int:
+    """
+    The maximum number of subtitle texts enhanced by a single LLM request
+    """
+    prompt_enhancement_batch_size = int(os.getenv("PROMPT_ENHANCEMENT_BATCH_SIZE", 10))
+    if prompt_enhancement_batch_size < 1:
+        raise ValueError(
+            f"PROMPT_ENHANCEMENT_BATCH_SIZE ({prompt_enhancement_batch_size}) must be "
+            ">= 1"
+        )
+    return prompt_enhancement_batch_size
+
+
+def get_llm_response_cache_backend() -> str:
+    """
+    Where the LLM responses are cached: memory, sqlite or redis. If not set, LLM
+    responses are not cached
+    """
+    llm_response_cache_backend = os.getenv("LLM_RESPONSE_CACHE_BACKEND", None)
+    if llm_response_cache_backend not in (None, "", "memory", "sqlite", "redis"):
+        raise ValueError(
+            f"LLM_RESPONSE_CACHE_BACKEND ({llm_response_cache_backend}) must be one of "
+            "memory, sqlite or redis"
+        )
+    return llm_response_cache_backend or None
+
+
+def get_llm_response_cache_ttl_sec() -> float:
+    """
+    How long a cached LLM response stays valid, 7 days by default
+    """
+    return float(os.getenv("LLM_RESPONSE_CACHE_TTL_SEC", 7 * 24 * 3600))
+
+
+def get_llm_response_cache_max_entries() -> int:
+    """
+    The maximum number of cached LLM responses, the least recently used ones being
+    evicted first
+    """
+    max_entries = int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", 10000))
+    if max_entries < 1:
+        raise ValueError(f"LLM_RESPONSE_CACHE_MAX_ENTRIES ({max_entries}) must be >= 1")
+    return max_entries
+
+
+def get_llm_response_cache_sqlite_file() -> str:
+    """
+    The SQLite database of the LLM responses cached with the sqlite backend
+    """
+    return os.getenv(
+        "LLM_RESPONSE_CACHE_SQLITE_FILE",
+        os.path.join(os.path.expanduser("~"), ".cache", "vikit", "llm_responses.db"),
+    )
+
+
+def get_llm_response_cache_redis_url() -> str:
+    """
+    The URL of the Redis compatible server caching the LLM responses with the redis
+    backend
+    """
+    return os.getenv("LLM_RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+
+def get_tts_sentence_chunking() -> bool:
+    """
+    Whether prompt texts are read aloud one sentence at a time, so that editing a
+    sentence only synthesizes that sentence again, False by default
+    """
+    return os.getenv("TTS_SENTENCE_CHUNKING", "false").lower() in ("1", "true", "yes")
+
+
+def get_max_concurrent_tts_sentences() -> int:
+    """
+    The maximum number of sentences of a prompt read aloud and transcribed at once
+    """
+    max_concurrent_tts_sentences = int(os.getenv("MAX_CONCURRENT_TTS_SENTENCES", 4))
+    if max_concurrent_tts_sentences < 1:
+        raise ValueError(
+            f"MAX_CONCURRENT_TTS_SENTENCES ({max_concurrent_tts_sentences}) must be "
+            ">= 1"
+        )
+    return max_concurrent_tts_sentences
+
+
 def get_gcs_upload_timeout_sec() -> int:
     gcs_upload_timeout_sec = int(os.getenv("GCS_UPLOAD_TIMEOUT_SEC", 60))
     if not gcs_upload_timeout_sec > 0:
@@ -31,7 +31,8 @@ class WorkingFolderContext:
 
     WARNING: Not thread safe. This class it is meant to be used in a synchronous context
     or by launching several ones in separate processes as we change directory in the
-    process.
+    process. Video builds do not need it: they write to the folder of their
+    BuildWorkspace, see vikit.common.workspace.
     """
 
     def __init__(
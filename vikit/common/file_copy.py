@@ -0,0 +1,151 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import errno
+import os
+import shutil
+import sys
+from enum import Enum
+
+from loguru import logger
+
+import vikit.common.config as config
+
+# ioctl request cloning a whole file on copy on write filesystems (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+class CopyStrategy(Enum):
+    """
+    The ways of making a local file available under another path, cheapest first
+    """
+
+    HARDLINK = "hardlink"  # Same inode, no data written
+    REFLINK = "reflink"  # Copy on write clone, no data written until modified
+    RENAME = "rename"  # The source is moved, only when the caller owns it
+    COPY = "copy"  # Full copy, in kernel with sendfile where available
+
+    def __str__(self):
+        return self.value
+
+
+def _hardlink(source: str, destination: str):
+    os.link(source, destination)
+
+
+def _reflink(source: str, destination: str):
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are only supported on Linux")
+    import fcntl
+
+    with open(source, "rb") as source_file, open(destination, "wb") as target_file:
+        fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+
+
+def _rename(source: str, destination: str):
+    os.replace(source, destination)
+
+
+def _copy(source: str, destination: str):
+    # shutil.copyfile copies in kernel space with sendfile on Linux
+    shutil.copyfile(source, destination)
+
+
+_COPY_FUNCTIONS = {
+    CopyStrategy.HARDLINK: _hardlink,
+    CopyStrategy.REFLINK: _reflink,
+    CopyStrategy.RENAME: _rename,
+    CopyStrategy.COPY: _copy,
+}
+
+
+def _get_strategies(
+    strategies: list[CopyStrategy], allow_move: bool
+) -> list[CopyStrategy]:
+    if strategies is None:
+        strategies = [CopyStrategy(s) for s in config.get_file_copy_strategies()]
+    if not allow_move:
+        strategies = [s for s in strategies if s != CopyStrategy.RENAME]
+    if not strategies:
+        raise ValueError("No copy strategy to copy the file with")
+    return strategies
+
+
+def _apply_strategy(strategy: CopyStrategy, source: str, destination: str):
+    if strategy == CopyStrategy.RENAME:
+        # Already atomic, and the source must not end up in a temporary file
+        _rename(source, destination)
+        return
+
+    # Work on a temporary path next to the destination, so an existing destination is
+    # replaced atomically and a failed attempt leaves nothing behind
+    tmp_destination = f"{destination}.{os.getpid()}.copy"
+    try:
+        _COPY_FUNCTIONS[strategy](source, tmp_destination)
+        os.replace(tmp_destination, destination)
+    except OSError:
+        if os.path.exists(tmp_destination):
+            os.remove(tmp_destination)
+        raise
+
+
+def link_or_copy_file(
+    source: str,
+    destination: str,
+    allow_move: bool = False,
+    strategies: list[CopyStrategy] = None,
+) -> CopyStrategy:
+    """
+    Make a local file available at another path, writing as few bytes as possible.
+
+    The strategies are tried in order until one works: by default a reflink on copy on
+    write filesystems, then a full copy. A rename is used when listed and the caller
+    owns the source and allows it to be moved.
+
+    A hard link shares its content with the source, so writing the destination in
+    place, as ffmpeg does when its output file already exists and -y is given, would
+    also change the source. Hard links are therefore never tried by default: only list
+    them for destinations that are never rewritten.
+
+    The destination is replaced atomically if it already exists.
+
+    Args:
+        source: The file to copy
+        destination: The path of the copy
+        allow_move: Whether the source may be moved to the destination, i.e. the
+            caller does not need the source anymore
+        strategies: The strategies to try, in order, defaults to FILE_COPY_STRATEGIES
+
+    Returns:
+        The strategy used, or None if the destination already is the source
+    """
+    if not os.path.isfile(source):
+        raise FileNotFoundError(f"Source file {source} does not exist")
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        logger.debug(f"{destination} is already {source}, nothing to copy")
+        return None
+
+    last_error = None
+    for strategy in _get_strategies(strategies, allow_move):
+        try:
+            _apply_strategy(strategy, source, destination)
+        except OSError as e:
+            last_error = e
+            logger.trace(f"Could not {strategy} {source} to {destination}: {e}")
+            continue
+        logger.debug(f"Copied {source} to {destination} with a {strategy}")
+        return strategy
+
+    raise last_error
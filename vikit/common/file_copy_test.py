@@ -0,0 +1,128 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import errno
+import os
+
+import pytest
+
+import vikit.common.file_copy as file_copy
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.file_copy import CopyStrategy, link_or_copy_file
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__same_filesystem__hardlinks():
+    with WorkingFolderContext():
+        _write_file("source.mp4", b"video")
+
+        strategy = link_or_copy_file(
+            "source.mp4",
+            "target.mp4",
+            strategies=[CopyStrategy.HARDLINK, CopyStrategy.COPY],
+        )
+
+        assert strategy == CopyStrategy.HARDLINK
+        assert os.path.samefile("source.mp4", "target.mp4")
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__default__target_rewritable_in_place():
+    with WorkingFolderContext():
+        _write_file("source.mp4", b"video")
+
+        strategy = link_or_copy_file("source.mp4", "target.mp4")
+        _write_file("target.mp4", b"rewritten video")
+
+        assert strategy in (CopyStrategy.REFLINK, CopyStrategy.COPY)
+        assert _read_file("source.mp4") == b"video"
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__strategy_fails__falls_back(monkeypatch):
+    def _cross_device_link(source, destination):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setitem(
+        file_copy._COPY_FUNCTIONS, CopyStrategy.HARDLINK, _cross_device_link
+    )
+    with WorkingFolderContext():
+        _write_file("source.mp4", b"video")
+
+        strategy = link_or_copy_file(
+            "source.mp4",
+            "target.mp4",
+            strategies=[CopyStrategy.HARDLINK, CopyStrategy.COPY],
+        )
+
+        assert strategy == CopyStrategy.COPY
+        assert _read_file("target.mp4") == b"video"
+        assert not os.path.samefile("source.mp4", "target.mp4")
+        assert sorted(os.listdir()) == ["source.mp4", "target.mp4"]
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__existing_target__replaced():
+    with WorkingFolderContext():
+        _write_file("source.mp4", b"video")
+        _write_file("target.mp4", b"previous video")
+
+        link_or_copy_file("source.mp4", "target.mp4")
+
+        assert _read_file("target.mp4") == b"video"
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__rename__only_when_move_allowed():
+    with WorkingFolderContext():
+        _write_file("source.mp4", b"video")
+        strategies = [CopyStrategy.RENAME, CopyStrategy.COPY]
+
+        assert link_or_copy_file("source.mp4", "copy.mp4", strategies=strategies) == (
+            CopyStrategy.COPY
+        )
+        assert os.path.exists("source.mp4")
+
+        assert link_or_copy_file(
+            "source.mp4", "moved.mp4", allow_move=True, strategies=strategies
+        ) == CopyStrategy.RENAME
+        assert not os.path.exists("source.mp4")
+        assert _read_file("moved.mp4") == b"video"
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__same_file__nothing_copied():
+    with WorkingFolderContext():
+        _write_file("source.mp4", b"video")
+
+        assert link_or_copy_file("source.mp4", "./source.mp4") is None
+        assert _read_file("source.mp4") == b"video"
+
+
+@pytest.mark.unit
+def test_link_or_copy_file__missing_source__fails():
+    with WorkingFolderContext():
+        with pytest.raises(FileNotFoundError):
+            link_or_copy_file("missing.mp4", "target.mp4")
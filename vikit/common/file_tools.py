@@ -13,27 +13,24 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
 import os
 import re
-import shutil
 import sys
 import urllib.parse
 from typing import Optional, Union
 from urllib.parse import quote
 
-import aiofiles
 import aiohttp
 import requests
-
-# Maybe we will consider breaking down the copying logic into modules to prevent adding too many dependencies on external linbs
-from google.cloud import storage
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from vikit.common.config import (
-    get_gcs_upload_timeout_sec,
-    get_nb_retries_http_calls,
-)
+from vikit.common.config import get_nb_retries_http_calls
+from vikit.common.file_copy import link_or_copy_file
+from vikit.common.gcs_transfer import get_gcs_transfer_manager
+from vikit.common.http_download import download_http_file
+from vikit.common.http_session import get_shared_http_session
 
 TIMEOUT = 10  # seconds before stopping the request to check an URL exists
 
@@ -207,16 +204,59 @@ def url_exists(url: str):
     return does_url_exists
 
 
+async def url_exists_async(
+    url: str, http_session: aiohttp.ClientSession = None
+) -> bool:
+    """
+    Check if a URL exists somewhere on the internet or locally, without blocking the
+    event loop
+
+    Args:
+        url (str): The URL to check
+        http_session (aiohttp.ClientSession): The session to check HTTP(S) URLs with, to
+            reuse its pooled connections. The process wide session is used by
+            default.
+
+    Returns:
+        bool: True if the URL exists, False otherwise
+    """
+    assert url, "url cannot be None"
+
+    if os.path.exists(url) or file_url_exists(url):
+        return True
+
+    is_gcs_url, bucket, file_path = _parse_gcs_url(url)
+    if is_gcs_url:
+        try:
+            return await get_gcs_transfer_manager().blob_exists_async(bucket, file_path)
+        except Exception as e:
+            logger.error(f"Error checking GCS URL: {e}")
+            return False
+
+    if not url.startswith("http"):
+        return False
+
+    async def _head(session: aiohttp.ClientSession) -> bool:
+        try:
+            async with session.head(
+                url,
+                allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+            ) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    return await _head(http_session or get_shared_http_session().get())
+
+
 def gcs_file_exists(bucket: str, file_path: str) -> bool:
     does_url_exists = False
     try:
-        storage_client = storage.Client()
-        gcs_bucket = storage_client.bucket(bucket)
-        blob = gcs_bucket.blob(file_path)
+        does_url_exists = get_gcs_transfer_manager().blob_exists(bucket, file_path)
         logger.debug(
-            f"Checking GCS URL on blob: {blob} , does it exist?: {blob.exists()}"
+            f"Checking GCS URL on blob: {file_path}, does it exist?: {does_url_exists}"
         )
-        does_url_exists = blob.exists()
     except Exception as e:
         logger.error(f"Error checking GCS URL: {e}")
         does_url_exists = False
@@ -298,6 +338,7 @@ async def download_or_copy_file(
     local_path: str,
     force_download: bool = False,
     enable_gcs_url_rewrite: bool = True,
+    http_session: aiohttp.ClientSession = None,
 ) -> str:
     """
     Download a file from a URL to a local file asynchronously
@@ -311,6 +352,12 @@ async def download_or_copy_file(
             used for HTTP(S) URLs pointing to cloud storage resource. If False, the file
             will be downloaded using the HTTP(S) protocol. This parameter exists mainly
             for testing purposes. We recommend using the GCS library whenever possible.
+        http_session (aiohttp.ClientSession): The session to download HTTP(S) URLs
+            with, to reuse its pooled connections. The process wide session is used
+            by default.
+
+    HTTP(S) downloads are validated and resumed by the next attempt if they fail, see
+    download_http_file.
 
     Returns:
         str: The filename of the downloaded file.
@@ -330,10 +377,11 @@ async def download_or_copy_file(
     if error:
         raise ValueError(f"Unsupported remote path type: {url} with error: {error}")
 
-    if len(local_path) > 255:
-        truncated_path = local_path[-255:]
+    local_dir, local_file_name = os.path.split(local_path)
+    if len(local_file_name) > 255:
+        truncated_path = os.path.join(local_dir, local_file_name[-255:])
         logger.warning(
-            "Local path is too long, truncating:"
+            "Local file name is too long, truncating:"
             f"\nold: {local_path}\nnew: {truncated_path}"
         )
         local_path = truncated_path
@@ -342,55 +390,35 @@ async def download_or_copy_file(
         return local_path
 
     if path_desc["type"] == "http" or path_desc["type"] == "https":
-        async with aiohttp.ClientSession() as session:
-            logger.debug(f"Downloading file from {url} to {local_path}")
-            async with session.get(url) as response:
-                _check_http_response(response)
-
-                # Use aiofiles to write the content asynchronously.
-                async with aiofiles.open(local_path, "wb") as f:
-                    # Read the content in chunks of 1MB to avoid using a lot of memory.
-                    async for chunk in response.content.iter_chunked(1024 * 1024):
-                        await f.write(chunk)
-                return local_path
+        return await download_http_file(
+            http_session or get_shared_http_session().get(), url, local_path
+        )
 
     elif path_desc["type"] == "local":
-        logger.debug(f"Copying file from {url} to {local_path}")
-        if url == local_path:
-            logger.debug(f"File already exists at {local_path}, skipping copy")
-            return local_path
-        else:
-            shutil.copyfile(url, local_path)
-        return local_path
+        return _copy_local_file(url, local_path)
     elif path_desc["type"] == "local_url_format":
-        url = url.replace("file://", "")
-        logger.debug(f"Copying file from {url} to {local_path}")
-        shutil.copyfile(url, local_path)
-        return local_path
+        return _copy_local_file(url.replace("file://", ""), local_path)
     elif path_desc["type"] == "gs":
-        return copy_file_from_gcs(
-            bucket=url.split("/")[2],
-            blob_path="/".join(url.split("/")[3:]),
-            destination_file_name=local_path,
-        )
+        return await _download_gcs_file(url, local_path)
     else:
         raise ValueError(f"Unsupported path type: {path_desc['type']} for url: {url}")
 
 
-def _check_http_response(response: aiohttp.ClientResponse):
-    """Throws the appropriate exception if the response indicates an error."""
-    if response.status == 200:
-        return
-
-    if response.status == 403:
-        raise PermissionError(response)
-    if response.status == 404:
-        raise FileNotFoundError(response)
+def _copy_local_file(source_path: str, local_path: str) -> str:
+    logger.debug(f"Copying file from {source_path} to {local_path}")
+    if source_path == local_path:
+        logger.debug(f"File already exists at {local_path}, skipping copy")
+    else:
+        link_or_copy_file(source_path, local_path)
+    return local_path
 
-    # TODO: Add more specialized errors here. See the full list of available errors at
-    # https://docs.python.org/3/library/exceptions.html
 
-    raise ConnectionError(response)
+async def _download_gcs_file(gs_url: str, local_path: str) -> str:
+    return await get_gcs_transfer_manager().download_async(
+        bucket_name=gs_url.split("/")[2],
+        blob_name="/".join(gs_url.split("/")[3:]),
+        local_path=local_path,
+    )
 
 
 def copy_file_from_gcs(
@@ -407,17 +435,14 @@ def copy_file_from_gcs(
     return: the local path of the copied file
 
     """
-    if not bucket or not object:
+    if not bucket or not blob_path:
         raise ValueError("No GCS bucket or object provided")
-    storage_client = storage.Client()
-
-    bucket = storage_client.bucket(bucket)
-    blob = bucket.blob(blob_path)
-    blob.download_to_filename(destination_file_name)
 
-    logger.debug(f"Blob {blob_path} downloaded to {destination_file_name}.")
-
-    return destination_file_name
+    return get_gcs_transfer_manager().download(
+        bucket_name=bucket,
+        blob_name=blob_path,
+        local_path=destination_file_name,
+    )
 
 
 async def upload_to_bucket(
@@ -435,14 +460,44 @@ async def upload_to_bucket(
     if not bucket_name:
         raise ValueError("bucket_name cannot be None or empty string")
 
-    bucket = storage.Client().bucket(bucket_name)
-    blob = bucket.blob(f"{destination_blob}/{destination_file_name}")
-    blob.upload_from_filename(source_file_name, timeout=get_gcs_upload_timeout_sec())
+    return await get_gcs_transfer_manager().upload_async(
+        source_file_name,
+        bucket_name=bucket_name,
+        blob_name=f"{destination_blob}/{destination_file_name}",
+    )
 
-    gcs_url = f"gs://{bucket.name}/{blob.name}"
-    logger.debug(f"Uploaded {source_file_name} to {gcs_url}, Blob name is {blob.name}")
 
-    return gcs_url
+async def upload_files_to_bucket(
+    source_file_names: list[str],
+    destination_blob: str,
+    bucket_name: str,
+) -> list[str]:
+    """
+    Upload a batch of local files, e.g. the outputs of a build, to the same folder of
+    a bucket, several of them at once
+
+    Args:
+        source_file_names: The local files to upload, keeping their base names
+        destination_blob: The folder of the uploaded blobs in the bucket
+        bucket_name: The destination bucket
+
+    Returns:
+        The gs:// URLs of the uploaded files, in the same order
+    """
+    if not destination_blob:
+        raise ValueError("destination_blob cannot be None or empty string")
+    if not bucket_name:
+        raise ValueError("bucket_name cannot be None or empty string")
+    if not all(source_file_names):
+        raise ValueError("source_file_names cannot contain None or empty strings")
+
+    files = [
+        (source_file_name, f"{destination_blob}/{os.path.basename(source_file_name)}")
+        for source_file_name in source_file_names
+    ]
+    return await get_gcs_transfer_manager().upload_many_async(
+        files, bucket_name=bucket_name
+    )
 
 
 # TODO: get the public URI from GCS path
@@ -25,6 +25,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 import tests.testing_medias as testing_medias
+import vikit.common.gcs_transfer as gcs_transfer
 from vikit.common.context_managers import WorkingFolderContext
 from vikit.common.file_tools import (
     _parse_gcs_url,
@@ -205,7 +206,9 @@ def test_parse_gcs_url(url, expected_result):
 
 @patch("google.cloud.storage.Client")
 @pytest.mark.unit
-async def test_upload_to_bucket(mock_storage_client):
+async def test_upload_to_bucket(mock_storage_client, monkeypatch):
+    # The storage client is cached by the transfer manager, use a fresh one
+    monkeypatch.setattr(gcs_transfer._gcs_transfer_manager, "instance", None)
     mock_bucket = MagicMock()
     mock_bucket.name = BUCKET_NAME
 
@@ -0,0 +1,316 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
+from google.cloud.storage import transfer_manager
+from loguru import logger
+
+import vikit.common.config as config
+from vikit.common.process_wide import ProcessWideInstance
+
+
+def create_storage_client() -> storage.Client:
+    """
+    Create a Google Cloud Storage client, talking to the storage emulator without
+    credentials when STORAGE_EMULATOR_HOST is set, e.g. to a local fake GCS server
+    """
+    if config.get_storage_emulator_host():
+        return storage.Client(project="test", credentials=AnonymousCredentials())
+    return storage.Client()
+
+
+class GCSTransferManager:
+    """
+    Transfers files to and from Google Cloud Storage without blocking the event loop.
+
+    The google.cloud.storage library is blocking, so transfers run in a dedicated pool
+    of threads, sharing a single client and its pooled connections, instead of creating
+    a client per call. Big blobs are downloaded in parallel slices, and many files can
+    be uploaded as one batch.
+    """
+
+    def __init__(
+        self,
+        client: storage.Client = None,
+        max_workers: int = 8,
+        nb_download_slices: int = 4,
+        min_sliced_download_size: int = 16 * 1024 * 1024,
+    ):
+        """
+        Args:
+            client: The storage client to use, created on first use by default
+            max_workers: The maximum number of transfers running at once
+            nb_download_slices: The number of slices big blobs are downloaded in
+            min_sliced_download_size: The minimum size in bytes of a blob downloaded
+                in slices
+        """
+        if max_workers < 1:
+            raise ValueError(f"Max workers ({max_workers}) must be >= 1")
+        if nb_download_slices < 1:
+            raise ValueError(
+                f"Number of download slices ({nb_download_slices}) must be >= 1"
+            )
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.max_workers = max_workers
+        self.nb_download_slices = nb_download_slices
+        self.min_sliced_download_size = min_sliced_download_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gcs_transfer"
+        )
+
+    @property
+    def client(self) -> storage.Client:
+        """
+        The storage client shared by all the transfers
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_storage_client()
+        return self._client
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, lambda: func(*args, **kwargs)
+        )
+
+    def blob_exists(self, bucket_name: str, blob_name: str) -> bool:
+        """
+        Check if a blob exists, blocking the calling thread
+        """
+        return self.client.bucket(bucket_name).blob(blob_name).exists()
+
+    async def blob_exists_async(self, bucket_name: str, blob_name: str) -> bool:
+        """
+        Check if a blob exists
+        """
+        return await self._run(self.blob_exists, bucket_name, blob_name)
+
+    def download(self, bucket_name: str, blob_name: str, local_path: str) -> str:
+        """
+        Download a blob to a local file, blocking the calling thread.
+
+        Blobs bigger than min_sliced_download_size are downloaded in parallel slices.
+        The blob is written to a .partial file first, so local_path only ever holds a
+        complete download.
+
+        Args:
+            bucket_name: The bucket of the blob
+            blob_name: The name of the blob
+            local_path: The path of the downloaded file
+
+        Returns:
+            The path of the downloaded file
+        """
+        blob = self.client.bucket(bucket_name).get_blob(blob_name)
+        if blob is None:
+            raise FileNotFoundError(f"Blob gs://{bucket_name}/{blob_name} not found")
+
+        partial_path = f"{local_path}.partial"
+        try:
+            if (
+                self.nb_download_slices > 1
+                and blob.size >= self.min_sliced_download_size
+            ):
+                slice_size = -(-blob.size // self.nb_download_slices)
+                logger.debug(
+                    f"Downloading gs://{bucket_name}/{blob_name} ({blob.size} bytes) "
+                    f"in {self.nb_download_slices} slices"
+                )
+                transfer_manager.download_chunks_concurrently(
+                    blob,
+                    partial_path,
+                    chunk_size=slice_size,
+                    worker_type=transfer_manager.THREAD,
+                    max_workers=self.nb_download_slices,
+                )
+            else:
+                blob.download_to_filename(partial_path)
+            os.replace(partial_path, local_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        logger.debug(f"Blob gs://{bucket_name}/{blob_name} downloaded to {local_path}")
+        return local_path
+
+    async def download_async(
+        self, bucket_name: str, blob_name: str, local_path: str
+    ) -> str:
+        """
+        Download a blob to a local file, see download
+        """
+        return await self._run(self.download, bucket_name, blob_name, local_path)
+
+    def upload(
+        self,
+        source_path: str,
+        bucket_name: str,
+        blob_name: str,
+        timeout: int = None,
+    ) -> str:
+        """
+        Upload a local file to a blob, blocking the calling thread
+
+        Args:
+            source_path: The path of the file to upload
+            bucket_name: The destination bucket
+            blob_name: The name of the destination blob
+            timeout: The timeout of the upload in seconds, defaults to
+                GCS_UPLOAD_TIMEOUT_SEC
+
+        Returns:
+            The gs:// URL of the uploaded blob
+        """
+        blob = self.client.bucket(bucket_name).blob(blob_name)
+        blob.upload_from_filename(
+            source_path, timeout=timeout or config.get_gcs_upload_timeout_sec()
+        )
+        gcs_url = f"gs://{bucket_name}/{blob.name}"
+        logger.debug(f"Uploaded {source_path} to {gcs_url}")
+        return gcs_url
+
+    async def upload_async(
+        self,
+        source_path: str,
+        bucket_name: str,
+        blob_name: str,
+        timeout: int = None,
+    ) -> str:
+        """
+        Upload a local file to a blob, see upload
+        """
+        return await self._run(
+            self.upload, source_path, bucket_name, blob_name, timeout
+        )
+
+    async def upload_many_async(
+        self,
+        files: list[tuple[str, str]],
+        bucket_name: str,
+        timeout: int = None,
+    ) -> list[str]:
+        """
+        Upload a batch of local files, e.g. the outputs of a build, at most max_workers
+        of them at once
+
+        Args:
+            files: The (source path, destination blob name) pairs to upload
+            bucket_name: The destination bucket
+            timeout: The timeout of each upload in seconds, defaults to
+                GCS_UPLOAD_TIMEOUT_SEC
+
+        Returns:
+            The gs:// URLs of the uploaded blobs, in the same order as the files
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.upload_async(source_path, bucket_name, blob_name, timeout)
+                    for source_path, blob_name in files
+                )
+            )
+        )
+
+    def get_signed_url(
+        self, bucket_name: str, blob_name: str, expiration_sec: int
+    ) -> str:
+        """
+        Get a V4 signed URL giving read access to a blob for a limited time, so that it
+        can be read without making the bucket public. Blocks the calling thread, and
+        requires credentials able to sign, e.g. a service account.
+
+        Args:
+            bucket_name: The bucket of the blob
+            blob_name: The name of the blob
+            expiration_sec: The number of seconds the URL is valid for
+
+        Returns:
+            The signed HTTPS URL of the blob
+        """
+        return (
+            self.client.bucket(bucket_name)
+            .blob(blob_name)
+            .generate_signed_url(
+                version="v4",
+                expiration=timedelta(seconds=expiration_sec),
+                method="GET",
+            )
+        )
+
+    async def get_signed_url_async(
+        self, bucket_name: str, blob_name: str, expiration_sec: int
+    ) -> str:
+        """
+        Get a signed URL giving read access to a blob, see get_signed_url
+        """
+        return await self._run(
+            self.get_signed_url, bucket_name, blob_name, expiration_sec
+        )
+
+    def delete(self, bucket_name: str, blob_name: str):
+        """
+        Delete a blob, blocking the calling thread
+        """
+        self.client.bucket(bucket_name).blob(blob_name).delete()
+        logger.debug(f"Deleted gs://{bucket_name}/{blob_name}")
+
+    async def delete_async(self, bucket_name: str, blob_name: str):
+        """
+        Delete a blob
+        """
+        await self._run(self.delete, bucket_name, blob_name)
+
+    def close(self):
+        """
+        Wait for the running transfers and release the threads
+        """
+        self._executor.shutdown(wait=True)
+
+
+def _create_gcs_transfer_manager() -> GCSTransferManager:
+    return GCSTransferManager(
+        max_workers=config.get_gcs_transfer_max_workers(),
+        nb_download_slices=config.get_nb_download_segments(),
+        min_sliced_download_size=config.get_min_segmented_download_size(),
+    )
+
+
+_gcs_transfer_manager = ProcessWideInstance(_create_gcs_transfer_manager)
+
+
+def get_gcs_transfer_manager() -> GCSTransferManager:
+    """
+    Get the process wide GCS transfer manager, created on first use from the
+    configuration
+    """
+    return _gcs_transfer_manager.get()
+
+
+def set_gcs_transfer_manager(gcs_transfer_manager: GCSTransferManager):
+    """
+    Replace the process wide GCS transfer manager, e.g. to use a preconfigured client
+    """
+    _gcs_transfer_manager.set(gcs_transfer_manager)
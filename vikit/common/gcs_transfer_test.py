@@ -0,0 +1,240 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import base64
+import hashlib
+import json
+import os
+import re
+
+import google_crc32c
+import pytest
+from aiohttp import web
+
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.gcs_transfer import GCSTransferManager, create_storage_client
+
+BUCKET_NAME = "test-bucket"
+CONTENT = bytes(range(256)) * 400  # 100 KB
+
+
+class FakeGCSServer:
+    """
+    Minimal in memory implementation of the GCS JSON API, enough for the storage client
+    to get, download and upload blobs
+    """
+
+    def __init__(self):
+        self.blobs = {}
+        self.requests = []
+
+    def _get_metadata(self, bucket: str, name: str) -> dict:
+        content = self.blobs[(bucket, name)]
+        return {
+            "kind": "storage#object",
+            "bucket": bucket,
+            "name": name,
+            "size": str(len(content)),
+            "generation": "1",
+            "md5Hash": base64.b64encode(hashlib.md5(content).digest()).decode(),
+            "crc32c": base64.b64encode(
+                google_crc32c.Checksum(content).digest()
+            ).decode(),
+        }
+
+    async def get_object(self, request):
+        bucket, name = request.match_info["bucket"], request.match_info["name"]
+        self.requests.append(("GET", name, request.headers.get("Range")))
+        if (bucket, name) not in self.blobs:
+            return web.json_response({"error": {"code": 404}}, status=404)
+        if request.query.get("alt") != "media":
+            return web.json_response(self._get_metadata(bucket, name))
+
+        content = self.blobs[(bucket, name)]
+        byte_range = request.headers.get("Range")
+        if not byte_range:
+            return web.Response(body=content)
+        start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", byte_range).groups())
+        return web.Response(
+            status=206,
+            body=content[start : end + 1],
+            headers={"Content-Range": f"bytes {start}-{end}/{len(content)}"},
+        )
+
+    async def upload_object(self, request):
+        bucket = request.match_info["bucket"]
+        body = await request.read()
+        # multipart/related: a JSON part with the metadata, then the content
+        boundary = re.search(
+            r'boundary="?([^";]+)', request.headers["Content-Type"]
+        ).group(1)
+        parts = body.split(b"--" + boundary.encode())
+        metadata = json.loads(parts[1].split(b"\r\n\r\n", 1)[1])
+        content = parts[2].split(b"\r\n\r\n", 1)[1][: -len(b"\r\n")]
+        self.requests.append(("POST", metadata["name"], None))
+        self.blobs[(bucket, metadata["name"])] = content
+        return web.json_response(self._get_metadata(bucket, metadata["name"]))
+
+    async def delete_object(self, request):
+        bucket, name = request.match_info["bucket"], request.match_info["name"]
+        self.requests.append(("DELETE", name, None))
+        if self.blobs.pop((bucket, name), None) is None:
+            return web.json_response({"error": {"code": 404}}, status=404)
+        return web.Response(status=204)
+
+
+@pytest.fixture
+async def fake_gcs_server(monkeypatch):
+    fake_gcs_server = FakeGCSServer()
+    app = web.Application()
+    app.router.add_get(
+        "/download/storage/v1/b/{bucket}/o/{name:.+}", fake_gcs_server.get_object
+    )
+    app.router.add_get("/storage/v1/b/{bucket}/o/{name:.+}", fake_gcs_server.get_object)
+    app.router.add_delete(
+        "/storage/v1/b/{bucket}/o/{name:.+}", fake_gcs_server.delete_object
+    )
+    app.router.add_post(
+        "/upload/storage/v1/b/{bucket}/o", fake_gcs_server.upload_object
+    )
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    monkeypatch.setenv("STORAGE_EMULATOR_HOST", f"http://127.0.0.1:{port}")
+
+    yield fake_gcs_server
+
+    await runner.cleanup()
+
+
+@pytest.fixture
+def gcs_transfer_manager(fake_gcs_server):
+    gcs_transfer_manager = GCSTransferManager(
+        client=create_storage_client(),
+        nb_download_slices=4,
+        min_sliced_download_size=1024,
+    )
+    yield gcs_transfer_manager
+    gcs_transfer_manager.close()
+
+
+@pytest.mark.unit
+def test_init__invalid_arg__fails():
+    with pytest.raises(ValueError):
+        GCSTransferManager(max_workers=0)
+    with pytest.raises(ValueError):
+        GCSTransferManager(nb_download_slices=0)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_async__big_blob__downloads_slices(
+    fake_gcs_server, gcs_transfer_manager
+):
+    fake_gcs_server.blobs[(BUCKET_NAME, "videos/media.mp4")] = CONTENT
+
+    with WorkingFolderContext():
+        local_path = await gcs_transfer_manager.download_async(
+            BUCKET_NAME, "videos/media.mp4", "media.mp4"
+        )
+
+        with open(local_path, "rb") as f:
+            assert f.read() == CONTENT
+        assert not os.path.exists("media.mp4.partial")
+
+    ranged_downloads = [r for r in fake_gcs_server.requests if r[2]]
+    assert len(ranged_downloads) == 4
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_async__small_blob__single_download(
+    fake_gcs_server, gcs_transfer_manager
+):
+    fake_gcs_server.blobs[(BUCKET_NAME, "small.txt")] = b"small"
+
+    with WorkingFolderContext():
+        await gcs_transfer_manager.download_async(BUCKET_NAME, "small.txt", "small.txt")
+
+        with open("small.txt", "rb") as f:
+            assert f.read() == b"small"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_async__missing_blob__fails(gcs_transfer_manager):
+    with WorkingFolderContext():
+        with pytest.raises(FileNotFoundError):
+            await gcs_transfer_manager.download_async(
+                BUCKET_NAME, "missing.mp4", "missing.mp4"
+            )
+        assert not os.listdir()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_async__uploads_file(fake_gcs_server, gcs_transfer_manager):
+    with WorkingFolderContext():
+        with open("video.mp4", "wb") as f:
+            f.write(CONTENT)
+
+        gcs_url = await gcs_transfer_manager.upload_async(
+            "video.mp4", BUCKET_NAME, "outputs/video.mp4"
+        )
+
+    assert gcs_url == f"gs://{BUCKET_NAME}/outputs/video.mp4"
+    assert fake_gcs_server.blobs[(BUCKET_NAME, "outputs/video.mp4")] == CONTENT
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_upload_many_async__uploads_all_files(
+    fake_gcs_server, gcs_transfer_manager
+):
+    with WorkingFolderContext():
+        files = []
+        for i in range(5):
+            with open(f"video_{i}.mp4", "wb") as f:
+                f.write(CONTENT[: i + 1])
+            files.append((f"video_{i}.mp4", f"outputs/video_{i}.mp4"))
+
+        gcs_urls = await gcs_transfer_manager.upload_many_async(files, BUCKET_NAME)
+
+    assert gcs_urls == [f"gs://{BUCKET_NAME}/outputs/video_{i}.mp4" for i in range(5)]
+    for i in range(5):
+        assert fake_gcs_server.blobs[(BUCKET_NAME, f"outputs/video_{i}.mp4")] == (
+            CONTENT[: i + 1]
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_blob_exists_async(fake_gcs_server, gcs_transfer_manager):
+    fake_gcs_server.blobs[(BUCKET_NAME, "media.mp4")] = CONTENT
+
+    assert await gcs_transfer_manager.blob_exists_async(BUCKET_NAME, "media.mp4")
+    assert not await gcs_transfer_manager.blob_exists_async(BUCKET_NAME, "other.mp4")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_delete_async(fake_gcs_server, gcs_transfer_manager):
+    fake_gcs_server.blobs[(BUCKET_NAME, "uploads/media.mp4")] = CONTENT
+
+    await gcs_transfer_manager.delete_async(BUCKET_NAME, "uploads/media.mp4")
+
+    assert not fake_gcs_server.blobs
@@ -0,0 +1,235 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import base64
+import hashlib
+import os
+
+import aiofiles
+import aiohttp
+from loguru import logger
+
+import vikit.common.config as config
+
+CHUNK_SIZE = 1024 * 1024
+# aiohttp transparently decompresses encoded responses, which would make the sizes and
+# byte ranges announced by the server not match the bytes written, so ask for the
+# raw bytes
+IDENTITY_ENCODING_HEADERS = {"Accept-Encoding": "identity"}
+
+
+async def _get_remote_file_info(session: aiohttp.ClientSession, url: str) -> dict:
+    """
+    Get the size, range support and MD5 checksum of a remote file, as far as the server
+    tells them
+    """
+    try:
+        async with session.head(
+            url, allow_redirects=True, headers=IDENTITY_ENCODING_HEADERS
+        ) as response:
+            if response.status != 200:
+                return {}
+            headers = response.headers
+    except aiohttp.ClientError as e:
+        logger.debug(f"Could not get the headers of {url}: {e}")
+        return {}
+
+    md5 = headers.get("Content-MD5")
+    # GCS sends the checksums as "crc32c=...,md5=..."
+    for goog_hash in headers.getall("x-goog-hash", []):
+        for checksum in goog_hash.split(","):
+            name, _, value = checksum.strip().partition("=")
+            if name == "md5":
+                md5 = value
+    content_length = headers.get("Content-Length")
+    if headers.get("Content-Encoding", "identity").lower() != "identity":
+        # The server encodes the file anyway: its announced size and ranges do not
+        # apply to the decoded bytes, so neither check the size nor use ranges
+        logger.debug(f"{url} is sent with a content encoding, not using its size")
+        content_length = None
+        accepts_ranges = False
+    else:
+        accepts_ranges = headers.get("Accept-Ranges", "").lower() == "bytes"
+    return {
+        "size": int(content_length) if content_length else None,
+        "accepts_ranges": accepts_ranges,
+        "md5": md5,
+        "etag": headers.get("ETag"),
+    }
+
+
+def _check_http_response(response: aiohttp.ClientResponse):
+    """Throws the appropriate exception if the response indicates an error."""
+    if response.status in (200, 206):
+        return
+
+    if response.status == 403:
+        raise PermissionError(response)
+    if response.status == 404:
+        raise FileNotFoundError(response)
+
+    # TODO: Add more specialized errors here. See the full list of available errors at
+    # https://docs.python.org/3/library/exceptions.html
+
+    raise ConnectionError(response)
+
+
+async def _download_segment(
+    session: aiohttp.ClientSession,
+    url: str,
+    part_path: str,
+    start: int = 0,
+    end: int = None,
+    if_range: str = None,
+):
+    """
+    Download the bytes start to end (included) of a file into a part file, resuming
+    from what a previous attempt already wrote to it
+    """
+    nb_downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if end is not None and nb_downloaded > end - start + 1:
+        nb_downloaded = 0  # Not from this file, start over
+
+    headers = dict(IDENTITY_ENCODING_HEADERS)
+    if nb_downloaded or end is not None:
+        headers["Range"] = f"bytes={start + nb_downloaded}-{'' if end is None else end}"
+        if if_range:
+            # Get the whole file rather than mixing bytes of two versions of it
+            headers["If-Range"] = if_range
+    if end is not None and nb_downloaded == end - start + 1:
+        return
+
+    async with session.get(url, headers=headers) as response:
+        _check_http_response(response)
+        if response.status == 200 and "Range" in headers:
+            if start != 0:
+                raise ConnectionError(f"Server ignored the range request for {url}")
+            nb_downloaded = 0  # The server sent the whole file
+
+        if nb_downloaded:
+            logger.debug(f"Resuming {part_path} from byte {nb_downloaded}")
+        async with aiofiles.open(part_path, "ab" if nb_downloaded else "wb") as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await f.write(chunk)
+
+
+def _get_md5(file_path: str) -> str:
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode("ascii")
+
+
+def _validate(file_path: str, file_info: dict):
+    """
+    Check a downloaded file against the size and checksum announced by the server
+    """
+    size = os.path.getsize(file_path)
+    if file_info.get("size") is not None and size != file_info["size"]:
+        raise ValueError(
+            f"Downloaded {size} bytes instead of {file_info['size']} for {file_path}"
+        )
+    if file_info.get("md5") and _get_md5(file_path) != file_info["md5"]:
+        raise ValueError(f"Checksum mismatch for the download of {file_path}")
+
+
+def _merge_parts(part_paths: list[str], target_path: str):
+    with open(target_path, "wb") as target_file:
+        for part_path in part_paths:
+            with open(part_path, "rb") as part_file:
+                while chunk := part_file.read(CHUNK_SIZE):
+                    target_file.write(chunk)
+
+
+def _remove_files(file_paths: list[str]):
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+async def download_http_file(
+    session: aiohttp.ClientSession,
+    url: str,
+    local_path: str,
+    nb_segments: int = None,
+    min_segmented_size: int = None,
+) -> str:
+    """
+    Download an HTTP(S) file, in parallel segments for big files if the server supports
+    range requests.
+
+    Bytes are written to .partial files first, kept if the download fails, so that a
+    new attempt resumes where the previous one stopped. The file is only moved to the
+    local path once its size and checksum, when announced by the server, are validated.
+
+    Args:
+        session: The session to download the file with
+        url: The URL of the file
+        local_path: The path to save the file to
+        nb_segments: The number of segments downloaded in parallel, from the
+            configuration by default
+        min_segmented_size: The minimum size in bytes of a file downloaded in segments,
+            from the configuration by default
+
+    Returns:
+        str: The local path
+    """
+    nb_segments = nb_segments or config.get_nb_download_segments()
+    if min_segmented_size is None:
+        min_segmented_size = config.get_min_segmented_download_size()
+
+    file_info = await _get_remote_file_info(session, url)
+    size = file_info.get("size")
+    can_use_ranges = bool(file_info.get("accepts_ranges") and size)
+    if_range = file_info.get("etag")
+
+    partial_path = f"{local_path}.partial"
+    if can_use_ranges and nb_segments > 1 and size >= min_segmented_size:
+        segment_size = -(-size // nb_segments)  # Rounded up
+        segments = [
+            (start, min(start + segment_size, size) - 1)
+            for start in range(0, size, segment_size)
+        ]
+        part_paths = [f"{partial_path}.{i}" for i in range(len(segments))]
+        logger.debug(f"Downloading {url} to {local_path} in {len(segments)} segments")
+        await asyncio.gather(
+            *(
+                _download_segment(session, url, part_path, start, end, if_range)
+                for part_path, (start, end) in zip(part_paths, segments)
+            )
+        )
+        await asyncio.to_thread(_merge_parts, part_paths, partial_path)
+        _remove_files(part_paths)
+    else:
+        logger.debug(f"Downloading file from {url} to {local_path}")
+        if not can_use_ranges:
+            _remove_files([partial_path])  # Cannot be resumed
+        await _download_segment(
+            session,
+            url,
+            partial_path,
+            end=size - 1 if can_use_ranges else None,
+            if_range=if_range,
+        )
+
+    try:
+        await asyncio.to_thread(_validate, partial_path, file_info)
+    except ValueError:
+        _remove_files([partial_path])
+        raise
+    os.replace(partial_path, local_path)
+    return local_path
@@ -0,0 +1,137 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import gzip
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.http_download import download_http_file
+
+CONTENT = bytes(range(256)) * 400  # 100 KB
+
+
+@pytest.fixture
+async def server():
+    requests = []
+
+    async def media_handler(request):
+        requests.append((request.method, request.headers.get("Range")))
+        return web.FileResponse("served/media.mp4")
+
+    async def wrong_checksum_handler(request):
+        return web.Response(body=CONTENT, headers={"Content-MD5": "d3Jvbmc="})
+
+    async def always_gzipped_handler(request):
+        requests.append((request.method, request.headers.get("Accept-Encoding")))
+        return web.Response(
+            body=gzip.compress(CONTENT),
+            headers={"Content-Encoding": "gzip", "Accept-Ranges": "bytes"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/media.mp4", media_handler)
+    app.router.add_get("/gzipped.mp4", always_gzipped_handler)
+    app.router.add_get("/wrong_checksum.mp4", wrong_checksum_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    with WorkingFolderContext():
+        os.makedirs("served")
+        with open("served/media.mp4", "wb") as f:
+            f.write(CONTENT)
+        yield f"http://127.0.0.1:{port}", requests
+
+    await runner.cleanup()
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_http_file__in_parallel_segments(server):
+    base_url, requests = server
+
+    async with aiohttp.ClientSession() as session:
+        await download_http_file(
+            session,
+            f"{base_url}/media.mp4",
+            "media.mp4",
+            nb_segments=4,
+            min_segmented_size=1024,
+        )
+
+    assert _read_file("media.mp4") == CONTENT
+    assert len([r for r in requests if r[0] == "GET" and r[1]]) == 4
+    assert not [f for f in os.listdir() if ".partial" in f]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_http_file__resumes_partial_file(server):
+    base_url, requests = server
+    with open("media.mp4.partial", "wb") as f:
+        f.write(CONTENT[:60000])
+
+    async with aiohttp.ClientSession() as session:
+        await download_http_file(
+            session, f"{base_url}/media.mp4", "media.mp4", nb_segments=1
+        )
+
+    assert _read_file("media.mp4") == CONTENT
+    assert ("GET", f"bytes=60000-{len(CONTENT) - 1}") in requests
+    assert not os.path.exists("media.mp4.partial")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_http_file__checksum_mismatch__fails(server):
+    base_url, _ = server
+
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            await download_http_file(
+                session, f"{base_url}/wrong_checksum.mp4", "media.mp4"
+            )
+
+    assert not os.path.exists("media.mp4")
+    assert not os.path.exists("media.mp4.partial")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_http_file__content_encoded__size_not_checked(server):
+    base_url, requests = server
+
+    async with aiohttp.ClientSession() as session:
+        await download_http_file(
+            session,
+            f"{base_url}/gzipped.mp4",
+            "media.mp4",
+            nb_segments=4,
+            min_segmented_size=1024,
+        )
+
+    assert _read_file("media.mp4") == CONTENT
+    assert requests == [("HEAD", "identity"), ("GET", "identity")]
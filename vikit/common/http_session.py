@@ -0,0 +1,119 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+from loguru import logger
+
+from vikit.common.process_wide import ProcessWideInstance
+
+
+class SharedHttpSession:
+    """
+    An aiohttp session shared by all the HTTP calls of its owner, e.g. a gateway, so
+    the calls made during a build reuse pooled keep-alive connections instead of paying
+    the DNS, TCP and TLS setup each time.
+
+    aiohttp sessions are bound to an event loop, so the session is created lazily and
+    recreated if used from another event loop, e.g. by a later build.
+    """
+
+    def __init__(
+        self,
+        timeout: aiohttp.ClientTimeout = None,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: int = 300,
+    ):
+        """
+        Args:
+            timeout: The default timeout of the requests
+            limit: The maximum number of open connections
+            limit_per_host: The maximum number of open connections to a single host
+            keepalive_timeout: How long idle connections are kept open, in seconds
+            ttl_dns_cache: How long DNS resolutions are cached, in seconds
+        """
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self._session = None
+        self._loop = None
+
+    def get(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating it if needed. Must be called from a coroutine
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                logger.debug("Event loop changed, creating a new HTTP session")
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout
+            )
+            self._loop = loop
+        return self._session
+
+    @asynccontextmanager
+    async def session(self):
+        """
+        Use the shared session, as a drop-in for "async with aiohttp.ClientSession()":
+        the session is left open on exit so the next call reuses its connections
+        """
+        yield self.get()
+
+    async def close(self):
+        """
+        Close the shared session and its connections
+        """
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._loop is asyncio.get_running_loop()
+        ):
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_shared_http_session = ProcessWideInstance(SharedHttpSession)
+
+
+def get_shared_http_session() -> SharedHttpSession:
+    """
+    Get the process wide HTTP session, used by the HTTP calls not made on behalf of a
+    gateway, e.g. downloads and availability checks
+
+    Returns:
+        SharedHttpSession: The shared HTTP session
+    """
+    return _shared_http_session.get()
+
+
+def set_shared_http_session(shared_http_session: SharedHttpSession):
+    """
+    Replace the process wide HTTP session, e.g. to tune its connection pool
+    """
+    _shared_http_session.set(shared_http_session)
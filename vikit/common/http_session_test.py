@@ -0,0 +1,114 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import vikit.common.http_session as http_session_module
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.file_tools import download_or_copy_file
+from vikit.common.http_session import SharedHttpSession
+
+
+async def _start_server(client_ports: list):
+    async def handler(request):
+        if request.method == "GET":
+            client_ports.append(request.transport.get_extra_info("peername")[1])
+        return web.Response(body=b"media content")
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_or_copy_file__shared_session_reuses_connection():
+    client_ports = []
+    runner, base_url = await _start_server(client_ports)
+    http_session = SharedHttpSession()
+    try:
+        with WorkingFolderContext():
+            for name in ["first.mp4", "second.mp4"]:
+                async with http_session.session() as session:
+                    await download_or_copy_file(
+                        url=f"{base_url}/{name}",
+                        local_path=name,
+                        http_session=session,
+                    )
+                with open(name, "rb") as f:
+                    assert f.read() == b"media content"
+    finally:
+        await http_session.close()
+        await runner.cleanup()
+
+    assert len(client_ports) == 2
+    assert client_ports[0] == client_ports[1], "The connection should be kept alive"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_download_or_copy_file__no_session__process_wide_session_used(
+    monkeypatch,
+):
+    client_ports = []
+    runner, base_url = await _start_server(client_ports)
+    http_session = SharedHttpSession()
+    monkeypatch.setattr(
+        http_session_module._shared_http_session, "instance", http_session
+    )
+    try:
+        with WorkingFolderContext():
+            for name in ["first.mp4", "second.mp4"]:
+                await download_or_copy_file(url=f"{base_url}/{name}", local_path=name)
+    finally:
+        await http_session.close()
+        await runner.cleanup()
+
+    assert len(client_ports) == 2
+    assert client_ports[0] == client_ports[1], "The connection should be kept alive"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get__same_session_until_closed():
+    http_session = SharedHttpSession()
+
+    session = http_session.get()
+    assert http_session.get() is session
+
+    await http_session.close()
+    assert session.closed
+    assert http_session.get() is not session
+    await http_session.close()
+
+
+@pytest.mark.unit
+def test_get__new_session_per_event_loop():
+    http_session = SharedHttpSession()
+
+    async def get_session():
+        session = http_session.get()
+        await http_session.close()
+        return session
+
+    assert asyncio.run(get_session()) is not asyncio.run(get_session())
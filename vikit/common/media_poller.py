@@ -0,0 +1,227 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import random
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from vikit.common.file_tools import url_exists_async
+
+
+@dataclass
+class _PolledMedia:
+    """The polling state of a media URL, shared by everyone waiting for it."""
+
+    future: asyncio.Future
+    interval_sec: float
+    next_check_at: float
+    nb_waiters: int = 0
+    nb_checks: int = 0
+    waiting_since: float = field(default_factory=time.monotonic)
+
+
+class MediaPoller:
+    """
+    Waits for media generated by long running jobs to become available, e.g. a video
+    URL returned before the video is uploaded.
+
+    A single polling loop checks all the outstanding media, so a process can wait on
+    hundreds of them at once. Each media is checked with an exponential backoff plus
+    some jitter, so checks for media submitted together do not hit the storage at the
+    same time, and the checks due at the same time run as one bounded batch.
+    """
+
+    def __init__(
+        self,
+        initial_interval_sec: float = 1.0,
+        max_interval_sec: float = 30.0,
+        backoff_factor: float = 2.0,
+        jitter_ratio: float = 0.2,
+        max_concurrent_checks: int = 16,
+        check_media: Callable[[str], Awaitable[bool]] = url_exists_async,
+    ):
+        """
+        Args:
+            initial_interval_sec: The delay before checking a media again the first time
+            max_interval_sec: The maximum delay between two checks of the same media
+            backoff_factor: How much the delay grows after each unsuccessful check
+            jitter_ratio: The random share of the delay added or removed to each delay
+            max_concurrent_checks: The maximum number of checks running at once
+            check_media: The coroutine function checking whether a media is available
+        """
+        if initial_interval_sec <= 0 or max_interval_sec < initial_interval_sec:
+            raise ValueError(
+                f"Invalid polling intervals: initial {initial_interval_sec}, "
+                f"max {max_interval_sec}"
+            )
+        if backoff_factor < 1:
+            raise ValueError(f"Backoff factor ({backoff_factor}) must be >= 1")
+        if not 0 <= jitter_ratio < 1:
+            raise ValueError(f"Jitter ratio ({jitter_ratio}) must be in [0, 1)")
+
+        self.initial_interval_sec = initial_interval_sec
+        self.max_interval_sec = max_interval_sec
+        self.backoff_factor = backoff_factor
+        self.jitter_ratio = jitter_ratio
+        self.max_concurrent_checks = max_concurrent_checks
+        self.check_media = check_media
+
+        self._polled_media = {}
+        self._wake_up = None
+        self._polling_task = None
+
+    def get_nb_polled_media(self) -> int:
+        """
+        Get the number of media being waited for
+        """
+        return len(self._polled_media)
+
+    def _with_jitter(self, delay_sec: float) -> float:
+        return delay_sec * (1 + random.uniform(-self.jitter_ratio, self.jitter_ratio))
+
+    async def wait_until_available(self, url: str, timeout_sec: float) -> bool:
+        """
+        Wait for a media to become available
+
+        Args:
+            url: The URL or path of the media
+            timeout_sec: How long to wait for the media at most
+
+        Returns:
+            bool: Whether the media became available in time
+        """
+        if await self.check_media(url):
+            return True
+
+        polled_media = self._polled_media.get(url)
+        if polled_media is None:
+            polled_media = _PolledMedia(
+                future=asyncio.get_running_loop().create_future(),
+                interval_sec=self.initial_interval_sec,
+                next_check_at=time.monotonic()
+                + self._with_jitter(self.initial_interval_sec),
+            )
+            self._polled_media[url] = polled_media
+        polled_media.nb_waiters += 1
+        self._ensure_polling()
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(polled_media.future), timeout=timeout_sec
+            )
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            polled_media.nb_waiters -= 1
+            if polled_media.nb_waiters == 0 and self._polled_media.get(url) is (
+                polled_media
+            ):
+                # Nobody is waiting for it anymore
+                del self._polled_media[url]
+            if not self._polled_media and self._polling_task is not None:
+                # Nothing left to poll, stop the polling loop before returning
+                polling_task, self._polling_task = self._polling_task, None
+                polling_task.cancel()
+                await asyncio.wait([polling_task])
+
+    def _ensure_polling(self):
+        if self._wake_up is None:
+            self._wake_up = asyncio.Event()
+        self._wake_up.set()
+        if self._polling_task is None or self._polling_task.done():
+            self._polling_task = asyncio.create_task(self._poll())
+
+    async def _check(self, url: str, polled_media: _PolledMedia, semaphore) -> bool:
+        async with semaphore:
+            try:
+                is_available = await self.check_media(url)
+            except Exception as e:
+                logger.warning(f"Could not check whether {url} is available: {e}")
+                is_available = False
+
+        polled_media.nb_checks += 1
+        if not is_available:
+            polled_media.interval_sec = min(
+                polled_media.interval_sec * self.backoff_factor, self.max_interval_sec
+            )
+            polled_media.next_check_at = time.monotonic() + self._with_jitter(
+                polled_media.interval_sec
+            )
+        return is_available
+
+    async def _poll(self):
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        while self._polled_media:
+            self._wake_up.clear()
+            now = time.monotonic()
+            due_media = [
+                (url, polled_media)
+                for url, polled_media in self._polled_media.items()
+                if polled_media.next_check_at <= now
+            ]
+            if due_media:
+                logger.trace(f"Checking {len(due_media)} polled media")
+                are_available = await asyncio.gather(
+                    *(
+                        self._check(url, polled_media, semaphore)
+                        for url, polled_media in due_media
+                    )
+                )
+                # Resolve the whole batch at once, so this loop is done before the
+                # waiters resume if nothing else is polled
+                for (url, polled_media), is_available in zip(due_media, are_available):
+                    if not is_available:
+                        continue
+                    logger.debug(
+                        f"Media {url} available after {polled_media.nb_checks} checks "
+                        f"and {time.monotonic() - polled_media.waiting_since:.1f}s"
+                    )
+                    if not polled_media.future.done():
+                        polled_media.future.set_result(True)
+                    if self._polled_media.get(url) is polled_media:
+                        del self._polled_media[url]
+                continue
+
+            next_check_at = min(
+                polled_media.next_check_at
+                for polled_media in self._polled_media.values()
+            )
+            try:
+                # Wake up early if new media are added
+                await asyncio.wait_for(
+                    self._wake_up.wait(), timeout=max(0, next_check_at - now)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+_media_pollers = weakref.WeakKeyDictionary()
+
+
+def get_media_poller() -> MediaPoller:
+    """
+    Get the media poller shared by the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    media_poller = _media_pollers.get(loop)
+    if media_poller is None:
+        media_poller = MediaPoller()
+        _media_pollers[loop] = media_poller
+    return media_poller
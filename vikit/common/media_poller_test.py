@@ -0,0 +1,91 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+
+import pytest
+
+from vikit.common.media_poller import MediaPoller
+
+
+class _FakeStorage:
+    def __init__(self):
+        self.available = set()
+        self.checks = []
+
+    async def check_media(self, url: str) -> bool:
+        self.checks.append(url)
+        return url in self.available
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_wait_until_available__already_available__no_polling():
+    storage = _FakeStorage()
+    storage.available.add("ready.mp4")
+    poller = MediaPoller(check_media=storage.check_media)
+
+    assert await poller.wait_until_available("ready.mp4", timeout_sec=1)
+    assert storage.checks == ["ready.mp4"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_wait_until_available__resolves_all_waiters_once_available():
+    storage = _FakeStorage()
+    poller = MediaPoller(
+        initial_interval_sec=0.01,
+        max_interval_sec=0.02,
+        jitter_ratio=0,
+        check_media=storage.check_media,
+    )
+
+    async def make_available():
+        await asyncio.sleep(0.05)
+        storage.available.update(["first.mp4", "second.mp4"])
+
+    results = await asyncio.gather(
+        poller.wait_until_available("first.mp4", timeout_sec=1),
+        poller.wait_until_available("first.mp4", timeout_sec=1),
+        poller.wait_until_available("second.mp4", timeout_sec=1),
+        make_available(),
+    )
+
+    assert results[:3] == [True, True, True]
+    assert poller.get_nb_polled_media() == 0
+    # Waiters of the same media share its checks
+    assert storage.checks.count("first.mp4") == storage.checks.count("second.mp4") + 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_wait_until_available__timeout__returns_false():
+    storage = _FakeStorage()
+    poller = MediaPoller(
+        initial_interval_sec=0.01,
+        max_interval_sec=0.04,
+        check_media=storage.check_media,
+    )
+
+    assert not await poller.wait_until_available("never.mp4", timeout_sec=0.1)
+    assert poller.get_nb_polled_media() == 0
+    # Backoff: far fewer checks than one per initial interval
+    assert len(storage.checks) < 8
+
+
+@pytest.mark.unit
+def test_init__invalid_intervals__fails():
+    with pytest.raises(ValueError):
+        MediaPoller(initial_interval_sec=2, max_interval_sec=1)
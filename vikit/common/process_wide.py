@@ -0,0 +1,51 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ProcessWideInstance(Generic[T]):
+    """
+    The process wide instance of a service, e.g. a cache or an executor, created on
+    first use by its factory, usually from the configuration.
+
+    The instance can be replaced, e.g. to share a tuned one across builds. While it is
+    None, e.g. when the configuration disables the service, the factory is called
+    again on the next use.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        """
+        Args:
+            factory: Creates the instance, or returns None if there should be none
+        """
+        self.factory = factory
+        self.instance: T = None
+
+    def get(self) -> T:
+        """
+        Get the instance, creating it if needed
+        """
+        if self.instance is None:
+            self.instance = self.factory()
+        return self.instance
+
+    def set(self, instance: T):
+        """
+        Replace the instance
+        """
+        self.instance = instance
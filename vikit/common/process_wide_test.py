@@ -0,0 +1,47 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import pytest
+
+from vikit.common.process_wide import ProcessWideInstance
+
+
+@pytest.mark.unit
+def test_get__created_once_on_first_use():
+    nb_creations = 0
+
+    def create():
+        nonlocal nb_creations
+        nb_creations += 1
+        return object()
+
+    process_wide_instance = ProcessWideInstance(create)
+    assert nb_creations == 0
+
+    instance = process_wide_instance.get()
+
+    assert process_wide_instance.get() is instance
+    assert nb_creations == 1
+
+
+@pytest.mark.unit
+def test_set__replaces_instance():
+    process_wide_instance = ProcessWideInstance(lambda: "created")
+    process_wide_instance.set("replacing")
+
+    assert process_wide_instance.get() == "replacing"
+
+    process_wide_instance.set(None)
+    assert process_wide_instance.get() == "created"
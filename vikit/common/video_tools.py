@@ -6,7 +6,11 @@ DEFAULT_BITRATE = "14000k"
 
 
 def write_videofile(
-    video: VideoClip, output_path: str, fps: float, verbose: bool = False
+    video: VideoClip,
+    output_path: str,
+    fps: float,
+    verbose: bool = False,
+    progress_logger=None,
 ):
     """
     Saves the specified clip to a file in the default Vikit video format.
@@ -16,12 +20,14 @@ def write_videofile(
       - output_path (str): Path of the video file to write.
       - fps (float): Number of frames per second in the video file to write.
       - verbose (bool): Whether to generate verbose logs. Defaults to False.
+      - progress_logger (ProgressBarLogger): A proglog logger following the progress of
+        the render, e.g. to cancel it. Takes precedence over verbose.
     """
     kwargs = {
         "codec": "libx264",
         "audio_codec": "aac",
         "fps": fps,
-        "logger": "bar" if verbose else None,
+        "logger": progress_logger or ("bar" if verbose else None),
     }
 
     if max(video.size) < MINIMUM_RESOLUTION_THRESHOLD:
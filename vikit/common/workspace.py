@@ -0,0 +1,71 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+
+class BuildWorkspace:
+    """
+    The folder a build writes its files to.
+
+    The files of a build are addressed by absolute paths derived from its workspace
+    instead of paths relative to the current working directory, so several builds can
+    run at the same time in one process, in an event loop or a pool of threads, each
+    in its own folder, without changing the process wide working directory.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: The folder of the workspace, created when the build starts, see
+                create. Defaults to the current working directory at the time the
+                workspace is created
+        """
+        self.path = os.path.abspath(path or os.getcwd())
+
+    def create(self) -> "BuildWorkspace":
+        """
+        Create the folder of the workspace if needed, before writing files to it.
+        Computing the paths of the files does not need the folder to exist
+
+        Returns:
+            The workspace
+        """
+        os.makedirs(self.path, exist_ok=True)
+        return self
+
+    def get_path(self, file_name: str) -> str:
+        """
+        Get the absolute path of a file of the build
+
+        Args:
+            file_name: The name of the file, or a path relative to the workspace.
+                Absolute paths are returned as is
+
+        Returns:
+            The absolute path of the file
+        """
+        if not file_name:
+            raise ValueError("file_name cannot be None or empty")
+        return os.path.join(self.path, file_name)
+
+    def __str__(self):
+        return self.path
+
+    def __eq__(self, other):
+        return isinstance(other, BuildWorkspace) and self.path == other.path
+
+    def __hash__(self):
+        return hash(self.path)
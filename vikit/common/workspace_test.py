@@ -0,0 +1,75 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+import pytest
+
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.common.GeneralBuildSettings import GeneralBuildSettings
+from vikit.common.workspace import BuildWorkspace
+from vikit.wrappers.ffmpeg_wrapper import _get_default_target_path
+
+
+@pytest.mark.unit
+def test_init__absolute_folder_created_on_demand():
+    with WorkingFolderContext():
+        workspace = BuildWorkspace("builds/first")
+        workspace.get_path("video.mp4")
+
+        assert os.path.isabs(workspace.path)
+        assert not os.path.exists("builds")
+        assert workspace == BuildWorkspace(os.path.abspath("builds/first"))
+
+        assert workspace.create() is workspace
+        assert os.path.isdir("builds/first")
+
+
+@pytest.mark.unit
+def test_get_path__independent_of_working_folder():
+    with WorkingFolderContext() as working_folder:
+        workspace = BuildWorkspace("build")
+    with WorkingFolderContext():
+        path = workspace.get_path("video.mp4")
+
+    assert path == os.path.join(working_folder.path, "build", "video.mp4")
+    assert workspace.get_path("/tmp/video.mp4") == "/tmp/video.mp4"
+    with pytest.raises(ValueError):
+        workspace.get_path("")
+
+
+@pytest.mark.unit
+def test_default_target_path__in_workspace():
+    with WorkingFolderContext():
+        workspace = BuildWorkspace("build")
+
+        assert _get_default_target_path("cutted_video.mp4", workspace) == (
+            os.path.join(workspace.path, "cutted_video.mp4")
+        )
+        assert _get_default_target_path("cutted_video.mp4") == os.path.abspath(
+            "cutted_video.mp4"
+        )
+
+
+@pytest.mark.unit
+def test_build_settings_workspace__pinned_for_the_build():
+    build_settings = GeneralBuildSettings(target_dir_path="build")
+    with WorkingFolderContext():
+        workspace = build_settings.get_workspace()
+    with WorkingFolderContext():
+        assert build_settings.get_workspace() is workspace
+
+        build_settings.target_dir_path = "other_build"
+        assert build_settings.get_workspace().path == os.path.abspath("other_build")
@@ -13,7 +13,29 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+import vikit.common.config as config
+import vikit.gateways.llm_response_cache as llm_response_cache
+from vikit.gateways.rate_limiter import ProviderRateLimiter, RateLimiterMetrics
+
+
+@dataclass
+class PromptEnhancement:
+    """
+    The LLM enhancements of one subtitle text, used to generate its videos
+
+    Attributes:
+        keywords: The keywords extracted from the text, ending with a title
+        enhanced_prompt: The text rewritten as a one sentence video scenario
+        title: A short title summarizing the text, usable in file names
+    """
+
+    keywords: str
+    enhanced_prompt: str
+    title: str
 
 
 class MLModelsGateway(ABC):
@@ -23,14 +45,76 @@ class MLModelsGateway(ABC):
 
     Stubs inheriting from this class may be created for each model to be used so as to prevent
     dependencies on the actual API implementation and speed up tests
+
+    Gateways can be used as async context managers, to release the resources they keep
+    across calls once a build is done
     """
 
     def __init__(self):
+        self._rate_limiters = {}
+        # The cache of the LLM responses of this gateway, the process wide one if None
+        self.llm_response_cache = None
+
+    def get_llm_response_cache(self) -> llm_response_cache.LLMResponseCache:
+        """
+        Get the cache of the LLM responses, used by the methods decorated with
+        llm_cached
+
+        Returns:
+            The cache, or None if LLM responses are not cached
+        """
+        return self.llm_response_cache or llm_response_cache.get_llm_response_cache()
+
+    def get_rate_limiter(self, provider: str) -> ProviderRateLimiter:
+        """
+        Get the limiter of the calls to a provider, created on first use from the
+        configured budgets
+        """
+        rate_limiter = self._rate_limiters.get(provider)
+        if rate_limiter is None:
+            provider_rate_limits = config.get_provider_rate_limits()
+            rate_limits = provider_rate_limits.get(
+                provider, provider_rate_limits.get("default", {})
+            )
+            rate_limiter = ProviderRateLimiter(name=provider, **rate_limits)
+            self._rate_limiters[provider] = rate_limiter
+        return rate_limiter
+
+    def get_rate_limiter_metrics(self) -> dict[str, RateLimiterMetrics]:
+        """
+        Get how long the calls waited for the rate limiters, by provider
+        """
+        return {
+            provider: rate_limiter.metrics
+            for provider, rate_limiter in self._rate_limiters.items()
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Release the resources kept across calls, such as pooled HTTP connections
+        """
         pass
 
     async def generate_mp3_from_text_async(self, prompt_text, target_file):
         pass
 
+    def get_tts_settings(self) -> dict:
+        """
+        Get what, besides the text, decides of the audio generated by
+        generate_mp3_from_text_async, e.g. the voice, the model and its settings, so
+        that the generated audio can be cached
+
+        Returns:
+            A JSON serializable description of the text to speech settings
+        """
+        return {"gateway": type(self).__name__}
+
     @abstractmethod
     async def generate_background_music_async(
         self, duration: int = 3, prompt: str = None, target_file_name: str = None
@@ -68,6 +152,38 @@ class MLModelsGateway(ABC):
     async def get_enhanced_prompt_async(self, subtitleText):
         pass
 
+    async def get_prompt_enhancements_async(
+        self, subtitle_texts: list[str]
+    ) -> list[PromptEnhancement]:
+        """
+        Get the keywords and the enhanced prompt of many subtitle texts at once
+
+        Gateways able to enhance several texts per LLM request should override this,
+        by default every text gets its own keywords and enhanced prompt calls, all
+        running concurrently
+
+        Args:
+            subtitle_texts: The subtitle texts to enhance
+
+        Returns:
+            The enhancements, in the order of the subtitle texts
+        """
+
+        async def get_prompt_enhancement(subtitle_text: str) -> PromptEnhancement:
+            (keywords, title), (enhanced_prompt, _) = await asyncio.gather(
+                self.get_keywords_from_prompt_async(subtitleText=subtitle_text),
+                self.get_enhanced_prompt_async(subtitle_text),
+            )
+            return PromptEnhancement(
+                keywords=keywords, enhanced_prompt=enhanced_prompt, title=title
+            )
+
+        return list(
+            await asyncio.gather(
+                *(get_prompt_enhancement(text) for text in subtitle_texts)
+            )
+        )
+
     @abstractmethod
     async def get_subtitles_async(self, audiofile_path: str):
         pass
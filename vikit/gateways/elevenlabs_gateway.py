@@ -18,11 +18,25 @@ import aiohttp
 from loguru import logger
 
 from vikit.common.config import get_elevenLabs_url
+from vikit.common.http_session import get_shared_http_session
 from vikit.common.secrets import get_eleven_labs_api_key
 
+ELEVEN_LABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVEN_LABS_VOICE_SETTINGS = {"stability": 0.5, "similarity_boost": 0.5}
 
-async def generate_mp3_from_text_async(text, target_file):
-    CHUNK_SIZE = 1024
+
+async def generate_mp3_from_text_async(
+    text, target_file, http_session: aiohttp.ClientSession = None
+):
+    """
+    Generate an mp3 file reading the text with a synthetic voice
+
+    Args:
+        text: The text to read
+        target_file: The path of the mp3 file to write
+        http_session: The session to call the API with, to reuse its pooled
+            connections. The process wide session is used by default.
+    """
 
     headers = {
         "Accept": "audio/mpeg",
@@ -32,19 +46,28 @@ async def generate_mp3_from_text_async(text, target_file):
 
     payload = {
         "text": text,
-        "model_id": "eleven_multilingual_v2",
-        "voice_settings": {"stability": 0.5, "similarity_boost": 0.5},
+        "model_id": ELEVEN_LABS_MODEL_ID,
+        "voice_settings": ELEVEN_LABS_VOICE_SETTINGS,
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            get_elevenLabs_url(), json=payload, headers=headers
-        ) as response:
-            if response.status == 200:
-                async with aiofiles.open(target_file, "wb") as f:
-                    logger.debug(f"Writing mp3 to {target_file}")
-                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
-                        if chunk:
-                            await f.write(chunk)
-                    logger.debug("mp3 successfully written")
-            else:
-                logger.error(f"Failed to fetch audio: {response.status}")
+    await _post_and_write_mp3(
+        http_session or get_shared_http_session().get(), payload, headers, target_file
+    )
+
+
+async def _post_and_write_mp3(
+    session: aiohttp.ClientSession, payload: dict, headers: dict, target_file: str
+):
+    CHUNK_SIZE = 1024
+
+    async with session.post(
+        get_elevenLabs_url(), json=payload, headers=headers
+    ) as response:
+        if response.status == 200:
+            async with aiofiles.open(target_file, "wb") as f:
+                logger.debug(f"Writing mp3 to {target_file}")
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    if chunk:
+                        await f.write(chunk)
+                logger.debug("mp3 successfully written")
+        else:
+            logger.error(f"Failed to fetch audio: {response.status}")
@@ -15,7 +15,6 @@
 
 import asyncio
 import os
-import shutil
 from pathlib import Path
 from time import sleep
 from urllib.parse import urljoin
@@ -24,6 +23,8 @@ from urllib.request import pathname2url
 from loguru import logger
 
 import tests.testing_medias as tests_medias
+from vikit.common.file_copy import link_or_copy_file
+from vikit.gateways.llm_response_cache import llm_cached
 from vikit.gateways.ML_models_gateway import MLModelsGateway
 from vikit.prompt.prompt_cleaning import cleanse_llm_keywords
 
@@ -54,8 +55,9 @@ class FakeMLModelsGateway(MLModelsGateway):
     async def generate_mp3_from_text_async(self, prompt_text, target_file: str = None):
         logger.debug(f"Creating aa prompt from text: {prompt_text}")
 
-        shutil.copy(
-            src=tests_medias.get_test_prompt_recording_trainboy(), dst=target_file
+        link_or_copy_file(
+            source=tests_medias.get_test_prompt_recording_trainboy(),
+            destination=target_file,
         )
 
     async def generate_background_music_async(
@@ -88,6 +90,7 @@ class FakeMLModelsGateway(MLModelsGateway):
         await asyncio.sleep(sleep_time)
         return tests_medias.get_sample_generated_music_path()
 
+    @llm_cached(model="fake")
     async def get_music_generation_keywords_async(
         self, text, sleep_time: int = 0
     ) -> str:
@@ -106,12 +109,14 @@ class FakeMLModelsGateway(MLModelsGateway):
         await asyncio.sleep(sleep_time)  # Simulate a long process with time.sleep
         return "KEYWORDS FROM PROMPT", "keywords_from_prompt_file"
 
+    @llm_cached(model="fake")
     async def get_keywords_from_prompt_async(
         self, subtitleText, excluded_words: str = None, sleep_time: int = 0
     ):
         await asyncio.sleep(sleep_time)  # Simulate a long process with time.sleep
         return "KEYWORDS FROM PROMPT", "test title"
 
+    @llm_cached(model="fake")
     async def get_enhanced_prompt_async(
         self, subtitleText, excluded_words: str = None, sleep_time: int = 0
     ):
@@ -175,5 +180,6 @@ class FakeMLModelsGateway(MLModelsGateway):
     def extract_audio_slice(self, i, end, audiofile_path, target_file_name: str = None):
         return tests_medias.get_test_prompt_recording_trainboy()
 
+    @llm_cached(model="fake")
     async def ask_gemini(self, prompt, more_contents=None):
         return "-1"
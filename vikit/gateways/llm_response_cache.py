@@ -0,0 +1,513 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from enum import Enum
+
+from loguru import logger
+
+import vikit.common.config as config
+from vikit.common.artifact_cache import get_file_hash
+from vikit.common.process_wide import ProcessWideInstance
+
+# Attributes describing how a result is built rather than what is asked to the LLM
+_IGNORED_ATTRIBUTES = {"build_settings"}
+
+
+def normalize_llm_input(
+    value,
+    file_args: frozenset = frozenset(),
+    _visited: frozenset = frozenset(),
+    _name: str = "",
+):
+    """
+    Normalize an input of an LLM call so that inputs only differing by their formatting
+    share the same cache entry: texts are NFC normalized with their whitespaces
+    collapsed, declared local files are hashed by content and objects such as prompts
+    are reduced to their public data attributes, recursively, their build settings
+    aside.
+
+    Args:
+        value: The input to normalize
+        file_args: The dotted names of the inputs holding local file paths, e.g.
+            prompt.image, the files they name being hashed by content
+
+    Returns:
+        A JSON serializable value
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if _name in file_args and os.path.isfile(value):
+            return {"file_sha256": get_file_hash(value)}
+        return " ".join(unicodedata.normalize("NFC", value).split())
+    if isinstance(value, Enum):
+        return normalize_llm_input(value.value, file_args, _visited, _name)
+    if isinstance(value, dict):
+        return {
+            str(k): normalize_llm_input(
+                v, file_args, _visited, f"{_name}.{k}" if _name else str(k)
+            )
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [normalize_llm_input(v, file_args, _visited, _name) for v in value]
+    if hasattr(value, "__dict__") and not callable(value):
+        if id(value) in _visited:  # A reference cycle, e.g. to a parent object
+            return type(value).__name__
+        data_attributes = {
+            name: attribute
+            for name, attribute in vars(value).items()
+            if not name.startswith("_")
+            and name not in _IGNORED_ATTRIBUTES
+            and not callable(attribute)
+        }
+        return {
+            type(value).__name__: normalize_llm_input(
+                data_attributes, file_args, _visited | {id(value)}, _name
+            )
+        }
+    text = str(value)
+    # Default representations hold memory addresses, which differ from run to run
+    return type(value).__name__ if " at 0x" in text else text
+
+
+def get_llm_response_key(
+    model: str,
+    method: str,
+    inputs: dict,
+    generation_config: dict,
+    file_args: tuple = (),
+) -> str:
+    """
+    Get the cache key of an LLM call
+
+    Args:
+        model: The LLM model
+        method: The gateway method making the call, standing for its prompt template
+        inputs: The inputs of the call, e.g. the subtitle text to get keywords from
+        generation_config: The generation settings, e.g. the temperature
+        file_args: The dotted names of the inputs holding local file paths, hashed by
+            content, e.g. prompt.image
+
+    Returns:
+        str: The cache key
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "model": model,
+                "method": method,
+                "inputs": normalize_llm_input(inputs, frozenset(file_args)),
+                "generation_config": generation_config,
+            },
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+class LLMResponseCacheBackend(ABC):
+    """
+    Storage of the cached LLM responses, serialized as strings
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> str:
+        """
+        Get the response stored under a key
+
+        Returns:
+            str: The response, or None if it is missing or expired
+        """
+
+    @abstractmethod
+    def put(self, key: str, response: str, ttl_sec: float = None):
+        """
+        Store the response of a key, then evict the least recently used responses if
+        the cache got too big
+
+        Args:
+            key: The cache key
+            response: The serialized response
+            ttl_sec: How long the response stays valid, or None for no expiration
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Remove all the cached responses
+        """
+
+
+class InMemoryLLMResponseCacheBackend(LLMResponseCacheBackend):
+    """
+    Keeps the responses in memory for the lifetime of the process
+    """
+
+    def __init__(self, max_entries: int = None):
+        """
+        Args:
+            max_entries: The maximum number of responses kept, or None for no limit
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (response, expires_at), LRU first
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: str, ttl_sec: float = None):
+        expires_at = time.time() + ttl_sec if ttl_sec is not None else None
+        with self._lock:
+            self._entries[key] = (response, expires_at)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteLLMResponseCacheBackend(LLMResponseCacheBackend):
+    """
+    Keeps the responses in a SQLite database, so they are shared across processes and
+    survive across builds
+    """
+
+    def __init__(self, db_path: str, max_entries: int = None):
+        """
+        Args:
+            db_path: The SQLite database file, created if missing
+            max_entries: The maximum number of responses kept, or None for no limit
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL, "
+                "last_access REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS llm_responses_last_access "
+                "ON llm_responses (last_access)"
+            )
+
+    def _connect(self):
+        # One connection per call, as calls come from different threads
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, key: str) -> str:
+        now = time.time()
+        connection = self._connect()
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT response, expires_at FROM llm_responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                response, expires_at = row
+                if expires_at is not None and expires_at <= now:
+                    connection.execute(
+                        "DELETE FROM llm_responses WHERE key = ?", (key,)
+                    )
+                    return None
+                connection.execute(
+                    "UPDATE llm_responses SET last_access = ? WHERE key = ?",
+                    (now, key),
+                )
+                return response
+        finally:
+            connection.close()
+
+    def put(self, key: str, response: str, ttl_sec: float = None):
+        now = time.time()
+        expires_at = now + ttl_sec if ttl_sec is not None else None
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(key, response, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, response, expires_at, now),
+                )
+                connection.execute(
+                    "DELETE FROM llm_responses WHERE expires_at <= ?", (now,)
+                )
+                if self.max_entries is not None:
+                    connection.execute(
+                        "DELETE FROM llm_responses WHERE key IN (SELECT key FROM "
+                        "llm_responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+        finally:
+            connection.close()
+
+    def clear(self):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM llm_responses")
+        finally:
+            connection.close()
+
+
+class RedisLLMResponseCacheBackend(LLMResponseCacheBackend):
+    """
+    Keeps the responses in a Redis compatible server, e.g. Redis, Valkey or a stand-in
+    exposing the same commands, shared by all the processes using it.
+
+    Expiration is left to the server. The last accesses are tracked in a sorted set so
+    the least recently used responses can be evicted past max_entries.
+    """
+
+    def __init__(self, client, prefix: str = "vikit:llm:", max_entries: int = None):
+        """
+        Args:
+            client: A client of the server, e.g. a redis.Redis instance
+            prefix: The prefix of the keys used by the cache
+            max_entries: The maximum number of responses kept, or None for no limit
+        """
+        self.client = client
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self._last_access_key = f"{prefix}last_access"
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisLLMResponseCacheBackend":
+        """
+        Create a backend connected to the server at the given URL, using the redis
+        package which then needs to be installed
+        """
+        import redis  # Only needed when this backend is used
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key: str) -> str:
+        response = self.client.get(self.prefix + key)
+        if response is None:
+            self.client.zrem(self._last_access_key, key)
+            return None
+        self.client.zadd(self._last_access_key, {key: time.time()})
+        return _decode(response)
+
+    def put(self, key: str, response: str, ttl_sec: float = None):
+        self.client.set(
+            self.prefix + key,
+            response,
+            px=int(ttl_sec * 1000) if ttl_sec is not None else None,
+        )
+        self.client.zadd(self._last_access_key, {key: time.time()})
+        if self.max_entries is None:
+            return
+        nb_evicted = self.client.zcard(self._last_access_key) - self.max_entries
+        if nb_evicted > 0:
+            evicted_keys = [
+                _decode(k)
+                for k in self.client.zrange(self._last_access_key, 0, nb_evicted - 1)
+            ]
+            self.client.delete(*(self.prefix + k for k in evicted_keys))
+            self.client.zrem(self._last_access_key, *evicted_keys)
+
+    def clear(self):
+        keys = [_decode(k) for k in self.client.zrange(self._last_access_key, 0, -1)]
+        if keys:
+            self.client.delete(*(self.prefix + k for k in keys))
+        self.client.delete(self._last_access_key)
+
+
+def _decode(value) -> str:
+    # Redis clients give back bytes unless asked to decode responses
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class LLMResponseCache:
+    """
+    Cache of the LLM responses, so that repeated prompts are answered without calling
+    the model again.
+
+    Responses are stored as JSON, tuples being given back as such. The backend calls
+    are blocking, so they run in a thread to keep the event loop free. Cache errors are
+    logged and treated as misses: the cache is just an optimization.
+    """
+
+    def __init__(self, backend: LLMResponseCacheBackend, ttl_sec: float = None):
+        """
+        Args:
+            backend: Where the responses are stored
+            ttl_sec: How long a response stays valid, or None for no expiration
+        """
+        self.backend = backend
+        self.ttl_sec = ttl_sec
+        self.nb_hits = 0
+        self.nb_misses = 0
+
+    async def get_async(self, key: str):
+        """
+        Get a cached response
+
+        Args:
+            key: The response key, see get_llm_response_key
+
+        Returns:
+            The cached response, or None if it is not cached
+        """
+        try:
+            response = await asyncio.to_thread(self.backend.get, key)
+        except Exception as e:
+            logger.warning(f"Could not read LLM response {key} from the cache: {e}")
+            response = None
+
+        if response is None:
+            self.nb_misses += 1
+            logger.debug(f"LLM response cache miss for {key}")
+            return None
+        self.nb_hits += 1
+        logger.debug(f"LLM response cache hit for {key}")
+        response = json.loads(response)
+        return tuple(response) if isinstance(response, list) else response
+
+    async def put_async(self, key: str, response):
+        """
+        Cache a response
+
+        Args:
+            key: The response key, see get_llm_response_key
+            response: The JSON serializable response
+        """
+        try:
+            await asyncio.to_thread(
+                self.backend.put, key, json.dumps(response), self.ttl_sec
+            )
+        except Exception as e:
+            logger.warning(f"Could not write LLM response {key} to the cache: {e}")
+
+
+def llm_cached(model: str, file_args: tuple = (), **generation_config):
+    """
+    Decorator caching the responses of a gateway LLM method in the gateway LLM response
+    cache, keyed by the model, the method, its normalized arguments and the generation
+    config. Put it above the retry decorator so that cached responses skip the call and
+    its retries altogether.
+
+    Args:
+        model: The LLM model called by the method
+        file_args: The dotted names of the arguments holding local file paths, e.g.
+            prompt.image, the files they name being hashed by content. Other strings
+            are taken as texts, even when they happen to name files
+        generation_config: The generation settings of the call, e.g. the temperature
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            llm_response_cache = self.get_llm_response_cache()
+            if llm_response_cache is None:
+                return await func(self, *args, **kwargs)
+
+            call_args = signature.bind(self, *args, **kwargs)
+            call_args.apply_defaults()
+            inputs = dict(list(call_args.arguments.items())[1:])  # Without self
+            # Inputs may hold files to hash, keep the event loop free meanwhile
+            key = await asyncio.to_thread(
+                get_llm_response_key,
+                model=model,
+                method=func.__qualname__,
+                inputs=inputs,
+                generation_config=generation_config,
+                file_args=file_args,
+            )
+
+            response = await llm_response_cache.get_async(key)
+            if response is None:
+                response = await func(self, *args, **kwargs)
+                await llm_response_cache.put_async(key, response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _create_llm_response_cache() -> LLMResponseCache:
+    backend_name = config.get_llm_response_cache_backend()
+    max_entries = config.get_llm_response_cache_max_entries()
+    if backend_name == "memory":
+        backend = InMemoryLLMResponseCacheBackend(max_entries=max_entries)
+    elif backend_name == "sqlite":
+        backend = SQLiteLLMResponseCacheBackend(
+            db_path=config.get_llm_response_cache_sqlite_file(),
+            max_entries=max_entries,
+        )
+    elif backend_name == "redis":
+        backend = RedisLLMResponseCacheBackend.from_url(
+            config.get_llm_response_cache_redis_url(), max_entries=max_entries
+        )
+    else:
+        return None
+    return LLMResponseCache(backend, ttl_sec=config.get_llm_response_cache_ttl_sec())
+
+
+_llm_response_cache = ProcessWideInstance(_create_llm_response_cache)
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """
+    Get the process wide LLM response cache, created on first use from the configuration
+
+    Returns:
+        LLMResponseCache: The LLM response cache, or None if no cache is configured
+    """
+    return _llm_response_cache.get()
+
+
+def set_llm_response_cache(llm_response_cache: LLMResponseCache):
+    """
+    Replace the process wide LLM response cache, e.g. to share one across builds or to
+    disable it with None
+    """
+    _llm_response_cache.set(llm_response_cache)
@@ -0,0 +1,283 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import json
+
+import pysrt
+import pytest
+
+import vikit.gateways.llm_response_cache as llm_response_cache
+from vikit.common.artifact_cache import get_file_hash
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.gateways.fake_ML_models_gateway import FakeMLModelsGateway
+from vikit.gateways.llm_response_cache import (
+    InMemoryLLMResponseCacheBackend,
+    LLMResponseCache,
+    LLMResponseCacheBackend,
+    RedisLLMResponseCacheBackend,
+    SQLiteLLMResponseCacheBackend,
+    get_llm_response_key,
+    llm_cached,
+    normalize_llm_input,
+)
+from vikit.prompt.prompt_build_settings import PromptBuildSettings
+from vikit.prompt.recorded_prompt import RecordedPrompt
+
+
+class _CountingGateway(FakeMLModelsGateway):
+    def __init__(self):
+        super().__init__()
+        self.nb_calls = 0
+
+    @llm_cached(model="test-model", temperature=0)
+    async def get_keywords_from_prompt_async(self, subtitleText, excluded_words=None):
+        self.nb_calls += 1
+        return f"{subtitleText} keywords", "test_title"
+
+
+class _FailingBackend(LLMResponseCacheBackend):
+    def get(self, key):
+        raise OSError("backend down")
+
+    def put(self, key, response, ttl_sec=None):
+        raise OSError("backend down")
+
+    def clear(self):
+        pass
+
+
+class _FakeRedisClient:
+    """
+    Implements the few Redis commands used by the backend, with no expiration
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return value.encode() if value is not None else None
+
+    def set(self, key, value, px=None):
+        self.values[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sorted_sets.pop(key, None)
+
+    def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.sorted_sets.get(key, {}).pop(member, None)
+
+    def zcard(self, key):
+        return len(self.sorted_sets.get(key, {}))
+
+    def zrange(self, key, start, end):
+        members = sorted(self.sorted_sets.get(key, {}).items(), key=lambda m: m[1])
+        end = len(members) if end == -1 else end + 1
+        return [member.encode() for member, _ in members[start:end]]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(llm_response_cache.time, "time", lambda: clock["now"])
+    return clock
+
+
+@pytest.mark.unit
+def test_get_llm_response_key__normalizes_whitespaces():
+    key = get_llm_response_key(
+        "model", "method", {"text": "A stone  in\na forest "}, {"temperature": 0}
+    )
+
+    assert key == get_llm_response_key(
+        "model", "method", {"text": "A stone in a forest"}, {"temperature": 0}
+    )
+    assert key != get_llm_response_key(
+        "other model", "method", {"text": "A stone in a forest"}, {"temperature": 0}
+    )
+    assert key != get_llm_response_key(
+        "model", "method", {"text": "A stone in a forest"}, {"temperature": 1}
+    )
+    assert key != get_llm_response_key(
+        "model", "method", {"text": "A stone in a lake"}, {"temperature": 0}
+    )
+
+
+@pytest.mark.unit
+def test_get_llm_response_key__identical_prompts__same_key():
+    def _create_prompt(text: str):
+        return RecordedPrompt(
+            text=text,
+            subtitles=[pysrt.SubRipItem(index=1, start=0, end=1000, text=text)],
+            build_settings=PromptBuildSettings(),
+        )
+
+    key = get_llm_response_key(
+        "model", "method", {"prompt": _create_prompt("A stone")}, {}
+    )
+
+    assert key == get_llm_response_key(
+        "model", "method", {"prompt": _create_prompt("A stone")}, {}
+    )
+    assert key != get_llm_response_key(
+        "model", "method", {"prompt": _create_prompt("A lake")}, {}
+    )
+    assert "0x" not in json.dumps(normalize_llm_input(_create_prompt("A stone")))
+
+
+@pytest.mark.unit
+def test_get_llm_response_key__hashes_files_by_content():
+    with WorkingFolderContext():
+        for file_name, content in [("a.png", b"img"), ("b.png", b"img")]:
+            with open(file_name, "wb") as f:
+                f.write(content)
+
+        keys = [
+            get_llm_response_key("m", "f", {"image": file}, {}, file_args=("image",))
+            for file in ("a.png", "b.png")
+        ]
+
+        assert keys[0] == keys[1]
+
+
+@pytest.mark.unit
+def test_get_llm_response_key__undeclared_file_args__taken_as_texts():
+    with WorkingFolderContext():
+        with open("stone", "wb") as f:
+            f.write(b"img")
+
+        assert normalize_llm_input({"text": "stone"}) == {"text": "stone"}
+        assert normalize_llm_input(
+            {"prompt": {"text": "stone", "image": "stone"}},
+            file_args=frozenset({"prompt.image"}),
+        ) == {
+            "prompt": {
+                "text": "stone",
+                "image": {"file_sha256": get_file_hash("stone")},
+            }
+        }
+
+
+@pytest.mark.unit
+def test_in_memory_backend__evicts_least_recently_used():
+    backend = InMemoryLLMResponseCacheBackend(max_entries=2)
+    backend.put("a", "1")
+    backend.put("b", "2")
+    backend.get("a")
+    backend.put("c", "3")
+
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+    assert len(backend) == 2
+
+
+@pytest.mark.unit
+def test_in_memory_backend__expired_response__missing(clock):
+    backend = InMemoryLLMResponseCacheBackend()
+    backend.put("a", "1", ttl_sec=10)
+
+    clock["now"] += 9
+    assert backend.get("a") == "1"
+    clock["now"] += 1
+    assert backend.get("a") is None
+
+
+@pytest.mark.unit
+def test_sqlite_backend__persists_expires_and_evicts(clock):
+    with WorkingFolderContext():
+        backend = SQLiteLLMResponseCacheBackend("cache/llm.db", max_entries=2)
+        backend.put("a", "1", ttl_sec=10)
+        clock["now"] += 1
+        backend.put("b", "2")
+        clock["now"] += 1
+        backend.get("a")
+
+        reloaded_backend = SQLiteLLMResponseCacheBackend("cache/llm.db", max_entries=2)
+        clock["now"] += 1
+        reloaded_backend.put("c", "3")
+
+        assert reloaded_backend.get("b") is None
+        assert reloaded_backend.get("c") == "3"
+        assert reloaded_backend.get("a") == "1"
+        clock["now"] += 10
+        assert reloaded_backend.get("a") is None
+
+
+@pytest.mark.unit
+def test_redis_backend__evicts_least_recently_used(clock):
+    client = _FakeRedisClient()
+    backend = RedisLLMResponseCacheBackend(client, max_entries=2)
+    backend.put("a", "1", ttl_sec=10)
+    clock["now"] += 1
+    backend.put("b", "2")
+    clock["now"] += 1
+    backend.get("a")
+    clock["now"] += 1
+    backend.put("c", "3")
+
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+    backend.clear()
+    assert client.values == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_llm_cached__repeated_call__served_from_cache():
+    gateway = _CountingGateway()
+    gateway.llm_response_cache = LLMResponseCache(InMemoryLLMResponseCacheBackend())
+
+    first = await gateway.get_keywords_from_prompt_async("A stone")
+    second = await gateway.get_keywords_from_prompt_async(subtitleText=" A  stone ")
+    await gateway.get_keywords_from_prompt_async("A stone", excluded_words="moss")
+
+    assert first == second == ("A stone keywords", "test_title")
+    assert gateway.nb_calls == 2
+    assert gateway.llm_response_cache.nb_hits == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_llm_cached__no_cache__always_calls(monkeypatch):
+    monkeypatch.setattr(llm_response_cache._llm_response_cache, "instance", None)
+    monkeypatch.delenv("LLM_RESPONSE_CACHE_BACKEND", raising=False)
+    gateway = _CountingGateway()
+
+    await gateway.get_keywords_from_prompt_async("A stone")
+    await gateway.get_keywords_from_prompt_async("A stone")
+
+    assert gateway.nb_calls == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_llm_cached__failing_backend__calls_model():
+    gateway = _CountingGateway()
+    gateway.llm_response_cache = LLMResponseCache(_FailingBackend())
+
+    response = await gateway.get_keywords_from_prompt_async("A stone")
+
+    assert response == ("A stone keywords", "test_title")
+    assert gateway.nb_calls == 1
@@ -0,0 +1,202 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import functools
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from loguru import logger
+
+# Used when a provider throttles us without telling how long to wait
+DEFAULT_RETRY_AFTER_SEC = 10.0
+
+
+class RateLimitError(RuntimeError):
+    """
+    Raised when a provider throttles our calls, e.g. with an HTTP 429 response
+    """
+
+    def __init__(self, message: str, retry_after_sec: float = None):
+        super().__init__(message)
+        self.retry_after_sec = (
+            retry_after_sec if retry_after_sec is not None else DEFAULT_RETRY_AFTER_SEC
+        )
+
+
+def parse_retry_after(retry_after: str) -> float:
+    """
+    Parse the value of a Retry-After HTTP header, either a number of seconds or a date
+
+    Returns:
+        float: The number of seconds to wait, or None if the value cannot be parsed
+    """
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RateLimiterMetrics:
+    """Waiting metrics for the calls to one provider."""
+
+    nb_calls: int = 0
+    nb_rate_limited_calls: int = 0
+    total_wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+
+    @property
+    def average_wait_sec(self) -> float:
+        if self.nb_calls == 0:
+            return 0.0
+        return self.total_wait_sec / self.nb_calls
+
+
+class ProviderRateLimiter:
+    """
+    Limits the calls made to a provider: a token bucket spaces the calls to a given
+    number of requests per second, and a semaphore caps the calls in flight.
+
+    When the provider throttles a call, all the following calls wait for the delay
+    it asked for, instead of each retrying on its own and throttling us further.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_sec: float = None,
+        max_in_flight: int = None,
+        burst: int = 1,
+    ):
+        """
+        Args:
+            name: The provider name, for logging
+            requests_per_sec: The maximum sustained rate of calls, or None for no limit
+            max_in_flight: The maximum number of calls in flight, or None for no limit
+            burst: The number of calls that can be made at once after an idle period
+        """
+        if requests_per_sec is not None and requests_per_sec <= 0:
+            raise ValueError(f"Requests per sec ({requests_per_sec}) must be > 0")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f"Max in flight ({max_in_flight}) must be >= 1")
+        if burst < 1:
+            raise ValueError(f"Burst ({burst}) must be >= 1")
+
+        self.name = name
+        self.requests_per_sec = requests_per_sec
+        self.max_in_flight = max_in_flight
+        self.burst = burst
+        self.metrics = RateLimiterMetrics()
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        # asyncio primitives are bound to the event loop they are first used in
+        self._primitives_by_loop = weakref.WeakKeyDictionary()
+
+    def _get_primitives(self):
+        loop = asyncio.get_running_loop()
+        primitives = self._primitives_by_loop.get(loop)
+        if primitives is None:
+            semaphore = (
+                asyncio.Semaphore(self.max_in_flight) if self.max_in_flight else None
+            )
+            primitives = (semaphore, asyncio.Lock())
+            self._primitives_by_loop[loop] = primitives
+        return primitives
+
+    def pause(self, delay_sec: float):
+        """
+        Hold the calls not started yet for a while, e.g. as asked by a Retry-After header
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + delay_sec)
+        logger.warning(f"Provider {self.name} throttled us, pausing for {delay_sec}s")
+
+    async def _wait_for_turn(self, lock: asyncio.Lock):
+        # Waiters go through the lock one at a time, so they are served in order
+        async with lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self.requests_per_sec is None:
+                    return
+
+                self._tokens = min(
+                    float(self.burst),
+                    self._tokens + (now - self._last_refill) * self.requests_per_sec,
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_sec)
+
+    @asynccontextmanager
+    async def limit(self):
+        """
+        Wait for the call to be allowed, then make it within the context
+
+        Yields:
+            float: How long the call waited for the limiter, in seconds
+        """
+        semaphore, lock = self._get_primitives()
+        queued_at = time.monotonic()
+        if semaphore:
+            await semaphore.acquire()
+        try:
+            await self._wait_for_turn(lock)
+            wait_sec = time.monotonic() - queued_at
+            self.metrics.nb_calls += 1
+            self.metrics.total_wait_sec += wait_sec
+            self.metrics.max_wait_sec = max(self.metrics.max_wait_sec, wait_sec)
+            logger.debug(f"Call to {self.name} waited {wait_sec:.3f}s for the limiter")
+            try:
+                yield wait_sec
+            except RateLimitError as e:
+                self.metrics.nb_rate_limited_calls += 1
+                self.pause(e.retry_after_sec)
+                raise
+        finally:
+            if semaphore:
+                semaphore.release()
+
+
+def rate_limited(provider: str):
+    """
+    Decorator limiting the calls of a gateway method with the gateway rate limiter of a
+    provider. Put it below the retry decorator so that each attempt is limited.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            async with self.get_rate_limiter(provider).limit():
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,105 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import time
+
+import pytest
+
+from vikit.gateways.fake_ML_models_gateway import FakeMLModelsGateway
+from vikit.gateways.rate_limiter import (
+    DEFAULT_RETRY_AFTER_SEC,
+    ProviderRateLimiter,
+    RateLimitError,
+    parse_retry_after,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_limit__spaces_calls_to_requests_per_sec():
+    rate_limiter = ProviderRateLimiter(name="haiper", requests_per_sec=20)
+    start = time.monotonic()
+
+    for _ in range(3):
+        async with rate_limiter.limit():
+            pass
+
+    # The first call uses the burst token, the next two wait 1/20s each
+    assert time.monotonic() - start >= 0.09
+    assert rate_limiter.metrics.nb_calls == 3
+    assert rate_limiter.metrics.max_wait_sec > 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_limit__caps_calls_in_flight():
+    rate_limiter = ProviderRateLimiter(name="runway", max_in_flight=2)
+    nb_in_flight = 0
+    max_nb_in_flight = 0
+
+    async def call():
+        nonlocal nb_in_flight, max_nb_in_flight
+        async with rate_limiter.limit():
+            nb_in_flight += 1
+            max_nb_in_flight = max(max_nb_in_flight, nb_in_flight)
+            await asyncio.sleep(0.01)
+            nb_in_flight -= 1
+
+    await asyncio.gather(*(call() for _ in range(5)))
+
+    assert max_nb_in_flight == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_limit__rate_limit_error__pauses_next_calls():
+    rate_limiter = ProviderRateLimiter(name="stabilityai")
+
+    with pytest.raises(RateLimitError):
+        async with rate_limiter.limit():
+            raise RateLimitError("throttled", retry_after_sec=0.05)
+
+    async with rate_limiter.limit() as wait_sec:
+        pass
+
+    assert wait_sec >= 0.04
+    assert rate_limiter.metrics.nb_rate_limited_calls == 1
+
+
+@pytest.mark.unit
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a delay") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert RateLimitError("throttled").retry_after_sec == DEFAULT_RETRY_AFTER_SEC
+
+
+@pytest.mark.unit
+def test_get_rate_limiter__uses_configured_budgets(monkeypatch):
+    monkeypatch.setenv(
+        "PROVIDER_RATE_LIMITS",
+        '{"haiper": {"requests_per_sec": 0.5, "max_in_flight": 2},'
+        ' "default": {"max_in_flight": 4}}',
+    )
+    gateway = FakeMLModelsGateway()
+
+    assert gateway.get_rate_limiter("haiper").requests_per_sec == 0.5
+    assert gateway.get_rate_limiter("haiper").max_in_flight == 2
+    assert gateway.get_rate_limiter("runway").requests_per_sec is None
+    assert gateway.get_rate_limiter("runway").max_in_flight == 4
+    assert gateway.get_rate_limiter("haiper") is gateway.get_rate_limiter("haiper")
+    assert set(gateway.get_rate_limiter_metrics()) == {"haiper", "runway"}
@@ -24,6 +24,7 @@ from tenacity import after_log, before_log, retry, stop_after_attempt
 
 from vikit.common.config import get_nb_retries_http_calls
 from vikit.common.secrets import get_replicate_api_token
+from vikit.gateways.llm_response_cache import llm_cached
 from vikit.gateways.ML_models_gateway import MLModelsGateway
 from vikit.prompt.prompt_cleaning import cleanse_llm_keywords
 
@@ -203,6 +204,11 @@ class ReplicateGateway(MLModelsGateway):
 
         return result_music_link
 
+    @llm_cached(
+        model="mistralai/mixtral-8x7b-instruct-v0.1",
+        temperature=0.6,
+        max_new_tokens=1024,
+    )
     @retry(
         stop=stop_after_attempt(get_nb_retries_http_calls()),
         reraise=True,
@@ -279,6 +285,9 @@ class ReplicateGateway(MLModelsGateway):
             },
         )
 
+    @llm_cached(
+        model="mistralai/mistral-7b-instruct-v0.2", temperature=0.6, max_new_tokens=32
+    )
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
     async def get_keywords_from_prompt_async(
         self, subtitleText, excluded_words: str = None
@@ -326,6 +335,9 @@ class ReplicateGateway(MLModelsGateway):
         # Transform the list of keywords into a single string, we do keep the final title within
         return clean_result, title_from_keywords_as_tokens
 
+    @llm_cached(
+        model="mistralai/mixtral-8x7b-instruct-v0.1", temperature=0.6, max_new_tokens=24
+    )
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
     async def get_enhanced_prompt_async(self, subtitleText):
         """
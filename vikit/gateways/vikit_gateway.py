@@ -19,7 +19,6 @@ import io
 import json
 import os
 import subprocess
-import time
 import uuid as uid
 from urllib.parse import urlparse
 
@@ -36,14 +35,27 @@ from tenacity import (
 )
 
 import vikit.gateways.elevenlabs_gateway as elevenlabs_gateway
-from vikit.common.config import get_nb_retries_http_calls, get_vikit_backend_url
-from vikit.common.file_tools import download_or_copy_file
+from vikit.common.config import (
+    get_elevenLabs_url,
+    get_max_inline_media_size,
+    get_media_upload_blob_prefix,
+    get_media_upload_bucket,
+    get_media_upload_url_expiration_sec,
+    get_nb_retries_http_calls,
+    get_prompt_enhancement_batch_size,
+    get_vikit_backend_url,
+)
+from vikit.common.file_tools import download_or_copy_file, upload_to_bucket
+from vikit.common.gcs_transfer import get_gcs_transfer_manager
+from vikit.common.http_session import SharedHttpSession
 from vikit.common.secrets import (
     get_replicate_api_token,
     get_vikit_api_token,
     has_eleven_labs_api_key,
 )
-from vikit.gateways.ML_models_gateway import MLModelsGateway
+from vikit.gateways.llm_response_cache import llm_cached
+from vikit.gateways.ML_models_gateway import MLModelsGateway, PromptEnhancement
+from vikit.gateways.rate_limiter import RateLimitError, parse_retry_after, rate_limited
 from vikit.prompt.prompt_cleaning import cleanse_llm_keywords
 from vikit.wrappers.ffmpeg_wrapper import convert_as_mp3_file
 
@@ -55,6 +67,9 @@ http_timeout = aiohttp.ClientTimeout(
 )
 
 mistral_version = "meta/meta-llama-3-70b-instruct"
+xtts_version = "lucataco/xtts-v2:684bc3855b37866c0c65add2ff39c78f3dea3f4ff103a436465326e0f438d55e"
+xtts_speaker = "https://replicate.delivery/pbxt/Jt79w0xsT64R1JsiJ0LQRL8UcWspg5J4RFrU6YwEKpOT1ukS/male.wav"
+xtts_settings = {"language": "en", "cleanup_voice": False}
 
 VALID_AUDIO_EXTENSIONS = [".mp3", ".wav", ".aiff", ".aac", ".ogg", ".flac"]
 VALID_VIDEO_EXTENSIONS = [".mp4", ".mov", ".avi", ".wmv", ".webm"]
@@ -72,6 +87,77 @@ class VikitGateway(MLModelsGateway):
             self.vikit_api_key = vikit_api_key
         else:
             self.vikit_api_key = get_vikit_api_token()
+        # Shared by all the calls to the backend, see close()
+        self.http_session = SharedHttpSession(timeout=http_timeout)
+        # The (bucket, blob) of the media files uploaded to be sent by reference
+        self._uploaded_media_blobs = []
+
+    async def close(self):
+        """
+        Close the HTTP connections kept open for reuse across calls, and delete the
+        media files uploaded to be sent by reference
+        """
+        await self.http_session.close()
+        uploaded_media_blobs, self._uploaded_media_blobs = (
+            self._uploaded_media_blobs,
+            [],
+        )
+        results = await asyncio.gather(
+            *(
+                get_gcs_transfer_manager().delete_async(bucket_name, blob_name)
+                for bucket_name, blob_name in uploaded_media_blobs
+            ),
+            return_exceptions=True,
+        )
+        for (bucket_name, blob_name), result in zip(uploaded_media_blobs, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Could not delete uploaded media gs://{bucket_name}/{blob_name}: "
+                    f"{result}"
+                )
+
+    async def get_media_reference_async(self, media: str, valid_extensions) -> str:
+        """
+        Upload a local media file too big to be sent inline, so that requests carry a
+        reference to it instead of the whole file encoded in base64. The file is
+        streamed to the upload bucket rather than read into memory, and deleted when
+        the gateway is closed.
+
+        Args:
+            media: A local file path, a URL or base64 encoded data
+            valid_extensions: The file extensions of the expected kind of media
+
+        Returns:
+            A signed URL of the uploaded file, so the bucket does not need to be
+            public, or the media unchanged if it is not a local file, is small enough
+            or no upload bucket is configured
+        """
+        if (
+            not media
+            or urlparse(media).scheme
+            or os.path.splitext(media)[1].lower() not in valid_extensions
+            or not os.path.isfile(media)
+        ):
+            return media
+
+        bucket_name = get_media_upload_bucket()
+        if not bucket_name or os.path.getsize(media) <= get_max_inline_media_size():
+            return media
+
+        logger.debug(f"Uploading {media} to be sent by reference")
+        blob_prefix = get_media_upload_blob_prefix()
+        file_name = f"{uid.uuid4()}{os.path.splitext(media)[1].lower()}"
+        await upload_to_bucket(
+            source_file_name=media,
+            destination_blob=blob_prefix,
+            destination_file_name=file_name,
+            bucket_name=bucket_name,
+        )
+        blob_name = f"{blob_prefix}/{file_name}"
+        self._uploaded_media_blobs.append((bucket_name, blob_name))
+        return await get_gcs_transfer_manager().get_signed_url_async(
+            bucket_name, blob_name, get_media_upload_url_expiration_sec()
+        )
 
     def get_sendable_image(self, image, aspect_ratio):
         image_prompt = image
@@ -134,35 +220,56 @@ class VikitGateway(MLModelsGateway):
             - None
         """
         await elevenlabs_gateway.generate_mp3_from_text_async(
-            text=prompt_text, target_file=target_file
+            text=prompt_text,
+            target_file=target_file,
+            http_session=self.http_session.get(),
         )
         assert os.path.exists(target_file), (
             f"The generated audio file does not exists: {target_file}"
         )
 
+    def get_tts_settings(self) -> dict:
+        """
+        Get the voice, the model and the settings used to read texts aloud, either
+        ElevenLabs when an API key is available or XTTS through the backend
+        """
+        if has_eleven_labs_api_key():
+            return {
+                "provider": "elevenlabs",
+                "voice": get_elevenLabs_url(),  # The URL holds the voice id
+                "model": elevenlabs_gateway.ELEVEN_LABS_MODEL_ID,
+                "settings": elevenlabs_gateway.ELEVEN_LABS_VOICE_SETTINGS,
+            }
+        return {
+            "provider": "xtts",
+            "voice": xtts_speaker,
+            "model": xtts_version,
+            "settings": xtts_settings,
+        }
+
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
     async def generate_mp3_from_text_async(
         self,
         prompt_text: str,
         target_file: str,
     ):
-        tempUuid = str(uid.uuid4())
+        # Keep the intermediate file next to the target file, in the build workspace
+        temp_file = f"{os.path.splitext(target_file)[0]}_{uid.uuid4()}.wav"
         if has_eleven_labs_api_key():
             await self.generate_mp3_from_text_async_elevenlabs(
                 prompt_text,
                 target_file,
             )
         else:
-            async with aiohttp.ClientSession(timeout=http_timeout) as session:
+            async with self.http_session.session() as session:
                 payload = (
                     {
                         "key": self.vikit_api_key,
-                        "model": "lucataco/xtts-v2:684bc3855b37866c0c65add2ff39c78f3dea3f4ff103a436465326e0f438d55e",
+                        "model": xtts_version,
                         "input": {
                             "text": prompt_text,
-                            "speaker": "https://replicate.delivery/pbxt/Jt79w0xsT64R1JsiJ0LQRL8UcWspg5J4RFrU6YwEKpOT1ukS/male.wav",
-                            "language": "en",
-                            "cleanup_voice": False,
+                            "speaker": xtts_speaker,
+                            **xtts_settings,
                         },
                     },
                 )
@@ -174,9 +281,11 @@ class VikitGateway(MLModelsGateway):
                     if not response.startswith("http"):
                         raise AttributeError("The result audio link is not a link")
                     await download_or_copy_file(
-                        url=response, local_path="temp" + tempUuid + ".wav"
+                        url=response,
+                        local_path=temp_file,
+                        http_session=session,
                     )
-            await convert_as_mp3_file("temp" + tempUuid + ".wav", target_file)
+            await convert_as_mp3_file(temp_file, target_file)
             return response
 
     async def generate_background_music_async(
@@ -211,7 +320,9 @@ class VikitGateway(MLModelsGateway):
 
         logger.debug("Downloading the generated music")
         gen_music_file_path = await download_or_copy_file(
-            url=output_music_link, local_path=prompt_based_music_file_name
+            url=output_music_link,
+            local_path=prompt_based_music_file_name,
+            http_session=self.http_session.get(),
         )
 
         lowered_music_filename = f"lowered_{prompt_based_music_file_name}"
@@ -237,6 +348,7 @@ class VikitGateway(MLModelsGateway):
 
         return lowered_music_filename
 
+    @rate_limited("seine")
     async def generate_seine_transition_async(
         self, source_image_path, target_image_path
     ):
@@ -292,7 +404,7 @@ class VikitGateway(MLModelsGateway):
                 reraise=True,
             ):
                 with attempt:
-                    async with aiohttp.ClientSession(timeout=http_timeout) as session:
+                    async with self.http_session.session() as session:
                         payload = (
                             {
                                 "key": self.vikit_api_key,
@@ -312,7 +424,7 @@ class VikitGateway(MLModelsGateway):
                         ) as response:
                             await _handle_backend_errors(response)
                             response = await response.text()
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     if not response.startswith("http"):
                         raise AttributeError(
                             "The result SEINE transition link is not a link"
@@ -328,6 +440,7 @@ class VikitGateway(MLModelsGateway):
         before=before_log(logger, logger.level("TRACE").no),
         after=after_log(logger, logger.level("TRACE").no),
     )
+    @rate_limited("music")
     async def compose_music_from_text_async(self, prompt_text: str, duration: int):
         """
         Compose a music for a prompt text
@@ -347,7 +460,7 @@ class VikitGateway(MLModelsGateway):
         if len(prompt_text) < 1:
             raise AttributeError("The input prompt text is empty")
 
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = {
                 "key": self.vikit_api_key,
                 "model": "meta/musicgen:b05b1dff1d8c6dc63d14b0cdb42135378dcb87f6373b0d3d341ede46e59e2b38",
@@ -388,6 +501,7 @@ class VikitGateway(MLModelsGateway):
 
         return result_music_link
 
+    @llm_cached(model=mistral_version, temperature=0.6, max_tokens=512)
     @retry(
         stop=stop_after_attempt(get_nb_retries_http_calls()),
         reraise=True,
@@ -411,7 +525,7 @@ class VikitGateway(MLModelsGateway):
         if text is None:
             text = "finally there is no prompt so just unleash your own imagination"
 
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = {
                 "key": self.vikit_api_key,
                 "model": mistral_version,
@@ -449,6 +563,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         before=before_log(logger, logger.level("DEBUG").no),
         after=after_log(logger, logger.level("DEBUG").no),
     )
+    @rate_limited("interpolation")
     async def interpolate_async(self, video):
         """
         Run some interpolation magic. This model may fail after timeout, so you
@@ -465,6 +580,8 @@ interesting the resulting music will be. Here is your prompt: '"""
 
         logger.debug(f"Video to interpolate {video[:50]}")
 
+        video = await self.get_media_reference_async(video, VALID_VIDEO_EXTENSIONS)
+
         if (
             not video.startswith("http")
             and video.split(".") is not None
@@ -483,7 +600,7 @@ interesting the resulting music will be. Here is your prompt: '"""
             # Result is already a base64
             video_data = video
 
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = (
                 {
                     "key": self.vikit_api_key,
@@ -512,6 +629,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         logger.debug(f"Interpolated video link: {output}")
         return output
 
+    @llm_cached(model=mistral_version, temperature=0.6, max_tokens=512)
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
     async def get_keywords_from_prompt_async(
         self, subtitleText, excluded_words: str = None
@@ -528,7 +646,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         """
         assert subtitleText is not None
 
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = (
                 {
                     "key": self.vikit_api_key,
@@ -573,6 +691,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         # Transform the list of keywords into a single string, we do keep the final title within
         return clean_result, title_from_keywords_as_tokens
 
+    @llm_cached(model=mistral_version, temperature=0.6, max_tokens=512)
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
     async def get_enhanced_prompt_async(self, subtitleText):
         """
@@ -586,7 +705,7 @@ interesting the resulting music will be. Here is your prompt: '"""
             A prompt enhanced by an LLM
         """
 
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = {
                 "key": self.vikit_api_key,
                 "model": mistral_version,
@@ -619,6 +738,87 @@ interesting the resulting music will be. Here is your prompt: '"""
         # Transform the list of keywords into a single string, we do keep the final title within
         return clean_result, title_from_keywords_as_tokens
 
+    async def get_prompt_enhancements_async(
+        self, subtitle_texts: list[str]
+    ) -> list[PromptEnhancement]:
+        """
+        Get the keywords and the enhanced prompt of many subtitle texts at once, asking
+        the LLM for the enhancements of several texts per request. Requests are sent
+        concurrently, each covering at most PROMPT_ENHANCEMENT_BATCH_SIZE texts.
+
+        Args:
+            subtitle_texts: The subtitle texts to enhance
+
+        Returns:
+            The enhancements, in the order of the subtitle texts
+        """
+        batch_size = get_prompt_enhancement_batch_size()
+        batches = [
+            subtitle_texts[i : i + batch_size]
+            for i in range(0, len(subtitle_texts), batch_size)
+        ]
+        batch_enhancements = await asyncio.gather(
+            *(self._get_prompt_enhancements_batch_async(batch) for batch in batches)
+        )
+        return [
+            enhancement
+            for enhancements in batch_enhancements
+            for enhancement in enhancements
+        ]
+
+    async def _get_prompt_enhancements_batch_async(
+        self, subtitle_texts: list[str]
+    ) -> list[PromptEnhancement]:
+        try:
+            llm_output = await self._request_prompt_enhancements_async(subtitle_texts)
+            return _parse_prompt_enhancements(llm_output, len(subtitle_texts))
+        except ValueError as e:
+            # The LLM did not follow the expected format, enhance each text on its own
+            logger.warning(
+                f"Could not batch the enhancement of {len(subtitle_texts)} subtitles, "
+                f"falling back to one request per subtitle: {e}"
+            )
+            return await super().get_prompt_enhancements_async(subtitle_texts)
+
+    @llm_cached(model=mistral_version, temperature=0.6)
+    @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    async def _request_prompt_enhancements_async(self, subtitle_texts: list[str]):
+        numbered_texts = "\n".join(
+            f"{i + 1}. '{text}'" for i, text in enumerate(subtitle_texts)
+        )
+        async with self.http_session.session() as session:
+            payload = {
+                "key": self.vikit_api_key,
+                "model": mistral_version,
+                "input": {
+                    "top_k": 50,
+                    "top_p": 0.9,
+                    "prompt": "I want you to act as a prompt creator for Midjourney's artificial intelligence program. For each of the numbered sentences below, "
+                    + "provide two things that will inspire unique and interesting videos from the AI. First, english keywords separated by a coma, detailed "
+                    + "and creative, not repeated and using no more than 100 characters. The last keyword should be a summary of all the other keywords so I "
+                    + "can generate a file name out of it, limited to three words joined by the underscore character, using only standard alphanumerical "
+                    + "characters. Second, one detailed and creative english sentence of no more than 100 characters describing a scenario for a video, "
+                    + "without speaking about anything related to text. Keep in mind that the AI is capable of understanding a wide range of language and "
+                    + "can interpret abstract concepts, so feel free to be as imaginative and descriptive as possible. Here are the sentences:\n"
+                    + numbered_texts
+                    + "\nAnswer with a JSON array only, no introduction, holding exactly one object per sentence, in the same order, each object matching "
+                    + 'this format: {"keywords": "KEYWORD1, KEYWORD2, etc", "prompt": "SENTENCE"}',
+                    "max_tokens": 256 * len(subtitle_texts),
+                    "min_tokens": 0,
+                    "temperature": 0.6,
+                    "system_prompt": "You are a helpful assistant",
+                    "length_penalty": 1,
+                    "stop_sequences": "<|end_of_text|>,<|eot_id|>",
+                    "prompt_template": "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\nYou are a helpful assistant<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n",
+                    "presence_penalty": 1.15,
+                    "log_performance_metrics": False,
+                },
+            }
+
+            async with session.post(vikit_backend_url, json=payload) as response:
+                await _handle_backend_errors(response)
+                return await response.text()
+
     async def get_subtitles_async(self, audiofile_path):
         # Obtain subtitles using Replicate API
         """
@@ -644,7 +844,7 @@ interesting the resulting music will be. Here is your prompt: '"""
                     base64AudioFile = base64.b64encode(
                         open(audiofile_path, "rb").read()
                     ).decode("ascii")
-                    async with aiohttp.ClientSession(timeout=http_timeout) as session:
+                    async with self.http_session.session() as session:
                         payload = (
                             {
                                 "key": self.vikit_api_key,
@@ -722,6 +922,7 @@ interesting the resulting music will be. Here is your prompt: '"""
             raise ValueError(f"Unknown model provider: {model_provider}")
 
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    @rate_limited("stabilityai")
     async def generate_video_stabilityai_async(self, prompt, aspect_ratio):
         """
         Generate a video from the given prompt
@@ -734,7 +935,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         """
         logger.debug(f"Generating image from prompt: {prompt.text[:50]}")
         ratio = str(aspect_ratio[0]) + ":" + str(aspect_ratio[1])
-        async with aiohttp.ClientSession() as session:
+        async with self.http_session.session() as session:
             payload = (
                 {
                     "key": self.vikit_api_key,
@@ -774,6 +975,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         stop=stop_after_attempt(get_nb_retries_http_calls()),
         reraise=True,
     )
+    @rate_limited("haiper")
     async def generate_video_haiper_async(self, prompt, aspect_ratio):
         """
         Generate a video from the given prompt
@@ -793,7 +995,7 @@ interesting the resulting music will be. Here is your prompt: '"""
             if prompt.duration:
                 duration = prompt.duration
 
-            async with aiohttp.ClientSession(timeout=http_timeout) as session:
+            async with self.http_session.session() as session:
                 payload = {
                     "key": self.vikit_api_key,
                     "model": "haiper_text2video",
@@ -845,6 +1047,7 @@ interesting the resulting music will be. Here is your prompt: '"""
             raise
 
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    @rate_limited("videocrafter")
     async def generate_video_VideoCrafter2_async(self, prompt):
         """
         Generate a video from the given prompt
@@ -857,7 +1060,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         """
         logger.debug(f"Generating video from prompt: {prompt.text}")
 
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = {
                 "key": self.vikit_api_key,
                 "model": "cjwbw/videocrafter:02edcff3e9d2d11dcc27e530773d988df25462b1ee93ed0257b6f246de4797c8",
@@ -882,6 +1085,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         return output
 
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    @rate_limited("dynamicrafter")
     async def generate_video_DynamiCrafter_image_async(self, prompt):
         """
         Generate a video from the given prompt
@@ -893,7 +1097,7 @@ interesting the resulting music will be. Here is your prompt: '"""
                 The link to the generated video
         """
         logger.debug(f"Generating video from prompt: {prompt.text[:50]}")
-        async with aiohttp.ClientSession(timeout=http_timeout) as session:
+        async with self.http_session.session() as session:
             payload = {
                 "key": self.vikit_api_key,
                 "model": "camenduru/dynami-crafter-576x1024:e79ff8d01e81cbd90acfa1df4f209f637da2c68307891d77a6e4227f4ec350f1",
@@ -916,6 +1120,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         return output
 
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    @rate_limited("stabilityai_image")
     async def generate_video_from_image_stabilityai_async(self, prompt, aspect_ratio):
         """
         Generate a video from the given image prompt
@@ -930,7 +1135,7 @@ interesting the resulting music will be. Here is your prompt: '"""
         # TO DO: include camera motion parameters
         output_vid_file_name = f"outputvid-{uid.uuid4()}.mp4"
         logger.debug(f"Generating video from image prompt {prompt.text} ")
-        async with aiohttp.ClientSession() as session:
+        async with self.http_session.session() as session:
             logger.debug("Resizing image for video generator")
 
             # Convert result to Base64
@@ -962,7 +1167,7 @@ interesting the resulting music will be. Here is your prompt: '"""
 
             logger.debug("Generating video from image")
             # Ask for a video
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session.session() as session:
                 payload = (
                     {
                         "key": self.vikit_api_key,
@@ -984,6 +1189,7 @@ interesting the resulting music will be. Here is your prompt: '"""
                     return output_vid_file_name
 
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    @rate_limited("runway")
     async def generate_video_from_image_and_text_runway(
         self, prompt, aspect_ratio=(16, 9)
     ):
@@ -1035,7 +1241,7 @@ interesting the resulting music will be. Here is your prompt: '"""
                 duration = prompt.duration
 
             # Ask for a video
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session.session() as session:
                 payload = (
                     {
                         "key": self.vikit_api_key,
@@ -1098,7 +1304,14 @@ interesting the resulting music will be. Here is your prompt: '"""
             part["inlineData"] = {"mimeType": mimetype, "data": base64_data}
         return part
 
+    @llm_cached(
+        model="gemini",
+        file_args=("prompt.image", "prompt.audio", "prompt.video"),
+        temperature=0,
+        max_output_tokens=8192,
+    )
     @retry(stop=stop_after_attempt(get_nb_retries_http_calls()), reraise=True)
+    @rate_limited("gemini")
     async def ask_gemini(
         self, prompt, gemini_version="gemini-1.5-pro-002", more_contents=None
     ):
@@ -1146,22 +1359,34 @@ interesting the resulting music will be. Here is your prompt: '"""
             part["text"] = prompt.text
             parts_array.append(part)
 
-        image_part = self.add_part_gemini(prompt.image, "image", VALID_IMAGE_EXTENSIONS)
+        image_part = self.add_part_gemini(
+            await self.get_media_reference_async(prompt.image, VALID_IMAGE_EXTENSIONS),
+            "image",
+            VALID_IMAGE_EXTENSIONS,
+        )
         if image_part:
             parts_array.append(image_part)
 
-        audio_part = self.add_part_gemini(prompt.audio, "audio", VALID_AUDIO_EXTENSIONS)
+        audio_part = self.add_part_gemini(
+            await self.get_media_reference_async(prompt.audio, VALID_AUDIO_EXTENSIONS),
+            "audio",
+            VALID_AUDIO_EXTENSIONS,
+        )
         if audio_part:
             parts_array.append(audio_part)
 
-        video_part = self.add_part_gemini(prompt.video, "video", VALID_VIDEO_EXTENSIONS)
+        video_part = self.add_part_gemini(
+            await self.get_media_reference_async(prompt.video, VALID_VIDEO_EXTENSIONS),
+            "video",
+            VALID_VIDEO_EXTENSIONS,
+        )
         if video_part:
             parts_array.append(video_part)
 
         output = ""
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_session.session() as session:
                 contents_array = [{"role": "USER", "parts": parts_array}]
 
                 if more_contents is not None:
@@ -1193,6 +1418,12 @@ interesting the resulting music will be. Here is your prompt: '"""
 
 
 async def _handle_backend_errors(response):
+    if response.status == 429:
+        raise RateLimitError(
+            "The Vikit API throttled our calls (429). " + await response.text(),
+            retry_after_sec=parse_retry_after(response.headers.get("Retry-After")),
+        )
+
     if response.status == 403:
         raise PermissionError(
             "Access to the Vikit API was forbidden (403). " + await response.text()
@@ -1202,3 +1433,58 @@ async def _handle_backend_errors(response):
         raise RuntimeError(
             f"We failed to connect to Vikit API. Returned Error: {response.status}, {response.reason}"
         )
+
+
+def _parse_prompt_enhancements(
+    llm_output: str, nb_texts: int
+) -> list[PromptEnhancement]:
+    """
+    Parse the JSON array of enhancements answered by the LLM for a batch of texts
+
+    Args:
+        llm_output: The LLM answer, either as text or as a JSON list of tokens
+        nb_texts: The number of texts in the batch
+
+    Returns:
+        The enhancements, in the order of the texts
+
+    Raises:
+        ValueError: If the answer does not hold exactly one valid enhancement per text
+    """
+    try:
+        answer = json.loads(llm_output)
+    except ValueError:
+        answer = llm_output
+    if isinstance(answer, list) and all(isinstance(token, str) for token in answer):
+        answer = "".join(answer)
+
+    if isinstance(answer, str):
+        # Skip any introduction or conclusion the LLM added around the array
+        start, end = answer.find("["), answer.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("No JSON array found in the LLM answer")
+        items = json.loads(answer[start : end + 1])
+    else:
+        items = answer
+    if not isinstance(items, list) or len(items) != nb_texts:
+        raise ValueError(
+            f"Expected {nb_texts} enhancements, got "
+            f"{len(items) if isinstance(items, list) else type(items).__name__}"
+        )
+
+    enhancements = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid enhancement: {item}")
+        keywords = cleanse_llm_keywords(str(item.get("keywords") or ""))
+        enhanced_prompt = cleanse_llm_keywords(str(item.get("prompt") or ""))
+        if not keywords.split() or not enhanced_prompt.split():
+            raise ValueError(f"Incomplete enhancement: {item}")
+        enhancements.append(
+            PromptEnhancement(
+                keywords=keywords,
+                enhanced_prompt=enhanced_prompt,
+                title=keywords.split()[-1],
+            )
+        )
+    return enhancements
@@ -0,0 +1,230 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import json
+
+import pytest
+
+import vikit.common.gcs_transfer as gcs_transfer
+import vikit.gateways.vikit_gateway as vikit_gateway
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.gateways.ML_models_gateway import PromptEnhancement
+from vikit.gateways.vikit_gateway import VALID_VIDEO_EXTENSIONS, VikitGateway
+
+
+class _FakeGCSTransferManager:
+    def __init__(self):
+        self.deleted_blobs = []
+
+    async def get_signed_url_async(self, bucket_name, blob_name, expiration_sec):
+        return f"https://signed.example.com/{bucket_name}/{blob_name}?expires=1"
+
+    async def delete_async(self, bucket_name, blob_name):
+        self.deleted_blobs.append(f"gs://{bucket_name}/{blob_name}")
+
+
+@pytest.fixture
+def gcs_transfer_manager(monkeypatch):
+    gcs_transfer_manager = _FakeGCSTransferManager()
+    monkeypatch.setattr(
+        gcs_transfer._gcs_transfer_manager, "instance", gcs_transfer_manager
+    )
+    return gcs_transfer_manager
+
+
+@pytest.fixture
+def uploads(monkeypatch, gcs_transfer_manager):
+    uploads = []
+
+    async def fake_upload_to_bucket(
+        source_file_name, destination_blob, destination_file_name, bucket_name
+    ):
+        uploads.append(source_file_name)
+        return f"gs://{bucket_name}/{destination_blob}/{destination_file_name}"
+
+    monkeypatch.setattr(vikit_gateway, "upload_to_bucket", fake_upload_to_bucket)
+    monkeypatch.setenv("MEDIA_UPLOAD_BUCKET", "test-bucket")
+    monkeypatch.setenv("MAX_INLINE_MEDIA_SIZE", "10")
+    return uploads
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_media_reference__big_local_file__uploaded_and_signed(uploads):
+    with WorkingFolderContext():
+        with open("video.mp4", "wb") as f:
+            f.write(b"more than ten bytes")
+
+        reference = await VikitGateway(
+            vikit_api_key="test"
+        ).get_media_reference_async("video.mp4", VALID_VIDEO_EXTENSIONS)
+
+    assert uploads == ["video.mp4"]
+    assert reference.startswith("https://signed.example.com/test-bucket/uploads/")
+    assert reference.endswith(".mp4?expires=1")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_close__uploaded_media_deleted(uploads, gcs_transfer_manager):
+    with WorkingFolderContext():
+        with open("video.mp4", "wb") as f:
+            f.write(b"more than ten bytes")
+
+        async with VikitGateway(vikit_api_key="test") as gateway:
+            await gateway.get_media_reference_async("video.mp4", VALID_VIDEO_EXTENSIONS)
+            await gateway.get_media_reference_async("video.mp4", VALID_VIDEO_EXTENSIONS)
+            assert gcs_transfer_manager.deleted_blobs == []
+
+    assert len(gcs_transfer_manager.deleted_blobs) == 2
+    assert all(
+        blob.startswith("gs://test-bucket/uploads/")
+        for blob in gcs_transfer_manager.deleted_blobs
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "media, content",
+    [
+        ("small.mp4", b"tiny"),
+        ("https://example.com/video.mp4", None),
+        ("aGVsbG8gd29ybGQgaGVsbG8gd29ybGQ=", None),
+    ],
+)
+async def test_get_media_reference__sent_inline(uploads, media, content):
+    with WorkingFolderContext():
+        if content:
+            with open(media, "wb") as f:
+                f.write(content)
+
+        reference = await VikitGateway(
+            vikit_api_key="test"
+        ).get_media_reference_async(media, VALID_VIDEO_EXTENSIONS)
+
+    assert uploads == []
+    assert reference == media
+
+
+@pytest.mark.unit
+def test_parse_prompt_enhancements__tokens_around_json_array():
+    llm_output = json.dumps(
+        [
+            "Here you go: [",
+            '{"keywords": "moss, stones, forest_stones", "prompt": "Stones in moss"},',
+            '{"keywords": "train, boy, boy_train", "prompt": "A boy on a train."}',
+            "] Enjoy!",
+        ]
+    )
+
+    enhancements = vikit_gateway._parse_prompt_enhancements(llm_output, nb_texts=2)
+
+    assert enhancements == [
+        PromptEnhancement(
+            keywords="moss stones forest_stones",
+            enhanced_prompt="Stones in moss",
+            title="forest_stones",
+        ),
+        PromptEnhancement(
+            keywords="train boy boy_train",
+            enhanced_prompt="A boy on a train",
+            title="boy_train",
+        ),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "llm_output",
+    [
+        "no array at all",
+        '[{"keywords": "moss, forest_stones", "prompt": "Stones in moss"}]',
+        '[{"keywords": "moss", "prompt": "Stones"}, {"keywords": "", "prompt": "x"}]',
+    ],
+)
+def test_parse_prompt_enhancements__invalid_answer__fails(llm_output):
+    with pytest.raises(ValueError):
+        vikit_gateway._parse_prompt_enhancements(llm_output, nb_texts=2)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_prompt_enhancements__batched_in_order(monkeypatch):
+    monkeypatch.setenv("PROMPT_ENHANCEMENT_BATCH_SIZE", "2")
+    requested_batches = []
+
+    async def fake_request(self, subtitle_texts):
+        requested_batches.append(subtitle_texts)
+        return json.dumps(
+            [
+                {"keywords": f"{text}, {text}_title", "prompt": f"{text} scenario"}
+                for text in subtitle_texts
+            ]
+        )
+
+    monkeypatch.setattr(
+        VikitGateway, "_request_prompt_enhancements_async", fake_request
+    )
+
+    enhancements = await VikitGateway(
+        vikit_api_key="test"
+    ).get_prompt_enhancements_async(["one", "two", "three"])
+
+    assert requested_batches == [["one", "two"], ["three"]]
+    assert [e.enhanced_prompt for e in enhancements] == [
+        "one scenario",
+        "two scenario",
+        "three scenario",
+    ]
+    assert [e.title for e in enhancements] == ["one_title", "two_title", "three_title"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_prompt_enhancements__invalid_answer__one_request_per_text(
+    monkeypatch,
+):
+    async def fake_request(self, subtitle_texts):
+        return "Sorry, I cannot answer in JSON"
+
+    async def fake_get_keywords(self, subtitleText, excluded_words=None):
+        return f"{subtitleText} keywords", f"{subtitleText}_title"
+
+    async def fake_get_enhanced_prompt(self, subtitleText):
+        return f"{subtitleText} scenario", f"{subtitleText}_title"
+
+    monkeypatch.setattr(
+        VikitGateway, "_request_prompt_enhancements_async", fake_request
+    )
+    monkeypatch.setattr(
+        VikitGateway, "get_keywords_from_prompt_async", fake_get_keywords
+    )
+    monkeypatch.setattr(
+        VikitGateway, "get_enhanced_prompt_async", fake_get_enhanced_prompt
+    )
+
+    enhancements = await VikitGateway(
+        vikit_api_key="test"
+    ).get_prompt_enhancements_async(["one", "two"])
+
+    assert enhancements == [
+        PromptEnhancement(
+            keywords="one keywords", enhanced_prompt="one scenario", title="one_title"
+        ),
+        PromptEnhancement(
+            keywords="two keywords", enhanced_prompt="two scenario", title="two_title"
+        ),
+    ]
@@ -8,6 +8,7 @@ from moviepy.editor import CompositeVideoClip, ImageClip, VideoFileClip
 from vikit.common.file_tools import get_canonical_name
 from vikit.common.video_tools import write_videofile
 from vikit.postprocessing.logo.model import LogoConfig
+from vikit.postprocessing.render_executor import get_render_executor
 
 MINIMUM_RESOLUTION_THRESHOLD = 720
 
@@ -27,6 +28,13 @@ class VideoLogoOverlayer:
         self.opacity = logo_config.opacity
 
     async def overlay_logo(self):
+        """
+        Overlay the logo on the video in a worker process of the render executor, so
+        that other builds keep running meanwhile. Cancelling the call stops the render.
+        """
+        await get_render_executor().run(self._overlay_logo)
+
+    def _overlay_logo(self, progress_logger=None):
         if not os.path.exists(self.video_path):
             raise FileNotFoundError(f"Video file not found: {self.video_path}")
         if not os.path.exists(self.logo_path):
@@ -86,4 +94,9 @@ class VideoLogoOverlayer:
         logo = logo.set_duration(video.duration)
 
         final_video = CompositeVideoClip([video, logo])
-        write_videofile(final_video, self.output_path, fps=video.fps)
+        write_videofile(
+            final_video,
+            self.output_path,
+            fps=video.fps,
+            progress_logger=progress_logger,
+        )
@@ -0,0 +1,171 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from loguru import logger
+from proglog import ProgressBarLogger
+
+import vikit.common.config as config
+from vikit.common.process_wide import ProcessWideInstance
+
+
+class RenderCancelledError(Exception):
+    """Raised in a render process when the render it runs has been cancelled"""
+
+
+class CancellableProgressLogger(ProgressBarLogger):
+    """
+    A moviepy progress logger aborting the render it reports on as soon as a
+    cancellation flag file exists, so a render already running in a worker process can
+    be stopped without killing the process
+    """
+
+    def __init__(self, cancel_flag_path: str):
+        super().__init__()
+        self.cancel_flag_path = cancel_flag_path
+
+    def is_cancelled(self) -> bool:
+        return os.path.exists(self.cancel_flag_path)
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if self.is_cancelled():
+            raise RenderCancelledError(f"Render cancelled while writing {bar}")
+
+
+def _run_render(fn, cancel_flag_path: str, cwd: str, args: tuple, kwargs: dict):
+    # Runs in the worker process, which keeps the working directory it was started
+    # in: relative paths must be resolved from the one of the caller instead
+    progress_logger = CancellableProgressLogger(cancel_flag_path)
+    if progress_logger.is_cancelled():
+        raise RenderCancelledError("Render cancelled before it started")
+    os.chdir(cwd)
+    return fn(*args, progress_logger=progress_logger, **kwargs)
+
+
+class RenderExecutor:
+    """
+    Runs moviepy based renders (subtitles, text overlays, logos) in a pool of worker
+    processes, so that compositing and encoding frames in Python does not block the
+    event loop, nor the other builds running in the same process.
+
+    The render functions and their arguments are pickled to the worker processes, and
+    must accept a progress_logger keyword argument that is passed down to moviepy:
+    cancelling the awaiting task drops a queued render, and stops a running one at the
+    next frame written. Renders run in the working directory of their caller at the
+    time they are submitted, so relative paths work as in the caller.
+    """
+
+    def __init__(self, max_workers: int = None):
+        """
+        Args:
+            max_workers: The maximum number of renders running at once, defaults to
+                half the number of cores
+        """
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) // 2)
+        if self.max_workers < 1:
+            raise ValueError(f"Max render workers ({self.max_workers}) must be >= 1")
+
+        self._executor = None
+        self._cancel_flags_dir = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process running an event loop and thread pools is unsafe, so
+            # workers start from a fresh interpreter
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._cancel_flags_dir = tempfile.mkdtemp(prefix="vikit_render_")
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a render in a worker process once one is available
+
+        Args:
+            fn: The picklable render function, e.g. a module level function or a
+                method of a picklable object
+            args: The positional arguments of the render function
+            kwargs: The keyword arguments of the render function
+
+        Returns:
+            The value returned by the render function
+        """
+        executor = self.executor
+        cancel_flag_path = os.path.join(self._cancel_flags_dir, uuid.uuid4().hex)
+        future = executor.submit(
+            _run_render, fn, cancel_flag_path, os.getcwd(), args, kwargs
+        )
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Only a queued render is cancelled by the future, tell a running one to
+            # stop and wait for its worker to be free again
+            if not future.cancel():
+                logger.debug(f"Stopping the running render {fn}")
+                with open(cancel_flag_path, "w"):
+                    pass
+                future.add_done_callback(lambda _: _remove_file(cancel_flag_path))
+            raise
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes, cancelling the renders not started yet
+
+        Args:
+            wait: Whether to wait for the running renders to finish
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            shutil.rmtree(self._cancel_flags_dir, ignore_errors=True)
+            self._cancel_flags_dir = None
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _create_render_executor() -> RenderExecutor:
+    return RenderExecutor(max_workers=config.get_max_render_workers())
+
+
+_render_executor = ProcessWideInstance(_create_render_executor)
+
+
+def get_render_executor() -> RenderExecutor:
+    """
+    Get the process wide render executor, created on first use from the configuration
+    """
+    return _render_executor.get()
+
+
+def set_render_executor(render_executor: RenderExecutor):
+    """
+    Replace the process wide render executor, e.g. to change the number of workers
+    """
+    _render_executor.set(render_executor)
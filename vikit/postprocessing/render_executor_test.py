@@ -0,0 +1,174 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import os
+import time
+
+import pytest
+
+import vikit.common.config as config
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.postprocessing.render_executor import (
+    CancellableProgressLogger,
+    RenderCancelledError,
+    RenderExecutor,
+)
+
+
+def _get_pid(progress_logger=None):
+    return os.getpid()
+
+
+def _write_file(path: str, progress_logger=None):
+    with open(path, "w") as f:
+        f.write("rendered")
+    return os.path.abspath(path)
+
+
+def _fail(message: str, progress_logger=None):
+    raise ValueError(message)
+
+
+def _render_frames(output_path: str, nb_frames: int, progress_logger=None):
+    # Mimics moviepy, which reports each frame written to the progress logger
+    for frame_index in progress_logger.iter_bar(frame_index=range(nb_frames)):
+        with open(output_path, "w") as f:
+            f.write(str(frame_index + 1))
+        time.sleep(0.02)
+
+
+def _read_nb_frames(output_path: str) -> int:
+    if not os.path.exists(output_path):
+        return 0
+    with open(output_path) as f:
+        return int(f.read())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__runs_in_worker_process():
+    render_executor = RenderExecutor(max_workers=1)
+    try:
+        worker_pid = await render_executor.run(_get_pid)
+    finally:
+        render_executor.shutdown()
+
+    assert worker_pid != os.getpid()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__relative_paths_resolved_from_caller_working_folder():
+    render_executor = RenderExecutor(max_workers=1)
+    try:
+        await render_executor.run(_get_pid)  # The worker starts in this folder
+        for _ in range(2):
+            with WorkingFolderContext():
+                rendered_path = await render_executor.run(_write_file, "render.mp4")
+
+                assert rendered_path == os.path.abspath("render.mp4")
+                assert os.path.exists("render.mp4")
+    finally:
+        render_executor.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__render_fails__raises_render_error():
+    render_executor = RenderExecutor(max_workers=1)
+    try:
+        with pytest.raises(ValueError, match="bad overlay"):
+            await render_executor.run(_fail, "bad overlay")
+    finally:
+        render_executor.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__cancelled_while_running__stops_render():
+    with WorkingFolderContext():
+        output_path = os.path.abspath("frames.txt")
+        render_executor = RenderExecutor(max_workers=1)
+        try:
+            render = asyncio.create_task(
+                render_executor.run(_render_frames, output_path, 500)
+            )
+            while _read_nb_frames(output_path) == 0:
+                await asyncio.sleep(0.05)
+
+            render.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await render
+        finally:
+            render_executor.shutdown(wait=True)
+
+        assert _read_nb_frames(output_path) < 500
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__cancelled_while_queued__never_runs():
+    with WorkingFolderContext():
+        running_output_path = os.path.abspath("running.txt")
+        queued_output_path = os.path.abspath("queued.txt")
+        render_executor = RenderExecutor(max_workers=1)
+        try:
+            running = asyncio.create_task(
+                render_executor.run(_render_frames, running_output_path, 10)
+            )
+            queued = asyncio.create_task(
+                render_executor.run(_render_frames, queued_output_path, 10)
+            )
+            while _read_nb_frames(running_output_path) == 0:
+                await asyncio.sleep(0.05)
+
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            await running
+        finally:
+            render_executor.shutdown(wait=True)
+
+        assert _read_nb_frames(running_output_path) == 10
+        assert not os.path.exists(queued_output_path)
+
+
+@pytest.mark.unit
+def test_cancellable_progress_logger__flag_file__raises():
+    with WorkingFolderContext():
+        progress_logger = CancellableProgressLogger(os.path.abspath("cancel"))
+        assert list(progress_logger.iter_bar(frame_index=range(3))) == [0, 1, 2]
+
+        with open("cancel", "w"):
+            pass
+
+        with pytest.raises(RenderCancelledError):
+            list(progress_logger.iter_bar(frame_index=range(3)))
+
+
+@pytest.mark.unit
+def test_init__invalid_max_workers__fails():
+    with pytest.raises(ValueError, match="must be >= 1"):
+        RenderExecutor(max_workers=-1)
+
+
+@pytest.mark.unit
+def test_get_max_render_workers(monkeypatch):
+    monkeypatch.delenv("MAX_RENDER_WORKERS", raising=False)
+    assert config.get_max_render_workers() is None
+
+    monkeypatch.setenv("MAX_RENDER_WORKERS", "3")
+    assert config.get_max_render_workers() == 3
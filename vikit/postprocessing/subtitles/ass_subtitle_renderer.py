@@ -0,0 +1,369 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+This module provides an ffmpeg based backend for rendering styled subtitles onto
+videos: the subtitle layout is converted into an ASS subtitle file, which ffmpeg burns
+into the video with libass in a single pass, instead of compositing one moviepy clip
+per word and per highlight frame by frame in Python.
+"""
+
+import asyncio
+import os
+from tempfile import NamedTemporaryFile
+from typing import Generator, List, Literal, Tuple
+
+from PIL import ImageColor
+from pysrt import SubRipFile
+
+from vikit.common.subtitle_tools import trim_subtitles
+from vikit.postprocessing.subtitles import font_metrics
+from vikit.postprocessing.subtitles.video_subtitle_renderer import (
+    BG_PADDING_H_PX,
+    SUBTITLE_STYLE,
+    WORD_GROUP_DURATION_SEC,
+    VideoSubtitleRenderer,
+    _split_subtitles_by_group,
+    _split_subtitles_by_line,
+    _SubtitleLineGroup,
+    _SubtitleWord,
+)
+from vikit.wrappers.ffmpeg_wrapper import (
+    burn_subtitles,
+    get_media_duration_async,
+    get_media_frame_size_async,
+)
+
+# How a word is drawn at a given time.
+WORD_STATE = Literal["text", "highlight", "hidden"]
+
+
+class AssSubtitleRenderer(VideoSubtitleRenderer):
+    """
+    Renders styled subtitles onto video clips with ffmpeg and libass.
+
+    Takes the same parameters and supports the same subtitle styles as
+    VideoSubtitleRenderer. Words are split into the same groups and lines, and each
+    group becomes a series of ASS events in which spoken words are highlighted karaoke
+    style.
+
+    Usage Example:
+    ```python
+    from vikit.postprocessing.subtitles.ass_subtitle_renderer import \
+        AssSubtitleRenderer
+
+    renderer = AssSubtitleRenderer(
+        subtitle_style="highlight_spoken_word",
+        font_path="/path/to/font.ttf",
+        font_size_pt=24,
+        text_color="white",
+        highlight_color="yellow",
+        bg_color="black",
+        bg_opacity=0.7,
+        margin_bottom_px=50,
+        margin_h_px=20,
+    )
+    await renderer.render_async(
+        src_video_path="/path/to/input_video.mp4",
+        dst_video_path="/path/to/output_video.mp4",
+        subtitles=SubRipFile.open("/path/to/subtitles.srt"),
+    )
+    ```
+    """
+
+    def render(
+        self,
+        src_video_path: str,
+        dst_video_path: str,
+        subtitles: SubRipFile,
+        progress_logger=None,
+    ) -> None:
+        """
+        Same as render_async, for callers not running an event loop.
+
+        Args:
+            src_video_path: The path to the input video file.
+            dst_video_path: The path to the output video file.
+            subtitles: The subtitles to render.
+            progress_logger: Ignored, ffmpeg does not report its progress to moviepy
+                loggers.
+        """
+        asyncio.run(self.render_async(src_video_path, dst_video_path, subtitles))
+
+    async def render_async(
+        self,
+        src_video_path: str,
+        dst_video_path: str,
+        subtitles: SubRipFile,
+    ) -> None:
+        """
+        Render the specified subtitles onto the given video with a single ffmpeg pass,
+        splitting the subtitles into readable chunks if necessary.
+
+        Subtitles that are past the end of the video are ignored.
+
+        Args:
+            src_video_path: The path to the input video file.
+            dst_video_path: The path to the output video file.
+            subtitles: The subtitles to render.
+        """
+        if not os.path.exists(src_video_path):
+            raise FileNotFoundError(src_video_path)
+
+        dst_video_dir = os.path.dirname(os.path.abspath(dst_video_path))
+        if not os.path.exists(dst_video_dir):
+            raise FileNotFoundError(dst_video_dir)
+
+        frame_size = await get_media_frame_size_async(src_video_path)
+        self._check_margins(frame_size)
+
+        duration_sec = await get_media_duration_async(src_video_path)
+        trimmed_subtitles = trim_subtitles(
+            subtitles, start_time_sec=0.0, end_time_sec=duration_sec
+        )
+        if not trimmed_subtitles:
+            raise ValueError(
+                f"No subtitles found in the specified time range: "
+                f"[{0}s, {duration_sec}s]"
+            )
+
+        with NamedTemporaryFile(
+            mode="w", suffix=".ass", dir=dst_video_dir, encoding="utf-8", delete=False
+        ) as ass_file:
+            ass_file.write(self.to_ass(trimmed_subtitles, frame_size))
+        try:
+            await burn_subtitles(
+                src_video_path,
+                ass_file.name,
+                target_path=dst_video_path,
+                fonts_dir=os.path.dirname(os.path.abspath(self._font_path)),
+            )
+        finally:
+            os.remove(ass_file.name)
+
+    def to_ass(self, subtitles: SubRipFile, frame_size: Tuple[int, int]) -> str:
+        """
+        Convert subtitles into an ASS subtitle document laid out for the given frame
+        size.
+
+        Args:
+            subtitles: The subtitles to convert, already trimmed to the video.
+            frame_size: The width and height of the video frames in pixels.
+
+        Returns:
+            The content of the ASS subtitle file.
+        """
+        frame_width_px, frame_height_px = frame_size
+        font = font_metrics.get_font(self._font_path, self._font_size_pt)
+        _, line_height_px = font_metrics.measure_text(
+            " ", self._font_path, self._font_size_pt
+        )
+
+        document = [
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {frame_width_px}",
+            f"PlayResY: {frame_height_px}",
+            # Lines are broken by the renderer, libass must not wrap them again.
+            "WrapStyle: 2",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, "
+            "OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, "
+            "ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, "
+            "MarginR, MarginV, Encoding",
+            self._get_ass_style(font.getname()[0], line_height_px),
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, "
+            "Effect, Text",
+        ]
+
+        for word_group in _split_subtitles_by_group(
+            subtitles, group_duration_sec=WORD_GROUP_DURATION_SEC
+        ):
+            group = _SubtitleLineGroup(
+                list(
+                    _split_subtitles_by_line(
+                        words=word_group,
+                        max_width_px=frame_width_px - 2 * self._margin_h_px,
+                        font_path=self._font_path,
+                        font_size_pt=self._font_size_pt,
+                    )
+                )
+            )
+            for start_sec, end_sec, word_states in _get_group_events(
+                group, self._subtitle_style
+            ):
+                text = self._get_ass_event_text(group, word_states)
+                document.append(
+                    f"Dialogue: 0,{_format_ass_time(start_sec)},"
+                    f"{_format_ass_time(end_sec)},Default,,0,0,0,,{text}"
+                )
+
+        return "\n".join(document) + "\n"
+
+    def _get_ass_style(self, font_name: str, font_size_px: int) -> str:
+        # libass scales fonts so that the ascent plus the descent match the font size,
+        # which is the line height of the font metrics.
+        if self._bg_opacity > 0:
+            # An opaque box drawn with the outline color, padded by the outline width.
+            border_style, outline_px = 3, BG_PADDING_H_PX
+        else:
+            border_style, outline_px = 1, 0
+        bg_color = _to_ass_color(self._bg_color, opacity=self._bg_opacity)
+        return ",".join(
+            str(value)
+            for value in (
+                "Style: Default",
+                font_name,
+                font_size_px,
+                _to_ass_color(self._text_color),
+                _to_ass_color(self._highlight_color),
+                bg_color,
+                bg_color,
+                0,  # Bold
+                0,  # Italic
+                0,  # Underline
+                0,  # StrikeOut
+                100,  # ScaleX
+                100,  # ScaleY
+                0,  # Spacing
+                0,  # Angle
+                border_style,
+                outline_px,
+                0,  # Shadow
+                2,  # Alignment: bottom center
+                self._margin_h_px,
+                self._margin_h_px,
+                self._margin_bottom_px,
+                1,  # Encoding
+            )
+        )
+
+    def _get_ass_event_text(
+        self, group: _SubtitleLineGroup, word_states: Tuple[WORD_STATE, ...]
+    ) -> str:
+        # Inline colors have no alpha, the alpha of the text is set separately.
+        overrides = {
+            "text": f"{{\\1c&H{_to_ass_color(self._text_color)[4:]}&\\1a&H00&}}",
+            "highlight": (
+                f"{{\\1c&H{_to_ass_color(self._highlight_color)[4:]}&\\1a&H00&}}"
+            ),
+            "hidden": "{\\1a&HFF&}",
+        }
+        states = iter(word_states)
+        current_state = "text"
+        lines = []
+        for line in group:
+            words = []
+            for word in line:
+                state = next(states)
+                override = overrides[state] if state != current_state else ""
+                current_state = state
+                words.append(override + _escape_ass_text(word.text))
+            lines.append(" ".join(words))
+        return "\\N".join(lines)
+
+
+def _get_word_state(
+    word: _SubtitleWord, time_sec: float, subtitle_style: SUBTITLE_STYLE
+) -> WORD_STATE:
+    """
+    Get how a word is drawn at a given time, following the timings of the moviepy
+    clips rendered by VideoSubtitleRenderer for the same style.
+    """
+    is_spoken = word.start_sec <= time_sec
+    if subtitle_style == "highlight_spoken_word":
+        return "highlight" if is_spoken and time_sec < word.end_sec else "text"
+    if subtitle_style == "highlight_spoken_sentence":
+        return "highlight" if is_spoken else "text"
+    if subtitle_style == "place_words":
+        return "highlight" if is_spoken else "hidden"
+    if subtitle_style == "static_block":
+        return "text"
+    assert False, f"Unknown subtitle style: {subtitle_style}"
+
+
+def _get_group_events(
+    group: _SubtitleLineGroup, subtitle_style: SUBTITLE_STYLE
+) -> Generator[Tuple[float, float, Tuple[WORD_STATE, ...]], None, None]:
+    """
+    A generator that splits the display of a group of lines into consecutive events,
+    a new event starting whenever a word changes state.
+
+    Args:
+        group: The group of subtitle lines to display.
+        subtitle_style: The style of the subtitle.
+
+    Returns:
+        A generator that yields the start time, end time and state of each word, in
+        chronological order.
+    """
+    words: List[_SubtitleWord] = [word for line in group for word in line]
+    change_times_sec = sorted(
+        {group.start_sec, group.end_sec}
+        | {
+            time_sec
+            for word in words
+            for time_sec in (word.start_sec, word.end_sec)
+            if group.start_sec < time_sec < group.end_sec
+        }
+    )
+
+    event = None
+    for start_sec, end_sec in zip(change_times_sec, change_times_sec[1:]):
+        word_states = tuple(
+            _get_word_state(word, start_sec, subtitle_style) for word in words
+        )
+        if event is not None and event[2] == word_states:
+            event = (event[0], end_sec, word_states)
+            continue
+        if event is not None:
+            yield event
+        event = (start_sec, end_sec, word_states)
+
+    if event is not None:
+        yield event
+
+
+def _to_ass_color(color: str | tuple, opacity: float = 1.0) -> str:
+    """
+    Convert a color normalized by VideoSubtitleRenderer into the ASS &HAABBGGRR format,
+    ASS alpha values going from 00 for opaque to FF for transparent.
+    """
+    if isinstance(color, tuple):
+        red, green, blue = color[:3]
+    elif color.startswith("rgba("):
+        red, green, blue = (int(float(c)) for c in color[5:-1].split(",")[:3])
+    else:
+        red, green, blue = ImageColor.getrgb(color)[:3]
+    alpha = round((1 - opacity) * 255)
+    return f"&H{alpha:02X}{blue:02X}{green:02X}{red:02X}"
+
+
+def _format_ass_time(time_sec: float) -> str:
+    centiseconds = round(time_sec * 100)
+    hours, centiseconds = divmod(centiseconds, 360000)
+    minutes, centiseconds = divmod(centiseconds, 6000)
+    seconds, centiseconds = divmod(centiseconds, 100)
+    return f"{hours}:{minutes:02}:{seconds:02}.{centiseconds:02}"
+
+
+def _escape_ass_text(text: str) -> str:
+    # Braces start override blocks and backslashes start tags in ASS events.
+    text = " ".join(text.split()).replace("\\", "\\\u2060")
+    return text.replace("{", "\\{").replace("}", "\\}")
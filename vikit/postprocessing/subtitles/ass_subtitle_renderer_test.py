@@ -0,0 +1,252 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+import pytest
+from pysrt import SubRipFile, SubRipItem, SubRipTime
+
+import vikit.wrappers.ffmpeg_wrapper as ffmpeg_wrapper
+from tests.medias.references_for_tests import (
+    DEMAIN_DES_LAUBE_SRT,
+    RANCHO_FONT,
+    VIKIT_PITCH_MP4,
+)
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.postprocessing.subtitles.ass_subtitle_renderer import (
+    AssSubtitleRenderer,
+    _escape_ass_text,
+    _format_ass_time,
+    _get_group_events,
+    _to_ass_color,
+)
+from vikit.postprocessing.subtitles.video_subtitle_renderer import (
+    _SubtitleLineGroup,
+    _SubtitleWord,
+    _SubtitleWordGroup,
+)
+
+MEDIA_INFO = {
+    "streams": [{"codec_type": "video", "width": 1080, "height": 1920}],
+    "format": {"duration": "5.0"},
+}
+
+
+def valid_init_kwargs(update: dict[str, any] = {}):
+    return {
+        "subtitle_style": "highlight_spoken_word",
+        "font_path": RANCHO_FONT,
+        "font_size_pt": 40,
+        "text_color": "white",
+        "highlight_color": "yellow",
+        "bg_color": "black",
+        "bg_opacity": 0.8,
+        "margin_bottom_px": 250,
+        "margin_h_px": 25,
+    } | update
+
+
+def _create_sub_rip_file(subtitles: list[tuple[float, float, str]]) -> SubRipFile:
+    return SubRipFile(
+        [
+            SubRipItem(
+                index=index,
+                start=SubRipTime.from_ordinal(int(start_sec * 1000)),
+                end=SubRipTime.from_ordinal(int(end_sec * 1000)),
+                text=text,
+            )
+            for index, (start_sec, end_sec, text) in enumerate(subtitles)
+        ]
+    )
+
+
+TEST_GROUP = _SubtitleLineGroup(
+    [
+        _SubtitleWordGroup([_SubtitleWord("one", 0.0, 1.0, 10, 10)], 10),
+        _SubtitleWordGroup(
+            [_SubtitleWord("two", 1.0, 1.5, 10, 10), _SubtitleWord("", 2.0, 3.0)],
+            20,
+        ),
+    ]
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "subtitle_style, expected_events",
+    [
+        ("static_block", [(0.0, 3.0, ("text", "text", "text"))]),
+        (
+            "highlight_spoken_word",
+            [
+                (0.0, 1.0, ("highlight", "text", "text")),
+                (1.0, 1.5, ("text", "highlight", "text")),
+                (1.5, 2.0, ("text", "text", "text")),
+                (2.0, 3.0, ("text", "text", "highlight")),
+            ],
+        ),
+        (
+            "highlight_spoken_sentence",
+            [
+                (0.0, 1.0, ("highlight", "text", "text")),
+                (1.0, 2.0, ("highlight", "highlight", "text")),
+                (2.0, 3.0, ("highlight", "highlight", "highlight")),
+            ],
+        ),
+        (
+            "place_words",
+            [
+                (0.0, 1.0, ("highlight", "hidden", "hidden")),
+                (1.0, 2.0, ("highlight", "highlight", "hidden")),
+                (2.0, 3.0, ("highlight", "highlight", "highlight")),
+            ],
+        ),
+    ],
+)
+def test_get_group_events(subtitle_style, expected_events):
+    assert list(_get_group_events(TEST_GROUP, subtitle_style)) == expected_events
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "color, opacity, expected_value",
+    [
+        ("white", 1.0, "&H00FFFFFF"),
+        ("#102030", 1.0, "&H00302010"),
+        ("rgb(16, 32, 48)", 1.0, "&H00302010"),
+        ("rgba(16, 32, 48, 0.4)", 1.0, "&H00302010"),
+        ((16, 32, 48), 0.0, "&HFF302010"),
+        ((0, 0, 0, 0), 0.8, "&H33000000"),
+    ],
+)
+def test_to_ass_color(color, opacity, expected_value):
+    assert _to_ass_color(color, opacity=opacity) == expected_value
+
+
+@pytest.mark.unit
+def test_format_ass_time_and_escape_text():
+    assert _format_ass_time(0) == "0:00:00.00"
+    assert _format_ass_time(3723.456) == "1:02:03.46"
+    assert _escape_ass_text("a {b}\\n\nc") == "a \\{b\\}\\\u2060n c"
+
+
+@pytest.mark.unit
+def test_to_ass__breaks_lines_and_highlights_words():
+    renderer = AssSubtitleRenderer(**valid_init_kwargs())
+    subtitles = _create_sub_rip_file(
+        [(0.0, 1.0, "word1"), (1.0, 2.0, "word2"), (2.0, 3.0, "word3")]
+    )
+
+    # Only one word fits on each line of a 200px wide frame.
+    document = renderer.to_ass(subtitles, frame_size=(200, 400))
+
+    assert "PlayResX: 200\nPlayResY: 400\n" in document
+    assert "\nStyle: Default,Rancho," in document
+    dialogues = [line for line in document.splitlines() if line.startswith("Dia")]
+    assert dialogues == [
+        "Dialogue: 0,0:00:00.00,0:00:01.00,Default,,0,0,0,,"
+        "{\\1c&H00FFFF&\\1a&H00&}word1\\N{\\1c&HFFFFFF&\\1a&H00&}word2\\Nword3",
+        "Dialogue: 0,0:00:01.00,0:00:02.00,Default,,0,0,0,,"
+        "word1\\N{\\1c&H00FFFF&\\1a&H00&}word2\\N{\\1c&HFFFFFF&\\1a&H00&}word3",
+        "Dialogue: 0,0:00:02.00,0:00:03.00,Default,,0,0,0,,"
+        "word1\\Nword2\\N{\\1c&H00FFFF&\\1a&H00&}word3",
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_render_async__single_ffmpeg_pass(monkeypatch):
+    commands = []
+
+    async def fake_run_command(cmd, job_class=None):
+        commands.append(cmd)
+        subtitles_filter = cmd[cmd.index("-vf") + 1]
+        ass_path = subtitles_filter.split("=")[2].removesuffix(":fontsdir")
+        with open(ass_path) as f:
+            ass_documents.append(f.read())
+
+    async def fake_get_media_info_async(media_path):
+        return MEDIA_INFO
+
+    ass_documents = []
+    monkeypatch.setattr(ffmpeg_wrapper, "_run_command", fake_run_command)
+    monkeypatch.setattr(
+        ffmpeg_wrapper, "get_media_info_async", fake_get_media_info_async
+    )
+
+    with WorkingFolderContext():
+        with open("video.mp4", "wb") as f:
+            f.write(b"fake media")
+        renderer = AssSubtitleRenderer(**valid_init_kwargs())
+
+        await renderer.render_async(
+            "video.mp4",
+            "output.mp4",
+            _create_sub_rip_file([(0.0, 1.0, "word1"), (6.0, 7.0, "too_late")]),
+        )
+
+        assert os.listdir() == ["video.mp4"]
+
+    assert len(commands) == 1
+    assert commands[0][-1] == "output.mp4"
+    assert "word1" in ass_documents[0]
+    assert "too_late" not in ass_documents[0]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_render_async__invalid_margin__fails(monkeypatch):
+    async def fake_get_media_info_async(media_path):
+        return MEDIA_INFO
+
+    monkeypatch.setattr(
+        ffmpeg_wrapper, "get_media_info_async", fake_get_media_info_async
+    )
+
+    with WorkingFolderContext():
+        with open("video.mp4", "wb") as f:
+            f.write(b"fake media")
+        renderer = AssSubtitleRenderer(**valid_init_kwargs({"margin_h_px": 541}))
+
+        with pytest.raises(ValueError, match=r"margin_h_px \(541\) must be"):
+            await renderer.render_async(
+                "video.mp4", "output.mp4", _create_sub_rip_file([(0, 1, "word1")])
+            )
+
+
+@pytest.mark.local_integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "subtitle_style",
+    [
+        "static_block",
+        "highlight_spoken_word",
+        "highlight_spoken_sentence",
+        "place_words",
+    ],
+)
+async def test_render_async__valid_input(subtitle_style):
+    with WorkingFolderContext():
+        renderer = AssSubtitleRenderer(
+            **valid_init_kwargs({"subtitle_style": subtitle_style})
+        )
+
+        await renderer.render_async(
+            VIKIT_PITCH_MP4, "output.mp4", SubRipFile.open(DEMAIN_DES_LAUBE_SRT)
+        )
+
+        assert await ffmpeg_wrapper.get_media_frame_size_async(
+            "output.mp4"
+        ) == await ffmpeg_wrapper.get_media_frame_size_async(VIKIT_PITCH_MP4)
@@ -0,0 +1,131 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+"""
+This module measures and rasterizes subtitle text with FreeType, through PIL, instead of
+rendering every word with ImageMagick just to read its size.
+
+Fonts, measurements and rendered bitmaps are cached by font, size and text (and color
+for bitmaps), so words repeated along a transcript, and the highlighted variants of a
+word, are only measured and rendered once per process.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# The number of distinct fonts and sizes kept loaded.
+FONT_CACHE_SIZE = 32
+
+# The number of text measurements kept, a few bytes each.
+TEXT_SIZE_CACHE_SIZE = 65536
+
+# The number of rendered text bitmaps kept, a few tens of KB each for subtitle words.
+TEXT_BITMAP_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_font(font_path: str, font_size_pt: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a TrueType or OpenType font at the given size.
+
+    Args:
+        font_path: The path to the font file.
+        font_size_pt: The font size in pt, i.e. the height of the em square in pixels.
+
+    Returns:
+        The loaded font.
+    """
+    return ImageFont.truetype(font_path, font_size_pt)
+
+
+@lru_cache(maxsize=TEXT_SIZE_CACHE_SIZE)
+def measure_text(text: str, font_path: str, font_size_pt: int) -> Tuple[int, int]:
+    """
+    Measure a single line of text.
+
+    Args:
+        text: The text to measure.
+        font_path: The path to the font file.
+        font_size_pt: The font size in pt.
+
+    Returns:
+        The width of the text in pixels, i.e. the advance of its glyphs so that words
+        measured separately can be laid out next to each other, and the height of a
+        line of text in pixels, the same for all the texts of a font and size.
+    """
+    font = get_font(font_path, font_size_pt)
+    ascent_px, descent_px = font.getmetrics()
+    return math.ceil(font.getlength(text)), ascent_px + descent_px
+
+
+@lru_cache(maxsize=TEXT_BITMAP_CACHE_SIZE)
+def render_text(
+    text: str, font_path: str, font_size_pt: int, color: str | tuple
+) -> np.ndarray:
+    """
+    Rasterize a single line of text on a transparent background.
+
+    Args:
+        text: The text to render.
+        font_path: The path to the font file.
+        font_size_pt: The font size in pt.
+        color: The color of the text, as a color name, a hex code, an RGB/RGBA string
+            or an RGB/RGBA tuple.
+
+    Returns:
+        A read-only RGBA image of the size returned by measure_text, shared between
+        all the callers rendering the same text.
+    """
+    width_px, height_px = measure_text(text, font_path, font_size_pt)
+    image = Image.new("RGBA", (max(width_px, 1), height_px), (0, 0, 0, 0))
+    ImageDraw.Draw(image).text(
+        (0, 0), text, font=get_font(font_path, font_size_pt), fill=_to_rgba(color)
+    )
+
+    bitmap = np.array(image)
+    bitmap.flags.writeable = False
+    return bitmap
+
+
+def clear_caches() -> None:
+    """
+    Drop the cached fonts, measurements and bitmaps, e.g. after a font file changed.
+    """
+    get_font.cache_clear()
+    measure_text.cache_clear()
+    render_text.cache_clear()
+
+
+def _to_rgba(color: str | tuple) -> Tuple[int, int, int, int]:
+    if isinstance(color, tuple):
+        # Float alphas are in the range [0, 1], integer ones in the range [0, 255].
+        alpha = color[3] if len(color) == 4 else 255
+        if isinstance(alpha, float):
+            alpha = round(alpha * 255)
+        return (*color[:3], alpha)
+
+    # PIL expects an integer alpha in RGBA strings, the renderers use a float.
+    match = re.match(
+        r"^rgba\(\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*([\d.]+)\s*\)$", color
+    )
+    if match:
+        red, green, blue, alpha = match.groups()
+        return int(red), int(green), int(blue), round(float(alpha) * 255)
+    return ImageColor.getcolor(color, "RGBA")
@@ -0,0 +1,80 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import pytest
+
+from tests.medias.references_for_tests import RANCHO_FONT
+from vikit.postprocessing.subtitles import font_metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    font_metrics.clear_caches()
+    yield
+    font_metrics.clear_caches()
+
+
+@pytest.mark.unit
+def test_measure_text__words_add_up_to_line():
+    word_width_px, line_height_px = font_metrics.measure_text("word", RANCHO_FONT, 40)
+    space_width_px, _ = font_metrics.measure_text(" ", RANCHO_FONT, 40)
+    line_width_px, _ = font_metrics.measure_text("word word", RANCHO_FONT, 40)
+
+    assert word_width_px > 0
+    assert space_width_px > 0
+    assert abs(line_width_px - (2 * word_width_px + space_width_px)) <= 2
+    assert font_metrics.measure_text("", RANCHO_FONT, 40) == (0, line_height_px)
+    assert font_metrics.measure_text("word", RANCHO_FONT, 80)[0] > word_width_px
+
+
+@pytest.mark.unit
+def test_measure_text__cached_per_font_size_and_text():
+    for _ in range(3):
+        font_metrics.measure_text("word", RANCHO_FONT, 40)
+        font_metrics.measure_text("other", RANCHO_FONT, 40)
+
+    cache_info = font_metrics.measure_text.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (2, 4)
+    assert font_metrics.get_font.cache_info().misses == 1
+
+
+@pytest.mark.unit
+def test_render_text__shared_read_only_bitmap():
+    bitmap = font_metrics.render_text("word", RANCHO_FONT, 40, "yellow")
+
+    width_px, height_px = font_metrics.measure_text("word", RANCHO_FONT, 40)
+    assert bitmap.shape == (height_px, width_px, 4)
+    assert not bitmap.flags.writeable
+    assert bitmap[:, :, 3].max() == 255  # Some glyph pixels are opaque
+    assert bitmap[0, 0, 3] == 0  # The background is transparent
+    assert font_metrics.render_text("word", RANCHO_FONT, 40, "yellow") is bitmap
+    assert font_metrics.render_text("word", RANCHO_FONT, 40, "white") is not bitmap
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "color, expected_rgba",
+    [
+        ("yellow", (255, 255, 0, 255)),
+        ("#102030", (16, 32, 48, 255)),
+        ("rgb(16, 32, 48)", (16, 32, 48, 255)),
+        ("rgba(16, 32, 48, 0.4)", (16, 32, 48, 102)),
+        ((16, 32, 48), (16, 32, 48, 255)),
+        ((16, 32, 48, 0), (16, 32, 48, 0)),
+        ((16, 32, 48, 0.4), (16, 32, 48, 102)),
+    ],
+)
+def test_render_text__color_formats(color, expected_rgba):
+    assert font_metrics._to_rgba(color) == expected_rgba
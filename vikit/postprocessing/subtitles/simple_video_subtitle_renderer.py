@@ -13,12 +13,16 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
 import os
 
 from moviepy.editor import VideoFileClip
 from pysrt import SubRipFile
 
 from medias import ARIAL_TTF_PATH
+from vikit.common.config import get_subtitle_renderer
+from vikit.postprocessing.render_executor import get_render_executor
+from vikit.postprocessing.subtitles.ass_subtitle_renderer import AssSubtitleRenderer
 from vikit.postprocessing.subtitles.video_subtitle_renderer import (
     VideoSubtitleRenderer,
 )
@@ -26,13 +30,16 @@ from vikit.postprocessing.subtitles.video_subtitle_renderer import (
 FONT_SIZE_RATIO = 0.045
 PIXEL_TO_POINT = 0.75
 
+RENDERERS = {"moviepy": VideoSubtitleRenderer, "ass": AssSubtitleRenderer}
+
 
 class SimpleVideoSubtitleRenderer:
     """
     A subtitle renderer with sensible parameter defaults for simple use cases.
 
-    Delegates the rendering to the VideoSubtitleRenderer class which can also be used
-    directly if finer control is needed.
+    Delegates the rendering to the VideoSubtitleRenderer class, or to the
+    AssSubtitleRenderer class with the ass renderer, which can also be used directly
+    if finer control is needed.
     """
 
     def __init__(
@@ -41,7 +48,19 @@ class SimpleVideoSubtitleRenderer:
         font_size_pt=None,
         margin_bottom_ratio=0.04,
         margin_h_ratio=0.05,
+        renderer: str = None,
     ) -> None:
+        """
+        Args:
+            renderer: How the subtitles are rendered, moviepy or ass. Defaults to the
+                SUBTITLE_RENDERER configuration
+        """
+        self.renderer = renderer or get_subtitle_renderer()
+        if self.renderer not in RENDERERS:
+            raise ValueError(
+                f"renderer ({self.renderer}) must be one of {', '.join(RENDERERS)}"
+            )
+
         self.font_path = font_path
         self.font_size_pt = font_size_pt
 
@@ -66,7 +85,70 @@ class SimpleVideoSubtitleRenderer:
         text_color: str = "white",
         highlight_color: str = "black",
         highlight_opacity: float = 0.7,
+        progress_logger=None,
     ) -> None:
+        renderer, subtitles = self._get_renderer(
+            input_video_path,
+            subtitle_srt_filepath,
+            text_color=text_color,
+            highlight_color=highlight_color,
+            highlight_opacity=highlight_opacity,
+        )
+        renderer.render(
+            input_video_path,
+            output_video_path,
+            subtitles,
+            progress_logger=progress_logger,
+        )
+
+    async def add_subtitles_to_video_async(
+        self,
+        input_video_path: str,
+        subtitle_srt_filepath: str,
+        output_video_path: str,
+        text_color: str = "white",
+        highlight_color: str = "black",
+        highlight_opacity: float = 0.7,
+    ) -> None:
+        """
+        Same as add_subtitles_to_video, but runs in a worker process of the render
+        executor, or in ffmpeg with the ass renderer. Cancelling the call stops the
+        render.
+        """
+        if self.renderer == "ass":
+            renderer, subtitles = await asyncio.to_thread(
+                self._get_renderer,
+                input_video_path,
+                subtitle_srt_filepath,
+                text_color=text_color,
+                highlight_color=highlight_color,
+                highlight_opacity=highlight_opacity,
+            )
+            await renderer.render_async(input_video_path, output_video_path, subtitles)
+            return
+
+        await get_render_executor().run(
+            self.add_subtitles_to_video,
+            input_video_path,
+            subtitle_srt_filepath,
+            output_video_path,
+            text_color=text_color,
+            highlight_color=highlight_color,
+            highlight_opacity=highlight_opacity,
+        )
+
+    def _get_renderer(
+        self,
+        input_video_path: str,
+        subtitle_srt_filepath: str,
+        text_color: str,
+        highlight_color: str,
+        highlight_opacity: float,
+    ) -> tuple[VideoSubtitleRenderer, SubRipFile]:
+        """
+        Returns:
+            The renderer sized after the input video, and the subtitles to render
+        """
         if not os.path.exists(input_video_path):
             raise FileNotFoundError(input_video_path)
 
@@ -91,7 +173,7 @@ class SimpleVideoSubtitleRenderer:
                 f"Failed to parse subtitle file {subtitle_srt_filepath}: {e}"
             ) from e
 
-        renderer = VideoSubtitleRenderer(
+        renderer = RENDERERS[self.renderer](
             subtitle_style="highlight_spoken_word",
             font_path=self.font_path,
             font_size_pt=font_size_px,
@@ -102,4 +184,4 @@ class SimpleVideoSubtitleRenderer:
             margin_bottom_px=int(self.margin_bottom_ratio * video_height_px),
             margin_h_px=int(self.margin_h_ratio * video_width_px),
         )
-        renderer.render(input_video_path, output_video_path, subtitles)
+        return renderer, subtitles
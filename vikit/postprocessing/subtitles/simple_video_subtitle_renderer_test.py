@@ -9,7 +9,9 @@ from tests.medias.references_for_tests import (
     DEMAIN_DES_LAUBE_SRT,
     RANCHO_FONT,
 )
+from tests.testing_medias import get_cat_video_path
 from vikit.common.context_managers import WorkingFolderContext
+from vikit.postprocessing.subtitles.ass_subtitle_renderer import AssSubtitleRenderer
 from vikit.postprocessing.subtitles.simple_video_subtitle_renderer import (
     SimpleVideoSubtitleRenderer,
 )
@@ -194,3 +196,38 @@ def test_create_video_subtitles__invalid_srt_file__fails():
                 update={"subtitle_srt_filepath": srt_file.name}
             )
             subtitle_renderer.add_subtitles_to_video(**render_kwargs)
+
+
+@pytest.mark.unit
+def test_init__renderer_defaults_to_config(monkeypatch):
+    monkeypatch.delenv("SUBTITLE_RENDERER", raising=False)
+    assert SimpleVideoSubtitleRenderer().renderer == "moviepy"
+
+    monkeypatch.setenv("SUBTITLE_RENDERER", "ass")
+    assert SimpleVideoSubtitleRenderer().renderer == "ass"
+    assert SimpleVideoSubtitleRenderer(renderer="moviepy").renderer == "moviepy"
+
+    with pytest.raises(ValueError, match=r"renderer \(unknown\) must be one of"):
+        SimpleVideoSubtitleRenderer(renderer="unknown")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_add_subtitles_to_video_async__ass__rendered_by_ffmpeg(monkeypatch):
+    rendered = []
+
+    async def render_async(self, src_video_path, dst_video_path, subtitles):
+        rendered.append((type(self), src_video_path, dst_video_path, len(subtitles)))
+
+    monkeypatch.setattr(AssSubtitleRenderer, "render_async", render_async)
+    subtitle_renderer = SimpleVideoSubtitleRenderer(renderer="ass")
+
+    await subtitle_renderer.add_subtitles_to_video_async(
+        get_cat_video_path(), DEMAIN_DES_LAUBE_SRT, "output.mp4"
+    )
+
+    assert len(rendered) == 1
+    renderer_type, src_video_path, dst_video_path, nb_subtitles = rendered[0]
+    assert renderer_type is AssSubtitleRenderer
+    assert (src_video_path, dst_video_path) == (get_cat_video_path(), "output.mp4")
+    assert nb_subtitles > 0
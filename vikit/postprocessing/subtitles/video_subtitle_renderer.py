@@ -27,7 +27,7 @@ from typing import Generator, List, Literal, Optional, Tuple
 from moviepy.editor import (
     ColorClip,
     CompositeVideoClip,
-    TextClip,
+    ImageClip,
     VideoClip,
     VideoFileClip,
 )
@@ -36,6 +36,8 @@ from pysrt import SubRipFile
 
 from vikit.common.subtitle_tools import trim_subtitles
 from vikit.common.video_tools import write_videofile
+from vikit.postprocessing.render_executor import get_render_executor
+from vikit.postprocessing.subtitles import font_metrics
 
 # The maximum duration of each group of subtitles.
 WORD_GROUP_DURATION_SEC = 3.0
@@ -158,6 +160,7 @@ class VideoSubtitleRenderer:
         src_video_path: str,
         dst_video_path: str,
         subtitles: SubRipFile,
+        progress_logger=None,
     ) -> None:
         """
         Render a sub-section of the specified subtitles onto the given video, splitting
@@ -171,6 +174,7 @@ class VideoSubtitleRenderer:
             src_video_path: The path to the input video file.
             dst_video_path: The path to the output video file.
             subtitles: The subtitles to render.
+            progress_logger: The proglog logger following the progress of the render.
         """
         # Check parameters
         if not os.path.exists(src_video_path):
@@ -181,16 +185,7 @@ class VideoSubtitleRenderer:
             raise FileNotFoundError(dst_video_dir)
 
         with VideoFileClip(src_video_path, fps_source="fps") as input_video:
-            if not 0 <= self._margin_bottom_px <= input_video.h:
-                raise ValueError(
-                    f"margin_bottom_px ({self._margin_bottom_px}) must be in the range "
-                    f"[0, {input_video.h}]"
-                )
-            if not 0 <= self._margin_h_px <= int(input_video.w / 2):
-                raise ValueError(
-                    f"margin_h_px ({self._margin_h_px}) must be in the range "
-                    f"[0, {int(input_video.w / 2)}]"
-                )
+            self._check_margins(input_video.size)
 
             # Remove any subtitles that are past the end of the video.
             trimmed_subtitles = trim_subtitles(
@@ -234,7 +229,39 @@ class VideoSubtitleRenderer:
 
             assert len(subtitle_clips) > 0
             final_video = CompositeVideoClip([input_video] + subtitle_clips)
-            write_videofile(final_video, dst_video_path, fps=input_video.fps)
+            write_videofile(
+                final_video,
+                dst_video_path,
+                fps=input_video.fps,
+                progress_logger=progress_logger,
+            )
+
+    def _check_margins(self, frame_size: Tuple[int, int]) -> None:
+        frame_width_px, frame_height_px = frame_size
+        if not 0 <= self._margin_bottom_px <= frame_height_px:
+            raise ValueError(
+                f"margin_bottom_px ({self._margin_bottom_px}) must be in the range "
+                f"[0, {frame_height_px}]"
+            )
+        if not 0 <= self._margin_h_px <= int(frame_width_px / 2):
+            raise ValueError(
+                f"margin_h_px ({self._margin_h_px}) must be in the range "
+                f"[0, {int(frame_width_px / 2)}]"
+            )
+
+    async def render_async(
+        self,
+        src_video_path: str,
+        dst_video_path: str,
+        subtitles: SubRipFile,
+    ) -> None:
+        """
+        Same as render, but runs in a worker process of the render executor so that
+        other builds keep running meanwhile. Cancelling the call stops the render.
+        """
+        await get_render_executor().run(
+            self.render, src_video_path, dst_video_path, subtitles
+        )
 
 
 @dataclass
@@ -439,18 +466,20 @@ def _split_subtitles_by_line(
         A generator that yields each line of words in chronological order. The
         SubtitleWords in each line contain the measured dimensions.
     """
-    space_width_px = TextClip(" ", font=font_path, fontsize=font_size_pt).w
+    space_width_px, _ = font_metrics.measure_text(" ", font_path, font_size_pt)
 
     line_words = []
     line_width_px = 0  # running sum, updated in the for loop
     for word in words:
         # Update the word with the measured dimensions.
-        word_clip = TextClip(word.text, font=font_path, fontsize=font_size_pt)
+        word_width_px, word_height_px = font_metrics.measure_text(
+            word.text, font_path, font_size_pt
+        )
         word_with_dimension = _SubtitleWord(
-            word.text, word.start_sec, word.end_sec, word_clip.w, word_clip.h
+            word.text, word.start_sec, word.end_sec, word_width_px, word_height_px
         )
 
-        if line_width_px + word_clip.w > max_width_px:
+        if line_width_px + word_width_px > max_width_px:
             yield _SubtitleWordGroup(
                 line_words,
                 line_width_px - space_width_px,  # Don't count the last space.
@@ -512,7 +541,7 @@ def _render_subtitle_line_group(
         A list of VideoClip objects that together render the subtitle group.
     """
     frame_width_px, frame_height_px = frame_size
-    space_width_px = TextClip(" ", font=font_path, fontsize=font_size_pt).w
+    space_width_px, _ = font_metrics.measure_text(" ", font_path, font_size_pt)
 
     # Calculate the vertical starting position of the text in this group.
     text_position_y = int(frame_height_px - margin_bottom_px - group.height_px)
@@ -587,12 +616,7 @@ def _render_subtitle_line_group(
                 assert False, f"Unknown subtitle style: {subtitle_style}"
 
             word_clip = (
-                TextClip(
-                    word.text,
-                    font=font_path,
-                    fontsize=font_size_pt,
-                    color=text_color,
-                )
+                _create_text_clip(word.text, font_path, font_size_pt, text_color)
                 .set_start(word_clip_start_sec)
                 .set_duration(word_clip_duration_sec)
                 .set_position((text_position_x, text_position_y))
@@ -600,11 +624,8 @@ def _render_subtitle_line_group(
             word_clips.append(word_clip)
             if hl_clip_duration_sec > 0:
                 hl_clip = (
-                    TextClip(
-                        word.text,
-                        font=font_path,
-                        fontsize=font_size_pt,
-                        color=highlight_color,
+                    _create_text_clip(
+                        word.text, font_path, font_size_pt, highlight_color
                     )
                     .set_start(hl_clip_start_sec)
                     .set_duration(hl_clip_duration_sec)
@@ -617,3 +638,25 @@ def _render_subtitle_line_group(
         text_position_y += line.height_px
 
     return bg_clips + word_clips + hl_clips
+
+
+def _create_text_clip(
+    text: str, font_path: str, font_size_pt: int, color: str
+) -> ImageClip:
+    """
+    Create a clip showing a single line of text on a transparent background, from the
+    cached bitmap of the text.
+
+    Args:
+        text: The text to show.
+        font_path: The path to the font to use for the text.
+        font_size_pt: The font size to use for the text in pt.
+        color: The color of the text.
+
+    Returns:
+        An ImageClip with a transparency mask, the size of the measured text.
+    """
+    return ImageClip(
+        font_metrics.render_text(text, font_path, font_size_pt, color),
+        transparent=True,
+    )
@@ -3,6 +3,7 @@ from math import isclose
 from typing import List, Tuple
 
 import pytest
+from moviepy.editor import ColorClip, CompositeVideoClip
 from moviepy.video.io.VideoFileClip import VideoFileClip
 from pysrt import SubRipFile, SubRipItem, SubRipTime
 
@@ -12,11 +13,15 @@ from tests.medias.references_for_tests import (
     VIKIT_PITCH_MP4,
 )
 from vikit.common.context_managers import WorkingFolderContext
+from vikit.postprocessing.subtitles import font_metrics
 from vikit.postprocessing.subtitles.video_subtitle_renderer import (
     VideoSubtitleRenderer,
     _convert_color_to_rgb,
     _normalize_color,
+    _render_subtitle_line_group,
     _split_subtitles_by_group,
+    _split_subtitles_by_line,
+    _SubtitleLineGroup,
 )
 
 
@@ -198,6 +203,62 @@ def test_render_subtitles__invalid_params__no_subtitles_in_range():
             renderer.render(src_video_path, "output.mp4", subtitles)
 
 
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_render_async__missing_src_video__fails_in_worker():
+    with WorkingFolderContext():
+        renderer = VideoSubtitleRenderer(**valid_init_kwargs())
+        with pytest.raises(FileNotFoundError, match="missing.mp4"):
+            await renderer.render_async(
+                **valid_render_kwargs(update={"src_video_path": "missing.mp4"})
+            )
+
+
+@pytest.mark.unit
+def test_render_subtitle_line_group__highlights_spoken_word():
+    # Measured and rendered with the cached font metrics, no ImageMagick involved.
+    subtitles = _create_sub_rip_file([(0.0, 1.0, "aaa"), (1.0, 2.0, "bbb")])
+    word_group = next(_split_subtitles_by_group(subtitles))
+    # Only one word fits on each line.
+    line_width_px, _ = font_metrics.measure_text("aaa bbb", RANCHO_FONT, 20)
+    lines = list(
+        _split_subtitles_by_line(
+            words=word_group,
+            max_width_px=line_width_px - 1,
+            font_path=RANCHO_FONT,
+            font_size_pt=20,
+        )
+    )
+    assert [[word.text for word in line] for line in lines] == [["aaa"], ["bbb"]]
+
+    clips = _render_subtitle_line_group(
+        group=_SubtitleLineGroup(lines),
+        frame_size=(100, 100),
+        font_path=RANCHO_FONT,
+        font_size_pt=20,
+        text_color="white",
+        highlight_color="rgb(255, 0, 0)",
+        bg_color=(0, 0, 0),
+        bg_opacity=0,
+        bg_padding_h_px=5,
+        margin_bottom_px=10,
+        subtitle_style="highlight_spoken_word",
+    )
+    background = ColorClip(size=(100, 100), color=(0, 0, 0), duration=2)
+    video = CompositeVideoClip([background] + clips)
+
+    def is_red(pixel):
+        return pixel[0] > 128 and pixel[1] < 64
+
+    first_line_height_px = lines[0].height_px
+    frame = video.get_frame(0.5)
+    first_line, second_line = frame[:-10][-2 * first_line_height_px :].reshape(
+        2, first_line_height_px, 100, 3
+    )
+    assert any(is_red(pixel) for row in first_line for pixel in row)
+    assert not any(is_red(pixel) for row in second_line for pixel in row)
+
+
 @pytest.mark.unit
 @pytest.mark.parametrize(
     "color, expected_value",
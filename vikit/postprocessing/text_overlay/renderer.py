@@ -3,6 +3,7 @@ from moviepy.editor import CompositeVideoClip, ImageClip, TextClip, VideoFileCli
 from PIL import Image, ImageDraw
 
 from vikit.common.video_tools import write_videofile
+from vikit.postprocessing.render_executor import get_render_executor
 from vikit.postprocessing.text_overlay.model import TextOverlay
 
 
@@ -10,6 +11,7 @@ def render_text_overlay(
     src_video_path: str,
     dst_video_path: str,
     text_overlay: TextOverlay,
+    progress_logger=None,
 ):
     video = VideoFileClip(src_video_path, fps_source="fps")
 
@@ -79,4 +81,20 @@ def render_text_overlay(
 
     # Assemble and render the final composite video.
     final_clip = CompositeVideoClip([video, overlay_clip])
-    write_videofile(final_clip, dst_video_path, fps=video.fps)
+    write_videofile(
+        final_clip, dst_video_path, fps=video.fps, progress_logger=progress_logger
+    )
+
+
+async def render_text_overlay_async(
+    src_video_path: str,
+    dst_video_path: str,
+    text_overlay: TextOverlay,
+):
+    """
+    Same as render_text_overlay, but runs in a worker process of the render executor
+    so that other builds keep running meanwhile. Cancelling the call stops the render.
+    """
+    await get_render_executor().run(
+        render_text_overlay, src_video_path, dst_video_path, text_overlay
+    )
@@ -34,7 +34,8 @@ from vikit.prompt.recorded_prompt import RecordedPrompt
 from vikit.prompt.recorded_prompt_subtitles_extractor import (
     RecordedPromptSubtitlesExtractor,
 )
-from vikit.wrappers.ffmpeg_wrapper import get_media_duration
+from vikit.prompt.voice_over_generator import VoiceOverGenerator
+from vikit.wrappers.ffmpeg_wrapper import get_media_duration_async
 
 
 class PromptFactory:
@@ -91,32 +92,22 @@ class PromptFactory:
             raise ValueError("The prompt text is not provided")
         if len(prompt_text) == 0:
             raise ValueError("The prompt text is empty")
-        extractor = None
         logger.debug(f"Creating prompt from text: {prompt_text}")
-        # calling a model like Whisper from openAI
-        await self.ml_models_gateway.generate_mp3_from_text_async(
-            prompt_text=prompt_text,
+        # Reading the text aloud, then transcribing it with a model like Whisper
+        subs = await VoiceOverGenerator(self.ml_models_gateway).generate_async(
+            prompt_text,
             target_file=config.get_prompt_mp3_file_name(self.prompt_factory_uuid),
         )
-
-        extractor = RecordedPromptSubtitlesExtractor()
-        subs = await extractor.extract_subtitles_async(
-            recorded_prompt_file_path=config.get_prompt_mp3_file_name(
-                self.prompt_factory_uuid
-            ),
-            ml_models_gateway=self.ml_models_gateway,
-        )
-        merged_subs = (
-            extractor.merge_short_subtitles(  # merge short subtitles into larger ones
-                subs, min_duration=config.get_subtitles_min_duration()
-            )
+        merged_subs = RecordedPromptSubtitlesExtractor().merge_short_subtitles(
+            subs,  # merge short subtitles into larger ones
+            min_duration=config.get_subtitles_min_duration(),
         )
 
         prompt = RecordedPrompt(
             text=prompt_text,
             subtitles=merged_subs,
             audio_recording=config.get_prompt_mp3_file_name(self.prompt_factory_uuid),
-            duration=get_media_duration(
+            duration=await get_media_duration_async(
                 config.get_prompt_mp3_file_name(self.prompt_factory_uuid)
             ),
             build_settings=self.prompt_build_settings,
@@ -13,9 +13,10 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
+import math
 import os
-import subprocess
-import uuid
+from tempfile import TemporaryDirectory
 
 import pysrt
 from loguru import logger
@@ -25,7 +26,7 @@ from vikit.gateways.ML_models_gateway import MLModelsGateway
 from vikit.prompt.subtitle_extractor import SubtitleExtractor
 from vikit.wrappers.ffmpeg_wrapper import (
     extract_audio_slice,
-    get_media_duration,
+    get_media_duration_async,
 )
 
 
@@ -35,14 +36,28 @@ class RecordedPromptSubtitlesExtractor(SubtitleExtractor):
     merge short subtitles into longer ones, or extract them as text tokens
 
     Here is how we do it:
-    - We extract the audio slice from the audio file and cap the duration of the slice to x seconds
-    so that replicate can process it (today n = 300 seconds, i.e. 5minutes)
-    - We save the generated subtitles to a temporary SRT file
-    - We concatenate the temporary SRT files to a prompt wide srt file
-
-    Yes this is kind of hacky, but it works for now.
+    - We split the audio file into slices of x seconds so that the transcription model
+    can process them (today x = 300 seconds, i.e. 5 minutes)
+    - We transcribe the slices concurrently, a few at a time
+    - We shift the subtitles of each slice by the start of the slice and merge them in
+    memory into prompt wide subtitles
     """
 
+    def __init__(self, max_concurrent_transcriptions: int = None):
+        """
+        Args:
+            max_concurrent_transcriptions: The maximum number of slices transcribed at
+                once, defaults to the configured value
+        """
+        self.max_concurrent_transcriptions = (
+            max_concurrent_transcriptions or config.get_max_concurrent_transcriptions()
+        )
+        if self.max_concurrent_transcriptions < 1:
+            raise ValueError(
+                f"Max concurrent transcriptions ({self.max_concurrent_transcriptions}) "
+                "must be >= 1"
+            )
+
     async def extract_subtitles_async(
         self, recorded_prompt_file_path, ml_models_gateway: MLModelsGateway = None
     ):
@@ -56,79 +71,80 @@ class RecordedPromptSubtitlesExtractor(SubtitleExtractor):
         if recorded_prompt_file_path is None:
             raise ValueError("The path to the recorded audio file is not provided")
 
-        subs = None
-        mp3_duration = get_media_duration(recorded_prompt_file_path)
-        cat_command_args = ""
-        video_length_per_subtitle = config.get_video_length_per_subtitle()
-        secondsToAdd = 0
-        for i in range(0, int(mp3_duration), video_length_per_subtitle):
-            # Determine the end time for the current slice
-            end = (
-                mp3_duration
-                if i + video_length_per_subtitle > mp3_duration
-                else i + video_length_per_subtitle
-            )
+        mp3_duration = await get_media_duration_async(recorded_prompt_file_path)
+        slices = self._get_slices(mp3_duration, config.get_video_length_per_subtitle())
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_transcriptions)
+        # The audio slices are only needed until they are transcribed
+        with TemporaryDirectory(prefix="vikit_audio_slices_") as slices_dir:
+            tasks = [
+                asyncio.ensure_future(
+                    self._transcribe_slice(
+                        recorded_prompt_file_path,
+                        start,
+                        end,
+                        slices_dir=slices_dir,
+                        ml_models_gateway=ml_models_gateway,
+                        semaphore=semaphore,
+                    )
+                )
+                for start, end in slices
+            ]
+            try:
+                slices_subtitles = await asyncio.gather(*tasks)
+            except BaseException:
+                # Do not leave transcriptions running, nor writing to the slices
+                # directory being removed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        subs = pysrt.SubRipFile()
+        for (start, _), slice_subtitles in zip(slices, slices_subtitles):
+            slice_subtitles.shift(seconds=start)
+            subs.extend(slice_subtitles)
+        subs.clean_indexes()
+        return subs
+
+    @staticmethod
+    def _get_slices(duration: float, slice_length: int) -> list[tuple[float, float]]:
+        """
+        Get the (start, end) of the slices covering the whole audio, in seconds: there
+        is always at least one, and the last one ends with the audio even if it lasts
+        less than a second
+        """
+        nb_slices = max(1, math.ceil(duration / slice_length))
+        return [
+            (i * slice_length, min((i + 1) * slice_length, duration))
+            for i in range(nb_slices)
+        ]
+
+    async def _transcribe_slice(
+        self,
+        recorded_prompt_file_path: str,
+        start: float,
+        end: float,
+        slices_dir: str,
+        ml_models_gateway: MLModelsGateway,
+        semaphore: asyncio.Semaphore,
+    ) -> pysrt.SubRipFile:
+        async with semaphore:
             # Generate the audio slice from the audio file
             generated_slice = await extract_audio_slice(
-                start=i, end=end, audiofile_path=recorded_prompt_file_path
+                start=start,
+                end=end,
+                audiofile_path=recorded_prompt_file_path,
+                target_file_name=os.path.join(slices_dir, f"slice_{start}_{end}.mp3"),
             )
             logger.debug(f"Generated slice {generated_slice}")
-            # Obtain  sub part of subtitles using elevenlabs API
             subs = await ml_models_gateway.get_subtitles_async(
                 audiofile_path=generated_slice
             )
-            logger.debug(f"Subtitles in subtitle extractor: {subs}")
-
-            subtitle_file_path = "_".join(["subSubtitle", str(i), str(end)]) + ".srt"
-
-            if "output" in subs:
-                if "transcription" in subs["output"]:
-                    transcription = subs["output"]["transcription"]
-                else:
-                    raise ValueError(
-                        "Error: 'transcription' key exists but has no content."
-                    )
-            else:
-                if "transcription" in subs:
-                    transcription = subs["transcription"]
-                else:
-                    raise ValueError(
-                        "Error: 'transcription' key exists but has no content."
-                    )
-            with open(subtitle_file_path, "w") as f:
-                f.write(transcription)
-
-            # We shift subtitles if this is not the first file
-            currentSubtitles = pysrt.open(subtitle_file_path)
-            currentSubtitles.shift(seconds=secondsToAdd)
-            currentSubtitles.save(subtitle_file_path)
-
-            # We save the new time of the last subtitle to add it to the next batch of subtitles
-            last_subtitle = currentSubtitles[-1]
-            secondsToAdd = (
-                last_subtitle.end.hours * 3600
-                + last_subtitle.end.minutes * 60
-                + last_subtitle.end.seconds
-            )
-
-            # Append SRT file path to cat command arguments
-            cat_command_args = " ".join([cat_command_args, subtitle_file_path])
+        logger.debug(f"Subtitles in subtitle extractor: {subs}")
 
-            # Concatenate the temporary SRT files to a prompt wide srt file
-            tempUuid = self.prompt_factory_uuid = str(uuid.uuid4())
-            with open(config.get_subtitles_default_file_name(tempUuid), "w") as f:
-                p = subprocess.Popen(
-                    ["cat"] + cat_command_args.split(), stdout=f, stderr=subprocess.PIPE
-                )
-                stdout, stderr = p.communicate()
-                if p.returncode != 0:
-                    raise subprocess.CalledProcessError(
-                        p.returncode, p.args, output=stdout, stderr=stderr
-                    )
-
-            assert os.path.exists(config.get_subtitles_default_file_name(tempUuid)), (
-                "The generated subtitles file does not exists after having generating subtitles from audio file"
-            )
-            subs = pysrt.open(config.get_subtitles_default_file_name(tempUuid))
-
-        return subs
+        output = subs.get("output", subs)
+        if "transcription" not in output:
+            raise ValueError("Error: 'transcription' key missing from the subtitles.")
+        # A slice without speech has an empty transcription
+        return pysrt.from_string(output["transcription"] or "")
@@ -13,9 +13,15 @@
 # limitations under the License.
 # ==============================================================================
 
+import pysrt
 from loguru import logger
 
 import vikit.common.config as config
+from vikit.prompt.subtitle_merge_strategies import (
+    MinDurationMergeStrategy,
+    SubtitleGroup,
+    SubtitleMergeStrategy,
+)
 
 
 class SubtitleExtractor:
@@ -27,35 +33,70 @@ class SubtitleExtractor:
     def merge_short_subtitles(self, subtitles, min_duration=7):
         """
         Merge subtitles which total duration is less than 7 seconds
+
+        Args:
+            subtitles: The subtitles to merge
+            min_duration: The minimum duration in seconds between the start of a merged
+                subtitle and the start of the next one
+
+        Returns:
+            A new SubRipFile with the merged subtitles
+        """
+        # We make sure that all subtitles are minimum of 7 seconds in order to be able
+        # to insert two videos inside
+        return self.merge_subtitles(
+            subtitles, strategies=[MinDurationMergeStrategy(min_duration)]
+        )
+
+    def merge_subtitles(
+        self, subtitles, strategies: list[SubtitleMergeStrategy]
+    ) -> pysrt.SubRipFile:
+        """
+        Merge consecutive subtitles in a single pass, a subtitle being merged into the
+        subtitles before it only if all the strategies agree
+
+        Args:
+            subtitles: The subtitles to merge, in chronological order
+            strategies: The strategies deciding which subtitles are merged
+
+        Returns:
+            A new SubRipFile with the merged subtitles, the input being left untouched
         """
         if subtitles is None:
             raise ValueError("The subtitles are not provided")
 
-        subs = subtitles
-        assert len(subs) > 0, "No Subtitles to process from the provided recording file"
-        logger.debug(f"Subs to merge {len(subs)}")
-
-        # We  make sure that all subtitles are minimum of 7 seconds in order to be able to insert two videos inside
-        index = 0
-        while index < len(subs) - 1:
-            secondsForSubtitle = (
-                subs[index].start.hours * 60 + subs[index].start.minutes
-            ) * 60 + subs[index].start.seconds
-            secondsForNextSubtitle = (
-                subs[index + 1].start.hours * 60 + subs[index + 1].start.minutes
-            ) * 60 + subs[index + 1].start.seconds
-            interspace = secondsForNextSubtitle - secondsForSubtitle
-
-            if interspace < min_duration:
-                # We need to merge the subtitles
-                subs[index + 1].text = subs[index].text + " " + subs[index + 1].text
-                subs[index + 1].start = subs[index].start
-                del subs[index]
+        assert len(subtitles) > 0, (
+            "No Subtitles to process from the provided recording file"
+        )
+        logger.debug(f"Subs to merge {len(subtitles)}")
+
+        groups = []
+        group = None
+        for sub in subtitles:
+            start_ms, end_ms = sub.start.ordinal, sub.end.ordinal
+            if group is not None and all(
+                strategy.should_merge(group, start_ms, end_ms, sub.text)
+                for strategy in strategies
+            ):
+                group.add(end_ms, sub.text)
             else:
-                index = index + 1
+                group = SubtitleGroup(start_ms=start_ms, end_ms=end_ms)
+                group.add(end_ms, sub.text)
+                groups.append(group)
 
-        logger.trace(f"Subs after merge {len(subs)}")
-        return subs
+        merged_subs = pysrt.SubRipFile(
+            [
+                pysrt.SubRipItem(
+                    index=index,
+                    start=pysrt.SubRipTime.from_ordinal(group.start_ms),
+                    end=pysrt.SubRipTime.from_ordinal(group.end_ms),
+                    text=group.text,
+                )
+                for index, group in enumerate(groups, start=1)
+            ]
+        )
+        logger.trace(f"Subs after merge {len(merged_subs)}")
+        return merged_subs
 
     def build_subtitles_as_text_tokens(self, subtitles) -> list[str]:
         """
@@ -0,0 +1,111 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+
+@dataclass
+class SubtitleGroup:
+    """Consecutive subtitles being merged into a single one"""
+
+    start_ms: int
+    end_ms: int
+    texts: list[str] = field(default_factory=list)
+    nb_characters: int = 0
+
+    @property
+    def duration_ms(self) -> int:
+        return self.end_ms - self.start_ms
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.texts)
+
+    def add(self, end_ms: int, text: str):
+        """
+        Merge the next subtitle into the group
+        """
+        if self.texts:
+            self.nb_characters += 1  # The space separating the texts
+        self.texts.append(text)
+        self.nb_characters += len(text)
+        self.end_ms = max(self.end_ms, end_ms)
+
+
+class SubtitleMergeStrategy(ABC):
+    """
+    Decides whether a subtitle is merged into the group of subtitles right before it.
+
+    A subtitle is merged only if all the strategies in use agree, so strategies can be
+    combined, e.g. merging until a minimum duration is reached but never across the end
+    of a sentence.
+    """
+
+    @abstractmethod
+    def should_merge(
+        self, group: SubtitleGroup, start_ms: int, end_ms: int, text: str
+    ) -> bool:
+        """
+        Args:
+            group: The subtitles merged so far
+            start_ms: The start of the next subtitle, in milliseconds
+            end_ms: The end of the next subtitle, in milliseconds
+            text: The text of the next subtitle
+
+        Returns:
+            True to merge the next subtitle into the group, False to start a new group
+        """
+
+
+class MinDurationMergeStrategy(SubtitleMergeStrategy):
+    """
+    Merges subtitles until the next one starts at least a minimum duration after the
+    start of the group, e.g. so that each group is long enough to insert videos in
+    """
+
+    def __init__(self, min_duration_sec: float):
+        if min_duration_sec < 0:
+            raise ValueError(f"Min duration ({min_duration_sec}s) must be >= 0")
+        self.min_duration_ms = round(min_duration_sec * 1000)
+
+    def should_merge(self, group, start_ms, end_ms, text) -> bool:
+        return start_ms - group.start_ms < self.min_duration_ms
+
+
+class MaxCharactersMergeStrategy(SubtitleMergeStrategy):
+    """
+    Merges subtitles as long as the merged text fits in a maximum number of characters
+    """
+
+    def __init__(self, max_characters: int):
+        if max_characters < 1:
+            raise ValueError(f"Max characters ({max_characters}) must be >= 1")
+        self.max_characters = max_characters
+
+    def should_merge(self, group, start_ms, end_ms, text) -> bool:
+        return group.nb_characters + 1 + len(text) <= self.max_characters
+
+
+class SentenceBoundaryMergeStrategy(SubtitleMergeStrategy):
+    """
+    Merges subtitles as long as the group does not end a sentence
+    """
+
+    SENTENCE_ENDINGS = (".", "!", "?", "…", "。", "！", "？")
+
+    def should_merge(self, group, start_ms, end_ms, text) -> bool:
+        last_text = group.texts[-1].rstrip(" \"'»”)]") if group.texts else ""
+        return not last_text.endswith(self.SENTENCE_ENDINGS)
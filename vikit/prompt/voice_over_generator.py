@@ -0,0 +1,221 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from tempfile import TemporaryDirectory
+
+import pysrt
+from loguru import logger
+
+import vikit.common.config as config
+from vikit.common.artifact_cache import (
+    ArtifactCache,
+    get_artifact_cache,
+    get_artifact_key,
+)
+from vikit.gateways.ML_models_gateway import MLModelsGateway
+from vikit.prompt.recorded_prompt_subtitles_extractor import (
+    RecordedPromptSubtitlesExtractor,
+)
+from vikit.wrappers.ffmpeg_wrapper import concatenate_audios, get_media_duration_async
+
+# A sentence ends with a punctuation mark followed by a space
+SENTENCE_SEPARATOR = re.compile(r"(?<=[.!?…])\s+")
+
+
+def split_into_sentences(text: str) -> list[str]:
+    """
+    Split a text into its sentences, dropping the empty ones
+
+    Args:
+        text: The text to split
+
+    Returns:
+        The sentences, in order
+    """
+    sentences = (sentence.strip() for sentence in SENTENCE_SEPARATOR.split(text))
+    return [sentence for sentence in sentences if sentence]
+
+
+@dataclass
+class SentenceVoiceOver:
+    """The audio reading a sentence aloud, and its subtitles."""
+
+    audio_path: str
+    duration: float
+    subtitles: str  # In the SRT format, so each use gets its own subtitle items
+
+
+class VoiceOverGenerator:
+    """
+    Reads a text aloud with the text to speech of a gateway, and gets the subtitles of
+    the generated audio.
+
+    - When sentence chunking is enabled, the text is read one sentence at a time and
+    the audio of the sentences is concatenated, so editing a sentence only synthesizes
+    that sentence again
+    - The audio of each sentence and its subtitles are kept in the artifact cache, keyed
+    by the sentence and the text to speech settings of the gateway
+    - A sentence repeated in the text is only synthesized once
+    """
+
+    def __init__(
+        self,
+        ml_models_gateway: MLModelsGateway,
+        artifact_cache: ArtifactCache = None,
+        sentence_chunking: bool = None,
+        max_concurrent_sentences: int = None,
+    ):
+        """
+        Args:
+            ml_models_gateway: The gateway reading the text aloud and transcribing it
+            artifact_cache: The cache of the sentences audio and subtitles, defaults to
+                the process wide artifact cache, if any
+            sentence_chunking: Whether to read the text one sentence at a time,
+                defaults to the configured value
+            max_concurrent_sentences: The maximum number of sentences read aloud at
+                once, defaults to the configured value
+        """
+        self.ml_models_gateway = ml_models_gateway
+        self.artifact_cache = artifact_cache or get_artifact_cache()
+        self.sentence_chunking = (
+            sentence_chunking
+            if sentence_chunking is not None
+            else config.get_tts_sentence_chunking()
+        )
+        self.max_concurrent_sentences = (
+            max_concurrent_sentences or config.get_max_concurrent_tts_sentences()
+        )
+        if self.max_concurrent_sentences < 1:
+            raise ValueError(
+                f"Max concurrent sentences ({self.max_concurrent_sentences}) must be "
+                ">= 1"
+            )
+
+    async def generate_async(self, text: str, target_file: str) -> pysrt.SubRipFile:
+        """
+        Read a text aloud into an mp3 file
+
+        Args:
+            text: The text to read
+            target_file: The path of the mp3 file to write
+
+        Returns:
+            The subtitles of the generated audio
+        """
+        if not text.strip():
+            raise ValueError("The text to read aloud is empty")
+        sentences = split_into_sentences(text) if self.sentence_chunking else [text]
+        if not sentences:
+            raise ValueError("The text to read aloud is empty")
+
+        tts_settings = self.ml_models_gateway.get_tts_settings()
+        unique_sentences = list(dict.fromkeys(sentences))
+        semaphore = asyncio.Semaphore(self.max_concurrent_sentences)
+        target_dir = os.path.dirname(os.path.abspath(target_file))
+        # The audio of the sentences is only needed until it is concatenated
+        with TemporaryDirectory(prefix="vikit_voice_over_", dir=target_dir) as work_dir:
+            voice_overs = await asyncio.gather(
+                *(
+                    self._get_sentence_voice_over(
+                        sentence,
+                        tts_settings,
+                        audio_path=os.path.join(work_dir, f"sentence_{i}.mp3"),
+                        semaphore=semaphore,
+                    )
+                    for i, sentence in enumerate(unique_sentences)
+                )
+            )
+            voice_over_by_sentence = dict(zip(unique_sentences, voice_overs))
+            voice_overs = [voice_over_by_sentence[s] for s in sentences]
+
+            if len(voice_overs) == 1:
+                shutil.copyfile(voice_overs[0].audio_path, target_file)
+            else:
+                await concatenate_audios(
+                    [voice_over.audio_path for voice_over in voice_overs],
+                    target_file_name=target_file,
+                )
+
+        subtitles = pysrt.SubRipFile()
+        start = 0.0
+        for voice_over in voice_overs:
+            sentence_subtitles = pysrt.from_string(voice_over.subtitles)
+            sentence_subtitles.shift(seconds=start)
+            subtitles.extend(sentence_subtitles)
+            start += voice_over.duration
+        subtitles.clean_indexes()
+        return subtitles
+
+    async def _get_sentence_voice_over(
+        self,
+        sentence: str,
+        tts_settings: dict,
+        audio_path: str,
+        semaphore: asyncio.Semaphore,
+    ) -> SentenceVoiceOver:
+        audio_key = get_artifact_key(
+            kind="tts_audio", text=sentence, tts_settings=tts_settings
+        )
+        # The subtitles also depend on how the audio is sliced and transcribed
+        subtitles_key = get_artifact_key(
+            kind="tts_subtitles",
+            audio_key=audio_key,
+            transcriber=type(self.ml_models_gateway).__name__,
+            video_length_per_subtitle=config.get_video_length_per_subtitle(),
+        )
+        subtitles_path = f"{os.path.splitext(audio_path)[0]}.srt"
+
+        async with semaphore:
+            is_audio_cached = is_subtitles_cached = False
+            if self.artifact_cache:
+                is_audio_cached = bool(
+                    await self.artifact_cache.get_async(audio_key, audio_path)
+                )
+                if is_audio_cached:
+                    is_subtitles_cached = bool(
+                        await self.artifact_cache.get_async(
+                            subtitles_key, subtitles_path
+                        )
+                    )
+
+            if not is_audio_cached:
+                logger.debug(f"Reading aloud: {sentence}")
+                await self.ml_models_gateway.generate_mp3_from_text_async(
+                    prompt_text=sentence, target_file=audio_path
+                )
+                if self.artifact_cache:
+                    await self.artifact_cache.put_async(audio_key, audio_path)
+
+            if not is_subtitles_cached:
+                extractor = RecordedPromptSubtitlesExtractor()
+                subtitles = await extractor.extract_subtitles_async(
+                    audio_path, ml_models_gateway=self.ml_models_gateway
+                )
+                subtitles.save(subtitles_path, encoding="utf-8")
+                if self.artifact_cache:
+                    await self.artifact_cache.put_async(subtitles_key, subtitles_path)
+
+        with open(subtitles_path, "r", encoding="utf-8") as subtitles_file:
+            subtitles = subtitles_file.read()
+        return SentenceVoiceOver(
+            audio_path=audio_path,
+            duration=await get_media_duration_async(audio_path),
+            subtitles=subtitles,
+        )
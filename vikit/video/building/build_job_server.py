@@ -0,0 +1,407 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import itertools
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+
+from loguru import logger
+
+from vikit.common.file_tools import upload_files_to_bucket
+from vikit.gateways.ML_models_gateway import MLModelsGateway
+from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
+from vikit.video.video import Video
+from vikit.video.video_build_settings import VideoBuildSettings
+
+
+class BuildJobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __str__(self):
+        return self.value
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (
+            BuildJobStatus.SUCCEEDED,
+            BuildJobStatus.FAILED,
+            BuildJobStatus.CANCELLED,
+        )
+
+
+@dataclass
+class BuildJob:
+    """
+    A video build submitted to a build job server
+    """
+
+    video: Video
+    build_settings: VideoBuildSettings
+    priority: int = 0  # Jobs with the lowest priority value are built first
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: BuildJobStatus = BuildJobStatus.QUEUED
+    error: BaseException = None
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float = None
+    finished_at: float = None
+    output_urls: list[str] = field(default_factory=list)  # gs:// URLs, if uploaded
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _task: asyncio.Task = field(default=None, repr=False)
+
+    @property
+    def progress(self) -> float:
+        """
+        The share of the videos of the job already built, from 0 to 1. Composite
+        videos count each of the videos they are made of
+        """
+        if self.status == BuildJobStatus.SUCCEEDED:
+            return 1.0
+        videos = _get_video_tree(self.video)
+        return sum(1 for video in videos if video.is_video_built) / len(videos)
+
+    async def wait(self) -> Video:
+        """
+        Wait for the job to finish
+
+        Returns:
+            The built video
+
+        Raises:
+            asyncio.CancelledError: If the job was cancelled
+            Exception: The error the build failed with
+        """
+        await self._done.wait()
+        if self.status == BuildJobStatus.CANCELLED:
+            raise asyncio.CancelledError(f"Build job {self.id} was cancelled")
+        if self.error is not None:
+            raise self.error
+        return self.video
+
+    def _finish(self, status: BuildJobStatus, error: BaseException = None):
+        self.status = status
+        self.error = error
+        self.finished_at = time.monotonic()
+        self._done.set()
+
+
+def _get_video_tree(video: Video) -> list[Video]:
+    videos = [video]
+    for child_video in getattr(video, "video_list", []):
+        videos.extend(_get_video_tree(child_video))
+    return videos
+
+
+class BuildJobServer:
+    """
+    Long running service building many videos concurrently in the same process.
+
+    Jobs are queued in a bounded priority queue, so submitting jobs faster than they
+    are built eventually waits instead of piling up, and built by a pool of workers.
+    All the jobs share the same models gateway, hence its pooled HTTP session and rate
+    limits, and the process wide media executor capping the ffmpeg processes, while
+    each build writes to its own workspace.
+
+    Finished jobs are kept for their results to be fetched, up to a number of them and
+    for a while, then forgotten, so a long running server does not keep every video it
+    ever built in memory.
+
+    If an output bucket is set, the files of each built video, including the videos it
+    is made of, are uploaded to it as one batch once the build is over.
+
+    To build on several processes or machines, run one server per process.
+    """
+
+    def __init__(
+        self,
+        ml_models_gateway: MLModelsGateway = None,
+        nb_workers: int = 4,
+        max_queued_jobs: int = 100,
+        test_mode: bool = False,
+        max_finished_jobs: int = 1000,
+        finished_job_ttl_sec: float = 3600,
+        output_bucket: str = None,
+        output_blob_prefix: str = "builds",
+    ):
+        """
+        Args:
+            ml_models_gateway: The gateway shared by all the builds, created from the
+                factory by default
+            nb_workers: The number of videos building at the same time
+            max_queued_jobs: The maximum number of jobs waiting to be built
+            test_mode: Whether the default gateway is the fake one, e.g. for load
+                testing the server without calling the models
+            max_finished_jobs: The maximum number of finished jobs kept, the oldest
+                ones being forgotten first
+            finished_job_ttl_sec: How long finished jobs are kept, in seconds
+            output_bucket: The GCS bucket the outputs of the builds are uploaded to,
+                if any
+            output_blob_prefix: The folder of the bucket the outputs are uploaded to,
+                in a sub folder per job
+        """
+        if nb_workers < 1:
+            raise ValueError(f"Number of workers ({nb_workers}) must be >= 1")
+        if max_queued_jobs < 1:
+            raise ValueError(f"Max queued jobs ({max_queued_jobs}) must be >= 1")
+        if max_finished_jobs < 0:
+            raise ValueError(f"Max finished jobs ({max_finished_jobs}) must be >= 0")
+        if finished_job_ttl_sec < 0:
+            raise ValueError(
+                f"Finished job TTL ({finished_job_ttl_sec}) must be >= 0 seconds"
+            )
+
+        self._owns_gateway = ml_models_gateway is None
+        self.ml_models_gateway = (
+            ml_models_gateway
+            or MLModelsGatewayFactory().get_ml_models_gateway(test_mode=test_mode)
+        )
+        self.nb_workers = nb_workers
+        self.max_queued_jobs = max_queued_jobs
+        self.max_finished_jobs = max_finished_jobs
+        self.finished_job_ttl_sec = finished_job_ttl_sec
+        self.output_bucket = output_bucket
+        self.output_blob_prefix = output_blob_prefix
+        self._jobs = {}
+        self._finished_jobs = deque()  # in the order they finished
+        self._sequence = itertools.count()  # keeps the FIFO order within a priority
+        self._queue = None
+        self._workers = []
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        """
+        Start the workers, in the running event loop
+        """
+        if self.is_running:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queued_jobs)
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"build_worker_{i}")
+            for i in range(self.nb_workers)
+        ]
+        logger.info(f"Build job server started with {self.nb_workers} workers")
+
+    async def stop(self, cancel_jobs: bool = False):
+        """
+        Stop the server once the queued jobs are built, or right away
+
+        Args:
+            cancel_jobs: Whether to cancel the queued and running jobs instead of
+                waiting for them
+        """
+        if not self.is_running:
+            return
+        if cancel_jobs:
+            for job in list(self._jobs.values()):
+                self.cancel(job.id)
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._owns_gateway:
+            await self.ml_models_gateway.close()
+        logger.info("Build job server stopped")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop(cancel_jobs=exc_type is not None)
+
+    def _create_job(
+        self, video: Video, build_settings: VideoBuildSettings, priority: int
+    ) -> BuildJob:
+        if not self.is_running:
+            raise RuntimeError("The build job server is not started")
+        if video is None:
+            raise ValueError("video cannot be None")
+        return BuildJob(
+            video=video,
+            build_settings=build_settings or VideoBuildSettings(),
+            priority=priority,
+        )
+
+    async def submit(
+        self,
+        video: Video,
+        build_settings: VideoBuildSettings = None,
+        priority: int = 0,
+    ) -> BuildJob:
+        """
+        Submit a video to build, waiting for room in the queue if it is full
+
+        Args:
+            video: The video to build
+            build_settings: The settings to build the video with
+            priority: The priority of the job, the lowest values being built first
+
+        Returns:
+            The job, to follow its progress or wait for its result
+        """
+        job = self._create_job(video, build_settings, priority)
+        await self._queue.put((job.priority, next(self._sequence), job))
+        self._evict_finished_jobs()
+        self._jobs[job.id] = job
+        logger.debug(f"Build job {job.id} submitted with priority {priority}")
+        return job
+
+    def submit_nowait(
+        self,
+        video: Video,
+        build_settings: VideoBuildSettings = None,
+        priority: int = 0,
+    ) -> BuildJob:
+        """
+        Submit a video to build, see submit
+
+        Raises:
+            asyncio.QueueFull: If the queue is full
+        """
+        job = self._create_job(video, build_settings, priority)
+        self._queue.put_nowait((job.priority, next(self._sequence), job))
+        self._evict_finished_jobs()
+        self._jobs[job.id] = job
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job, whether it is still queued or already building
+
+        Args:
+            job_id: The id of the job to cancel
+
+        Returns:
+            True if the job was cancelled, False if it was already finished
+        """
+        job = self._jobs[job_id]
+        if job.status.is_finished:
+            return False
+        if job.status == BuildJobStatus.QUEUED:
+            # The job stays in the queue, the worker getting it will skip it
+            job._finish(BuildJobStatus.CANCELLED)
+            self._on_job_finished(job)
+        else:
+            job._task.cancel()
+        logger.debug(f"Build job {job_id} cancelled")
+        return True
+
+    def get_job(self, job_id: str) -> BuildJob:
+        """
+        Get a job queued, running or finished recently enough to still be kept
+
+        Raises:
+            KeyError: If the job is unknown or was forgotten since it finished
+        """
+        return self._jobs[job_id]
+
+    def _on_job_finished(self, job: BuildJob):
+        self._finished_jobs.append(job)
+        self._evict_finished_jobs()
+
+    def _evict_finished_jobs(self):
+        """
+        Forget the oldest finished jobs, beyond the maximum number kept or once their
+        time to live is over
+        """
+        expiry = time.monotonic() - self.finished_job_ttl_sec
+        while self._finished_jobs and (
+            len(self._finished_jobs) > self.max_finished_jobs
+            or self._finished_jobs[0].finished_at < expiry
+        ):
+            job = self._finished_jobs.popleft()
+            self._jobs.pop(job.id, None)
+
+    def get_jobs(self, status: BuildJobStatus = None) -> list[BuildJob]:
+        """
+        Get the jobs submitted to the server, with the given status if any
+        """
+        return [
+            job for job in self._jobs.values() if status is None or job.status == status
+        ]
+
+    def get_queue_depth(self) -> int:
+        """
+        Get the number of jobs waiting to be built
+        """
+        return len(self.get_jobs(BuildJobStatus.QUEUED))
+
+    async def _work(self):
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                if job.status == BuildJobStatus.QUEUED:
+                    await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: BuildJob):
+        job.status = BuildJobStatus.RUNNING
+        job.started_at = time.monotonic()
+        logger.info(f"Building job {job.id}, video {job.video.id}")
+        job._task = asyncio.create_task(
+            job.video.build_async(
+                build_settings=job.build_settings,
+                ml_models_gateway=self.ml_models_gateway,
+            )
+        )
+        try:
+            await job._task
+            if self.output_bucket:
+                job.output_urls = await self._upload_outputs(job)
+        except asyncio.CancelledError:
+            if not job._task.cancelled():  # The worker itself is being stopped
+                job._task.cancel()
+                job._finish(BuildJobStatus.CANCELLED)
+                raise
+            job._finish(BuildJobStatus.CANCELLED)
+        except Exception as e:
+            logger.error(f"Build job {job.id} failed: {e}")
+            job._finish(BuildJobStatus.FAILED, e)
+        else:
+            job._finish(BuildJobStatus.SUCCEEDED)
+            logger.info(
+                f"Build job {job.id} built in "
+                f"{job.finished_at - job.started_at:.1f}s: {job.video.media_url}"
+            )
+        finally:
+            self._on_job_finished(job)
+
+    async def _upload_outputs(self, job: BuildJob) -> list[str]:
+        output_paths = list(
+            dict.fromkeys(
+                video.media_url
+                for video in _get_video_tree(job.video)
+                if video.media_url and os.path.isfile(video.media_url)
+            )
+        )
+        logger.debug(f"Uploading {len(output_paths)} outputs of build job {job.id}")
+        return await upload_files_to_bucket(
+            output_paths,
+            destination_blob=f"{self.output_blob_prefix}/{job.id}",
+            bucket_name=self.output_bucket,
+        )
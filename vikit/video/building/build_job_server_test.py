@@ -0,0 +1,247 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import uuid
+
+import pytest
+
+import vikit.video.building.build_job_server as build_job_server
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.video.building.build_job_server import BuildJobServer, BuildJobStatus
+
+
+class _FakeVideo:
+    """
+    Stands for a video, only recording how it is built
+    """
+
+    def __init__(self, build_log: list = None, build_sec: float = 0, fail=False):
+        self.id = str(uuid.uuid4())
+        self.build_log = build_log if build_log is not None else []
+        self.build_sec = build_sec
+        self.fail = fail
+        self.is_video_built = False
+        self.media_url = None
+        self.video_list = []
+
+    async def build_async(self, build_settings=None, ml_models_gateway=None):
+        self.build_log.append(self.id)
+        await asyncio.sleep(self.build_sec)
+        if self.fail:
+            raise ValueError(f"Video {self.id} failed")
+        self.is_video_built = True
+        self.media_url = f"{self.id}.mp4"
+        return self
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_submit__builds_all_jobs_with_bounded_concurrency():
+    nb_running = 0
+    max_running = 0
+
+    class _CountingVideo(_FakeVideo):
+        async def build_async(self, build_settings=None, ml_models_gateway=None):
+            nonlocal nb_running, max_running
+            nb_running += 1
+            max_running = max(max_running, nb_running)
+            try:
+                return await super().build_async(build_settings, ml_models_gateway)
+            finally:
+                nb_running -= 1
+
+    async with BuildJobServer(nb_workers=3, test_mode=True) as server:
+        jobs = [
+            await server.submit(_CountingVideo(build_sec=0.01)) for _ in range(10)
+        ]
+        built_videos = [await job.wait() for job in jobs]
+
+    assert all(video.is_video_built for video in built_videos)
+    assert all(job.status == BuildJobStatus.SUCCEEDED for job in jobs)
+    assert all(job.progress == 1.0 for job in jobs)
+    assert max_running == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_submit__highest_priority_built_first():
+    build_log = []
+    async with BuildJobServer(nb_workers=1, test_mode=True) as server:
+        await server.submit(_FakeVideo(build_log, build_sec=0.05))
+        await asyncio.sleep(0)  # let the only worker pick the first job
+        low_priority = await server.submit(_FakeVideo(build_log), priority=10)
+        high_priority = await server.submit(_FakeVideo(build_log), priority=1)
+
+    assert build_log[1:] == [high_priority.video.id, low_priority.video.id]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cancel__queued_and_running_jobs():
+    build_log = []
+    async with BuildJobServer(nb_workers=1, test_mode=True) as server:
+        running = await server.submit(_FakeVideo(build_log, build_sec=10))
+        queued = await server.submit(_FakeVideo(build_log))
+        await asyncio.sleep(0)
+
+        assert running.status == BuildJobStatus.RUNNING
+        assert server.cancel(queued.id)
+        assert server.cancel(running.id)
+
+        with pytest.raises(asyncio.CancelledError):
+            await running.wait()
+        with pytest.raises(asyncio.CancelledError):
+            await queued.wait()
+
+    assert running.status == BuildJobStatus.CANCELLED
+    assert queued.status == BuildJobStatus.CANCELLED
+    assert queued.video.id not in build_log
+    assert not server.cancel(running.id)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_job__does_not_stop_the_server():
+    async with BuildJobServer(nb_workers=1, test_mode=True) as server:
+        failing = await server.submit(_FakeVideo(fail=True))
+        succeeding = await server.submit(_FakeVideo())
+
+        with pytest.raises(ValueError):
+            await failing.wait()
+        await succeeding.wait()
+
+    assert failing.status == BuildJobStatus.FAILED
+    assert succeeding.status == BuildJobStatus.SUCCEEDED
+    assert server.get_jobs(BuildJobStatus.FAILED) == [failing]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_submit_nowait__queue_full__fails():
+    async with BuildJobServer(
+        nb_workers=1, max_queued_jobs=1, test_mode=True
+    ) as server:
+        server.submit_nowait(_FakeVideo(build_sec=0.05))
+        with pytest.raises(asyncio.QueueFull):
+            server.submit_nowait(_FakeVideo())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_progress__counts_built_child_videos():
+    async with BuildJobServer(nb_workers=1, test_mode=True) as server:
+        composite = _FakeVideo(build_sec=10)
+        composite.video_list = [_FakeVideo(), _FakeVideo(), _FakeVideo()]
+        job = await server.submit(composite)
+        composite.video_list[0].is_video_built = True
+
+        assert job.progress == 0.25
+
+        server.cancel(job.id)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_submit__server_not_started__fails():
+    with pytest.raises(RuntimeError):
+        await BuildJobServer(test_mode=True).submit(_FakeVideo())
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_finished_jobs__oldest_forgotten_beyond_max():
+    async with BuildJobServer(
+        nb_workers=1, test_mode=True, max_finished_jobs=2
+    ) as server:
+        jobs = [await server.submit(_FakeVideo()) for _ in range(3)]
+        for job in jobs:
+            await job.wait()
+
+    assert server.get_jobs() == jobs[1:]
+    with pytest.raises(KeyError):
+        server.get_job(jobs[0].id)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_finished_jobs__forgotten_after_ttl():
+    async with BuildJobServer(
+        nb_workers=1, test_mode=True, finished_job_ttl_sec=0.01
+    ) as server:
+        finished = await server.submit(_FakeVideo())
+        await finished.wait()
+        await asyncio.sleep(0.02)
+        queued = await server.submit(_FakeVideo(build_sec=0.05))
+
+        assert server.get_jobs() == [queued]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_output_bucket__outputs_uploaded_as_one_batch(monkeypatch):
+    uploaded_batches = []
+
+    async def fake_upload_files_to_bucket(
+        source_file_names, destination_blob, bucket_name
+    ):
+        uploaded_batches.append((source_file_names, destination_blob, bucket_name))
+        return [f"gs://{bucket_name}/{destination_blob}/{f}" for f in source_file_names]
+
+    class _FileWritingVideo(_FakeVideo):
+        async def build_async(self, build_settings=None, ml_models_gateway=None):
+            for video in self.video_list:
+                await video.build_async(build_settings, ml_models_gateway)
+            await super().build_async(build_settings, ml_models_gateway)
+            with open(self.media_url, "w") as f:
+                f.write(self.id)
+            return self
+
+    monkeypatch.setattr(
+        build_job_server, "upload_files_to_bucket", fake_upload_files_to_bucket
+    )
+    video = _FileWritingVideo()
+    video.video_list = [_FileWritingVideo(), _FileWritingVideo()]
+    with WorkingFolderContext():
+        async with BuildJobServer(
+            test_mode=True, output_bucket="outputs", output_blob_prefix="renders"
+        ) as server:
+            job = await server.submit(video)
+            await job.wait()
+
+    expected_outputs = [video.media_url] + [v.media_url for v in video.video_list]
+    assert uploaded_batches == [(expected_outputs, f"renders/{job.id}", "outputs")]
+    assert job.output_urls == [
+        f"gs://outputs/renders/{job.id}/{output}" for output in expected_outputs
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_output_bucket__upload_failure__job_failed(monkeypatch):
+    async def failing_upload_files_to_bucket(
+        source_file_names, destination_blob, bucket_name
+    ):
+        raise ConnectionError("bucket unreachable")
+
+    monkeypatch.setattr(
+        build_job_server, "upload_files_to_bucket", failing_upload_files_to_bucket
+    )
+    async with BuildJobServer(test_mode=True, output_bucket="outputs") as server:
+        job = await server.submit(_FakeVideo())
+        with pytest.raises(ConnectionError):
+            await job.wait()
+
+    assert job.status == BuildJobStatus.FAILED
@@ -35,7 +35,7 @@ def get_lazy_dependency_chain_build_order(
     video_tree: list[Video],
     build_settings: VideoBuildSettings,
     already_added: set,
-    video_build_order: list[Video] = [],
+    video_build_order: list[Video] = None,
 ):
     """
     Get the first videos first build order
@@ -49,10 +49,14 @@ def get_lazy_dependency_chain_build_order(
         video_tree (list): The video tree to recurse on to parse the tree and get the build order
         build_settings: The build settings
         already_added (set): The set of already added videos
+        video_build_order (list): The build order to extend, a new one by default
 
     Returns:
         list: The build order
     """
+    if video_build_order is None:
+        video_build_order = []
+
     logger.trace(f"video_tree len is {len(video_tree)}")
     if len(video_tree) == 1:
         logger.debug(
@@ -84,3 +88,41 @@ def get_lazy_dependency_chain_build_order(
             already_added.add(video.id)
 
     return video_build_order
+
+
+class VideoBuildOrder:
+    """
+    The lazy dependency chain build order of a video tree, see
+    get_lazy_dependency_chain_build_order.
+
+    A build order only holds the videos of the tree it was planned from, so create one
+    per build, once all the videos are appended.
+    """
+
+    def __init__(
+        self, video_tree: list[Video], build_settings: VideoBuildSettings = None
+    ):
+        """
+        Args:
+            video_tree: The video tree to plan the build of
+            build_settings: The build settings
+        """
+        self.build_settings = build_settings
+        self._already_added = set()
+        self._video_build_order = get_lazy_dependency_chain_build_order(
+            video_tree=video_tree,
+            build_settings=build_settings,
+            already_added=self._already_added,
+        )
+
+    def get_build_order(self) -> list[Video]:
+        """
+        Get the videos of the tree, in build order
+        """
+        return list(self._video_build_order)
+
+    def __contains__(self, video: Video) -> bool:
+        return video.id in self._already_added
+
+    def __len__(self):
+        return len(self._video_build_order)
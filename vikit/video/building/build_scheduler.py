@@ -0,0 +1,264 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from vikit.video.video import Video
+
+
+class BuildScheduler:
+    """
+    Builds a graph of videos, starting each video as soon as the videos it depends on
+    are built, instead of building the graph in waves.
+
+    A video failing to build only prevents the videos depending on it, directly or not,
+    from being built: the rest of the graph keeps building, and the failures are raised
+    together once nothing else can be built.
+    """
+
+    def __init__(self, max_concurrency: int = None):
+        """
+        Args:
+            max_concurrency: The maximum number of videos building at the same time, or
+                None for no limit
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"Max concurrency ({max_concurrency}) must be >= 1")
+        self.max_concurrency = max_concurrency
+
+    @staticmethod
+    def get_dependencies_by_video_id(videos: list[Video]) -> dict[str, list[str]]:
+        """
+        Get the ids of the videos each video depends on, only keeping the dependencies
+        that are part of the graph: the others must be built already
+
+        Args:
+            videos: The videos of the graph
+
+        Returns:
+            The dependency ids, by video id
+
+        Raises:
+            ValueError: If some dependencies are neither part of the graph nor built
+        """
+        video_ids = {video.id for video in videos}
+        unknown_dependency_ids = {
+            dependency.id
+            for video in videos
+            for dependency in video.video_dependencies
+            if dependency.id not in video_ids and not dependency.is_video_built
+        }
+        if unknown_dependency_ids:
+            raise ValueError(
+                "Some dependencies could not be processed, as they are neither built "
+                "nor part of the videos to build: "
+                + ", ".join(sorted(unknown_dependency_ids))
+            )
+
+        return {
+            video.id: [
+                dependency.id
+                for dependency in video.video_dependencies
+                if dependency.id in video_ids
+            ]
+            for video in videos
+        }
+
+    @staticmethod
+    def _get_dependents(dependencies_by_video_id: dict[str, list[str]]):
+        dependents = {video_id: [] for video_id in dependencies_by_video_id}
+        for video_id, dependencies in dependencies_by_video_id.items():
+            for dependency_id in dependencies:
+                dependents[dependency_id].append(video_id)
+        return dependents
+
+    @staticmethod
+    def check_for_cycles(dependencies_by_video_id: dict[str, list[str]]):
+        """
+        Check the dependency graph has no cycle, as the videos in a cycle could never be
+        built
+
+        Args:
+            dependencies_by_video_id: The dependency ids, by video id
+
+        Raises:
+            ValueError: If some videos depend on each other
+        """
+        nb_pending_dependencies = {
+            video_id: len(dependencies)
+            for video_id, dependencies in dependencies_by_video_id.items()
+        }
+        dependents = BuildScheduler._get_dependents(dependencies_by_video_id)
+
+        ready = [
+            video_id for video_id, nb in nb_pending_dependencies.items() if nb == 0
+        ]
+        while ready:
+            video_id = ready.pop()
+            del nb_pending_dependencies[video_id]
+            for dependent_id in dependents[video_id]:
+                nb_pending_dependencies[dependent_id] -= 1
+                if nb_pending_dependencies[dependent_id] == 0:
+                    ready.append(dependent_id)
+
+        if nb_pending_dependencies:
+            raise ValueError(
+                "Dependency cycle detected between videos: "
+                + ", ".join(sorted(nb_pending_dependencies))
+            )
+
+    async def run(
+        self,
+        videos: list[Video],
+        build_video: Callable[[Video], Awaitable],
+    ):
+        """
+        Build all the videos of the graph
+
+        Args:
+            videos: The videos to build, in any order
+            build_video: The coroutine function building one video
+
+        Raises:
+            ValueError: If the graph has a dependency cycle, or depends on videos
+                which are neither built nor part of it
+            Exception: If some videos could not be built, once all the others are
+        """
+        videos_by_id = {video.id: video for video in videos}
+        dependencies_by_video_id = self.get_dependencies_by_video_id(
+            list(videos_by_id.values())
+        )
+        self.check_for_cycles(dependencies_by_video_id)
+
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+        graph_build = _GraphBuild(
+            videos_by_id, dependencies_by_video_id, build_video, semaphore
+        )
+        try:
+            graph_build.start_ready_videos()
+            while graph_build.running:
+                done, _ = await asyncio.wait(
+                    graph_build.running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    graph_build.on_build_done(task)
+        finally:
+            graph_build.cancel()
+
+        graph_build.raise_failures()
+
+
+class _GraphBuild:
+    """
+    The state of one run of the scheduler: the videos waiting for their dependencies,
+    the running builds, the failures and the videos skipped because of them
+    """
+
+    def __init__(
+        self,
+        videos_by_id: dict[str, Video],
+        dependencies_by_video_id: dict[str, list[str]],
+        build_video: Callable[[Video], Awaitable],
+        semaphore: asyncio.Semaphore = None,
+    ):
+        self.videos_by_id = videos_by_id
+        self.build_video = build_video
+        self.semaphore = semaphore
+        self.dependents = BuildScheduler._get_dependents(dependencies_by_video_id)
+        self.nb_pending_dependencies = {
+            video_id: len(dependencies)
+            for video_id, dependencies in dependencies_by_video_id.items()
+        }
+        self.failures = {}
+        self.skipped = set()
+        self.running = {}  # task -> video id
+
+    async def _build(self, video_id: str):
+        video = self.videos_by_id[video_id]
+        if self.semaphore:
+            async with self.semaphore:
+                await self.build_video(video)
+        else:
+            await self.build_video(video)
+
+    def _start(self, video_id: str):
+        self.running[asyncio.create_task(self._build(video_id))] = video_id
+
+    def start_ready_videos(self):
+        """
+        Start building the videos which do not depend on any other video of the graph
+        """
+        for video_id, nb in self.nb_pending_dependencies.items():
+            if nb == 0:
+                self._start(video_id)
+
+    def on_build_done(self, task: asyncio.Task):
+        """
+        Start the dependents the finished video was the last dependency of, or skip
+        all its dependents if it failed to build
+
+        Args:
+            task: The finished build task
+        """
+        video_id = self.running.pop(task)
+        if task.exception() is not None:
+            logger.error(f"Video {video_id} failed to build: {task.exception()}")
+            self.failures[video_id] = task.exception()
+            self._skip_dependents(video_id)
+            return
+
+        for dependent_id in self.dependents[video_id]:
+            self.nb_pending_dependencies[dependent_id] -= 1
+            if (
+                self.nb_pending_dependencies[dependent_id] == 0
+                and dependent_id not in self.skipped
+            ):
+                self._start(dependent_id)
+
+    def _skip_dependents(self, video_id: str):
+        for dependent_id in self.dependents[video_id]:
+            if dependent_id not in self.skipped:
+                self.skipped.add(dependent_id)
+                self._skip_dependents(dependent_id)
+
+    def cancel(self):
+        """
+        Cancel the builds still running
+        """
+        for task in self.running:
+            task.cancel()
+
+    def raise_failures(self):
+        """
+        Raise the build failures together, if any
+
+        Raises:
+            Exception: If some videos could not be built
+        """
+        if not self.failures:
+            return
+        if self.skipped:
+            logger.warning(
+                "Skipped videos depending on failed builds: "
+                + ", ".join(sorted(self.skipped))
+            )
+        raise Exception(
+            f"{len(self.failures)} video(s) failed to build: {', '.join(self.failures)}"
+        ) from next(iter(self.failures.values()))
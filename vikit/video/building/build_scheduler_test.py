@@ -0,0 +1,133 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+
+import pytest
+
+from vikit.video.building.build_scheduler import BuildScheduler
+
+
+class _FakeVideo:
+    def __init__(self, id, video_dependencies=None, is_video_built=False):
+        self.id = id
+        self.video_dependencies = video_dependencies or []
+        self.is_video_built = is_video_built
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__starts_videos_as_soon_as_their_dependencies_are_built():
+    slow = _FakeVideo("slow")
+    fast = _FakeVideo("fast")
+    fast_transition = _FakeVideo("fast_transition", [fast])
+    slow_transition = _FakeVideo("slow_transition", [slow, fast])
+    events = []
+
+    async def build_video(video):
+        events.append(f"start {video.id}")
+        await asyncio.sleep(0.05 if video.id == "slow" else 0)
+        events.append(f"end {video.id}")
+
+    await BuildScheduler().run(
+        [slow_transition, fast_transition, slow, fast], build_video
+    )
+
+    # The fast transition does not wait for the slow video, unrelated to it
+    assert events.index("end fast_transition") < events.index("end slow")
+    assert events.index("end slow") < events.index("start slow_transition")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__max_concurrency():
+    videos = [_FakeVideo(str(i)) for i in range(6)]
+    nb_running = 0
+    max_nb_running = 0
+
+    async def build_video(video):
+        nonlocal nb_running, max_nb_running
+        nb_running += 1
+        max_nb_running = max(max_nb_running, nb_running)
+        await asyncio.sleep(0.01)
+        nb_running -= 1
+
+    await BuildScheduler(max_concurrency=2).run(videos, build_video)
+
+    assert max_nb_running == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__failure_only_skips_dependents():
+    failing = _FakeVideo("failing")
+    dependent = _FakeVideo("dependent", [failing])
+    transitive_dependent = _FakeVideo("transitive_dependent", [dependent])
+    independent = _FakeVideo("independent")
+    built = []
+
+    async def build_video(video):
+        if video.id == "failing":
+            raise RuntimeError("boom")
+        built.append(video.id)
+
+    with pytest.raises(Exception, match="1 video\\(s\\) failed to build: failing"):
+        await BuildScheduler().run(
+            [failing, dependent, transitive_dependent, independent], build_video
+        )
+
+    assert built == ["independent"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__dependency_cycle__fails_before_building():
+    first = _FakeVideo("first")
+    second = _FakeVideo("second", [first])
+    first.video_dependencies.append(second)
+    built = []
+
+    async def build_video(video):
+        built.append(video.id)
+
+    with pytest.raises(ValueError, match="Dependency cycle detected"):
+        await BuildScheduler().run([first, second, _FakeVideo("other")], build_video)
+
+    assert built == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__dependency_outside_graph__fails_unless_built():
+    built_dependency = _FakeVideo("built", is_video_built=True)
+    unknown_dependency = _FakeVideo("unknown")
+    built = []
+
+    async def build_video(video):
+        built.append(video.id)
+
+    await BuildScheduler().run([_FakeVideo("first", [built_dependency])], build_video)
+    with pytest.raises(ValueError, match="could not be processed.*unknown"):
+        await BuildScheduler().run(
+            [_FakeVideo("second", [unknown_dependency])], build_video
+        )
+
+    assert built == ["first"]
+
+
+@pytest.mark.unit
+def test_init__invalid_max_concurrency__fails():
+    with pytest.raises(ValueError):
+        BuildScheduler(max_concurrency=0)
@@ -0,0 +1,72 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from abc import abstractmethod
+
+from vikit.common.handler import Handler
+from vikit.wrappers.ffmpeg_wrapper import merge_audio
+
+
+class AudioMergingHandler(Handler):
+    """
+    Base class for the handlers merging an audio track, e.g. a background music or a
+    synthetic voice, into the video.
+
+    Preparing the audio track is kept apart from merging it, so that the audio tracks of
+    several handlers can also be mixed in a single ffmpeg pass, see
+    FusedPostBuildHandler.
+    """
+
+    # The volume of the audio track relative to the audio of the video, the same
+    # whether the track is merged on its own or mixed with others
+    audio_file_relative_volume = 1.0
+
+    @abstractmethod
+    async def prepare_audio_track_async(self, video, ml_models_gateway) -> str:
+        """
+        Prepare the audio track to merge into the video, and update the video metadata
+        accordingly
+
+        Args:
+            video (Video): The video to process
+            ml_models_gateway (MLModelsGateway): The gateway used to generate audio
+
+        Returns:
+            str: The path to the audio file to merge
+        """
+
+    async def execute_async(self, video, ml_models_gateway=None):
+        """
+        Merge the prepared audio track and the video as a single media file
+
+        Args:
+            video (Video): The video to process
+
+        Returns:
+            The video including the audio track
+        """
+        audio_file_path = await self.prepare_audio_track_async(
+            video, ml_models_gateway
+        )
+
+        video.media_url = await merge_audio(
+            media_url=video.media_url,
+            audio_file_path=audio_file_path,
+            audio_file_relative_volume=self.audio_file_relative_volume,
+            target_file_name=video.get_file_name_by_state(),
+        )
+        assert video.media_url, "Audio was not merged properly"
+
+        return video
@@ -18,30 +18,29 @@ from loguru import logger
 
 # from  vikit.video.video import Video
 import vikit.common.config as config
-from vikit.common.handler import Handler
+from vikit.video.building.handlers.audio_merging_handler import AudioMergingHandler
 from vikit.wrappers.ffmpeg_wrapper import (
     extract_audio_slice,
-    get_media_duration,
-    merge_audio,
+    get_media_duration_async,
 )
 
 
-class DefaultBGMusicAndAudioMergingHandler(Handler):
+class DefaultBGMusicAndAudioMergingHandler(AudioMergingHandler):
     def __init__(self, music_duration: float = None):
         """
         Initialize the handler with the duration of the background music
         """
         self.duration = music_duration
 
-    async def execute_async(self, video, ml_models_gateway):
+    async def prepare_audio_track_async(self, video, ml_models_gateway=None):
         """
-        Merge background music and video  as a single media file
+        Fit the default background music to the video duration
 
         Args:
             video (Video): The video to process
 
         Returns:
-            The video including bg music
+            str: The path to the fitted background music
         """
         logger.info(
             f"about to merge default background music to video: {video.id}, music media source (before transformation):  {config.get_default_background_music()}"
@@ -52,26 +51,19 @@ class DefaultBGMusicAndAudioMergingHandler(Handler):
             self.duration = float(self.duration)
             logger.info(f"Using provided music duration: {self.duration}")
         else:
-            self.duration = get_media_duration(video.media_url)
+            self.duration = await get_media_duration_async(video.media_url)
             logger.info(
                 f"Using video media duration as music duration: {self.duration}"
             )
         audio_file = await self._fit_standard_background_music(
             expected_music_duration=self.duration, video=video
         )
+        assert audio_file, "Default Background music was not fit properly to video"
         video.metadata.bg_music_applied = True
         video.metadata.is_default_bg_music_applied = True
-
-        video.media_url = await merge_audio(
-            media_url=video.media_url,
-            audio_file_path=audio_file,
-            target_file_name=video.get_file_name_by_state(),
-        )
-        assert audio_file, "Default Background music was not fit properly to video"
         video.background_music = audio_file
-        assert video.media_url, "Default Background music was not merged properly"
 
-        return video
+        return audio_file
 
     async def _fit_standard_background_music(
         self, video, expected_music_duration: float = None
@@ -90,5 +82,7 @@ class DefaultBGMusicAndAudioMergingHandler(Handler):
             start=0,
             end=expected_music_duration,
             audiofile_path=config.get_default_background_music(),
-            target_file_name=f"{file_name_without_ext}_background_music.mp3",
+            target_file_name=video.workspace.get_path(
+                f"{file_name_without_ext}_background_music.mp3"
+            ),
         )
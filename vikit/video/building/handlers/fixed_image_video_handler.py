@@ -38,17 +38,23 @@ class FixedImageVideoGenHandler(Handler):
 
         image_path = await download_or_copy_file(
             url=video.prompt.image,
-            local_path="for_fixed_image_video_"
-            + get_canonical_name(video.prompt.image)
-            + "."
-            + video.prompt.image.split(".")[-1],
+            local_path=video.workspace.get_path(
+                "for_fixed_image_video_"
+                + get_canonical_name(video.prompt.image)
+                + "."
+                + video.prompt.image.split(".")[-1]
+            ),
         )
 
         if video.prompt.duration is None:
-            fixed_image_video = await generate_video_from_image(image_url=image_path)
+            fixed_image_video = await generate_video_from_image(
+                image_url=image_path, workspace=video.workspace
+            )
         else:
             fixed_image_video = await generate_video_from_image(
-                image_url=image_path, duration=video.prompt.duration
+                image_url=image_path,
+                duration=video.prompt.duration,
+                workspace=video.workspace,
             )
 
         assert fixed_image_video, "Fixed image video video was not generated properly"
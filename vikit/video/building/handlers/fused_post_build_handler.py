@@ -0,0 +1,104 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+from loguru import logger
+
+from vikit.common.file_tools import download_or_copy_file
+from vikit.common.handler import Handler
+from vikit.video.building.handlers.audio_merging_handler import AudioMergingHandler
+from vikit.video.building.handlers.video_reencoding_handler import (
+    VideoReencodingHandler,
+)
+from vikit.wrappers.ffmpeg_wrapper import reencode_and_merge_audio_tracks
+
+
+class FusedPostBuildHandler(Handler):
+    """
+    Handler running the reencoding and audio merging handlers of a video as a single
+    ffmpeg pass, so the video is decoded and encoded once instead of once per handler
+    """
+
+    def __init__(self, handlers: list[Handler], fps: int = 24):
+        """
+        Args:
+            handlers: The reencoding and audio merging handlers to fuse, in order
+            fps: The frame rate to normalize the video to, if it needs reencoding
+        """
+        for handler in handlers:
+            if not isinstance(handler, (VideoReencodingHandler, AudioMergingHandler)):
+                raise ValueError(f"Handler {type(handler)} cannot be fused")
+        self.handlers = handlers
+        self.fps = fps
+
+    async def execute_async(self, video, ml_models_gateway):
+        """
+        Prepare the audio tracks of all the fused handlers, then reencode the video and
+        mix the audio tracks in
+
+        Args:
+            video (Video): The video to process
+
+        Returns:
+            The processed video
+        """
+        logger.info(
+            f"about to run {len(self.handlers)} fused handlers on video: {video.id}"
+        )
+        if not video.media_url:
+            raise ValueError(f"Video {video.id} has no media url")
+
+        if video.media_url.startswith("http"):
+            # We keep the external video URL for further reuse
+            video.media_url_http = video.media_url
+            video.media_url = await download_or_copy_file(
+                video.media_url_http, video.get_file_name_by_state()
+            )
+
+        fps = None
+        audio_merging_handlers = []
+        for handler in self.handlers:
+            if isinstance(handler, VideoReencodingHandler):
+                if video._needs_video_reencoding:
+                    video.metadata.is_reencoded = True
+                    fps = self.fps
+            else:
+                audio_merging_handlers.append(handler)
+
+        audio_tracks = []
+        for handler in audio_merging_handlers:
+            audio_file_path = await handler.prepare_audio_track_async(
+                video, ml_models_gateway
+            )
+            audio_tracks.append((audio_file_path, handler.audio_file_relative_volume))
+
+        # Named after the state of the video once all the fused handlers have run, like
+        # the output of the last handler of the unfused chain
+        target_file_name = video.get_file_name_by_state()
+        if target_file_name == video.media_url:
+            logger.warning(
+                f"Fused handlers would overwrite the media of video {video.id}, "
+                "skipping them"
+            )
+            return video
+
+        video.media_url = await reencode_and_merge_audio_tracks(
+            media_url=video.media_url,
+            audio_tracks=audio_tracks,
+            fps=fps,
+            target_file_name=target_file_name,
+        )
+        assert video.media_url, "Fused handlers did not run properly"
+
+        return video
@@ -15,11 +15,10 @@
 
 from loguru import logger
 
-from vikit.common.handler import Handler
-from vikit.wrappers.ffmpeg_wrapper import merge_audio
+from vikit.video.building.handlers.audio_merging_handler import AudioMergingHandler
 
 
-class ReadAloudPromptAudioMergingHandler(Handler):
+class ReadAloudPromptAudioMergingHandler(AudioMergingHandler):
     """
     Handler used to apply a synthetic voice to the video, as an audio prompt
     """
@@ -29,28 +28,19 @@ class ReadAloudPromptAudioMergingHandler(Handler):
             raise ValueError("Recorded prompt is required")
         self.recorded_prompt = recorded_prompt
 
-    async def execute_async(self, video, ml_models_gateway):
+    async def prepare_audio_track_async(self, video, ml_models_gateway=None):
         """
-        Merge prompt generated recording with video  as a single media file
+        Use the prompt generated recording as the synthetic voice that reads the prompt
 
         Args:
             video (Video): The video to process
 
         Returns:
-            The video including generated synthetic voice that reads the prompt
+            str: The path to the prompt recording
         """
         logger.info(
             f"about to merge read aloud prompt audio to video: {video.id}, read aloud media:  {self.recorded_prompt.audio_recording}"
         )
         video.metadata.is_prompt_read_aloud = True
 
-        video.media_url = await merge_audio(
-            media_url=video.media_url,
-            audio_file_path=self.recorded_prompt.audio_recording,
-            target_file_name=video.get_file_name_by_state(
-                build_settings=video.build_settings
-            ),
-        )
-        assert video.media_url, "Media URL was not generated properly"
-
-        return video
+        return self.recorded_prompt.audio_recording
@@ -15,12 +15,12 @@
 
 from loguru import logger
 
-from vikit.common.handler import Handler
 from vikit.gateways.ML_models_gateway import MLModelsGateway
-from vikit.wrappers.ffmpeg_wrapper import get_media_duration, merge_audio
+from vikit.video.building.handlers.audio_merging_handler import AudioMergingHandler
+from vikit.wrappers.ffmpeg_wrapper import get_media_duration_async
 
 
-class GenerateMusicAndMergeHandler(Handler):
+class GenerateMusicAndMergeHandler(AudioMergingHandler):
     def __init__(
         self,
         music_duration: float = None,
@@ -29,15 +29,17 @@ class GenerateMusicAndMergeHandler(Handler):
         self.music_duration = music_duration
         self.bg_music_prompt = bg_music_prompt
 
-    async def execute_async(self, video, ml_models_gateway: MLModelsGateway):
+    async def prepare_audio_track_async(
+        self, video, ml_models_gateway: MLModelsGateway
+    ):
         """
-        Generate a background music based on the prompt and merge it with the video
+        Generate a background music based on the prompt
 
         Args:
             video (Video): The video to process
 
         Returns:
-            CompositeVideo: The composite video
+            str: The path to the generated music
         """
         logger.info(f"about to generate music for video: {video.id} ")
         self.bg_music_prompt = (
@@ -47,7 +49,7 @@ class GenerateMusicAndMergeHandler(Handler):
             self.music_duration = float(self.music_duration)
             logger.info(f"Using provided music duration: {self.music_duration}")
         else:
-            self.music_duration = get_media_duration(video.media_url)
+            self.music_duration = await get_media_duration_async(video.media_url)
             logger.info(
                 f"Using video media duration as music duration: {self.music_duration}"
             )
@@ -60,14 +62,8 @@ class GenerateMusicAndMergeHandler(Handler):
 
         video.metadata.is_bg_music_generated = True
         video.metadata.bg_music_applied = True
-
-        video.media_url = await merge_audio(
-            media_url=video.media_url,
-            audio_file_path=video.background_music,
-            target_file_name=video.get_file_name_by_state(),
-        )
         assert video.background_music is not None, (
             "Background music was not generated properly"
         )
 
-        return video
+        return video.background_music
@@ -13,8 +13,11 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
+
 from loguru import logger
 
+from vikit.common.artifact_cache import get_artifact_cache, get_artifact_key
 from vikit.common.file_tools import download_or_copy_file
 from vikit.common.handler import Handler
 from vikit.gateways.ML_models_gateway import MLModelsGateway
@@ -27,16 +30,45 @@ class VideoInterpolationHandler(Handler):
             f"About to interpolate video: id: {video.id}, media: {video.media_url[:50]}"
         )
 
-        interpolated_video = await ml_models_gateway.interpolate_async(video.media_url)
-        assert interpolated_video, "Interpolated video was not generated properly"
-        video.metadata.is_interpolated = True
+        # Local videos are keyed by content, so a video served from the cache is
+        # interpolated once for all the builds using it
+        artifact_cache = get_artifact_cache()
+        if artifact_cache:
+            # Hashing a local video reads it whole
+            cache_key = await asyncio.to_thread(
+                self._get_cache_key, video, ml_models_gateway
+            )
 
-        interpolated_video_path = await download_or_copy_file(
-            url=interpolated_video,
-            local_path=video.get_file_name_by_state(video.build_settings),
+        video.metadata.is_interpolated = True
+        target_path = video.get_file_name_by_state(video.build_settings)
+        interpolated_video_path = (
+            await artifact_cache.get_async(cache_key, target_path)
+            if artifact_cache
+            else None
         )
+        if not interpolated_video_path:
+            interpolated_video = await ml_models_gateway.interpolate_async(
+                video.media_url
+            )
+            assert interpolated_video, "Interpolated video was not generated properly"
+
+            interpolated_video_path = await download_or_copy_file(
+                url=interpolated_video,
+                local_path=target_path,
+            )
+            if artifact_cache:
+                await artifact_cache.put_async(cache_key, interpolated_video_path)
 
         video.media_url = interpolated_video_path
         assert video.media_url, "Interpolated video was not downloaded properly"
 
         return video
+
+    def _get_cache_key(self, video: Video, ml_models_gateway: MLModelsGateway) -> str:
+        return get_artifact_key(
+            handler=type(self).__name__,
+            gateway=type(ml_models_gateway).__name__,
+            media=video.media_url,
+            model_provider=video.build_settings.target_model_provider,
+            aspect_ratio=video.build_settings.aspect_ratio,
+        )
@@ -15,40 +15,33 @@
 
 from loguru import logger
 
-from vikit.common.handler import Handler
-from vikit.wrappers.ffmpeg_wrapper import merge_audio
+from vikit.video.building.handlers.audio_merging_handler import AudioMergingHandler
 
 
-class MusicMergeHandler(Handler):
+class MusicMergeHandler(AudioMergingHandler):
     def __init__(
         self,
         music_to_merge: str = None,
     ):
         self.music_to_merge = music_to_merge
 
-    async def execute_async(self, video, ml_models_gateway=None):
+    async def prepare_audio_track_async(self, video, ml_models_gateway=None):
         """
-        Generate a background music based on the prompt and merge it with the video
+        Use the provided music as the background music of the video
 
         Args:
             video (Video): The video to process
 
         Returns:
-            CompositeVideo: The composite video
+            str: The path to the music to merge
         """
 
         logger.info(f"about to generate music for video: {video.id} ")
 
         video.metadata.bg_music_applied = True
         video.background_music = self.music_to_merge
-
-        video.media_url = await merge_audio(
-            media_url=video.media_url,
-            audio_file_path=self.music_to_merge,
-            target_file_name=video.get_file_name_by_state(),
-        )
         assert video.background_music is not None, (
             "Background music was not generated properly"
         )
 
-        return video
+        return self.music_to_merge
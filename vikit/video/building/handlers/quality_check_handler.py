@@ -168,22 +168,32 @@ class QualityCheckHandler(Handler):
                     f"We did not manage to generate a qualitative \
                              video {video.id} with AI. Keeping the last video"
                 )
-                video.media_url = await cut_video(video.media_url, 0, 3, 5)
+                video.media_url = await cut_video(
+                    video.media_url, 0, 3, 5, workspace=video.workspace
+                )
             else:
                 logger.debug(
                     f"Video {video.id} is only qualitative \
                              until {is_good_up_to_secs}, reducing it"
                 )
                 video.media_url = await cut_video(
-                    video.media_url, 0, is_good_up_to_secs, 5
+                    video.media_url,
+                    0,
+                    is_good_up_to_secs,
+                    5,
+                    workspace=video.workspace,
                 )
         else:
-            video.media_url = await cut_video(video.media_url, 0, 3, 5)
+            video.media_url = await cut_video(
+                video.media_url, 0, 3, 5, workspace=video.workspace
+            )
         # Or else : is_good_up_to_secs = -1, we just keep the original built_video.media_url
 
         # We invert one video over 4
         random_int = random.randint(0, 4)
         if random_int == 3:
-            video.media_url = await reverse_video(video.media_url)
+            video.media_url = await reverse_video(
+                video.media_url, workspace=video.workspace
+            )
 
         return video
@@ -15,20 +15,19 @@
 
 from loguru import logger
 
-from vikit.common.handler import Handler
-from vikit.wrappers.ffmpeg_wrapper import merge_audio
+from vikit.video.building.handlers.audio_merging_handler import AudioMergingHandler
 
 
-class UsePromptAudioTrackAndAudioMergingHandler(Handler):
-    async def execute_async(self, video: "Video"):
+class UsePromptAudioTrackAndAudioMergingHandler(AudioMergingHandler):
+    async def prepare_audio_track_async(self, video: "Video", ml_models_gateway=None):
         """
-        Merge music and video  as a single media file
+        Use the prompt recording as the audio track of the video
 
         Args:
             video (Video): The video to process
 
         Returns:
-            The video including generated music
+            str: The path to the prompt recording
         """
         logger.info(
             f"about to use recording audio track for video: {video.id}, video url : {video.media_url}"
@@ -41,10 +40,4 @@ class UsePromptAudioTrackAndAudioMergingHandler(Handler):
         video.metadata.is_subtitle_audio_applied = True
         video.background_music = audio_file_path
 
-        video.media_url = await merge_audio(
-            media_url=video.media_url,
-            audio_file_path=audio_file_path,
-            target_file_name=video.get_file_name_by_state(),
-        )
-
-        return video
+        return audio_file_path
@@ -14,13 +14,14 @@
 # ==============================================================================
 
 import copy
-import time
 
 from loguru import logger
 
+from vikit.common.artifact_cache import get_artifact_cache, get_artifact_key
 from vikit.common.config import get_media_polling_interval
-from vikit.common.file_tools import url_exists
+from vikit.common.file_tools import download_or_copy_file
 from vikit.common.handler import Handler
+from vikit.common.media_poller import get_media_poller
 from vikit.gateways.ML_models_gateway import MLModelsGateway
 from vikit.prompt.prompt_factory import PromptFactory
 from vikit.video.video import VideoBuildSettings
@@ -60,6 +61,18 @@ class VideoGenHandler(Handler):
         else:
             model_provider = video.prompt.build_settings.model_provider
 
+        # Identical generation inputs give interchangeable videos, so reuse them
+        artifact_cache = get_artifact_cache()
+        if artifact_cache:
+            cache_key = self._get_cache_key(video, model_provider, ml_models_gateway)
+            cached_video = await artifact_cache.get_async(
+                cache_key, video.get_file_name_by_state(self.video_gen_build_settings)
+            )
+            if cached_video:
+                logger.info(f"Reusing cached video for video: {video.id}")
+                video.media_url = cached_video
+                return video
+
         prompt_to_use = video.prompt
         if video.prompt.reengineer_text_prompt_from_image_and_text:
             new_prompt = copy.deepcopy(prompt_to_use)
@@ -85,18 +98,38 @@ class VideoGenHandler(Handler):
             )
         )
 
-        if not url_exists(video.media_url):
-            logger.warning(
-                f"Media URL {video.media_url} is not available yet, waiting for it for {get_media_polling_interval()} seconds"
+        is_available = await get_media_poller().wait_until_available(
+            video.media_url, timeout_sec=get_media_polling_interval()
+        )
+        if not is_available:
+            logger.error(
+                f"Media URL {video.media_url} is not available yet, the related video will need to be generated after the overall video generation process"
             )
-            time.sleep(get_media_polling_interval())
-            if url_exists(video.media_url):
-                return video.media_url
-            else:
-                logger.error(
-                    f"Media URL {video.media_url} is not available yet, the related video will need to be generated after the overall video generation process"
-                )
         video.media_url_http = video.media_url
 
+        # Only cache the media once it is available, so a failed download never
+        # leaves a broken artifact behind
+        if artifact_cache and is_available:
+            video.media_url = await download_or_copy_file(
+                url=video.media_url_http,
+                local_path=video.get_file_name_by_state(self.video_gen_build_settings),
+            )
+            await artifact_cache.put_async(cache_key, video.media_url)
+
         logger.debug(f"Video generated from prompt: {video.media_url}")
         return video
+
+    def _get_cache_key(self, video, model_provider, ml_models_gateway) -> str:
+        return get_artifact_key(
+            handler=type(self).__name__,
+            gateway=type(ml_models_gateway).__name__,
+            prompt_text=getattr(video.prompt, "text", None),
+            negative_prompt=getattr(video.prompt, "negative_text", None)
+            or video.prompt.negative_prompt,
+            image=getattr(video.prompt, "image", None),
+            reengineer_text_prompt_from_image_and_text=getattr(
+                video.prompt, "reengineer_text_prompt_from_image_and_text", False
+            ),
+            model_provider=model_provider,
+            aspect_ratio=self.video_gen_build_settings.aspect_ratio,
+        )
@@ -18,6 +18,9 @@ from loguru import logger
 from vikit.video.building.handlers.default_bg_music_and_audio_merging_handler import (
     DefaultBGMusicAndAudioMergingHandler,
 )
+from vikit.video.building.handlers.fused_post_build_handler import (
+    FusedPostBuildHandler,
+)
 from vikit.video.building.handlers.gen_read_aloud_prompt_and_audio_merging_handler import (
     ReadAloudPromptAudioMergingHandler,
 )
@@ -41,6 +44,8 @@ class VideoBuildingPipeline:
         - background music based on the build settings (background music)
         - read aloud prompt based on the build settings (read aloud prompt)
 
+        If the build settings ask for it, these handlers are fused into a single one
+        running them as one ffmpeg pass
         """
         handlers = []
 
@@ -58,6 +63,9 @@ class VideoBuildingPipeline:
         )
         handlers.extend(self.get_read_aloud_prompt_handlers(build_settings))
 
+        if build_settings.fuse_post_build_handlers and len(handlers) > 1:
+            handlers = [FusedPostBuildHandler(handlers)]
+
         return handlers
 
     def get_background_music_handlers(self, build_settings: VideoBuildSettings, video):
@@ -13,21 +13,21 @@
 # limitations under the License.
 # ==============================================================================
 
-import asyncio
 import os
 import uuid as uid
 
 from loguru import logger
 
 from vikit.music_building_context import MusicBuildingContext
-from vikit.video.building.build_order import (
-    get_lazy_dependency_chain_build_order,
-    is_composite_video,
-)
+from vikit.video.building.build_order import VideoBuildOrder, is_composite_video
+from vikit.video.building.build_scheduler import BuildScheduler
 from vikit.video.video import DEFAULT_VIDEO_TITLE, Video
 from vikit.video.video_build_settings import VideoBuildSettings
 from vikit.video.video_types import VideoType
-from vikit.wrappers.ffmpeg_wrapper import concatenate_videos, get_media_duration
+from vikit.wrappers.ffmpeg_wrapper import (
+    concatenate_videos,
+    get_media_duration_async,
+)
 
 
 class CompositeVideo(Video, is_composite_video):
@@ -88,7 +88,9 @@ class CompositeVideo(Video, is_composite_video):
         if self.build_settings.cascade_build_settings:
             return self.build_settings
         else:
+            # The children write their files next to the composite ones
             return VideoBuildSettings(
+                target_dir_path=self.workspace.path,
                 interpolate=self.build_settings.interpolate,
                 include_read_aloud_prompt=False,
                 music_building_context=MusicBuildingContext(
@@ -100,6 +102,7 @@ class CompositeVideo(Video, is_composite_video):
                 is_good_until=self.build_settings.is_good_until,
                 max_attempts=self.build_settings.max_attempts,
                 prompt_updater_fn=self.build_settings.prompt_updater_fn,
+                fuse_post_build_handlers=self.build_settings.fuse_post_build_handlers,
             )
 
     def append_video(self, video: Video):
@@ -144,6 +147,22 @@ class CompositeVideo(Video, is_composite_video):
             self.metadata.duration = all_video_duration
             return all_video_duration
 
+    async def get_duration_async(self):
+        """
+        Get the duration of the video without blocking the event loop, we recompute
+        it every time as the duration of the video can change if we add or remove videos
+        """
+        if self.metadata.is_video_built:
+            return self.metadata.duration
+        else:
+            all_video_duration = 0
+            for video in self.video_list:
+                all_video_duration += await video.get_duration_async()
+            self._duration = all_video_duration
+
+            self.metadata.duration = all_video_duration
+            return all_video_duration
+
     def get_title(self):
         """
         Get the title of the video, we recompute it every time
@@ -213,46 +232,20 @@ class CompositeVideo(Video, is_composite_video):
             self.is_root_video_composite
         ):  # This check is important: we generate an ordered video list
             # for the whole video tree at once
-            ordered_video_list = get_lazy_dependency_chain_build_order(
-                video_tree=self.video_list,
-                build_settings=build_settings,
-                already_added=set(),
-            )
-            no_dependency_videos = [
-                v for v in ordered_video_list if not v.video_dependencies
-            ]
-            await asyncio.gather(
-                *(
-                    v.build(
-                        self.get_children_build_settings(),
-                        ml_models_gateway=ml_models_gateway,
-                    )
-                    for v in no_dependency_videos
+            ordered_video_list = VideoBuildOrder(
+                video_tree=self.video_list, build_settings=build_settings
+            ).get_build_order()
+
+            async def build_video(video: Video):
+                await video.build(
+                    build_settings=self.get_children_build_settings(),
+                    ml_models_gateway=ml_models_gateway,
                 )
-            )
-            with_dependency_videos = [
-                v for v in ordered_video_list if v.video_dependencies
-            ]
-            # Repeat the process until all videos are processed.
-            while with_dependency_videos:
-                tasks = []
-                for video in with_dependency_videos[:]:
-                    dependencies_processed = all(
-                        dep._is_video_built for dep in video.video_dependencies
-                    )
-                    if dependencies_processed:
-                        tasks.append(
-                            video.build(
-                                build_settings=self.get_children_build_settings(),
-                                ml_models_gateway=ml_models_gateway,
-                            )
-                        )
-                        with_dependency_videos.remove(video)
-
-                if tasks:
-                    await asyncio.gather(*tasks)
-                else:
-                    raise Exception("Some dependencies could not be processed.")
+
+            # Each video starts building as soon as its own dependencies are built
+            await BuildScheduler(
+                max_concurrency=build_settings.max_concurrent_builds
+            ).run(ordered_video_list, build_video)
 
         # at this stage we should have all the videos generated. Will be improved in the future
         # in case we are called directly on a child composite without starting by the composite root
@@ -330,13 +323,12 @@ class CompositeVideo(Video, is_composite_video):
                 name, extension = os.path.splitext(os.path.basename(self.media_url))
                 _name = name.replace(DEFAULT_VIDEO_TITLE, "YourVideo")
                 new_name = f"{_name}_{uid.uuid4()}{extension}"
-                build_settings.target_file_name = os.path.join(
-                    os.path.dirname(self.media_url), new_name
-                )
+                # The final video is written next to the other files of the build
+                build_settings.target_file_name = new_name
                 logger.info(
-                    f"Your final video name is : {build_settings.target_file_name}"
+                    f"Your final video name is : {self.workspace.get_path(new_name)}"
                 )
-        self.metadata.duration = get_media_duration(self.media_url)
+        self.metadata.duration = await get_media_duration_async(self.media_url)
 
     def generate_background_music_prompt(self):
         """
@@ -13,16 +13,15 @@
 # limitations under the License.
 # ==============================================================================
 
+import asyncio
 import copy
 import os
 
 import pysrt
 from loguru import logger
 
-from vikit.gateways.ML_models_gateway import MLModelsGateway
+from vikit.gateways.ML_models_gateway import MLModelsGateway, PromptEnhancement
 from vikit.prompt.prompt import Prompt
-from vikit.prompt.prompt_build_settings import PromptBuildSettings
-from vikit.prompt.prompt_factory import PromptFactory
 from vikit.video.composite_video import CompositeVideo
 from vikit.video.raw_text_based_video import RawTextBasedVideo
 from vikit.video.video import VideoBuildSettings
@@ -98,15 +97,26 @@ class PromptBasedVideo(CompositeVideo):
             )
             build_settings.prompt = self._prompt
 
-        for sub in self._prompt.subtitles:
-            vid_cp_sub = CompositeVideo()
-            (
-                keyword_based_vid,
-                prompt_based_vid,
-            ) = await self._prepare_basic_building_block(
-                sub, build_stgs=build_settings, ml_models_gateway=ml_models_gateway
+        # All the subtitles are enhanced up front, in as few LLM requests as the
+        # gateway allows, then their building blocks are prepared concurrently
+        subtitles = list(self._prompt.subtitles)
+        prompt_enhancements = await ml_models_gateway.get_prompt_enhancements_async(
+            [sub.text for sub in subtitles]
+        )
+        building_blocks = await asyncio.gather(
+            *(
+                self._prepare_basic_building_block(
+                    sub,
+                    build_stgs=build_settings,
+                    ml_models_gateway=ml_models_gateway,
+                    prompt_enhancement=prompt_enhancement,
+                )
+                for sub, prompt_enhancement in zip(subtitles, prompt_enhancements)
             )
+        )
 
+        for keyword_based_vid, prompt_based_vid in building_blocks:
+            vid_cp_sub = CompositeVideo()
             vid_cp_sub.append_video(keyword_based_vid).append_video(
                 prompt_based_vid
             )  # Building a set of 2 videos around the same text + a transition
@@ -120,6 +130,7 @@ class PromptBasedVideo(CompositeVideo):
         sub: pysrt.SubRipItem,
         ml_models_gateway: MLModelsGateway,
         build_stgs: VideoBuildSettings = None,
+        prompt_enhancement: PromptEnhancement = None,
     ):
         """
         build the basic building block of the full video/
@@ -132,32 +143,19 @@ class PromptBasedVideo(CompositeVideo):
         Params:
             - sub_text: the subtitle text
             - build_stgs: the VideoBuildSettings
+            - prompt_enhancement: the LLM enhancements of the subtitle text, requested
+              from the gateway if not provided
 
         Returns:
             - keyword_based_vid: the video generated from the keyword
             - prompt_based_vid: the video generated from the prompt
         """
-
-        prompt_fact = PromptFactory(ml_models_gateway=ml_models_gateway)
-        enhanced_prompt_from_keywords = (
-            await prompt_fact.get_reengineered_prompt_text_from_raw_text(
-                prompt=sub.text,
-                prompt_build_settings=PromptBuildSettings(
-                    generate_from_llm_keyword=True,
-                    generate_from_llm_prompt=False,
-                ),
+        if prompt_enhancement is None:
+            (prompt_enhancement,) = (
+                await ml_models_gateway.get_prompt_enhancements_async([sub.text])
             )
-        )
-
-        enhanced_prompt_from_prompt_text = (
-            await prompt_fact.get_reengineered_prompt_text_from_raw_text(
-                prompt=sub.text,
-                prompt_build_settings=PromptBuildSettings(
-                    generate_from_llm_keyword=False,
-                    generate_from_llm_prompt=True,
-                ),
-            )
-        )
+        enhanced_prompt_from_keywords = prompt_enhancement.keywords
+        enhanced_prompt_from_prompt_text = prompt_enhancement.enhanced_prompt
 
         build_stgs_video_1 = copy.copy(build_stgs)
         build_stgs_video_1.target_file_name = None
@@ -81,6 +81,9 @@ class RawFixedImageVideo(Video):
     def get_duration(self):
         return self.duration
 
+    async def get_duration_async(self):
+        return self.get_duration()
+
     def run_build_core_logic_hook(
         self, build_settings: VideoBuildSettings, ml_models_gateway
     ):
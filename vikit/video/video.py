@@ -16,19 +16,20 @@
 import os
 import random
 import re
-import shutil
 import uuid as uid
 from abc import ABC, abstractmethod
 
 from loguru import logger
 
 from vikit.common.decorators import log_function_params
+from vikit.common.file_copy import CopyStrategy, link_or_copy_file
 from vikit.common.file_tools import (
     download_or_copy_file,
     is_valid_filename,
     is_valid_path,
 )
 from vikit.common.handler import Handler
+from vikit.common.workspace import BuildWorkspace
 from vikit.gateways.ML_models_gateway_factory import MLModelsGatewayFactory
 from vikit.prompt.prompt import Prompt
 from vikit.video.building.video_building_pipeline import VideoBuildingPipeline
@@ -39,6 +40,7 @@ from vikit.wrappers.ffmpeg_wrapper import (
     get_first_frame_as_image_ffmpeg,
     get_last_frame_as_image_ffmpeg,
     get_media_duration,
+    get_media_duration_async,
 )
 
 DEFAULT_VIDEO_TITLE = "no-title-yet"
@@ -94,6 +96,7 @@ class Video(ABC):
         self.are_build_settings_prepared = False
         self.discarded = False
         self.video_dependencies = []  # Define video dependencies, i.e. the videos that are needed to build the current video
+        self._workspace = None
 
     def __str__(self):
         return f"ID:  {self.id}, type: {type(self)}, short_type_name: {self.short_type_name} , title: {self.title}, duration: {self.duration}, is_video_built: {self.is_video_built}"
@@ -119,6 +122,20 @@ class Video(ABC):
     def metadata(self):
         return self._videoMetadata
 
+    @property
+    def workspace(self) -> BuildWorkspace:
+        """
+        Get the workspace the video files are written to: the one the video is being
+        or has been built in, or the one of its build settings before the build
+        """
+        if self._workspace is not None:
+            return self._workspace
+        return self.build_settings.get_workspace()
+
+    @workspace.setter
+    def workspace(self, value: BuildWorkspace):
+        self._workspace = value
+
     @property
     @abstractmethod
     def short_type_name(self):
@@ -227,7 +244,7 @@ class Video(ABC):
         """
         Get the first frame of the video
         """
-        target_path = f"fst_frm_{self.id}.jpg"
+        target_path = self.workspace.create().get_path(f"fst_frm_{self.id}.jpg")
 
         return await get_first_frame_as_image_ffmpeg(
             media_url=self.media_url, target_path=target_path
@@ -237,7 +254,7 @@ class Video(ABC):
         """
         Get the last frame of the video
         """
-        target_path = f"lst_frm_{self.id}.jpg"
+        target_path = self.workspace.create().get_path(f"lst_frm_{self.id}.jpg")
 
         return await get_last_frame_as_image_ffmpeg(
             media_url=self.media_url, target_path=target_path
@@ -255,16 +272,17 @@ class Video(ABC):
         self.duration = float(get_media_duration(self.media_url))
         return self._duration
 
-    def _set_working_folder_dir(self, working_folder_path: str):
-        if working_folder_path:
-            if is_valid_path(working_folder_path):
-                os.chdir(working_folder_path)
-                return True
-            else:
-                logger.warning(
-                    f"Video target dir path name is None or invalid, using the current video generation path: {os.getcwd()}"
-                )
-                return False
+    async def get_duration_async(self):
+        """
+        Get the duration of the final video without blocking the event loop
+
+        Returns:
+            float: The duration of the final video
+        """
+        if self.media_url is None:
+            raise ValueError("The source media URL is not set")
+        self.duration = float(await get_media_duration_async(self.media_url))
+        return self._duration
 
     def build(
         self,
@@ -279,11 +297,8 @@ class Video(ABC):
         """
         import asyncio
 
-        if not ml_models_gateway:
-            ml_models_gateway = MLModelsGatewayFactory().get_ml_models_gateway(
-                test_mode=False
-            )
-
+        # The gateway is created by build_async if needed, so it is closed by the build
+        # owning it
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -319,17 +334,32 @@ class Video(ABC):
             return self
 
         if not ml_models_gateway:
-            ml_models_gateway = MLModelsGatewayFactory().get_ml_models_gateway(
+            # The gateway is owned by this build, so its pooled connections are closed
+            # once the build is over
+            async with MLModelsGatewayFactory().get_ml_models_gateway(
                 test_mode=False
-            )
+            ) as ml_models_gateway:
+                return await self._build_async(build_settings, ml_models_gateway)
 
-        current_dir = os.getcwd()
-        logger.trace(
-            f"Starting the pre build hook for Video {self.id}, current_dir {current_dir} "
-        )
+        return await self._build_async(build_settings, ml_models_gateway)
 
-        wfolder_changed = self._set_working_folder_dir(build_settings.output_path)
-        logger.trace(f"Working folder has changed? : {wfolder_changed}")
+    async def _build_async(self, build_settings: VideoBuildSettings, ml_models_gateway):
+        """
+        Build the video with the given gateway, see build_async
+        """
+        # The files of the build are written to its workspace, using absolute paths,
+        # so concurrent builds in the same process do not depend on the working folder
+        if build_settings.output_path and not is_valid_path(
+            build_settings.output_path
+        ):
+            logger.warning(
+                f"Video target dir path name is invalid, using the current working folder: {os.getcwd()}"
+            )
+            self.workspace = BuildWorkspace()
+        else:
+            self.workspace = build_settings.get_workspace()
+        self.workspace.create()
+        logger.trace(f"Building Video {self.id} in workspace {self.workspace}")
 
         logger.trace(
             f"Starting the pre build hook for Video {self.id} of type {self.short_type_name} / {type(self)}"
@@ -367,11 +397,6 @@ class Video(ABC):
                 output_file_name=self.build_settings.target_file_name,
             )
 
-        if wfolder_changed:
-            self._set_working_folder_dir(
-                current_dir
-            )  # go back to the original working folder
-
         self.is_video_built = True
 
         return built_video
@@ -417,7 +442,7 @@ class Video(ABC):
             local_path=self.get_file_name_by_state(self.build_settings),
         )
         self.metadata.duration = (
-            self.get_duration()
+            await self.get_duration_async()
         )  # This needs to happen once the video has been downloaded
 
         return built_video
@@ -491,7 +516,7 @@ class Video(ABC):
         current_file_name = os.path.basename(self.media_url)
         # We should already be positioned in the right target folder
         if current_file_name != output_file_name:
-            new_file_path = output_file_name
+            new_file_path = self.workspace.get_path(output_file_name)
             logger.debug(
                 f"Copying video media file from {self.media_url} to {new_file_path}"
             )
@@ -500,9 +525,20 @@ class Video(ABC):
                     f"Invalid output file name: {output_file_name}, cannot rename the video media file"
                 )
             try:
-                shutil.copyfile(
+                # The intermediate file written by this build under its state name is
+                # not needed anymore, so it is moved. Otherwise the file may belong to
+                # the caller: a built video is never rewritten, so it can share its
+                # content
+                link_or_copy_file(
                     self.media_url,
                     new_file_path,
+                    allow_move=self.media_url == self.get_file_name_by_state(),
+                    strategies=[
+                        CopyStrategy.RENAME,
+                        CopyStrategy.HARDLINK,
+                        CopyStrategy.REFLINK,
+                        CopyStrategy.COPY,
+                    ],
                 )
                 self.media_url = new_file_path
             except Exception as e:
@@ -512,7 +548,8 @@ class Video(ABC):
 
     def get_file_name_by_state(self, build_settings: VideoBuildSettings = None):
         """
-        Get the file name of the video by its state
+        Get the file name of the video by its state, as an absolute path in the
+        workspace of the video
 
         Shortcut method not to have to call the VideoFileName class directly
         """
@@ -520,16 +557,15 @@ class Video(ABC):
         if not build_settings and not self.build_settings:
             raise ValueError("build_settings should be set")
 
-        inferred_name = str(
-            VideoFileName(
-                video_type=self.short_type_name,
-                video_metadata=self.metadata,
-                build_settings=(
-                    self.build_settings if not build_settings else build_settings
-                ),
-            )
-        )
-        return inferred_name
+        inferred_path = VideoFileName(
+            video_type=self.short_type_name,
+            video_metadata=self.metadata,
+            build_settings=(
+                self.build_settings if not build_settings else build_settings
+            ),
+            workspace=self.workspace,
+        ).path
+        return inferred_path
 
     def generate_background_music_prompt(self):
         """
@@ -36,6 +36,8 @@ class VideoBuildSettings(GeneralBuildSettings.GeneralBuildSettings):
         is_good_until=None,
         prompt_updater_fn=None,
         max_attempts=1,
+        fuse_post_build_handlers: bool = False,
+        max_concurrent_builds: int = None,
     ):
         """
         VideoBuildSettings class constructor
@@ -63,6 +65,10 @@ class VideoBuildSettings(GeneralBuildSettings.GeneralBuildSettings):
                 video generation prompt for each attempt. If not specified, the same
                 prompt is reused for every attempt. Used in combination with the
                 is_good_until filter function and max_attempts.
+            fuse_post_build_handlers: Whether to run the reencoding and audio merging
+                steps that follow a video build as a single ffmpeg pass
+            max_concurrent_builds: The maximum number of videos of a composite building
+                at the same time, or None for no limit
         """
 
         super().__init__(
@@ -83,6 +89,8 @@ class VideoBuildSettings(GeneralBuildSettings.GeneralBuildSettings):
         self.is_good_until = is_good_until
         self.max_attempts = max_attempts
         self.prompt_updater_fn = prompt_updater_fn
+        self.fuse_post_build_handlers = fuse_post_build_handlers
+        self.max_concurrent_builds = max_concurrent_builds
 
     def __copy__(self):
         return VideoBuildSettings(
@@ -99,4 +107,6 @@ class VideoBuildSettings(GeneralBuildSettings.GeneralBuildSettings):
             vikit_api_key=self.vikit_api_key,
             aspect_ratio=self.aspect_ratio,
             max_attempts=self.max_attempts,
+            fuse_post_build_handlers=self.fuse_post_build_handlers,
+            max_concurrent_builds=self.max_concurrent_builds,
         )
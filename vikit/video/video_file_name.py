@@ -19,6 +19,7 @@ import os
 from loguru import logger
 
 from vikit.common.file_tools import get_max_path_length
+from vikit.common.workspace import BuildWorkspace
 from vikit.video.video_build_settings import VideoBuildSettings
 from vikit.video.video_metadata import VideoMetadata
 
@@ -46,6 +47,7 @@ class VideoFileName:
         video_type: str = None,
         video_features: str = None,
         file_extension: str = "mp4",
+        workspace: BuildWorkspace = None,
     ):
         """
         Initializes the file name with the metadata
@@ -67,6 +69,8 @@ class VideoFileName:
                 - 5th digit: free to use
 
             file_extension: The file extension of the video, uses 3 digits max
+            workspace: The workspace the video file is written to, defaults to the
+                workspace of the build settings
         """
         if video_metadata is None:
             raise ValueError("video_metadata cannot be None")
@@ -78,6 +82,7 @@ class VideoFileName:
         if build_settings is None:
             raise ValueError("build_settings cannot be None")
         self._build_settings = build_settings
+        self._workspace = workspace
 
         self._build_id = build_settings.id
         self._build_date = build_settings.build_date
@@ -121,13 +126,13 @@ class VideoFileName:
         Parse a file name to extract the metadata
 
         params:
-            file_name: The file name to parse
+            file_name: The file name to parse, or its path
 
         returns:
             VideoFileName: The video file name object
         """
 
-        parts = file_name.split("__")
+        parts = os.path.basename(file_name).split("__")
         title = parts[0]
         bld_settings = VideoBuildSettings()
         bld_settings.id = parts[3]
@@ -210,8 +215,24 @@ class VideoFileName:
         self._file_name = file_name
         return self._file_name
 
+    @property
+    def workspace(self) -> BuildWorkspace:
+        """
+        Get the workspace the video file is written to
+        """
+        if self._workspace is None:
+            self._workspace = self._build_settings.get_workspace()
+        return self._workspace
+
+    @property
+    def path(self) -> str:
+        """
+        Get the absolute path of the video file in its workspace
+        """
+        return self.workspace.get_path(str(self))
+
     def __str__(self):
-        return self._fit(target_path=self._build_settings.output_path)
+        return self._fit(target_path=self.workspace.path)
 
     def __repr__(self):
         return f"Title: {self.title}, Video Type: {self._video_type}, Video Features: {self._video_features} , Build ID: {self._build_id}, Build Date: {self._build_date}"
@@ -270,7 +291,7 @@ class VideoFileName:
         return: the fitted file name
         """
         if target_path is None:
-            target_path = os.getcwd()
+            target_path = self.workspace.path
 
         if self.length + len(target_path) >= get_max_path_length():
             logger.warning(
@@ -24,6 +24,33 @@ from loguru import logger
 import vikit.common.config as config
 from vikit.common.decorators import log_function_params
 from vikit.common.file_tools import get_canonical_name
+from vikit.common.workspace import BuildWorkspace
+from vikit.wrappers.media_executor import MediaJobClass, get_media_executor
+from vikit.wrappers.media_info_cache import get_media_info_cache
+
+# Codecs that can be stream copied as is into an mp4 container
+STREAM_COPY_VIDEO_CODECS = ["h264", "hevc"]
+STREAM_COPY_AUDIO_CODECS = ["aac", "mp3"]
+# Stream parameters that must be identical for videos to be concatenated without
+# re-encoding
+STREAM_COPY_VIDEO_KEYS = [
+    "codec_name",
+    "profile",
+    "width",
+    "height",
+    "pix_fmt",
+    "r_frame_rate",
+    "time_base",
+]
+STREAM_COPY_AUDIO_KEYS = ["codec_name", "sample_rate", "channels", "channel_layout"]
+
+
+def _get_default_target_path(file_name: str, workspace: BuildWorkspace = None) -> str:
+    """
+    Get the absolute path of an output file the caller did not name, in the workspace
+    of the build or, without workspace, in the current working directory
+    """
+    return (workspace or BuildWorkspace()).get_path(file_name)
 
 
 async def extract_audio_from_video(video_full_path, target_dir: str = None) -> str:
@@ -71,51 +98,148 @@ async def extract_audio_from_video(video_full_path, target_dir: str = None) -> s
 
     # The command you want to execute
     # TODO: allow for encoding and frequency selection by end user
-    cmd = ["ffmpeg", "-i", video_full_path, target_file_path]
-
-    logger.debug(" ".join(cmd))
-
-    # Execute the command
-    subprocess.run(cmd, check=True)
+    cmd = ("ffmpeg", "-i", video_full_path, target_file_path)
+    await _run_command(cmd)
 
     assert os.path.exists(target_file_path), f"File {target_file_path} does not exist"
 
     return target_file_path
 
 
-@log_function_params
-def has_audio_track(video_path):
+def get_media_info(media_path: str) -> dict:
     """
-    Check if the video has an audio track
+    Get the description of all the streams and of the container format of a media
+    file, using a single ffprobe call.
+
+    The result is cached as long as the file is not modified, so probing the same
+    file again (e.g. for its duration, then its FPS) does not spawn a new process.
 
     Args:
-        video_path (str): The path to the video file
+        media_path (str): The path to the media file
 
     Returns:
-        bool: True if the video has an audio track, False otherwise
+        dict: The ffprobe output, with a "streams" list and a "format" dict
+    """
+    assert os.path.exists(media_path), f"File {media_path} does not exist"
+
+    media_info_cache = get_media_info_cache()
+    media_info = media_info_cache.get(media_path)
+    if media_info is not None:
+        logger.trace(f"Media info cache hit for {media_path}")
+        return media_info
 
+    cmd = _get_media_info_command(media_path)
+    logger.debug(" ".join(cmd))
+
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    logger.trace(f"Subprocess run stderr for get_media_info :  {result.stderr}")
+    result.check_returncode()
+
+    media_info = json.loads(result.stdout)
+    media_info_cache.put(media_path, media_info)
+    return media_info
+
+
+async def get_media_info_async(media_path: str) -> dict:
+    """
+    Get the description of all the streams and of the container format of a media
+    file without blocking the event loop. Shares its cache with get_media_info.
+
+    Args:
+        media_path (str): The path to the media file
+
+    Returns:
+        dict: The ffprobe output, with a "streams" list and a "format" dict
     """
+    assert os.path.exists(media_path), f"File {media_path} does not exist"
+
+    media_info_cache = get_media_info_cache()
+    media_info = media_info_cache.get(media_path)
+    if media_info is not None:
+        logger.trace(f"Media info cache hit for {media_path}")
+        return media_info
+
+    stdout = await _run_command(
+        _get_media_info_command(media_path), job_class=MediaJobClass.PROBE
+    )
+
+    media_info = json.loads(stdout)
+    media_info_cache.put(media_path, media_info)
+    return media_info
 
-    command = [
+
+def _get_media_info_command(media_path: str) -> tuple[str]:
+    return (
         "ffprobe",
         "-v",
-        "quiet",
+        "error",
         "-print_format",
         "json",
         "-show_streams",
-        video_path,
+        "-show_format",
+        media_path,
+    )
+
+
+def _get_has_audio_track(media_info: dict) -> bool:
+    return any(
+        stream.get("codec_type") == "audio" for stream in media_info.get("streams", [])
+    )
+
+
+def _get_duration(media_info: dict) -> float:
+    duration = media_info.get("format", {}).get("duration")
+    if duration is None:
+        # Some containers only report the duration at the stream level
+        stream_durations = [
+            float(stream["duration"])
+            for stream in media_info.get("streams", [])
+            if "duration" in stream
+        ]
+        if not stream_durations:
+            raise ValueError("No duration found in media info")
+        duration = max(stream_durations)
+    return float(duration)
+
+
+def _get_fps(media_info: dict) -> float:
+    video_streams = [
+        stream
+        for stream in media_info.get("streams", [])
+        if stream.get("codec_type") == "video"
     ]
+    if not video_streams:
+        raise ValueError("No video stream found in media info")
 
-    logger.debug(" ".join(command))
+    numerator, _, denominator = video_streams[0]["r_frame_rate"].partition("/")
+    return float(numerator) / float(denominator or 1)
 
-    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    logger.trace(f"Subprocess run stdout for has_audio_track :  {result.stdout}")
-    logger.trace(f"Subprocess run stderr for has_audio_track :  {result.stderr}")
 
-    result.check_returncode()
+def _get_frame_size(media_info: dict) -> tuple[int, int]:
+    video_streams = [
+        stream
+        for stream in media_info.get("streams", [])
+        if stream.get("codec_type") == "video"
+    ]
+    if not video_streams:
+        raise ValueError("No video stream found in media info")
 
-    streams = json.loads(result.stdout)["streams"]
-    return any(stream["codec_type"] == "audio" for stream in streams)
+    return int(video_streams[0]["width"]), int(video_streams[0]["height"])
+
+
+@log_function_params
+def has_audio_track(video_path):
+    """
+    Check if the video has an audio track
+
+    Args:
+        video_path (str): The path to the video file
+
+    Returns:
+        bool: True if the video has an audio track, False otherwise
+
+    """
+    return _get_has_audio_track(get_media_info(video_path))
 
 
 def get_media_duration(input_video_path):
@@ -128,30 +252,7 @@ def get_media_duration(input_video_path):
     Returns:
         float: The duration of the media file in seconds.
     """
-    assert os.path.exists(input_video_path), f"File {input_video_path} does not exist"
-
-    cmd = (
-        "ffprobe",
-        "-v",
-        "error",
-        "-show_entries",
-        "format=duration",
-        "-of",
-        "default=noprint_wrappers=1:nokey=1",
-        input_video_path,
-    )
-
-    logger.debug(" ".join(cmd))
-
-    result = subprocess.run(
-        [
-            *cmd,
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-    )
-    result.check_returncode()
-    return float(float(result.stdout))
+    return _get_duration(get_media_info(input_video_path))
 
 
 def get_media_fps(input_video_path):
@@ -164,50 +265,68 @@ def get_media_fps(input_video_path):
     Returns:
         float: The FPS of the media file in frames per seconds.
     """
-    assert os.path.exists(input_video_path), f"File {input_video_path} does not exist"
+    return _get_fps(get_media_info(input_video_path))
 
-    cmd = (
-        "ffprobe",
-        "-v",
-        "0",
-        "-of",
-        "csv=p=0",
-        "-select_streams",
-        "v:0",
-        "-show_entries",
-        "stream=r_frame_rate",
-        input_video_path,
-    )
 
-    logger.debug(" ".join(cmd))
+async def has_audio_track_async(video_path: str) -> bool:
+    """
+    Check if the video has an audio track, without blocking the event loop
 
-    result = subprocess.run(
-        [
-            *cmd,
-        ],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-    )
-    result.check_returncode()
+    Args:
+        video_path (str): The path to the video file
 
-    # Extract the denominator of the frame rate fraction
-    result_stdout = str(result.stdout).split("/")[1].strip().replace("\\n'", "")
+    Returns:
+        bool: True if the video has an audio track, False otherwise
+    """
+    return _get_has_audio_track(await get_media_info_async(video_path))
 
-    # Handle cases where the extracted value ends with an unwanted character
-    if result_stdout.endswith((".", ",")):
-        result_stdout = result_stdout[:-1] + (
-            "0" if result_stdout.endswith(".") else "."
-        )
 
-    # Compute FPS by dividing the numerator by the denominator
+async def get_media_duration_async(input_video_path: str) -> float:
+    """
+    Get the duration of a media file, without blocking the event loop
 
-    return float(str(result.stdout).split("/")[0].replace("b'", "")) / float(
-        result_stdout
-    )
+    Args:
+        input_video_path (str): The path to the input video file.
+
+    Returns:
+        float: The duration of the media file in seconds.
+    """
+    return _get_duration(await get_media_info_async(input_video_path))
+
+
+async def get_media_fps_async(input_video_path: str) -> float:
+    """
+    Get the frames per second of a media file, without blocking the event loop
+
+    Args:
+        input_video_path (str): The path to the input video file.
+
+    Returns:
+        float: The FPS of the media file in frames per seconds.
+    """
+    return _get_fps(await get_media_info_async(input_video_path))
+
+
+async def get_media_frame_size_async(input_video_path: str) -> tuple[int, int]:
+    """
+    Get the width and height of the frames of a video file, without blocking the event
+    loop
+
+    Args:
+        input_video_path (str): The path to the input video file.
+
+    Returns:
+        tuple: The width and height of the frames in pixels.
+    """
+    return _get_frame_size(await get_media_info_async(input_video_path))
 
 
 async def extract_audio_slice(
-    audiofile_path: str, start: float = 0, end: float = 1, target_file_name: str = None
+    audiofile_path: str,
+    start: float = 0,
+    end: float = 1,
+    target_file_name: str = None,
+    workspace: BuildWorkspace = None,
 ):
     """
     Extract a slice of the audio file using ffmpeg
@@ -217,6 +336,8 @@ async def extract_audio_slice(
         end (int): The end of the slice
         audiofile_path (str): The path to the audio file
         target_file_name : the target file name
+        workspace (BuildWorkspace): The workspace of the default target file,
+            defaults to the current working directory
 
     Returns:
         str: The path to the extracted audio slice
@@ -227,7 +348,7 @@ async def extract_audio_slice(
     )
 
     if not target_file_name:
-        target_file_name = (
+        target_file_name = _get_default_target_path(
             "_".join(
                 [
                     config.get_sub_audio_for_subtitle_prefix(),
@@ -236,12 +357,11 @@ async def extract_audio_slice(
                     str(float(end)),
                 ]
             )
-            + ".mp3"
+            + ".mp3",
+            workspace,
         )
-    else:
-        target_file_name = target_file_name
 
-    media_length = get_media_duration(audiofile_path)
+    media_length = await get_media_duration_async(audiofile_path)
     if end is None:
         end = media_length
 
@@ -253,15 +373,16 @@ async def extract_audio_slice(
         "-y",
         "-ss",
         str(start),
+        # -t is a duration, not an end time
         "-t",
-        str(end),
+        str(end - start),
         "-i",
         audiofile_path,
         "-acodec",
         "copy",
         target_file_name,
     )
-    await _run_command(cmd)
+    await _run_command(cmd, job_class=MediaJobClass.REMUX)
     return target_file_name
 
 
@@ -282,14 +403,58 @@ async def convert_as_mp3_file(fileName, target_file_name: str):
     return target_file_name
 
 
+def _get_stream_copy_signature(media_info: dict) -> tuple:
+    """
+    Get the stream parameters that must be identical across files for them to be
+    concatenated without re-encoding, or None if the file cannot be stream copied into
+    an mp4 container
+    """
+    streams = media_info.get("streams", [])
+    video_streams = [s for s in streams if s.get("codec_type") == "video"]
+    audio_streams = [s for s in streams if s.get("codec_type") == "audio"]
+    if len(video_streams) != 1 or len(audio_streams) > 1:
+        return None
+
+    video_stream = video_streams[0]
+    if video_stream.get("codec_name") not in STREAM_COPY_VIDEO_CODECS:
+        return None
+    signature = tuple(video_stream.get(key) for key in STREAM_COPY_VIDEO_KEYS)
+
+    if audio_streams:
+        audio_stream = audio_streams[0]
+        if audio_stream.get("codec_name") not in STREAM_COPY_AUDIO_CODECS:
+            return None
+        signature += tuple(audio_stream.get(key) for key in STREAM_COPY_AUDIO_KEYS)
+    else:
+        signature += (None,) * len(STREAM_COPY_AUDIO_KEYS)
+
+    return signature
+
+
+def _can_concatenate_with_stream_copy(media_infos: list[dict]) -> bool:
+    """
+    Check whether files can be concatenated with the concat demuxer and -c copy, i.e.
+    they all share the same codec parameters, frame rate, resolution and audio layout
+    """
+    signatures = set(_get_stream_copy_signature(info) for info in media_infos)
+    return len(signatures) == 1 and None not in signatures
+
+
 async def concatenate_videos(
     video_file_paths: list[str],
     target_file_name: str = None,
     ratio_to_multiply_animations: float = 1,
+    allow_stream_copy: bool = True,
+    workspace: BuildWorkspace = None,
 ) -> str:
     """
     Concatenate multiple videos into a single video.
 
+    When the videos are not sped up nor slowed down and they all share the same
+    encoding parameters, e.g. because they have been normalized by the re-encoding
+    handler, they are concatenated without re-encoding, which is mostly I/O bound.
+    Otherwise the concatenated video is re-encoded.
+
     Args:
         video_file_paths: The file paths to the videos to concatenate. Must contain at
             least 1 path and all videos must have the same FPS.
@@ -297,6 +462,9 @@ async def concatenate_videos(
             TargetCompositeVideo.mp4
         ratioToMultiplyAnimations: The ratio by which to speed up or slow down the video
             to match its duration to an expected duration, e.g. of an audio track.
+        allow_stream_copy: If False, the concatenated video is always re-encoded
+        workspace: The workspace of the default target file, defaults to the current
+            working directory
 
     Returns:
         str: The path to the concatenated video file
@@ -312,10 +480,17 @@ async def concatenate_videos(
         if not os.path.exists(video_path):
             raise FileNotFoundError(video_path)
 
+    media_infos = await asyncio.gather(
+        *(get_media_info_async(path) for path in video_file_paths)
+    )
+
     # Ensure that all videos have the same FPS and record it for later use.
-    fps_values = set(get_media_fps(path) for path in video_file_paths)
+    fps_by_path = {
+        path: _get_fps(media_info)
+        for path, media_info in zip(video_file_paths, media_infos)
+    }
+    fps_values = set(fps_by_path.values())
     if len(fps_values) > 1:
-        fps_by_path = {path: get_media_fps(path) for path in video_file_paths}
         raise ValueError(f"Cannot concatenate videos with different FPS: {fps_by_path}")
     fps = list(fps_values)[0]
 
@@ -325,7 +500,15 @@ async def concatenate_videos(
             f"{ratio_to_multiply_animations}"
         )
 
-    target_file_name = target_file_name or "TargetCompositeVideo.mp4"
+    target_file_name = target_file_name or _get_default_target_path(
+        "TargetCompositeVideo.mp4", workspace
+    )
+
+    use_stream_copy = (
+        allow_stream_copy
+        and ratio_to_multiply_animations == 1
+        and _can_concatenate_with_stream_copy(media_infos)
+    )
 
     # Generate a temporary file containing the video file paths as required by ffmpeg.
     with NamedTemporaryFile(mode="w") as input_file:
@@ -333,6 +516,24 @@ async def concatenate_videos(
             input_file.write(f"file '{os.path.abspath(video_path)}'{os.linesep}")
         input_file.flush()
 
+        if use_stream_copy:
+            logger.trace("About to start ffmpeg video concat with stream copy.")
+            cmd = (
+                "ffmpeg",
+                "-y",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                input_file.name,
+                "-c",
+                "copy",
+                target_file_name,
+            )
+            await _run_command(cmd, job_class=MediaJobClass.REMUX)
+            return target_file_name
+
         logger.trace("About to start ffmpeg video concat.")
 
         cmd = (
@@ -360,11 +561,65 @@ async def concatenate_videos(
     return target_file_name
 
 
+async def concatenate_audios(
+    audio_file_paths: list[str],
+    target_file_name: str = None,
+    workspace: BuildWorkspace = None,
+) -> str:
+    """
+    Concatenate multiple audio files into a single mp3 file, re-encoding them so that
+    files with different sample rates or channel layouts can be joined
+
+    Args:
+        audio_file_paths: The file paths to the audio files to concatenate, in order.
+            Must contain at least 1 path.
+        target_file_name: The target mp3 file. Default: concatenated_audio.mp3
+        workspace: The workspace of the default target file, defaults to the current
+            working directory
+
+    Returns:
+        str: The path to the concatenated audio file
+
+    Raises:
+        ValueError: If audio_file_paths is empty
+        FileNotFoundError: If any of the audio files does not exist
+    """
+    if len(audio_file_paths) < 1:
+        raise ValueError("audio_file_paths must contain at least 1 element")
+
+    for audio_path in audio_file_paths:
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(audio_path)
+
+    target_file_name = target_file_name or _get_default_target_path(
+        "concatenated_audio.mp3", workspace
+    )
+
+    inputs = []
+    for audio_path in audio_file_paths:
+        inputs.extend(("-i", audio_path))
+    streams = "".join(f"[{i}:a]" for i in range(len(audio_file_paths)))
+
+    cmd = (
+        "ffmpeg",
+        "-y",
+        *inputs,
+        "-filter_complex",
+        f"{streams}concat=n={len(audio_file_paths)}:v=0:a=1[a]",
+        "-map",
+        "[a]",
+        target_file_name,
+    )
+    await _run_command(cmd)
+    return target_file_name
+
+
 async def merge_audio(
     media_url: str,
     audio_file_path: str,
     audio_file_relative_volume: float | None = None,
     target_file_name=None,
+    workspace: BuildWorkspace = None,
 ):
     """
     Merge audio with the video
@@ -374,15 +629,19 @@ async def merge_audio(
         audio_file_path (str): The audio file path to merge
         audio_file_relative_volume (float): The relative volume of the audio file
         target_file_name (str): The target file name
+        workspace (BuildWorkspace): The workspace of the default target file,
+            defaults to the current working directory
 
     Returns:
         str: The merged audio file path
 
     """
     if not target_file_name:
-        target_file_name = "merged_audio_video.mp4"
+        target_file_name = _get_default_target_path(
+            "merged_audio_video.mp4", workspace
+        )
 
-    if has_audio_track(media_url):
+    if await has_audio_track_async(media_url):
         merged_file = await _merge_audio_and_video_with_existing_audio(
             media_url=media_url,
             audio_file_path=audio_file_path,
@@ -523,7 +782,9 @@ async def _merge_audio_and_video_without_audio_track(
     return target_file_name
 
 
-async def reencode_video(video_url, target_video_name=None, fps=24):
+async def reencode_video(
+    video_url, target_video_name=None, fps=24, workspace: BuildWorkspace = None
+):
     """
     Reencode the video, doing this for imported video that might not concatenate well
     with generated ones or among themselves
@@ -531,6 +792,8 @@ async def reencode_video(video_url, target_video_name=None, fps=24):
     Args:
         video_url (str): The video url to reencode
         target_video_name (str): The target video name
+        workspace (BuildWorkspace): The workspace of the default target video,
+            defaults to the current working directory
 
     Returns:
         Video: The reencoded video
@@ -538,7 +801,9 @@ async def reencode_video(video_url, target_video_name=None, fps=24):
     if video_url is None:
         raise ValueError("The video url is not provided")
     if not target_video_name:
-        target_video_name = "reencoded_" + get_canonical_name(video_url) + ".mp4"
+        target_video_name = _get_default_target_path(
+            "reencoded_" + get_canonical_name(video_url) + ".mp4", workspace
+        )
 
     logger.trace("Re-encoding video " + video_url + " with name " + target_video_name)
 
@@ -573,9 +838,99 @@ async def reencode_video(video_url, target_video_name=None, fps=24):
     return target_video_name
 
 
+async def reencode_and_merge_audio_tracks(
+    media_url: str,
+    audio_tracks: list[tuple[str, float]],
+    fps: int = None,
+    target_file_name: str = None,
+    workspace: BuildWorkspace = None,
+):
+    """
+    Reencode the video and mix several audio tracks into it in a single ffmpeg pass,
+    instead of writing one intermediate file per reencoding or audio merging step
+
+    Args:
+        media_url (str): The media url to process
+        audio_tracks (list): The audio file paths to mix in, with their relative volume
+        fps (int): The frame rate to normalize the video to, or None to keep it as is
+        target_file_name (str): The target file name
+        workspace (BuildWorkspace): The workspace of the default target file,
+            defaults to the current working directory
+
+    Returns:
+        str: The processed media file
+    """
+    if media_url is None:
+        raise ValueError("The video url is not provided")
+    if not target_file_name:
+        target_file_name = _get_default_target_path(
+            "reencoded_" + get_canonical_name(media_url) + ".mp4", workspace
+        )
+
+    filters = [f"[0:v]fps={fps}[V]" if fps else "[0:v]null[V]"]
+    mixed_audios = []
+    if await has_audio_track_async(media_url):
+        mixed_audios.append("[0:a]")
+    for i, (_, audio_file_relative_volume) in enumerate(audio_tracks, start=1):
+        filters.append(
+            f"[{i}:a]apad,loudnorm,volume={audio_file_relative_volume},"
+            f"aformat=sample_fmts=s16:channel_layouts=stereo[A{i}]"
+        )
+        mixed_audios.append(f"[A{i}]")
+    if mixed_audios:
+        # Tracks are summed rather than averaged, like amerge does when downmixing
+        filters.append(
+            "".join(mixed_audios)
+            + f"amix=inputs={len(mixed_audios)}:duration=longest:normalize=0[A]"
+        )
+
+    cmd = ["ffmpeg", "-y", "-i", media_url]
+    for audio_file_path, _ in audio_tracks:
+        cmd.extend(["-i", audio_file_path])
+    cmd.extend(["-filter_complex", ";".join(filters), "-map", "[V]"])
+    if mixed_audios:
+        # Padded audio tracks never end, so stop with the video
+        cmd.extend(["-map", "[A]", "-shortest"])
+    cmd.extend(
+        [
+            "-c:v",
+            "libx264",
+            "-profile:v",
+            "baseline",
+            "-level",
+            "3.0",
+            "-pix_fmt",
+            "yuv420p",
+            "-acodec",
+            "aac",
+            "-ar",
+            "44100",
+            "-ac",
+            "2",
+        ]
+    )
+
+    # ffmpeg cannot write over one of its inputs
+    output_file_name = target_file_name
+    if os.path.abspath(target_file_name) == os.path.abspath(media_url):
+        root, ext = os.path.splitext(target_file_name)
+        output_file_name = root + "_fused" + ext
+    cmd.append(output_file_name)
+
+    await _run_command(tuple(cmd))
+    if output_file_name != target_file_name:
+        os.replace(output_file_name, target_file_name)
+    return target_file_name
+
+
 # TODO: remove unused parameter target_duration
 async def cut_video(
-    video_url, start_time, end_time, target_duration=None, target_video_name=None
+    video_url,
+    start_time,
+    end_time,
+    target_duration=None,
+    target_video_name=None,
+    workspace: BuildWorkspace = None,
 ):
     """
     Cuts the video starting at start_time and ending at end_time
@@ -585,6 +940,8 @@ async def cut_video(
         end_time (float): The end time of the video in seconds
         target_duration (float) : Optional, the duration of the output video in seconds
         target_video_name (string) : Optional, the name of the output video in seconds
+        workspace (BuildWorkspace) : Optional, the workspace of the default output
+            video, defaults to the current working directory
 
     Returns:
         Video: The reencoded video
@@ -593,7 +950,9 @@ async def cut_video(
     assert video_url, "no media URL provided"
 
     if not target_video_name:
-        target_video_name = "cutted_" + get_canonical_name(video_url) + ".mp4"
+        target_video_name = _get_default_target_path(
+            "cutted_" + get_canonical_name(video_url) + ".mp4", workspace
+        )
 
     cmd = (
         "ffmpeg",
@@ -640,6 +999,7 @@ async def get_first_frame_as_image_ffmpeg(media_url, target_path=None):
 async def reverse_video(
     video_url,
     target_video_name=None,
+    workspace: BuildWorkspace = None,
 ):
     """
     Reverses the frames of the video, with last frame being the first, second to last
@@ -647,6 +1007,8 @@ async def reverse_video(
     Args:
         video_url (str): The video to reverse
         target_video_name (string) : Optional, the name of the output video
+        workspace (BuildWorkspace) : Optional, the workspace of the default output
+            video, defaults to the current working directory
 
     Returns:
         Video: The reversed video
@@ -654,7 +1016,9 @@ async def reverse_video(
     assert video_url, "no media URL provided"
 
     if not target_video_name:
-        target_video_name = "reversed_" + get_canonical_name(video_url) + ".mp4"
+        target_video_name = _get_default_target_path(
+            "reversed_" + get_canonical_name(video_url) + ".mp4", workspace
+        )
     # ffmpeg -i example.mp4 -vf reverse -an output_r.mp4
     cmd = ("ffmpeg", "-i", video_url, "-vf", "reverse", target_video_name)
     await _run_command(cmd)
@@ -665,6 +1029,7 @@ async def create_zoom_video(
     image_url,
     target_duration=3,
     target_video_name=None,
+    workspace: BuildWorkspace = None,
 ):
     """
     Creates a video zooming into an image for a certain duration
@@ -672,6 +1037,8 @@ async def create_zoom_video(
         image_url (str): The image url to zoom in
         target_duration (float) : Optional, the duration of the output video in seconds
         target_video_name (string) : Optional, the name of the output video
+        workspace (BuildWorkspace) : Optional, the workspace of the default output
+            video, defaults to the current working directory
 
     Returns:
         Video: The zoomed video
@@ -680,7 +1047,9 @@ async def create_zoom_video(
     assert image_url, "no media URL provided"
 
     if not target_video_name:
-        target_video_name = "zoom_" + get_canonical_name(image_url) + ".mp4"
+        target_video_name = _get_default_target_path(
+            "zoom_" + get_canonical_name(image_url) + ".mp4", workspace
+        )
 
     cmd = (
         "ffmpeg",
@@ -735,15 +1104,22 @@ async def get_last_frame_as_image_ffmpeg(media_url, target_path=None):
 
 
 async def generate_video_from_image(
-    image_url, duration=5, dimensions=(1280, 720), target_path=None
+    image_url,
+    duration=5,
+    dimensions=(1280, 720),
+    target_path=None,
+    workspace: BuildWorkspace = None,
 ):
     """
-    Generates a video from an image
+    Generates a video from an image, in the given workspace unless a target path is
+    provided
     """
     assert image_url, "no media URL provided"
 
     if not target_path:
-        target_path = "animated_" + get_canonical_name(image_url) + ".mp4"
+        target_path = _get_default_target_path(
+            "animated_" + get_canonical_name(image_url) + ".mp4", workspace
+        )
 
     cmd = (
         "ffmpeg",
@@ -769,16 +1145,86 @@ async def generate_video_from_image(
     return target_path
 
 
-async def _run_command(cmd: tuple[str]):
-    logger.debug(" ".join(cmd))
+def _escape_filter_value(value: str) -> str:
+    # A filter option value is escaped once for the filter options, then once more for
+    # the filtergraph, see "Notes on filtergraph escaping" in the ffmpeg documentation
+    value = "".join("\\" + c if c in "\\':" else c for c in value)
+    return "".join("\\" + c if c in "\\'[],;" else c for c in value)
+
 
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+async def burn_subtitles(
+    video_path: str,
+    subtitles_path: str,
+    target_path: str = None,
+    fonts_dir: str = None,
+    workspace: BuildWorkspace = None,
+) -> str:
+    """
+    Burn an ASS subtitle file into a video in a single ffmpeg pass, the audio being
+    copied as is
+
+    Args:
+        video_path (str): The path to the input video
+        subtitles_path (str): The path to the ASS subtitle file
+        target_path (str): The path to the output video
+        fonts_dir (str): A directory with the fonts used by the subtitles, in addition
+            to the fonts installed on the system
+        workspace (BuildWorkspace): The workspace of the default target video,
+            defaults to the current working directory
+
+    Returns:
+        str: The path to the output video
+    """
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(video_path)
+    if not os.path.exists(subtitles_path):
+        raise FileNotFoundError(subtitles_path)
+    if not target_path:
+        target_path = _get_default_target_path(
+            "subtitled_" + get_canonical_name(video_path) + ".mp4", workspace
+        )
+
+    subtitles_filter = "ass=filename=" + _escape_filter_value(subtitles_path)
+    if fonts_dir:
+        subtitles_filter += ":fontsdir=" + _escape_filter_value(fonts_dir)
+
+    cmd = (
+        "ffmpeg",
+        "-y",
+        "-i",
+        video_path,
+        "-vf",
+        subtitles_filter,
+        "-c:v",
+        "libx264",
+        "-pix_fmt",
+        "yuv420p",
+        "-c:a",
+        "copy",
+        target_path,
     )
+    await _run_command(cmd)
+    return target_path
+
+
+async def _run_command(
+    cmd: tuple[str], job_class: MediaJobClass = MediaJobClass.ENCODE
+) -> bytes:
+    """
+    Run a command in a subprocess without blocking the event loop, through the media
+    executor so that the number of concurrent processes stays bounded
 
-    stdout, stderr = await process.communicate()
+    Args:
+        cmd (tuple): The command and its arguments
+        job_class (MediaJobClass): The class of job, deciding which concurrency cap
+            applies
+
+    Returns:
+        bytes: The standard output of the command
+    """
+    logger.debug(" ".join(cmd))
+
+    process, stdout, stderr = await get_media_executor().run(cmd, job_class=job_class)
     if process.returncode != 0:
         error_messages = []
         if stdout:
@@ -795,3 +1241,5 @@ async def _run_command(cmd: tuple[str]):
 
         logger.error(error_message)
         raise Exception(error_message)
+
+    return stdout
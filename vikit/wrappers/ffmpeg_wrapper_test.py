@@ -13,14 +13,17 @@
 # limitations under the License.
 # ==============================================================================
 
+import json
 import math
 import os
+import subprocess
 import warnings
 
 import pytest
 from loguru import logger
 
 import tests.testing_medias as tests_medias
+import vikit.wrappers.ffmpeg_wrapper as ffmpeg_wrapper
 from vikit.common.context_managers import WorkingFolderContext
 from vikit.wrappers.ffmpeg_wrapper import (
     concatenate_videos,
@@ -29,8 +32,42 @@ from vikit.wrappers.ffmpeg_wrapper import (
     extract_audio_from_video,
     generate_video_from_image,
     get_media_duration,
+    get_media_fps,
+    has_audio_track,
+    reencode_and_merge_audio_tracks,
     reencode_video,
 )
+from vikit.wrappers.media_info_cache import MediaInfoCache
+
+PROBED_MEDIA_INFO = {
+    "streams": [
+        {"codec_type": "video", "r_frame_rate": "30000/1001", "duration": "4.9"},
+        {"codec_type": "audio", "duration": "5.0"},
+    ],
+    "format": {"duration": "5.005"},
+}
+NORMALIZED_MEDIA_INFO = {
+    "streams": [
+        {
+            "codec_type": "video",
+            "codec_name": "h264",
+            "profile": "Constrained Baseline",
+            "width": 1024,
+            "height": 576,
+            "pix_fmt": "yuv420p",
+            "r_frame_rate": "24/1",
+            "time_base": "1/12288",
+        },
+        {
+            "codec_type": "audio",
+            "codec_name": "aac",
+            "sample_rate": "44100",
+            "channels": 2,
+            "channel_layout": "stereo",
+        },
+    ],
+    "format": {"duration": "3.0"},
+}
 
 
 class TestFFMPEGWrapper:
@@ -243,3 +280,243 @@ class TestFFMPEGWrapper:
                 image_url=tests_medias.get_test_prompt_image(),
             )
             assert int(get_media_duration(image_video)) == 5
+
+    @pytest.mark.unit
+    def test_media_info_probes__single_ffprobe_call(self, monkeypatch):
+        """
+        Duration, FPS and audio track detection should share one cached ffprobe call
+        """
+        probe_calls = []
+
+        def fake_run(cmd, **kwargs):
+            probe_calls.append(cmd)
+            return subprocess.CompletedProcess(
+                cmd, 0, stdout=json.dumps(PROBED_MEDIA_INFO).encode(), stderr=b""
+            )
+
+        media_info_cache = MediaInfoCache()
+        monkeypatch.setattr(ffmpeg_wrapper.subprocess, "run", fake_run)
+        monkeypatch.setattr(
+            ffmpeg_wrapper, "get_media_info_cache", lambda: media_info_cache
+        )
+
+        with WorkingFolderContext():
+            with open("media.mp4", "wb") as f:
+                f.write(b"fake media")
+
+            assert get_media_duration("media.mp4") == 5.005
+            assert math.isclose(get_media_fps("media.mp4"), 29.97, rel_tol=1e-3)
+            assert has_audio_track("media.mp4")
+
+        assert len(probe_calls) == 1
+        assert "-show_streams" in probe_calls[0]
+        assert "-show_format" in probe_calls[0]
+
+    @pytest.mark.unit
+    def test_media_info_parsing__missing_data(self):
+        no_video_info = {"streams": [{"codec_type": "audio", "duration": "2.5"}]}
+
+        assert ffmpeg_wrapper._get_duration(no_video_info) == 2.5
+        assert ffmpeg_wrapper._get_has_audio_track(no_video_info)
+        assert not ffmpeg_wrapper._get_has_audio_track({"streams": []})
+        with pytest.raises(ValueError):
+            ffmpeg_wrapper._get_fps(no_video_info)
+        with pytest.raises(ValueError):
+            ffmpeg_wrapper._get_duration({"streams": []})
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_media_info_async_probes__single_ffprobe_call(self, monkeypatch):
+        """
+        The async probes should not block on subprocess.run and share the same cache
+        """
+        probe_calls = []
+
+        async def fake_run_command(cmd, job_class=None):
+            probe_calls.append(cmd)
+            return json.dumps(PROBED_MEDIA_INFO).encode()
+
+        def forbidden_run(cmd, **kwargs):
+            raise AssertionError("async probes must not call subprocess.run")
+
+        media_info_cache = MediaInfoCache()
+        monkeypatch.setattr(ffmpeg_wrapper, "_run_command", fake_run_command)
+        monkeypatch.setattr(ffmpeg_wrapper.subprocess, "run", forbidden_run)
+        monkeypatch.setattr(
+            ffmpeg_wrapper, "get_media_info_cache", lambda: media_info_cache
+        )
+
+        with WorkingFolderContext():
+            with open("media.mp4", "wb") as f:
+                f.write(b"fake media")
+
+            assert await ffmpeg_wrapper.get_media_duration_async("media.mp4") == 5.005
+            assert math.isclose(
+                await ffmpeg_wrapper.get_media_fps_async("media.mp4"),
+                29.97,
+                rel_tol=1e-3,
+            )
+            assert await ffmpeg_wrapper.has_audio_track_async("media.mp4")
+            assert get_media_duration("media.mp4") == 5.005
+
+        assert len(probe_calls) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "second_video_info, ratio, expect_stream_copy",
+        [
+            (NORMALIZED_MEDIA_INFO, 1, True),
+            (NORMALIZED_MEDIA_INFO, 1.5, False),
+            (
+                {
+                    "streams": [
+                        {**NORMALIZED_MEDIA_INFO["streams"][0], "width": 1280},
+                        NORMALIZED_MEDIA_INFO["streams"][1],
+                    ]
+                },
+                1,
+                False,
+            ),
+            ({"streams": [NORMALIZED_MEDIA_INFO["streams"][0]]}, 1, False),
+        ],
+    )
+    async def test_concatenate_videos__stream_copy_only_when_compatible(
+        self, monkeypatch, second_video_info, ratio, expect_stream_copy
+    ):
+        commands = []
+
+        async def fake_run_command(cmd, job_class=None):
+            commands.append(cmd)
+
+        async def fake_get_media_info_async(media_path):
+            return (
+                NORMALIZED_MEDIA_INFO if media_path == "first.mp4" else second_video_info
+            )
+
+        monkeypatch.setattr(ffmpeg_wrapper, "_run_command", fake_run_command)
+        monkeypatch.setattr(
+            ffmpeg_wrapper, "get_media_info_async", fake_get_media_info_async
+        )
+
+        with WorkingFolderContext():
+            for path in ["first.mp4", "second.mp4"]:
+                with open(path, "wb") as f:
+                    f.write(b"fake media")
+
+            await concatenate_videos(
+                video_file_paths=["first.mp4", "second.mp4"],
+                target_file_name="target.mp4",
+                ratio_to_multiply_animations=ratio,
+            )
+
+        assert len(commands) == 1
+        assert ("copy" in commands[0]) == expect_stream_copy
+        assert ("libx264" in commands[0]) != expect_stream_copy
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("has_audio", [True, False])
+    async def test_reencode_and_merge_audio_tracks__single_ffmpeg_pass(
+        self, monkeypatch, has_audio
+    ):
+        commands = []
+
+        async def fake_run_command(cmd, job_class=None):
+            commands.append(cmd)
+            with open(cmd[-1], "wb") as f:
+                f.write(b"fused media")
+
+        async def fake_has_audio_track_async(video_path):
+            return has_audio
+
+        monkeypatch.setattr(ffmpeg_wrapper, "_run_command", fake_run_command)
+        monkeypatch.setattr(
+            ffmpeg_wrapper, "has_audio_track_async", fake_has_audio_track_async
+        )
+
+        with WorkingFolderContext():
+            with open("video.mp4", "wb") as f:
+                f.write(b"fake media")
+
+            result = await reencode_and_merge_audio_tracks(
+                media_url="video.mp4",
+                audio_tracks=[("music.mp3", 0.5), ("voice.mp3", 1.0)],
+                fps=24,
+                target_file_name="video.mp4",
+            )
+
+            with open("video.mp4", "rb") as f:
+                assert f.read() == b"fused media"
+
+        assert result == "video.mp4"
+        assert len(commands) == 1
+        filter_graph = commands[0][commands[0].index("-filter_complex") + 1]
+        assert "[0:v]fps=24[V]" in filter_graph
+        assert "volume=0.5" in filter_graph
+        assert ("[0:a][A1][A2]amix=inputs=3" in filter_graph) == has_audio
+        assert ("[A1][A2]amix=inputs=2" in filter_graph) != has_audio
+        assert commands[0][-1] != "video.mp4"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_concatenate_audios__joined_in_order(self, monkeypatch):
+        commands = []
+
+        async def fake_run_command(cmd, job_class=None):
+            commands.append(cmd)
+
+        monkeypatch.setattr(ffmpeg_wrapper, "_run_command", fake_run_command)
+
+        with WorkingFolderContext():
+            for path in ["one.mp3", "two.wav", "three.mp3"]:
+                with open(path, "wb") as f:
+                    f.write(b"fake audio")
+
+            result = await ffmpeg_wrapper.concatenate_audios(
+                ["one.mp3", "two.wav", "three.mp3"], target_file_name="all.mp3"
+            )
+
+            with pytest.raises(FileNotFoundError):
+                await ffmpeg_wrapper.concatenate_audios(["one.mp3", "missing.mp3"])
+
+        assert result == "all.mp3"
+        assert len(commands) == 1
+        cmd = commands[0]
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-i"] == [
+            "one.mp3",
+            "two.wav",
+            "three.mp3",
+        ]
+        assert cmd[cmd.index("-filter_complex") + 1] == (
+            "[0:a][1:a][2:a]concat=n=3:v=0:a=1[a]"
+        )
+        assert cmd[-1] == "all.mp3"
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_burn_subtitles__escapes_filter_paths(self, monkeypatch):
+        commands = []
+
+        async def fake_run_command(cmd, job_class=None):
+            commands.append(cmd)
+
+        monkeypatch.setattr(ffmpeg_wrapper, "_run_command", fake_run_command)
+
+        with WorkingFolderContext():
+            for path in ["video.mp4", "it's: subs.ass"]:
+                with open(path, "wb") as f:
+                    f.write(b"fake media")
+
+            result = await ffmpeg_wrapper.burn_subtitles(
+                "video.mp4", "it's: subs.ass", fonts_dir="fonts[1]"
+            )
+
+            assert result == os.path.abspath("subtitled_video.mp4")
+
+        assert len(commands) == 1
+        subtitles_filter = commands[0][commands[0].index("-vf") + 1]
+        assert subtitles_filter == (
+            "ass=filename=it\\\\\\'s\\\\: subs.ass:fontsdir=fonts\\[1\\]"
+        )
+        assert commands[0][commands[0].index("-c:a") + 1] == "copy"
@@ -0,0 +1,221 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from enum import Enum
+
+from loguru import logger
+
+import vikit.common.config as config
+from vikit.common.process_wide import ProcessWideInstance
+
+
+class MediaJobClass(Enum):
+    """
+    The kind of media job, each kind having its own concurrency cap
+    """
+
+    ENCODE = 0  # CPU bound: decoding, filtering and encoding
+    REMUX = 1  # I/O bound: stream copy, container changes
+    PROBE = 2  # Short lived: reading metadata
+
+    def __str__(self):
+        return self.name.lower()
+
+
+@dataclass
+class MediaJobMetrics:
+    """Queueing metrics for one class of media jobs."""
+
+    max_concurrent_jobs: int
+    queued_jobs: int = 0
+    running_jobs: int = 0
+    completed_jobs: int = 0
+    total_wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+
+    @property
+    def average_wait_sec(self) -> float:
+        if self.completed_jobs == 0:
+            return 0.0
+        return self.total_wait_sec / self.completed_jobs
+
+
+class MediaExecutor:
+    """
+    Runs media commands (ffmpeg, ffprobe) in subprocesses, capping how many of them run
+    at the same time for each class of job, so that building many videos concurrently
+    does not spawn as many encoders as there are videos.
+
+    Encode jobs also get a thread budget so that the total number of encoding threads
+    stays close to the number of cores.
+
+    Caps apply per event loop, which is one per process for a regular build.
+    """
+
+    def __init__(
+        self,
+        max_encode_jobs: int = None,
+        max_remux_jobs: int = None,
+        max_probe_jobs: int = None,
+        encode_threads: int = None,
+    ):
+        """
+        Args:
+            max_encode_jobs: The maximum number of encode jobs running at once, defaults
+                to half the number of cores
+            max_remux_jobs: The maximum number of remux jobs running at once, defaults
+                to the number of cores
+            max_probe_jobs: The maximum number of probe jobs running at once, defaults
+                to twice the number of cores
+            encode_threads: The number of threads given to each encode job, defaults to
+                the number of cores divided by max_encode_jobs
+        """
+        cpu_count = os.cpu_count() or 1
+
+        max_encode_jobs = max_encode_jobs or max(1, cpu_count // 2)
+        max_remux_jobs = max_remux_jobs or cpu_count
+        max_probe_jobs = max_probe_jobs or 2 * cpu_count
+        self.encode_threads = encode_threads or max(1, cpu_count // max_encode_jobs)
+
+        self._max_jobs = {
+            MediaJobClass.ENCODE: max_encode_jobs,
+            MediaJobClass.REMUX: max_remux_jobs,
+            MediaJobClass.PROBE: max_probe_jobs,
+        }
+        for job_class, max_jobs in self._max_jobs.items():
+            if max_jobs < 1:
+                raise ValueError(
+                    f"Max concurrent {job_class} jobs ({max_jobs}) must be >= 1"
+                )
+        if self.encode_threads < 1:
+            raise ValueError(f"Encode threads ({self.encode_threads}) must be >= 1")
+
+        self._metrics = {
+            job_class: MediaJobMetrics(max_concurrent_jobs=max_jobs)
+            for job_class, max_jobs in self._max_jobs.items()
+        }
+        # asyncio semaphores are bound to the event loop they are first used in
+        self._semaphores_by_loop = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self, job_class: MediaJobClass) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores_by_loop.get(loop)
+        if semaphores is None:
+            semaphores = {
+                job_class: asyncio.Semaphore(max_jobs)
+                for job_class, max_jobs in self._max_jobs.items()
+            }
+            self._semaphores_by_loop[loop] = semaphores
+        return semaphores[job_class]
+
+    def _with_thread_budget(self, cmd: tuple[str]) -> tuple[str]:
+        if cmd[0] != "ffmpeg" or "-threads" in cmd:
+            return tuple(cmd)
+        # -threads is an output option, so it goes right before the output file
+        return (*cmd[:-1], "-threads", str(self.encode_threads), cmd[-1])
+
+    async def run(
+        self, cmd: tuple[str], job_class: MediaJobClass = MediaJobClass.ENCODE
+    ):
+        """
+        Run a media command once a slot is available for its class of job
+
+        Args:
+            cmd: The command and its arguments
+            job_class: The class of job, deciding which cap applies
+
+        Returns:
+            The finished process, its standard output and its standard error
+        """
+        if job_class == MediaJobClass.ENCODE:
+            cmd = self._with_thread_budget(cmd)
+
+        metrics = self._metrics[job_class]
+        metrics.queued_jobs += 1
+        queued_at = time.monotonic()
+        has_started = False
+        try:
+            async with self._get_semaphore(job_class):
+                has_started = True
+                wait_sec = time.monotonic() - queued_at
+                metrics.queued_jobs -= 1
+                metrics.running_jobs += 1
+                metrics.total_wait_sec += wait_sec
+                metrics.max_wait_sec = max(metrics.max_wait_sec, wait_sec)
+                logger.trace(f"Waited {wait_sec:.3f}s for a {job_class} slot")
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    try:
+                        stdout, stderr = await process.communicate()
+                    except asyncio.CancelledError:
+                        process.kill()
+                        await process.wait()
+                        raise
+                finally:
+                    metrics.running_jobs -= 1
+                    metrics.completed_jobs += 1
+        finally:
+            if not has_started:  # e.g. cancelled while waiting for a slot
+                metrics.queued_jobs -= 1
+
+        return process, stdout, stderr
+
+    def get_queue_depth(self, job_class: MediaJobClass) -> int:
+        """
+        Get the number of jobs of a given class waiting for a slot
+        """
+        return self._metrics[job_class].queued_jobs
+
+    def get_metrics(self) -> dict:
+        """
+        Get the queueing metrics, by class of job
+        """
+        return dict(self._metrics)
+
+
+def _create_media_executor() -> MediaExecutor:
+    return MediaExecutor(
+        max_encode_jobs=config.get_max_concurrent_encode_jobs(),
+        max_remux_jobs=config.get_max_concurrent_remux_jobs(),
+        max_probe_jobs=config.get_max_concurrent_probe_jobs(),
+        encode_threads=config.get_encode_threads(),
+    )
+
+
+_media_executor = ProcessWideInstance(_create_media_executor)
+
+
+def get_media_executor() -> MediaExecutor:
+    """
+    Get the process wide media executor, created on first use from the configuration
+    """
+    return _media_executor.get()
+
+
+def set_media_executor(media_executor: MediaExecutor):
+    """
+    Replace the process wide media executor, e.g. to share a tuned executor across
+    builds or to reset the metrics
+    """
+    _media_executor.set(media_executor)
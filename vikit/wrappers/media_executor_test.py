@@ -0,0 +1,104 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import asyncio
+import sys
+
+import pytest
+
+from vikit.wrappers.media_executor import MediaExecutor, MediaJobClass
+
+SLEEP_CMD = (sys.executable, "-c", "import time; time.sleep(0.2); print('done')")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__returns_process_output():
+    executor = MediaExecutor(max_encode_jobs=1)
+
+    process, stdout, _ = await executor.run(SLEEP_CMD)
+
+    assert process.returncode == 0
+    assert stdout.strip() == b"done"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__caps_concurrent_jobs_per_class():
+    executor = MediaExecutor(max_encode_jobs=1, max_probe_jobs=4)
+
+    encode_jobs = [executor.run(SLEEP_CMD) for _ in range(3)]
+    probe_jobs = [executor.run(SLEEP_CMD, MediaJobClass.PROBE) for _ in range(3)]
+    jobs = asyncio.gather(*encode_jobs, *probe_jobs)
+    await asyncio.sleep(0.1)
+
+    assert executor.get_queue_depth(MediaJobClass.ENCODE) == 2
+    assert executor.get_queue_depth(MediaJobClass.PROBE) == 0
+
+    await jobs
+
+    encode_metrics = executor.get_metrics()[MediaJobClass.ENCODE]
+    probe_metrics = executor.get_metrics()[MediaJobClass.PROBE]
+    assert encode_metrics.completed_jobs == 3
+    assert encode_metrics.queued_jobs == 0
+    assert encode_metrics.running_jobs == 0
+    # The last encode job waited for the two previous ones
+    assert encode_metrics.max_wait_sec >= 0.3
+    assert probe_metrics.max_wait_sec < 0.2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_run__cancelled_while_queued__leaves_the_queue():
+    executor = MediaExecutor(max_remux_jobs=1)
+
+    running_job = asyncio.create_task(executor.run(SLEEP_CMD, MediaJobClass.REMUX))
+    queued_job = asyncio.create_task(executor.run(SLEEP_CMD, MediaJobClass.REMUX))
+    await asyncio.sleep(0.05)
+    queued_job.cancel()
+    await running_job
+
+    with pytest.raises(asyncio.CancelledError):
+        await queued_job
+    assert executor.get_queue_depth(MediaJobClass.REMUX) == 0
+    assert executor.get_metrics()[MediaJobClass.REMUX].completed_jobs == 1
+
+
+@pytest.mark.unit
+def test_thread_budget__added_to_ffmpeg_encodes_only():
+    executor = MediaExecutor(max_encode_jobs=2, encode_threads=3)
+
+    assert executor._with_thread_budget(("ffmpeg", "-i", "in.mp4", "out.mp4")) == (
+        "ffmpeg",
+        "-i",
+        "in.mp4",
+        "-threads",
+        "3",
+        "out.mp4",
+    )
+    assert executor._with_thread_budget(
+        ("ffmpeg", "-i", "in.mp4", "-threads", "1", "out.mp4")
+    ) == ("ffmpeg", "-i", "in.mp4", "-threads", "1", "out.mp4")
+    assert executor._with_thread_budget(("ffprobe", "in.mp4")) == ("ffprobe", "in.mp4")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "init_kwargs",
+    [{"max_encode_jobs": -1}, {"max_probe_jobs": -2}, {"encode_threads": -1}],
+)
+def test_init__invalid_arg__fails(init_kwargs):
+    with pytest.raises(ValueError):
+        MediaExecutor(**init_kwargs)
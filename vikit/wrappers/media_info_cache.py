@@ -0,0 +1,205 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from tempfile import NamedTemporaryFile
+
+from loguru import logger
+
+import vikit.common.config as config
+from vikit.common.process_wide import ProcessWideInstance
+
+
+class MediaInfoCache:
+    """
+    Cache of the ffprobe results of media files.
+
+    Entries are keyed by the absolute path of the media file and are only valid as long
+    as the file size and modification time are unchanged, so a file rewritten by ffmpeg
+    is probed again. The cache is kept in memory and, if a cache file path is provided,
+    also persisted as JSON so it survives across builds and processes.
+
+    The least recently used entries are evicted past max_entries. Writing the cache
+    file is debounced: it is rewritten at most once every save_interval_sec, and
+    flush() writes the pending entries.
+    """
+
+    def __init__(
+        self,
+        cache_file_path: str = None,
+        max_entries: int = None,
+        save_interval_sec: float = 5.0,
+    ):
+        """
+        Args:
+            cache_file_path: The JSON file used to persist the cache, or None to keep
+                the cache in memory only
+            max_entries: The maximum number of entries kept, or None for no limit
+            save_interval_sec: The minimum delay between two writes of the cache file
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f"Max entries ({max_entries}) must be >= 1")
+
+        self.cache_file_path = cache_file_path
+        self.max_entries = max_entries
+        self.save_interval_sec = save_interval_sec
+        self._entries = OrderedDict()  # Least recently used first
+        self._lock = threading.Lock()
+        self._is_dirty = False
+        self._last_save = None
+
+        if self.cache_file_path:
+            self._load()
+
+    @staticmethod
+    def _get_file_signature(media_path: str):
+        stat = os.stat(media_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, media_path: str) -> dict:
+        """
+        Get the cached media info for a file
+
+        Args:
+            media_path: The path to the media file
+
+        Returns:
+            A copy of the cached ffprobe output, or None if the file was never probed or
+            has changed since it was probed
+        """
+        try:
+            size, mtime_ns = self._get_file_signature(media_path)
+        except OSError:
+            return None
+
+        key = os.path.abspath(media_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["size"] != size or entry["mtime_ns"] != mtime_ns:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry["media_info"])
+
+    def put(self, media_path: str, media_info: dict):
+        """
+        Store the media info of a file, replacing any previous entry for the same path
+
+        Args:
+            media_path: The path to the media file
+            media_info: The ffprobe output for that file
+        """
+        size, mtime_ns = self._get_file_signature(media_path)
+        key = os.path.abspath(media_path)
+        with self._lock:
+            self._entries[key] = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "media_info": copy.deepcopy(media_info),
+            }
+            self._entries.move_to_end(key)
+            self._evict()
+            self._is_dirty = True
+            if self.cache_file_path and (
+                self._last_save is None
+                or time.monotonic() - self._last_save >= self.save_interval_sec
+            ):
+                self._save()
+
+    def flush(self):
+        """
+        Write the entries not persisted yet to the cache file
+        """
+        with self._lock:
+            if self.cache_file_path and self._is_dirty:
+                self._save()
+
+    def clear(self):
+        """
+        Remove all the entries from the cache, including the persisted ones
+        """
+        with self._lock:
+            self._entries = OrderedDict()
+            self._is_dirty = False
+            if self.cache_file_path and os.path.exists(self.cache_file_path):
+                os.remove(self.cache_file_path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self):
+        if not os.path.exists(self.cache_file_path):
+            return
+        try:
+            with open(self.cache_file_path, "r") as cache_file:
+                self._entries = OrderedDict(json.load(cache_file))
+        except (OSError, ValueError) as e:
+            # Fail open, the cache is just an optimization
+            logger.warning(
+                f"Could not load media info cache {self.cache_file_path}: {e}"
+            )
+            self._entries = OrderedDict()
+        self._evict()
+
+    def _save(self):
+        # Write to a temporary file first so concurrent readers never see a partially
+        # written cache file
+        self._last_save = time.monotonic()
+        self._is_dirty = False
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_file_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with NamedTemporaryFile(
+                mode="w", dir=cache_dir, suffix=".tmp", delete=False
+            ) as tmp_file:
+                json.dump(self._entries, tmp_file)
+            os.replace(tmp_file.name, self.cache_file_path)
+        except OSError as e:
+            logger.warning(
+                f"Could not persist media info cache {self.cache_file_path}: {e}"
+            )
+
+
+def _create_media_info_cache() -> MediaInfoCache:
+    media_info_cache = MediaInfoCache(
+        cache_file_path=config.get_media_info_cache_file(),
+        max_entries=config.get_media_info_cache_max_entries(),
+    )
+    # Persist the entries whose write was debounced
+    atexit.register(media_info_cache.flush)
+    return media_info_cache
+
+
+_media_info_cache = ProcessWideInstance(_create_media_info_cache)
+
+
+def get_media_info_cache() -> MediaInfoCache:
+    """
+    Get the process wide media info cache, created on first use from the configuration
+    """
+    return _media_info_cache.get()
@@ -0,0 +1,142 @@
+# Copyright 2024 Vikit.ai. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+
+import os
+
+import pytest
+
+from vikit.common.context_managers import WorkingFolderContext
+from vikit.wrappers.media_info_cache import MediaInfoCache
+
+MEDIA_INFO = {"streams": [{"codec_type": "video"}], "format": {"duration": "3.0"}}
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+@pytest.mark.unit
+def test_get__unknown_file__returns_none():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        assert MediaInfoCache().get("media.mp4") is None
+        assert MediaInfoCache().get("missing.mp4") is None
+
+
+@pytest.mark.unit
+def test_put_then_get__returns_media_info():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        cache = MediaInfoCache()
+        cache.put("media.mp4", MEDIA_INFO)
+
+        assert cache.get("media.mp4") == MEDIA_INFO
+        assert cache.get(os.path.abspath("media.mp4")) == MEDIA_INFO
+        assert len(cache) == 1
+
+
+@pytest.mark.unit
+def test_get__file_modified__returns_none():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        cache = MediaInfoCache()
+        cache.put("media.mp4", MEDIA_INFO)
+
+        _write_file("media.mp4", b"abcdef")
+
+        assert cache.get("media.mp4") is None
+
+
+@pytest.mark.unit
+def test_cache_file__persists_entries_across_instances():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        MediaInfoCache(cache_file_path="cache/media_info.json").put(
+            "media.mp4", MEDIA_INFO
+        )
+
+        reloaded_cache = MediaInfoCache(cache_file_path="cache/media_info.json")
+
+        assert reloaded_cache.get("media.mp4") == MEDIA_INFO
+
+
+@pytest.mark.unit
+def test_cache_file__corrupted__starts_empty():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        _write_file("media_info.json", b"not json")
+
+        cache = MediaInfoCache(cache_file_path="media_info.json")
+
+        assert cache.get("media.mp4") is None
+
+
+@pytest.mark.unit
+def test_clear__removes_entries_and_cache_file():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        cache = MediaInfoCache(cache_file_path="media_info.json")
+        cache.put("media.mp4", MEDIA_INFO)
+
+        cache.clear()
+
+        assert cache.get("media.mp4") is None
+        assert not os.path.exists("media_info.json")
+
+
+@pytest.mark.unit
+def test_get__returns_a_copy():
+    with WorkingFolderContext():
+        _write_file("media.mp4", b"abc")
+        cache = MediaInfoCache()
+        cache.put("media.mp4", MEDIA_INFO)
+
+        cache.get("media.mp4")["format"]["duration"] = "0"
+
+        assert cache.get("media.mp4") == MEDIA_INFO
+
+
+@pytest.mark.unit
+def test_put__max_entries__evicts_least_recently_used():
+    with WorkingFolderContext():
+        for file_name in ["a.mp4", "b.mp4", "c.mp4"]:
+            _write_file(file_name, b"abc")
+        cache = MediaInfoCache(max_entries=2)
+        cache.put("a.mp4", MEDIA_INFO)
+        cache.put("b.mp4", MEDIA_INFO)
+        cache.get("a.mp4")
+
+        cache.put("c.mp4", MEDIA_INFO)
+
+        assert cache.get("a.mp4") == MEDIA_INFO
+        assert cache.get("b.mp4") is None
+        assert cache.get("c.mp4") == MEDIA_INFO
+
+
+@pytest.mark.unit
+def test_put__cache_file_writes_debounced_until_flush():
+    with WorkingFolderContext():
+        for file_name in ["a.mp4", "b.mp4"]:
+            _write_file(file_name, b"abc")
+        cache = MediaInfoCache(cache_file_path="media_info.json", save_interval_sec=60)
+        cache.put("a.mp4", MEDIA_INFO)
+        cache.put("b.mp4", MEDIA_INFO)
+
+        assert len(MediaInfoCache(cache_file_path="media_info.json")) == 1
+
+        cache.flush()
+
+        assert len(MediaInfoCache(cache_file_path="media_info.json")) == 2